@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Rolling, multi-benchmark CAPM beta engine over a locally cached return store.
+
+Weekly total returns live in the time-series store (source ``weekly_returns``,
+one partition per ticker, field ``return``). The cache is seeded from
+``evidence/capm_returns_data.csv`` and refreshed incrementally: each run only
+adds weeks after the latest cached observation, built from the shared daily
+OHLC cache (analysis/price_service.py), which itself downloads only the days
+it is missing. When the network is unavailable the engine runs on the cached
+history.
+
+Betas are computed for every asset × benchmark × window at once from rolling
+sums (cumulative-sum differences), so 52/104/260-week betas for CATY and the
+full peer set against several benchmarks are a handful of array operations.
+
+Outputs:
+  - analysis/capm_beta_timeseries.json (rolling beta / R² series + latest snapshot)
+  - data/caty16_coe_triangulation.json ``capm.rolling_beta`` (CATY betas and
+    implied CAPM COE per window/benchmark for the triangulation page)
+
+Usage:
+  python3 analysis/beta_engine.py                 # refresh cache, recompute
+  python3 analysis/beta_engine.py --offline       # cached history only
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from analysis.data_io import load_json, write_json  # noqa: E402
+from analysis.http_cassette import install_from_env  # noqa: E402
+from analysis.price_service import PriceService  # noqa: E402
+from analysis.timeseries_store import TimeSeriesStore, records_to_frame  # noqa: E402
+
+SEED_CSV = ROOT / "evidence" / "capm_returns_data.csv"
+OUTPUT_PATH = ROOT / "analysis" / "capm_beta_timeseries.json"
+COE_TRIANGULATION_PATH = ROOT / "data" / "caty16_coe_triangulation.json"
+
+SOURCE = "weekly_returns"
+FIELD = "return"
+TARGET = "CATY"
+ASSETS = ["CATY", "EWBC", "CVBF", "HAFC", "HOPE", "COLB", "WAFD", "PPBI", "BANC", "OPBK"]
+BENCHMARKS = ["^GSPC", "KRE", "KBWR"]
+WINDOWS = [52, 104, 260]
+HISTORY_START = "2015-01-01"
+
+# Seed CSV column → ticker
+SEED_COLUMNS = {"CATY": "CATY", "SP500": "^GSPC"}
+
+DEFAULT_RF = 0.0423
+DEFAULT_ERP = 0.0585
+
+
+def seed_from_csv(store: TimeSeriesStore, path: Path = SEED_CSV) -> int:
+    """Load the audited weekly return export into the cache (idempotent)."""
+    if not path.exists():
+        return 0
+    frame = pd.read_csv(path, parse_dates=["Date"])
+    records = []
+    for column, ticker in SEED_COLUMNS.items():
+        if column in frame.columns:
+            records.extend((ticker, FIELD, date, value) for date, value in zip(frame["Date"], frame[column]))
+    return store.append(SOURCE, records_to_frame(records))
+
+
+def _download_weekly_closes(tickers: Sequence[str], start: str) -> pd.DataFrame:
+    return PriceService().weekly_closes(tickers, start)
+
+
+def refresh(store: TimeSeriesStore, tickers: Sequence[str]) -> int:
+    """Append the weeks from each ticker's last cached return onward.
+
+    The last cached week is recomputed so a week stored while still in
+    progress is replaced by its completed return.
+    """
+    latest = {ticker: store.latest_date(SOURCE, ticker, FIELD) for ticker in tickers}
+    known = [stamp for stamp in latest.values() if stamp is not None]
+    if len(known) == len(tickers):
+        # One prior week is needed to turn the first new close into a return.
+        start = (min(known) - timedelta(days=14)).strftime("%Y-%m-%d")
+    else:
+        start = HISTORY_START
+    try:
+        closes = _download_weekly_closes(tickers, start)
+    except Exception as exc:  # noqa: BLE001
+        logging.warning("Price refresh failed (%s); using cached returns", exc)
+        return 0
+    if closes.empty:
+        logging.warning("Price refresh returned no data; using cached returns")
+        return 0
+
+    returns = closes.pct_change(fill_method=None)
+    records = []
+    for ticker in tickers:
+        if ticker not in returns.columns:
+            continue
+        series = returns[ticker].dropna()
+        if latest[ticker] is not None:
+            # Re-append the last cached week: it may have been stored mid-week
+            # (partial close), and append overwrites it with the final value.
+            series = series[series.index >= latest[ticker]]
+        records.extend((ticker, FIELD, date, value) for date, value in series.items())
+    return store.append(SOURCE, records_to_frame(records))
+
+
+def load_returns(store: TimeSeriesStore, tickers: Sequence[str], start: Any = None, end: Any = None) -> pd.DataFrame:
+    """Aligned weekly returns (date × ticker); missing weeks stay NaN."""
+    wide = store.pivot(SOURCE, FIELD, entities=list(tickers), start=start, end=end)
+    return wide.reindex(columns=[ticker for ticker in tickers if ticker in wide.columns])
+
+
+def _rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing sums along axis 0; rows before a full window are NaN."""
+    padded = np.concatenate([np.zeros((1,) + values.shape[1:]), np.cumsum(values, axis=0)])
+    out = np.full(values.shape, np.nan)
+    if window <= values.shape[0]:
+        out[window - 1 :] = padded[window:] - padded[:-window]
+    return out
+
+
+def rolling_betas(
+    returns: pd.DataFrame,
+    assets: Sequence[str],
+    benchmarks: Sequence[str],
+    windows: Sequence[int] = WINDOWS,
+) -> Dict[int, Dict[str, np.ndarray]]:
+    """Rolling beta and R² for every (asset, benchmark) pair and window.
+
+    Returns ``{window: {"beta": (T, A, B), "r2": (T, A, B)}}`` where a value
+    is only reported once the window holds ``window`` complete pairs.
+    """
+    y = returns[list(assets)].to_numpy(dtype=float)[:, :, None]  # (T, A, 1)
+    x = returns[list(benchmarks)].to_numpy(dtype=float)[:, None, :]  # (T, 1, B)
+    valid = ~np.isnan(y) & ~np.isnan(x)  # (T, A, B)
+    xv = np.where(valid, x, 0.0)
+    yv = np.where(valid, y, 0.0)
+    moments = {
+        "n": valid.astype(float),
+        "x": xv,
+        "y": yv,
+        "xx": xv * xv,
+        "yy": yv * yv,
+        "xy": xv * yv,
+    }
+
+    output: Dict[int, Dict[str, np.ndarray]] = {}
+    for window in windows:
+        sums = {key: _rolling_sum(value, window) for key, value in moments.items()}
+        complete = sums["n"] == window
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = sums["xy"] - sums["x"] * sums["y"] / window
+            var_x = sums["xx"] - sums["x"] ** 2 / window
+            var_y = sums["yy"] - sums["y"] ** 2 / window
+            beta = np.where(complete & (var_x > 0), cov / var_x, np.nan)
+            r2 = np.where(complete & (var_x > 0) & (var_y > 0), cov**2 / (var_x * var_y), np.nan)
+        output[window] = {"beta": beta, "r2": r2}
+    return output
+
+
+def _series(values: np.ndarray) -> List[Optional[float]]:
+    return [None if np.isnan(value) else round(float(value), 4) for value in values]
+
+
+def build_payload(
+    returns: pd.DataFrame,
+    assets: Sequence[str],
+    benchmarks: Sequence[str],
+    windows: Sequence[int] = WINDOWS,
+    rf: float = DEFAULT_RF,
+    erp: float = DEFAULT_ERP,
+) -> Dict[str, Any]:
+    results = rolling_betas(returns, assets, benchmarks, windows)
+    dates = [stamp.strftime("%Y-%m-%d") for stamp in returns.index]
+
+    series: Dict[str, Any] = {}
+    latest: Dict[str, Any] = {}
+    for window in windows:
+        beta, r2 = results[window]["beta"], results[window]["r2"]
+        window_key = f"{window}w"
+        series[window_key] = {}
+        latest[window_key] = {}
+        for b_idx, bench in enumerate(benchmarks):
+            series[window_key][bench] = {}
+            latest[window_key][bench] = {}
+            for a_idx, asset in enumerate(assets):
+                beta_path = beta[:, a_idx, b_idx]
+                series[window_key][bench][asset] = {
+                    "beta": _series(beta_path),
+                    "r2": _series(r2[:, a_idx, b_idx]),
+                }
+                observed = np.flatnonzero(~np.isnan(beta_path))
+                if observed.size:
+                    last = observed[-1]
+                    latest[window_key][bench][asset] = {
+                        "as_of": dates[last],
+                        "beta": round(float(beta_path[last]), 4),
+                        "r2": round(float(r2[last, a_idx, b_idx]), 4),
+                    }
+
+    coe_feed: Dict[str, Any] = {}
+    for window_key, by_bench in latest.items():
+        for bench, by_asset in by_bench.items():
+            snapshot = by_asset.get(TARGET)
+            if snapshot:
+                coe_feed.setdefault(window_key, {})[bench] = {
+                    **snapshot,
+                    "capm_coe_pct": round((rf + snapshot["beta"] * erp) * 100, 3),
+                }
+
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "frequency": "weekly",
+        "source": f"time-series store ({SOURCE}); seeded from {SEED_CSV.relative_to(ROOT)}",
+        "windows_weeks": list(windows),
+        "assets": [asset for asset in assets],
+        "benchmarks": [bench for bench in benchmarks],
+        "assumptions": {"rf": rf, "erp": erp},
+        "dates": dates,
+        "series": series,
+        "latest": latest,
+        "coe_feed": {"ticker": TARGET, "by_window": coe_feed},
+    }
+
+
+def update_coe_triangulation(payload: Dict[str, Any], path: Path = COE_TRIANGULATION_PATH) -> None:
+    """Record CATY's latest rolling betas next to the CAPM inputs used for COE triangulation."""
+    if not path.exists():
+        return
+    data = load_json(path)
+    capm = data.setdefault("capm", {})
+    capm["rolling_beta"] = {
+        "source": str(OUTPUT_PATH.relative_to(ROOT)),
+        "generated_at": payload["generated_at"],
+        "assumptions": payload["assumptions"],
+        "by_window": payload["coe_feed"]["by_window"],
+    }
+    write_json(path, data, sort_keys=False)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Rolling multi-benchmark CAPM betas")
+    parser.add_argument("--offline", action="store_true", help="Skip the incremental price refresh")
+    parser.add_argument("--assets", nargs="+", default=ASSETS)
+    parser.add_argument("--benchmarks", nargs="+", default=BENCHMARKS)
+    parser.add_argument("--windows", nargs="+", type=int, default=WINDOWS)
+    parser.add_argument("--rf", type=float, default=DEFAULT_RF, help="Risk-free rate (annualized, decimal)")
+    parser.add_argument("--erp", type=float, default=DEFAULT_ERP, help="Equity risk premium (annualized, decimal)")
+    parser.add_argument("--no-coe-update", action="store_true", help="Do not write into caty16_coe_triangulation.json")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    install_from_env()
+
+    try:
+        store = TimeSeriesStore()
+    except RuntimeError as exc:
+        print(f"❌ {exc}")
+        return 1
+
+    seed_from_csv(store)
+    if not args.offline:
+        added = refresh(store, list(dict.fromkeys(args.assets + args.benchmarks)))
+        logging.info("Cached %s new weekly returns", added)
+
+    returns = load_returns(store, list(dict.fromkeys(args.assets + args.benchmarks)))
+    assets = [ticker for ticker in args.assets if ticker in returns.columns]
+    benchmarks = [ticker for ticker in args.benchmarks if ticker in returns.columns]
+    if not assets or not benchmarks:
+        print("❌ No cached returns for the requested assets/benchmarks")
+        return 1
+
+    payload = build_payload(returns, assets, benchmarks, args.windows, args.rf, args.erp)
+    write_json(OUTPUT_PATH, payload, sort_keys=False)
+    if not args.no_coe_update:
+        update_coe_triangulation(payload)
+
+    print(f"✓ Wrote {OUTPUT_PATH.relative_to(ROOT)} ({len(assets)} assets × {len(benchmarks)} benchmarks × {len(args.windows)} windows)")
+    for window_key, by_bench in payload["coe_feed"]["by_window"].items():
+        for bench, snapshot in by_bench.items():
+            print(f"  {TARGET} {window_key} vs {bench}: β={snapshot['beta']:.3f} → COE {snapshot['capm_coe_pct']:.2f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,159 @@
+"""
+Shared JSON data-access layer for the pipeline scripts.
+
+``load_json`` memoizes the parsed document for every file per process, keyed
+by path and its ``(mtime_ns, size)`` signature (analysis/file_watch.py). The
+stages and build_site renderers that each read market_data_current.json,
+valuation_methods.json, … in one run parse them once; later calls get a deep
+copy (or, with ``shared=True``, the memoized object itself), and a file
+rewritten on disk is re-read on the next call. Parsing goes through orjson when it is
+installed; stdlib json is the fallback and also handles the NaN/Infinity
+literals orjson rejects.
+
+``write_json`` writes a sibling temp file (unique per process and thread) and
+renames it over the destination, so a crash mid-write never leaves a
+truncated file for the next stage to read and concurrent writers never share
+a temp file. Output is stdlib-formatted (indent=2, ASCII escapes, trailing
+newline) so regenerated files are byte-stable whichever parser is installed.
+Keys are sorted; in-place updaters of hand-ordered documents
+(market_data_current.json, valuation outputs) pass ``sort_keys=False`` to keep
+the document's existing order. ``file_lock`` serializes read-modify-write
+cycles on a shared cache across threads and processes.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import copy
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+from analysis.file_watch import Signature, file_signature
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional fast path
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX: in-process locking only
+    fcntl = None
+
+PathLike = Union[str, os.PathLike]
+
+_MISSING = object()
+_MEMO: Dict[Path, Tuple[Signature, Any]] = {}
+_STATS = {"hits": 0, "misses": 0}
+_LOCK = threading.Lock()
+_PATH_LOCKS: Dict[Path, threading.Lock] = {}
+
+
+def backend() -> str:
+    return "orjson" if orjson is not None else "json"
+
+
+def parse(data: Union[bytes, str]) -> Any:
+    """Decode JSON text with the fastest available backend."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # NaN/Infinity literals (or invalid JSON: stdlib raises below)
+    return json.loads(data)
+
+
+def dumps(payload: Any, *, sort_keys: bool = True, indent: Optional[int] = 2) -> str:
+    return json.dumps(payload, indent=indent, sort_keys=sort_keys) + "\n"
+
+
+def _key(path: PathLike) -> Path:
+    return Path(path).absolute()
+
+
+def load_json(path: PathLike, default: Any = _MISSING, *, shared: bool = False) -> Any:
+    """Parsed JSON at ``path``, memoized per (path, mtime_ns, size).
+
+    The file is parsed once per signature. Every call returns a deep copy
+    (callers stamp metadata into what they load) unless ``shared=True``,
+    which returns the memoized object itself for read-only use. A missing
+    file raises FileNotFoundError unless ``default`` is given.
+    """
+    key = _key(path)
+    signature = file_signature(key)
+    if signature is None:
+        with _LOCK:
+            _MEMO.pop(key, None)
+        if default is _MISSING:
+            raise FileNotFoundError(f"Required data file missing: {path}")
+        return default
+
+    with _LOCK:
+        cached = _MEMO.get(key)
+        fresh = cached is None or cached[0] != signature
+        _STATS["misses" if fresh else "hits"] += 1
+    if fresh:
+        cached = (signature, parse(key.read_bytes()))
+        with _LOCK:
+            _MEMO[key] = cached
+    return cached[1] if shared else copy.deepcopy(cached[1])
+
+
+def temp_path(path: PathLike) -> Path:
+    """Sibling temp file for an atomic replace, unique per process and thread."""
+    path = Path(path)
+    return path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+@contextlib.contextmanager
+def file_lock(path: PathLike) -> Iterator[None]:
+    """Hold an exclusive lock on ``path`` (created if missing).
+
+    The lock is advisory (``flock``), so it serializes every thread and
+    process that takes it, including out-of-process pipeline stages.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _LOCK:
+        local = _PATH_LOCKS.setdefault(_key(path), threading.Lock())
+    with local, open(path, "a+b") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def write_text(path: PathLike, text: str) -> Path:
+    """Atomically replace ``path`` with ``text`` (temp file + rename)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = temp_path(path)
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+    invalidate(path)
+    return path
+
+
+def write_json(path: PathLike, payload: Any, *, sort_keys: bool = True) -> Path:
+    """Atomically write ``payload`` as indented JSON with a trailing newline."""
+    return write_text(path, dumps(payload, sort_keys=sort_keys))
+
+
+def invalidate(path: Optional[PathLike] = None) -> None:
+    """Drop one memoized file (or all of them)."""
+    with _LOCK:
+        if path is None:
+            _MEMO.clear()
+        else:
+            _MEMO.pop(_key(path), None)
+
+
+def memo_stats() -> Dict[str, int]:
+    with _LOCK:
+        return {**_STATS, "entries": len(_MEMO)}
@@ -4,28 +4,29 @@ Disconfirmer Monitoring Script - Exit codes fire when thresholds breached
 Monitors key drivers and raises alerts when assumptions invalidated
 """
 
-import json
 import sys
 from pathlib import Path
 from datetime import datetime, timezone
 
 # Paths
 base_dir = Path(__file__).parent.parent
+if str(base_dir) not in sys.path:
+    sys.path.insert(0, str(base_dir))
+
+from analysis.data_io import load_json  # noqa: E402
+
 log_path = base_dir / 'logs' / 'automation_run.log'
 market_data_path = base_dir / 'data' / 'market_data_current.json'
 nco_history_path = base_dir / 'data' / 'fdic_nco_history.json'
 driver_inputs_path = base_dir / 'data' / 'driver_inputs.json'
 
-with open(market_data_path, 'r', encoding='utf-8') as f:
-    data = json.load(f)
+data = load_json(market_data_path)
 
 # Load NCO history
-with open(nco_history_path, 'r', encoding='utf-8') as f:
-    nco_data = json.load(f)
+nco_data = load_json(nco_history_path)
 
 # Load driver inputs
-with open(driver_inputs_path, 'r', encoding='utf-8') as f:
-    driver_inputs = json.load(f)
+driver_inputs = load_json(driver_inputs_path)
 
 print("=" * 70)
 print("DISCONFIRMER MONITORING - Driver Invalidation Check")
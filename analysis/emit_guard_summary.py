@@ -9,16 +9,16 @@ Usage (in GitHub Actions):
 
 from __future__ import annotations
 
-import json
+import sys
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
-VAL_PATH = ROOT / "data" / "valuation_outputs.json"
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 
+from analysis.data_io import load_json  # noqa: E402
 
-def load_json(path: Path) -> dict:
-    with path.open("r", encoding="utf-8") as fh:
-        return json.load(fh)
+VAL_PATH = ROOT / "data" / "valuation_outputs.json"
 
 
 def main() -> int:
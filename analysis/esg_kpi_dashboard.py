@@ -15,12 +15,17 @@ Usage:
     python3 analysis/esg_kpi_dashboard.py --export-csv       # Generate CSV
 """
 
-import json
 import sys
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from analysis.data_io import load_json  # noqa: E402
+
 
 class ESGDashboard:
     """ESG KPI Dashboard for CATY"""
@@ -33,8 +38,7 @@ class ESGDashboard:
         if not full_path.exists():
             raise FileNotFoundError(f"ESG data file not found: {full_path}")
 
-        with open(full_path, 'r') as f:
-            self.data = json.load(f)
+        self.data = load_json(full_path)
 
         self.last_updated = self.data['metadata']['last_updated']
 
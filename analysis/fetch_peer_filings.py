@@ -13,10 +13,17 @@ import argparse
 import datetime as dt
 import json
 import sys
+from pathlib import Path
 from typing import Iterable, List, Tuple
 
 import urllib.request
 
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from analysis.http_cassette import install_from_env  # noqa: E402
+
 USER_AGENT = "CATYResearchBot/1.0 (nirvan@example.com)"
 
 
@@ -78,6 +85,7 @@ def resolve_cik(identifier: str) -> str:
 
 def main(argv: List[str]) -> int:
     args = parse_args(argv)
+    install_from_env()
     print("Peer Filing Monitor")
     print("===================")
     print(f"Cutoff date: {args.cutoff.isoformat()}")
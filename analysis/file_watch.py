@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Directory change notification for long-running builders.
+
+``open_watcher`` returns an object whose ``wait(timeout)`` blocks until files
+matching ``suffixes`` are created, rewritten, renamed into place or deleted in
+one of the watched directories, and returns the affected paths. On Linux the
+kernel's inotify interface is used through ``ctypes`` (no third-party
+dependency); elsewhere, or when inotify is unavailable, a stat-polling watcher
+compares ``(mtime_ns, size)`` snapshots every ``poll_interval`` seconds.
+
+Both backends coalesce bursts: after the first event they keep collecting for
+``settle`` seconds so an editor's write-then-rename or a pipeline stage that
+rewrites several files yields a single batch.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence, Set, Tuple
+
+Signature = Tuple[int, int]
+
+# inotify(7) event masks.
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def file_signature(path: Path) -> Optional[Signature]:
+    """``(mtime_ns, size)`` of a file, or ``None`` when it does not exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class PollingWatcher:
+    """Portable fallback: diff directory snapshots on an interval."""
+
+    backend = "poll"
+
+    def __init__(
+        self,
+        directories: Iterable[Path],
+        suffixes: Sequence[str] = (".json",),
+        poll_interval: float = 0.25,
+        settle: float = 0.05,
+    ) -> None:
+        self.directories = [Path(directory) for directory in directories]
+        self.suffixes = tuple(suffixes)
+        self.poll_interval = poll_interval
+        self.settle = settle
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[Path, Signature]:
+        snapshot: Dict[Path, Signature] = {}
+        for directory in self.directories:
+            try:
+                entries = list(os.scandir(directory))
+            except FileNotFoundError:
+                continue
+            for entry in entries:
+                if not entry.name.endswith(self.suffixes) or not entry.is_file():
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                snapshot[Path(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def _diff(self) -> Set[Path]:
+        current = self._scan()
+        changed = {path for path in current.keys() | self._snapshot.keys() if current.get(path) != self._snapshot.get(path)}
+        self._snapshot = current
+        return changed
+
+    def wait(self, timeout: Optional[float] = None) -> Set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = self._diff()
+            if changed:
+                time.sleep(self.settle)
+                return changed | self._diff()
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(self.poll_interval)
+
+    def close(self) -> None:
+        self._snapshot = {}
+
+
+class InotifyWatcher:
+    """Linux inotify via libc; raises ``OSError`` when unavailable."""
+
+    backend = "inotify"
+
+    def __init__(
+        self,
+        directories: Iterable[Path],
+        suffixes: Sequence[str] = (".json",),
+        settle: float = 0.05,
+    ) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "libc does not export inotify_init1")
+        self._libc = libc
+        self.suffixes = tuple(suffixes)
+        self.settle = settle
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._dirs: Dict[int, Path] = {}
+        for directory in directories:
+            directory = Path(directory)
+            wd = libc.inotify_add_watch(self._fd, os.fsencode(str(directory)), WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                self.close()
+                raise OSError(err, f"inotify_add_watch({directory}): {os.strerror(err)}")
+            self._dirs[wd] = directory
+
+    def _drain(self) -> Set[Path]:
+        changed: Set[Path] = set()
+        while True:
+            try:
+                buffer = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(buffer, offset)
+                offset += _EVENT_HEADER.size
+                name = buffer[offset : offset + length].rstrip(b"\0").decode("utf-8", "surrogateescape")
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    # Events were dropped; report every matching file so callers resync.
+                    for directory in self._dirs.values():
+                        changed.update(p for p in directory.iterdir() if p.name.endswith(self.suffixes))
+                    continue
+                if name.endswith(self.suffixes) and wd in self._dirs:
+                    changed.add(self._dirs[wd] / name)
+
+    def wait(self, timeout: Optional[float] = None) -> Set[Path]:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed = self._drain()
+        if changed:
+            # Let bursts finish (tmp write + rename, multi-file stages).
+            while select.select([self._fd], [], [], self.settle)[0]:
+                changed |= self._drain()
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __del__(self) -> None:  # pragma: no cover - best effort
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+def open_watcher(
+    directories: Iterable[Path],
+    suffixes: Sequence[str] = (".json",),
+    poll_interval: float = 0.25,
+    backend: str = "auto",
+):
+    """Return an inotify watcher when possible, otherwise a polling watcher."""
+    directories = [Path(directory) for directory in directories]
+    if backend not in ("auto", "inotify", "poll"):
+        raise ValueError(f"Unknown watch backend {backend!r}")
+    if backend in ("auto", "inotify"):
+        try:
+            return InotifyWatcher(directories, suffixes)
+        except (OSError, AttributeError):
+            if backend == "inotify":
+                raise
+    return PollingWatcher(directories, suffixes, poll_interval=poll_interval)
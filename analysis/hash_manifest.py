@@ -7,11 +7,16 @@ Computes SHA256 hashes for files under evidence/ and writes evidence/manifest_sh
 from __future__ import annotations
 
 import hashlib
-import json
+import sys
 from pathlib import Path
 from typing import Dict
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from analysis.data_io import write_json  # noqa: E402
+
 EVID = ROOT / "evidence"
 OUT = EVID / "manifest_sha256.json"
 
@@ -39,7 +44,7 @@ def main() -> int:
             key = str(path.relative_to(ROOT))
             manifest[key] = sha256_file(path)
 
-    OUT.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    write_json(OUT, manifest, sort_keys=False)
     print(f"Hashed {len(manifest)} evidence files → {OUT.relative_to(ROOT)}")
     return 0
 
@@ -0,0 +1,613 @@
+#!/usr/bin/env python3
+"""
+Record/replay transport shared by every network fetcher.
+
+The fetchers talk to SEC EDGAR, the FDIC API and Yahoo Finance through three
+clients (``requests``, ``httpx`` and ``yfinance``) plus one ``urllib`` call.
+:func:`install` hooks all of them at the transport layer so a whole
+``update_all_data.py`` run can be captured once and then replayed offline:
+
+``live``
+    No hooks; every request goes to the network (the default).
+``record``
+    Requests go to the network and each response is written to the cassette
+    store, keyed by the normalized request.
+``replay``
+    Responses are served from the cassette store; a request with no cassette
+    fails like a connection error, so fetchers fall back to their cached
+    payloads exactly as they do when the network is down.
+``stub``
+    HTTP requests are rewritten to a local stub server
+    (``python3 analysis/http_cassette.py serve``) that answers from the same
+    store, exercising real sockets without leaving the machine.
+
+Request keys ignore headers and fragments, lowercase the scheme and host, drop
+default ports and sort query parameters; request bodies contribute a SHA-256
+prefix. Cassettes are JSON files under ``<store>/<host>/<sha>.json`` written
+atomically. yfinance is hooked at its API (``Ticker.history`` and
+``download``) because its cookie/crumb handshake makes raw HTTP replay
+brittle; those frames are stored under ``yfinance://`` keys and are served
+from disk in both ``replay`` and ``stub`` mode.
+
+Child processes pick the mode up from ``CATY_HTTP_MODE``,
+``CATY_HTTP_CASSETTES`` and ``CATY_HTTP_STUB`` through
+:func:`install_from_env`, which every fetcher calls at the top of ``main()``.
+
+Usage:
+    CATY_HTTP_MODE=record python3 scripts/update_all_data.py
+    python3 scripts/update_all_data.py --http-mode replay
+    python3 analysis/http_cassette.py serve --port 8765
+    python3 analysis/http_cassette.py list
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import email.message
+import hashlib
+import io
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_CASSETTE_DIR = ROOT / "logs" / "http_cassettes"
+
+MODE_ENV_VAR = "CATY_HTTP_MODE"
+CASSETTE_ENV_VAR = "CATY_HTTP_CASSETTES"
+STUB_ENV_VAR = "CATY_HTTP_STUB"
+DEFAULT_STUB_URL = "http://127.0.0.1:8765"
+
+LIVE, RECORD, REPLAY, STUB = "live", "record", "replay", "stub"
+MODES = (LIVE, RECORD, REPLAY, STUB)
+
+# Bodies are stored decoded, so transfer framing headers no longer apply.
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode when no cassette matches a request."""
+
+    def __init__(self, key: str) -> None:
+        super().__init__(f"no cassette recorded for {key}")
+        self.key = key
+
+
+def normalize_url(url: str) -> str:
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+def request_key(method: str, url: str, body: Optional[bytes] = None) -> str:
+    """Stable cassette key: method, normalized URL and a body digest."""
+    key = f"{method.upper()} {normalize_url(url)}"
+    if body:
+        key += f" body={hashlib.sha256(body).hexdigest()[:16]}"
+    return key
+
+
+class CassetteStore:
+    """Directory of recorded responses, one JSON file per request key."""
+
+    def __init__(self, root: Path = DEFAULT_CASSETTE_DIR) -> None:
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._memo: Dict[str, Optional[Dict[str, Any]]] = {}
+
+    def path_for(self, key: str) -> Path:
+        url = key.split(" ", 2)[1]
+        host = urlsplit(url).netloc.replace(":", "_") or "local"
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:24]
+        return self.root / host / f"{digest}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if key in self._memo:
+                return self._memo[key]
+        path = self.path_for(key)
+        entry = None
+        if path.exists():
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        with self._lock:
+            self._memo[key] = entry
+        return entry
+
+    def put(self, key: str, status: int, headers: Dict[str, str], body: bytes) -> Path:
+        entry: Dict[str, Any] = {
+            "key": key,
+            "status": int(status),
+            "headers": {
+                name: value for name, value in sorted(headers.items()) if name.lower() not in DROPPED_HEADERS
+            },
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        }
+        try:
+            entry["text"] = body.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["base64"] = base64.b64encode(body).decode("ascii")
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(entry, indent=1, sort_keys=True) + "\n", encoding="utf-8")
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._memo[key] = entry
+        return path
+
+    def entries(self) -> Iterator[Dict[str, Any]]:
+        for path in sorted(self.root.glob("*/*.json")):
+            yield json.loads(path.read_text(encoding="utf-8"))
+
+
+def entry_body(entry: Dict[str, Any]) -> bytes:
+    if "base64" in entry:
+        return base64.b64decode(entry["base64"])
+    return entry.get("text", "").encode("utf-8")
+
+
+class Transport:
+    """Active mode plus the store; shared by all client hooks."""
+
+    def __init__(self, mode: str, store: CassetteStore, stub_url: str = DEFAULT_STUB_URL) -> None:
+        if mode not in MODES:
+            raise ValueError(f"unknown HTTP mode {mode!r} (choose from {', '.join(MODES)})")
+        self.mode = mode
+        self.store = store
+        self.stub_url = stub_url.rstrip("/")
+        self.recorded = 0
+        self.replayed = 0
+
+    @property
+    def offline(self) -> bool:
+        return self.mode in (REPLAY, STUB)
+
+    def lookup(self, key: str) -> Dict[str, Any]:
+        entry = self.store.get(key)
+        if entry is None:
+            raise CassetteMiss(key)
+        self.replayed += 1
+        return entry
+
+    def record(self, key: str, status: int, headers: Dict[str, str], body: bytes) -> None:
+        self.store.put(key, status, headers, body)
+        self.recorded += 1
+
+    def stub_target(self, url: str) -> str:
+        """Map ``scheme://host/path?q`` onto the stub server as ``/scheme/host/path?q``."""
+        parts = urlsplit(url)
+        return f"{self.stub_url}/{parts.scheme}/{parts.netloc}{parts.path or '/'}" + (
+            f"?{parts.query}" if parts.query else ""
+        )
+
+
+_ACTIVE: Optional[Transport] = None
+_MISSING = object()
+# (owner, attribute, value in owner.__dict__ before patching) for uninstall().
+_PATCHES: List[Tuple[Any, str, Any]] = []
+
+
+def active() -> Optional[Transport]:
+    return _ACTIVE
+
+
+def is_offline() -> bool:
+    return _ACTIVE is not None and _ACTIVE.offline
+
+
+def throttle(seconds: float) -> None:
+    """Rate-limit pause between live requests; skipped when serving cassettes."""
+    if not is_offline():
+        time.sleep(seconds)
+
+
+def _patch(owner: Any, attr: str, replacement: Callable) -> Any:
+    """Swap ``owner.attr`` for ``replacement`` and return the original."""
+    original = getattr(owner, attr)
+    _PATCHES.append((owner, attr, vars(owner).get(attr, _MISSING)))
+    setattr(owner, attr, replacement)
+    return original
+
+
+# --- requests --------------------------------------------------------------
+
+
+def _install_requests() -> bool:
+    try:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from requests.structures import CaseInsensitiveDict
+        from requests.utils import get_encoding_from_headers
+    except ImportError:  # pragma: no cover - optional dependency guard
+        return False
+
+    original_send = HTTPAdapter.send
+
+    def build(request: Any, status: int, headers: Dict[str, str], body: bytes) -> Any:
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(
+            {name: value for name, value in headers.items() if name.lower() not in DROPPED_HEADERS}
+        )
+        response._content = body  # noqa: SLF001 - decoded body, nothing left to stream
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.reason = "OK" if status < 400 else "Error"
+        return response
+
+    def send(self: Any, request: Any, **kwargs: Any) -> Any:
+        transport = _ACTIVE
+        if transport is None or transport.mode == LIVE:
+            return original_send(self, request, **kwargs)
+        body = request.body.encode("utf-8") if isinstance(request.body, str) else request.body
+        if not isinstance(body, bytes):
+            body = None  # streamed uploads are keyed by URL alone
+        key = request_key(request.method, request.url, body)
+        if transport.mode == REPLAY:
+            try:
+                entry = transport.lookup(key)
+            except CassetteMiss as miss:
+                raise requests.exceptions.ConnectionError(str(miss), request=request) from miss
+            return build(request, entry["status"], entry["headers"], entry_body(entry))
+        if transport.mode == STUB:
+            original_url = request.url
+            request.url = transport.stub_target(original_url)
+            try:
+                response = original_send(self, request, **kwargs)
+            finally:
+                request.url = original_url
+            response.url = original_url
+            return response
+        response = original_send(self, request, **kwargs)
+        transport.record(key, response.status_code, dict(response.headers), response.content)
+        return build(request, response.status_code, dict(response.headers), response.content)
+
+    _patch(HTTPAdapter, "send", send)
+    return True
+
+
+# --- httpx -----------------------------------------------------------------
+
+
+def _install_httpx() -> bool:
+    try:
+        import httpx
+    except ImportError:  # pragma: no cover - optional dependency guard
+        return False
+
+    original_sync = httpx.HTTPTransport.handle_request
+    original_async = httpx.AsyncHTTPTransport.handle_async_request
+
+    def key_for(request: Any) -> str:
+        return request_key(request.method, str(request.url), request.content)
+
+    def replayed(request: Any, transport: Transport) -> Any:
+        try:
+            entry = transport.lookup(key_for(request))
+        except CassetteMiss as miss:
+            raise httpx.ConnectError(str(miss), request=request) from miss
+        return httpx.Response(entry["status"], headers=entry["headers"], content=entry_body(entry), request=request)
+
+    def recorded(request: Any, response: Any, transport: Transport) -> Any:
+        headers = dict(response.headers)
+        transport.record(key_for(request), response.status_code, headers, response.content)
+        kept = {name: value for name, value in headers.items() if name.lower() not in DROPPED_HEADERS}
+        return httpx.Response(response.status_code, headers=kept, content=response.content, request=request)
+
+    def handle_request(self: Any, request: Any) -> Any:
+        transport = _ACTIVE
+        if transport is None or transport.mode == LIVE:
+            return original_sync(self, request)
+        if transport.mode == REPLAY:
+            return replayed(request, transport)
+        if transport.mode == STUB:
+            request.url = httpx.URL(transport.stub_target(str(request.url)))
+            return original_sync(self, request)
+        response = original_sync(self, request)
+        response.read()
+        return recorded(request, response, transport)
+
+    async def handle_async_request(self: Any, request: Any) -> Any:
+        transport = _ACTIVE
+        if transport is None or transport.mode == LIVE:
+            return await original_async(self, request)
+        if transport.mode == REPLAY:
+            return replayed(request, transport)
+        if transport.mode == STUB:
+            request.url = httpx.URL(transport.stub_target(str(request.url)))
+            return await original_async(self, request)
+        response = await original_async(self, request)
+        await response.aread()
+        return recorded(request, response, transport)
+
+    _patch(httpx.HTTPTransport, "handle_request", handle_request)
+    _patch(httpx.AsyncHTTPTransport, "handle_async_request", handle_async_request)
+    return True
+
+
+# --- urllib ----------------------------------------------------------------
+
+
+def _install_urllib() -> bool:
+    import urllib.error
+    import urllib.request
+    import urllib.response
+
+    def _response(body: bytes, headers: Any, url: str, status: int) -> Any:
+        response = urllib.response.addinfourl(io.BytesIO(body), headers, url, status)
+        response.msg = "OK" if status < 400 else "Error"
+        return response
+
+    class CassetteHandler(urllib.request.BaseHandler):
+        handler_order = 100  # ahead of the stock HTTP(S) handlers
+
+        def default_open(self, req: urllib.request.Request) -> Any:
+            transport = _ACTIVE
+            if transport is None or transport.mode in (LIVE, RECORD):
+                return None
+            if transport.mode == STUB:
+                req.full_url = transport.stub_target(req.full_url)
+                return None  # the stock handler now opens the stub URL
+            try:
+                entry = transport.lookup(request_key(req.get_method(), req.full_url, req.data))
+            except CassetteMiss as miss:
+                raise urllib.error.URLError(str(miss)) from miss
+            headers = email.message.Message()
+            for name, value in entry["headers"].items():
+                headers[name] = value
+            return _response(entry_body(entry), headers, req.full_url, entry["status"])
+
+        def http_response(self, req: urllib.request.Request, response: Any) -> Any:
+            transport = _ACTIVE
+            if transport is None or transport.mode != RECORD:
+                return response
+            body = response.read()
+            transport.record(
+                request_key(req.get_method(), req.full_url, req.data), response.status, dict(response.headers), body
+            )
+            return _response(body, response.headers, req.full_url, response.status)
+
+        https_response = http_response
+
+    urllib.request.install_opener(urllib.request.build_opener(CassetteHandler()))
+    return True
+
+
+# --- yfinance --------------------------------------------------------------
+
+
+def frame_to_payload(frame: Any) -> Dict[str, Any]:
+    """JSON-safe frame encoding that keeps MultiIndex columns and index timezones."""
+    index = frame.index
+    tz = getattr(index, "tz", None)
+    return {
+        "columns": [list(col) if isinstance(col, tuple) else col for col in frame.columns],
+        "column_names": list(frame.columns.names),
+        "index": [stamp.isoformat() for stamp in index],
+        "index_name": index.name,
+        "index_tz": str(tz) if tz is not None else None,
+        "data": frame.astype(object).where(frame.notna(), None).values.tolist(),
+    }
+
+
+def payload_to_frame(payload: Dict[str, Any]) -> Any:
+    import pandas as pd
+
+    columns: Any = payload["columns"]
+    if columns and isinstance(columns[0], list):
+        columns = pd.MultiIndex.from_tuples([tuple(col) for col in columns], names=payload["column_names"])
+    if payload["index_tz"]:
+        index = pd.to_datetime(payload["index"], utc=True).tz_convert(payload["index_tz"])
+    else:
+        index = pd.to_datetime(payload["index"])
+    index.name = payload["index_name"]
+    frame = pd.DataFrame(payload["data"], index=index, columns=columns)
+    return frame.apply(pd.to_numeric, errors="coerce")
+
+
+def _yfinance_key(kind: str, tickers: Any, params: Dict[str, Any]) -> str:
+    if isinstance(tickers, str):
+        tickers = tickers.split()
+    symbols = ",".join(str(t).upper() for t in tickers)
+    query = urlencode(sorted((name, str(value)) for name, value in params.items() if value is not None))
+    return request_key("GET", f"yfinance://{kind}/{symbols}" + (f"?{query}" if query else ""))
+
+
+def _frame_call(key: str, fetch: Callable[[], Any]) -> Any:
+    transport = _ACTIVE
+    if transport is None or transport.mode == LIVE:
+        return fetch()
+    if transport.offline:
+        entry = transport.lookup(key)
+        return payload_to_frame(json.loads(entry_body(entry)))
+    frame = fetch()
+    body = json.dumps(frame_to_payload(frame), sort_keys=True).encode("utf-8")
+    transport.record(key, 200, {"Content-Type": "application/json"}, body)
+    return frame
+
+
+def _install_yfinance() -> bool:
+    try:
+        import yfinance
+    except ImportError:  # pragma: no cover - optional dependency guard
+        return False
+
+    original_history = yfinance.Ticker.history
+    original_download = yfinance.download
+
+    def history(self: Any, *args: Any, **kwargs: Any) -> Any:
+        params = dict(kwargs)
+        params.update({f"arg{idx}": value for idx, value in enumerate(args)})
+        key = _yfinance_key("history", [self.ticker], params)
+        return _frame_call(key, lambda: original_history(self, *args, **kwargs))
+
+    def download(tickers: Any, *args: Any, **kwargs: Any) -> Any:
+        params = {name: value for name, value in kwargs.items() if name not in ("progress", "threads")}
+        params.update({f"arg{idx}": value for idx, value in enumerate(args)})
+        key = _yfinance_key("download", tickers, params)
+        return _frame_call(key, lambda: original_download(tickers, *args, **kwargs))
+
+    _patch(yfinance.Ticker, "history", history)
+    _patch(yfinance, "download", download)
+    return True
+
+
+# --- activation ------------------------------------------------------------
+
+
+def install(
+    mode: str,
+    cassette_dir: Optional[Path] = None,
+    stub_url: Optional[str] = None,
+) -> Optional[Transport]:
+    """Activate ``mode`` for every supported client in this process.
+
+    ``live`` uninstalls the hooks. Returns the active transport (None for live).
+    """
+    global _ACTIVE
+    if mode == LIVE:
+        uninstall()
+        return None
+    transport = Transport(mode, CassetteStore(cassette_dir or DEFAULT_CASSETTE_DIR), stub_url or DEFAULT_STUB_URL)
+    if _ACTIVE is None:
+        hooked = [
+            name
+            for name, hook in (
+                ("requests", _install_requests),
+                ("httpx", _install_httpx),
+                ("urllib", _install_urllib),
+                ("yfinance", _install_yfinance),
+            )
+            if hook()
+        ]
+        logging.info("HTTP %s mode (%s) using %s", mode, ", ".join(hooked), transport.store.root)
+    _ACTIVE = transport
+    return transport
+
+
+def uninstall() -> None:
+    global _ACTIVE
+    _ACTIVE = None
+    while _PATCHES:
+        owner, attr, original = _PATCHES.pop()
+        if original is _MISSING:
+            delattr(owner, attr)
+        else:
+            setattr(owner, attr, original)
+    if "urllib.request" in sys.modules:
+        import urllib.request
+
+        urllib.request.install_opener(None)
+
+
+def install_from_env(environ: Optional[Dict[str, str]] = None) -> Optional[Transport]:
+    """Install the mode named by ``CATY_HTTP_MODE``; a no-op when unset or ``live``.
+
+    Safe to call repeatedly: an already-active transport with the same
+    settings is reused, so in-process pipeline stages share one store.
+    """
+    env = os.environ if environ is None else environ
+    mode = env.get(MODE_ENV_VAR, "").strip().lower() or LIVE
+    if mode == LIVE:
+        return _ACTIVE
+    cassette_dir = Path(env.get(CASSETTE_ENV_VAR) or DEFAULT_CASSETTE_DIR)
+    stub_url = env.get(STUB_ENV_VAR) or DEFAULT_STUB_URL
+    current = _ACTIVE
+    if (
+        current is not None
+        and current.mode == mode
+        and current.store.root == cassette_dir
+        and current.stub_url == stub_url.rstrip("/")
+    ):
+        return current
+    return install(mode, cassette_dir, stub_url)
+
+
+# --- stub server -----------------------------------------------------------
+
+
+def make_stub_server(store: CassetteStore, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """HTTP server answering ``/<scheme>/<host>/<path>`` from ``store``."""
+
+    class StubHandler(BaseHTTPRequestHandler):
+        server_version = "CATYCassetteStub/1.0"
+
+        def _serve(self) -> None:
+            scheme, _, rest = self.path.lstrip("/").partition("/")
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else None
+            key = request_key(self.command, f"{scheme}://{rest}", body)
+            entry = store.get(key)
+            if entry is None:
+                payload = json.dumps({"error": "no cassette", "key": key}).encode("utf-8")
+                self.send_response(404)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                return
+            payload = entry_body(entry)
+            self.send_response(entry["status"])
+            for name, value in entry["headers"].items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(payload)
+
+        do_GET = do_POST = do_HEAD = _serve
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+            logging.debug("stub %s", format % args)
+
+    return ThreadingHTTPServer((host, port), StubHandler)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect or serve recorded HTTP cassettes")
+    parser.add_argument("--cassettes", type=Path, default=None, help="Cassette directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="Run the local stub server")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    sub.add_parser("list", help="List recorded request keys")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    store = CassetteStore(args.cassettes or Path(os.environ.get(CASSETTE_ENV_VAR) or DEFAULT_CASSETTE_DIR))
+    if args.command == "list":
+        count = 0
+        for entry in store.entries():
+            print(f"{entry['status']}  {entry['key']}")
+            count += 1
+        print(f"{count} cassette(s) in {store.root}")
+        return 0
+
+    server = make_stub_server(store, args.host, args.port)
+    print(f"✓ Serving {store.root} on http://{args.host}:{server.server_address[1]}")
+    print(f"  export {MODE_ENV_VAR}={STUB} {STUB_ENV_VAR}=http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Single-pass inline-style normalization for the HTML modules.
+
+A rule set maps ``style="..."`` attribute values to utility classes. Rules are
+compiled into a dictionary keyed by the normalized declaration list (property
+names lowercased, whitespace and trailing semicolons ignored), so each
+document is rewritten by one scan over its start tags instead of one regex
+pass per rule:
+
+- the matching rule's classes are merged into an existing ``class`` attribute
+  (never a second ``class=``), or replace the ``style`` attribute in place;
+- a rule may be scoped to a tag (``tag="table"``) or to elements that already
+  carry a class (``requires_class="source-box"``); scoped rules win over
+  generic ones for the same style;
+- ``prefix=True`` rules match any style that starts with the given
+  declarations, and ``keep_attrs`` rebuilds the tag with only those attributes;
+- ``<script>`` and ``<style>`` bodies are copied through untouched.
+
+``rewrite_documents`` applies a transform to many pages, in parallel, with an
+optional unified-diff dry run.
+"""
+
+from __future__ import annotations
+
+import difflib
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# html -> (converted html, stats); stats are passed back to the caller as-is.
+Transform = Callable[[str], Tuple[str, Any]]
+
+# Pools cost more than they save on a handful of pages.
+PARALLEL_MIN_FILES = 8
+
+# One alternation anchored on "<": raw-text blocks to skip, or a start tag that
+# carries a style attribute.
+_TOKEN_RE = re.compile(
+    r"<(?:(?P<raw_tag>script|style)\b[^>]*>.*?</(?P=raw_tag)\s*>"
+    r"|(?P<name>[A-Za-z][\w:-]*)(?P<attrs>\s[^<>]*?(?<![\w-])style\s*=[^<>]*)>)",
+    re.DOTALL | re.IGNORECASE,
+)
+_ATTR_RE = re.compile(r"""(?P<ws>\s+)(?P<name>[^\s=/>"']+)(?:\s*=\s*(?P<value>"[^"]*"|'[^']*'|[^\s"'>]+))?""")
+
+
+@dataclass(frozen=True)
+class StyleRule:
+    style: str
+    classes: str
+    tag: Optional[str] = None
+    requires_class: Optional[str] = None
+    prefix: bool = False
+    keep_attrs: Optional[Tuple[str, ...]] = None
+
+
+def normalize_style(value: str) -> str:
+    """Canonical ``prop: value; prop: value`` form of a style attribute."""
+    declarations = []
+    for declaration in value.split(";"):
+        prop, sep, val = declaration.partition(":")
+        if not sep:
+            if declaration.strip():
+                declarations.append(" ".join(declaration.split()))
+            continue
+        val = re.sub(r"\s*,\s*", ", ", " ".join(val.split()))
+        declarations.append(f"{prop.strip().lower()}: {val}")
+    return "; ".join(declarations)
+
+
+def _unquote(value: Optional[str]) -> str:
+    if value and value[0] in "\"'" and value[-1] == value[0]:
+        return value[1:-1]
+    return value or ""
+
+
+class StyleRewriter:
+    """Compiled rule set; ``rewrite(html)`` returns ``(html, replacements)``."""
+
+    def __init__(self, rules: Iterable[StyleRule]) -> None:
+        self.rules = list(rules)
+        self._exact: Dict[str, List[StyleRule]] = {}
+        self._prefix: List[Tuple[str, StyleRule]] = []
+        seen: Dict[Tuple[str, Optional[str], Optional[str], bool], StyleRule] = {}
+        for rule in self.rules:
+            key = normalize_style(rule.style)
+            context = (key, rule.tag, rule.requires_class, rule.prefix)
+            if context in seen and seen[context].classes != rule.classes:
+                raise ValueError(f"Conflicting rules for style {rule.style!r}: {seen[context].classes!r} vs {rule.classes!r}")
+            seen[context] = rule
+            if rule.prefix:
+                self._prefix.append((key, rule))
+            else:
+                self._exact.setdefault(key, []).append(rule)
+        for candidates in self._exact.values():
+            # Scoped rules first; stable sort keeps declaration order otherwise.
+            candidates.sort(key=lambda rule: (rule.requires_class is None, rule.tag is None))
+
+    def match(self, tag: str, classes: Sequence[str], style: str) -> Optional[StyleRule]:
+        key = normalize_style(style)
+        candidates = list(self._exact.get(key, ()))
+        candidates += [rule for prefix, rule in self._prefix if key == prefix or key.startswith(prefix + "; ")]
+        for rule in candidates:
+            if rule.tag is not None and rule.tag != tag:
+                continue
+            if rule.requires_class is not None and rule.requires_class not in classes:
+                continue
+            return rule
+        return None
+
+    def _rewrite_tag(self, match: re.Match[str]) -> Tuple[str, bool]:
+        text = match.group(0)
+        tag = match.group("name").lower()
+        attrs_start = match.start("attrs") - match.start()
+        attrs = list(_ATTR_RE.finditer(text, attrs_start, len(text) - 1))
+        style_attr = next((a for a in attrs if a.group("name").lower() == "style"), None)
+        if style_attr is None:
+            return text, False
+        class_attr = next((a for a in attrs if a.group("name").lower() == "class"), None)
+        existing = _unquote(class_attr.group("value")).split() if class_attr else []
+        rule = self.match(tag, existing, _unquote(style_attr.group("value")))
+        if rule is None:
+            return text, False
+
+        added = rule.classes.split()
+        if rule.keep_attrs is not None:
+            kept = [a for a in attrs if a.group("name").lower() in rule.keep_attrs]
+            pieces = [f" {text[a.start('name'):a.end()]}" for a in kept]
+            if added:
+                pieces.append(f' class="{" ".join(added)}"')
+            return f"<{match.group('name')}{''.join(pieces)}{text[attrs[-1].end():]}", True
+
+        edits: List[Tuple[int, int, str]] = []
+        if class_attr is not None:
+            merged = existing + [name for name in added if name not in existing]
+            if merged != existing:
+                edits.append((class_attr.start("name"), class_attr.end(), f'class="{" ".join(merged)}"'))
+            edits.append((style_attr.start(), style_attr.end(), ""))
+        elif added:
+            edits.append((style_attr.start("name"), style_attr.end(), f'class="{" ".join(added)}"'))
+        else:
+            edits.append((style_attr.start(), style_attr.end(), ""))
+        for start, end, replacement in sorted(edits, reverse=True):
+            text = text[:start] + replacement + text[end:]
+        return text, True
+
+    def rewrite(self, html: str) -> Tuple[str, int]:
+        pieces: List[str] = []
+        replacements = 0
+        pos = 0
+        for match in _TOKEN_RE.finditer(html):
+            if match.group("raw_tag") is not None:
+                continue
+            new_tag, changed = self._rewrite_tag(match)
+            if changed:
+                pieces.append(html[pos : match.start()])
+                pieces.append(new_tag)
+                pos = match.end()
+                replacements += 1
+        if not replacements:
+            return html, 0
+        pieces.append(html[pos:])
+        return "".join(pieces), replacements
+
+
+def _rewrite_file(path: Path, transform: Transform, dry_run: bool) -> Tuple[Path, Any, str]:
+    original = path.read_text(encoding="utf-8")
+    converted, stats = transform(original)
+    diff = ""
+    if converted != original:
+        if dry_run:
+            diff = "".join(
+                difflib.unified_diff(
+                    original.splitlines(keepends=True),
+                    converted.splitlines(keepends=True),
+                    fromfile=f"a/{path.name}",
+                    tofile=f"b/{path.name}",
+                )
+            )
+        else:
+            tmp_path = path.with_name(f".{path.name}.tmp")
+            tmp_path.write_text(converted, encoding="utf-8")
+            os.replace(tmp_path, path)
+    return path, stats, diff
+
+
+def rewrite_documents(
+    paths: Sequence[Path],
+    transform: Transform,
+    dry_run: bool = False,
+    jobs: Optional[int] = None,
+) -> List[Tuple[Path, Any, str]]:
+    """Apply ``transform`` to every page; returns ``(path, stats, diff)`` in input order.
+
+    Pages are written atomically unless ``dry_run``, in which case ``diff`` holds
+    the unified diff that would have been applied.
+    """
+    jobs = min(jobs or os.cpu_count() or 1, len(paths)) or 1
+    if jobs > 1 and len(paths) >= PARALLEL_MIN_FILES:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            return list(pool.map(_rewrite_file, paths, [transform] * len(paths), [dry_run] * len(paths)))
+    return [_rewrite_file(path, transform, dry_run) for path in paths]
@@ -2,17 +2,39 @@
 """
 Internal Link Checker
 
-Scans HTML files in the repo for internal links and verifies the targets exist.
-Exits non-zero if broken links are found.
+Scans HTML and Markdown files in the repo for internal links and verifies that
+every target exists and, for ``page.html#anchor`` / ``doc.md#heading`` links,
+that the target actually defines the anchor. Exits non-zero if broken links
+are found.
+
+Each file is parsed once into a record of its outgoing links and the anchors
+it defines (element ``id``/``name`` attributes; GitHub-style heading slugs for
+Markdown). Records are cached in ``logs/link_checker_cache.json`` keyed by
+path and validated by ``(mtime_ns, size)`` first and the content SHA-256
+second, so an incremental run after rebuilding one page re-parses one file.
+Cold runs parse files in a process pool.
 """
 from __future__ import annotations
 
+import argparse
+import hashlib
+import json
+import os
 import re
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Iterator, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import unquote
 
 ROOT = Path(__file__).resolve().parents[1]
+CACHE_PATH = ROOT / "logs" / "link_checker_cache.json"
+# Bump when the parse functions change so cached records are discarded.
+CACHE_VERSION = 1
+# Below this many stale files a process pool costs more than it saves.
+PARALLEL_MIN_FILES = 24
+ANCHOR_SUFFIXES = (".html", ".htm", ".md")
 
 
 def iter_html_files() -> Iterator[Path]:
@@ -38,85 +60,220 @@ def iter_html_files() -> Iterator[Path]:
             yield p
 
 
+def iter_markdown_files() -> Iterator[Path]:
+    # Docs and analysis markdown are part of the public navigation and evidence
+    for pattern in ("docs/**/*.md", "analysis/**/*.md", "evidence/**/*.md"):
+        for p in ROOT.glob(pattern):
+            if p.is_file():
+                yield p
+
+
 # Capture href/src attributes with single or double quotes.
 # Example matches: href="...", href='...', src="...", src='...'
 ATTR_RE = re.compile(r'(?:href|src)\s*=\s*([\"\'])([^\"\']+)\1', re.IGNORECASE)
+ID_RE = re.compile(r'(?<![\w-])(?:id|name)\s*=\s*([\"\'])([^\"\']+)\1', re.IGNORECASE)
+MD_LINK_RE = re.compile(r"!??\[[^\]]*\]\(([^)]+)\)")
+MD_HEADING_RE = re.compile(r"^ {0,3}#{1,6}[ \t]+(.+?)[ \t]*#*[ \t]*$")
+MD_FENCE_RE = re.compile(r"^ {0,3}(```|~~~)")
 
 
 def is_internal_link(href: str) -> bool:
     href = href.strip()
     if not href:
         return False
-    if href.startswith(("http://", "https://", "mailto:", "#", "javascript:")):
+    if href.startswith(("http://", "https://", "mailto:", "javascript:")):
         return False
     return True
 
 
-def scan_file(path: Path) -> Iterator[Tuple[str, Path]]:
-    text = path.read_text(encoding="utf-8", errors="ignore")
-    for m in ATTR_RE.finditer(text):
-        href = m.group(2)
-        if not is_internal_link(href):
-            continue
-        # Strip fragment and query (e.g., file.html#anchor or file.pdf?x=1)
-        clean = href.split('#', 1)[0].split('?', 1)[0]
-        if not clean:
+def github_slug(heading: str) -> str:
+    """Anchor GitHub generates for a Markdown heading."""
+    text = re.sub(r"\[([^\]]*)\]\([^)]*\)", r"\1", heading)
+    text = re.sub(r"<[^>]+>", "", text).strip().lower()
+    text = re.sub(r"[^\w\- ]", "", text)
+    return text.replace(" ", "-")
+
+
+def parse_html(text: str) -> Tuple[List[str], List[str]]:
+    links = [m.group(2) for m in ATTR_RE.finditer(text)]
+    ids = {m.group(2) for m in ID_RE.finditer(text)}
+    return links, sorted(ids)
+
+
+def parse_markdown(text: str) -> Tuple[List[str], List[str]]:
+    links = [m.group(1).strip() for m in MD_LINK_RE.finditer(text)]
+    ids = {m.group(2) for m in ID_RE.finditer(text)}
+    seen: Dict[str, int] = {}
+    in_fence = False
+    for line in text.splitlines():
+        if MD_FENCE_RE.match(line):
+            in_fence = not in_fence
             continue
-        target = (path.parent / clean).resolve()
-        try:
-            target.relative_to(ROOT)
-        except Exception:
-            # Link escapes repo root – treat as broken
-            yield (href, target)
+        heading = None if in_fence else MD_HEADING_RE.match(line)
+        if not heading:
             continue
-        if not target.exists():
-            yield (href, target)
+        slug = github_slug(heading.group(1))
+        # GitHub disambiguates repeated headings as slug, slug-1, slug-2, ...
+        count = seen.get(slug, 0)
+        seen[slug] = count + 1
+        ids.add(slug if count == 0 else f"{slug}-{count}")
+    return links, sorted(ids)
 
 
-MD_LINK_RE = re.compile(r"!??\[[^\]]*\]\(([^)]+)\)")
+def parse_file(path: Path, payload: Optional[bytes] = None) -> Dict[str, object]:
+    """Hash and parse one file into a cacheable record."""
+    if payload is None:
+        payload = path.read_bytes()
+    text = payload.decode("utf-8", errors="ignore")
+    if path.suffix == ".md":
+        links, ids = parse_markdown(text)
+    elif path.suffix in (".html", ".htm"):
+        links, ids = parse_html(text)
+    else:
+        links, ids = [], []
+    return {"sha256": hashlib.sha256(payload).hexdigest(), "links": links, "ids": ids}
 
 
-def iter_markdown_files() -> Iterator[Path]:
-    # Docs and analysis markdown are part of the public navigation and evidence
-    for pattern in ("docs/**/*.md", "analysis/**/*.md", "evidence/**/*.md"):
-        for p in ROOT.glob(pattern):
-            if p.is_file():
-                yield p
+def _parse_if_changed(path: Path, cached_sha: Optional[str]) -> Tuple[Optional[Dict[str, object]], str]:
+    """Return ``(record, sha)``; ``record`` is None when the content hash still matches."""
+    payload = path.read_bytes()
+    sha = hashlib.sha256(payload).hexdigest()
+    if sha == cached_sha:
+        return None, sha
+    return parse_file(path, payload), sha
 
 
-def scan_markdown(path: Path) -> Iterator[Tuple[str, Path]]:
-    text = path.read_text(encoding="utf-8", errors="ignore")
-    for m in MD_LINK_RE.finditer(text):
-        link = m.group(1).strip()
-        if not is_internal_link(link):
-            continue
-        clean = link.split('#', 1)[0].split('?', 1)[0]
-        if not clean:
-            continue
-        target = (path.parent / clean).resolve()
-        try:
-            target.relative_to(ROOT)
-        except Exception:
-            yield (link, target)
-            continue
-        if not target.exists():
-            yield (link, target)
+class LinkGraph:
+    """Per-file link/anchor records, cached across runs by content hash."""
+
+    def __init__(self, root: Path = ROOT, cache_path: Optional[Path] = CACHE_PATH, jobs: Optional[int] = None) -> None:
+        self.root = root.resolve()
+        self.cache_path = cache_path
+        self.jobs = jobs or os.cpu_count() or 1
+        self.records: Dict[str, Dict[str, object]] = {}
+        self.parsed = 0
+        self._exists: Dict[str, bool] = {}
+        # Keys already refreshed this run; anchor lookups skip the stat.
+        self._fresh: Set[str] = set()
+        if cache_path is not None and cache_path.is_file():
+            try:
+                cached = json.loads(cache_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                cached = {}
+            if cached.get("version") == CACHE_VERSION and cached.get("root") == str(self.root):
+                self.records = cached.get("files", {})
+
+    def _key(self, path: Path) -> str:
+        text = str(path)
+        prefix = str(self.root) + os.sep
+        return text[len(prefix):].replace(os.sep, "/") if text.startswith(prefix) else text
+
+    def refresh(self, paths: Iterable[Path]) -> None:
+        """Bring the records for ``paths`` up to date, re-parsing only changed content."""
+        stale: List[Tuple[Path, str, List[int], Optional[str]]] = []
+        for path in paths:
+            key = self._key(path)
+            self._fresh.add(key)
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                self.records.pop(key, None)
+                continue
+            signature = [stat.st_mtime_ns, stat.st_size]
+            record = self.records.get(key)
+            if record is not None and record.get("signature") == signature:
+                continue
+            stale.append((path, key, signature, record.get("sha256") if record else None))
+        if not stale:
+            return
+
+        if self.jobs > 1 and len(stale) >= PARALLEL_MIN_FILES:
+            with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+                results = list(pool.map(_parse_if_changed, [s[0] for s in stale], [s[3] for s in stale], chunksize=8))
+        else:
+            results = [_parse_if_changed(path, sha) for path, _key, _sig, sha in stale]
+
+        for (_path, key, signature, _sha), (record, sha) in zip(stale, results):
+            if record is None:
+                record = self.records[key]
+            else:
+                self.parsed += 1
+            record["signature"] = signature
+            record["sha256"] = sha
+            self.records[key] = record
+
+    def record(self, path: Path) -> Dict[str, object]:
+        key = self._key(path)
+        if key not in self._fresh:
+            self.refresh([path])
+        return self.records.get(key, {"links": [], "ids": []})
+
+    def exists(self, target: str) -> bool:
+        known = self._exists.get(target)
+        if known is None:
+            known = self._exists[target] = os.path.exists(target)
+        return known
+
+    def check(self, sources: Iterable[Path]) -> List[Tuple[Path, str, Path, str]]:
+        """Return ``(source, ref, target, problem)`` for every broken link in ``sources``."""
+        sources = [path.resolve() for path in sources]
+        self.refresh(sources)
+        root_prefix = str(self.root) + os.sep
+        broken: List[Tuple[Path, str, Path, str]] = []
+        for source in sources:
+            record = self.records.get(self._key(source))
+            if record is None:
+                continue
+            source_dir = str(source.parent)
+            for href in record["links"]:
+                if not is_internal_link(href):
+                    continue
+                # Split off fragment and query (e.g., file.html#anchor or file.pdf?x=1)
+                path_part, _, fragment = href.partition("#")
+                clean = path_part.split("?", 1)[0]
+                # String-level normalisation: the tree has no symlinks and this
+                # avoids a realpath() per link.
+                target = os.path.normpath(os.path.join(source_dir, clean)) if clean else str(source)
+                if not (target + os.sep).startswith(root_prefix):
+                    # Link escapes repo root – treat as broken
+                    broken.append((source, href, Path(target), "missing"))
+                    continue
+                if not self.exists(target):
+                    broken.append((source, href, Path(target), "missing"))
+                    continue
+                fragment = unquote(fragment)
+                # Only pages define anchors; PDF "#page=N" style fragments are viewer hints.
+                if fragment and target.endswith(ANCHOR_SUFFIXES) and os.path.isfile(target):
+                    if fragment not in self.record(Path(target))["ids"]:
+                        broken.append((source, href, Path(target), f"missing anchor #{fragment}"))
+        return broken
+
+    def save(self) -> None:
+        if self.cache_path is None:
+            return
+        payload = {"version": CACHE_VERSION, "root": str(self.root), "files": dict(sorted(self.records.items()))}
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_name(f".{self.cache_path.name}.tmp")
+        tmp_path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, self.cache_path)
+
 
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Verify internal links and #anchors across HTML + Markdown")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not write the link graph cache")
+    parser.add_argument("--jobs", type=int, default=None, help="Parser processes for cold runs (default: CPU count)")
+    args = parser.parse_args(list(argv) if argv is not None else None)
 
-def main() -> int:
-    broken: list[tuple[Path, str, Path]] = []
-    # HTML
-    for html in iter_html_files():
-        for href, target in scan_file(html):
-            broken.append((html, href, target))
-    # Markdown
-    for md in iter_markdown_files():
-        for href, target in scan_markdown(md):
-            broken.append((md, href, target))
+    started = time.perf_counter()
+    graph = LinkGraph(ROOT, None if args.no_cache else CACHE_PATH, jobs=args.jobs)
+    sources = [*iter_html_files(), *iter_markdown_files()]
+    broken = graph.check(sources)
+    graph.save()
+    elapsed_ms = (time.perf_counter() - started) * 1000
 
     if broken:
         print("Broken internal links detected (failing):\n")
-        for src, href, tgt in broken:
+        for src, href, tgt, problem in broken:
             try:
                 rel_src = src.relative_to(ROOT)
             except Exception:
@@ -125,10 +282,13 @@ def main() -> int:
                 rel_tgt = tgt.relative_to(ROOT)
             except Exception:
                 rel_tgt = tgt
-            print(f" - Source: {rel_src} -> ref='{href}' | target='{rel_tgt}' (missing)")
+            print(f" - Source: {rel_src} -> ref='{href}' | target='{rel_tgt}' ({problem})")
         return 1
 
-    print("All internal links verified across HTML + Markdown (PASS)")
+    print(
+        "All internal links verified across HTML + Markdown (PASS) "
+        f"[{len(sources)} files, {graph.parsed} parsed, {elapsed_ms:.0f} ms]"
+    )
     return 0
 
 
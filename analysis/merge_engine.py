@@ -0,0 +1,389 @@
+"""
+Vectorized SEC EDGAR × FDIC call-report merge engine.
+
+The SEC XBRL tag → canonical field mapping, each field's FDIC call-report
+counterpart and its unit conversion live in the declarative ``FIELD_MAP``
+table; derived fields (TCE, TBVPS, efficiency ratio, …) are ``DERIVED_FIELDS``
+column expressions over the same table. ``merge`` takes long
+``(entity, period, field, value)`` frames for any number of entities and
+quarters, pivots each source to one row per (entity, period), evaluates the
+derived columns once for every row, and reconciles every FDIC-mapped field
+against ``CONFLICT_THRESHOLD_PCT`` as array operations.
+
+Units: SEC facts arrive in USD (shares, USD/share); FDIC call-report fields
+arrive in USD thousands. Both sides are reported in the conversion named by
+the field (USD millions unless stated otherwise).
+
+scripts/merge_data_sources.py lays the merged CATY rows out into
+caty02/caty03 and writes the consolidated data_quality_report.json; the
+adapters below also accept timeseries_store frames (``date`` in place of
+``period``), so multi-quarter history merges use the same kernel.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+CONFLICT_THRESHOLD_PCT = 1.0
+RESOLUTION = "Use SEC EDGAR (primary GAAP source)"
+DEFAULT_ENTITY = "CATY"
+
+KEY_COLUMNS = ["entity", "period"]
+LONG_COLUMNS = ["entity", "period", "field", "value"]
+
+# conversion → (divisor from SEC source units, published decimals)
+CONVERSIONS: Dict[str, Tuple[float, int]] = {
+    "millions": (1_000_000.0, 4),
+    "shares_millions": (1_000_000.0, 6),
+    "per_share": (1.0, 4),
+    "percent": (1.0, 4),
+}
+# FDIC call-report dollar fields are reported in thousands.
+FDIC_TO_MILLIONS = 1_000.0
+FDIC_ID_FIELDS = frozenset({"period", "REPDTE", "CERT", "NAME"})
+
+
+@dataclass(frozen=True)
+class FieldMapping:
+    """One SEC XBRL tag, its canonical name and optional FDIC counterpart."""
+
+    name: str
+    sec_key: str
+    fdic_key: Optional[str] = None
+    conversion: str = "millions"
+
+    @property
+    def xbrl_tag(self) -> str:
+        return f"us-gaap:{self.sec_key}"
+
+
+@dataclass(frozen=True)
+class DerivedField:
+    """Column expression over raw-unit SEC columns.
+
+    ``fill`` derived fields only fill gaps in the mapped column of the same
+    name (e.g. interest expense when the 10-Q omits the tag).
+    """
+
+    name: str
+    compute: Callable[[pd.DataFrame], pd.Series]
+    computed_from: Tuple[str, ...]
+    conversion: str = "millions"
+    fill: bool = False
+
+
+FIELD_MAP: Tuple[FieldMapping, ...] = (
+    # Income statement (period flows)
+    FieldMapping("interest_income", "InterestAndDividendIncomeOperating"),
+    FieldMapping("interest_expense", "InterestExpense"),
+    FieldMapping("net_interest_income", "InterestIncomeExpenseNet", "RIAD4074"),
+    FieldMapping("provision", "ProvisionForLoanLossesExpensed"),
+    FieldMapping("noninterest_income", "NoninterestIncome"),
+    FieldMapping("noninterest_expense", "NoninterestExpense"),
+    FieldMapping("income_tax_expense", "IncomeTaxExpenseBenefit"),
+    FieldMapping("net_income", "NetIncomeLoss", "RIAD4230"),
+    FieldMapping("diluted_eps", "EarningsPerShareDiluted", conversion="per_share"),
+    # Balance sheet (point in time)
+    FieldMapping("total_assets", "Assets", "ASSET"),
+    FieldMapping("loans_hfi", "LoansAndLeasesReceivableNetOfDeferredIncome"),
+    FieldMapping("loans_hfs", "LoansHeldForSaleFairValueDisclosure"),
+    FieldMapping("afs_securities", "AvailableForSaleSecurities"),
+    FieldMapping("cash", "CashAndDueFromBanks"),
+    FieldMapping("allowance", "AllowanceForLoanAndLeaseLosses"),
+    FieldMapping("total_deposits", "Deposits", "DEP"),
+    FieldMapping("interest_bearing_deposits", "InterestBearingDepositLiabilities"),
+    FieldMapping("total_equity", "StockholdersEquity", "EQTOT"),
+    FieldMapping("goodwill", "Goodwill"),
+    FieldMapping("intangibles", "IntangibleAssetsNetExcludingGoodwill"),
+    FieldMapping("aoci", "AccumulatedOtherComprehensiveIncomeLossNetOfTax"),
+    FieldMapping("shares_outstanding", "CommonStockSharesOutstanding", conversion="shares_millions"),
+    FieldMapping("fhlb_advances", "FederalHomeLoanBankAdvances"),
+    FieldMapping("subordinated_debt", "SubordinatedDebt"),
+)
+
+
+def _pct(numerator: pd.Series, denominator: pd.Series) -> pd.Series:
+    return numerator / denominator.where(denominator != 0) * 100.0
+
+
+DERIVED_FIELDS: Tuple[DerivedField, ...] = (
+    DerivedField(
+        "interest_expense",
+        lambda f: f["interest_income"] - f["net_interest_income"],
+        ("InterestAndDividendIncomeOperating", "InterestIncomeExpenseNet"),
+        fill=True,
+    ),
+    DerivedField(
+        "nii_after_provision",
+        lambda f: f["net_interest_income"] - f["provision"],
+        ("InterestIncomeExpenseNet", "ProvisionForLoanLossesExpensed"),
+    ),
+    DerivedField(
+        "pretax_income",
+        lambda f: f["net_income"] + f["income_tax_expense"],
+        ("NetIncomeLoss", "IncomeTaxExpenseBenefit"),
+    ),
+    DerivedField(
+        "efficiency_ratio_pct",
+        lambda f: _pct(f["noninterest_expense"], f["net_interest_income"] + f["noninterest_income"]),
+        ("NoninterestExpense", "InterestIncomeExpenseNet", "NoninterestIncome"),
+        conversion="percent",
+    ),
+    DerivedField(
+        "effective_tax_rate_pct",
+        lambda f: _pct(f["income_tax_expense"], f["pretax_income"]),
+        ("IncomeTaxExpenseBenefit", "NetIncomeLoss"),
+        conversion="percent",
+    ),
+    DerivedField(
+        "tce",
+        lambda f: f["total_equity"] - f["goodwill"] - f["intangibles"],
+        ("StockholdersEquity", "Goodwill", "IntangibleAssetsNetExcludingGoodwill"),
+    ),
+    DerivedField(
+        "tbvps",
+        lambda f: f["tce"] / f["shares_outstanding"].where(f["shares_outstanding"] != 0),
+        ("StockholdersEquity", "Goodwill", "IntangibleAssetsNetExcludingGoodwill", "CommonStockSharesOutstanding"),
+        conversion="per_share",
+    ),
+    DerivedField(
+        "noninterest_bearing_deposits",
+        lambda f: f["total_deposits"] - f["interest_bearing_deposits"],
+        ("Deposits", "InterestBearingDepositLiabilities"),
+    ),
+    DerivedField(
+        "aoci_abs",
+        lambda f: f["aoci"].abs(),
+        ("AccumulatedOtherComprehensiveIncomeLossNetOfTax",),
+    ),
+)
+
+MAPPINGS_BY_NAME: Dict[str, FieldMapping] = {mapping.name: mapping for mapping in FIELD_MAP}
+DERIVED_BY_NAME: Dict[str, DerivedField] = {spec.name: spec for spec in DERIVED_FIELDS}
+
+
+def conversion_for(field: str) -> str:
+    if field in MAPPINGS_BY_NAME:
+        return MAPPINGS_BY_NAME[field].conversion
+    return DERIVED_BY_NAME[field].conversion
+
+
+def iso_period(value: Any) -> str:
+    """Normalise FDIC ``YYYYMMDD`` / timestamp periods to ``YYYY-MM-DD``."""
+    text = str(value)
+    if len(text) == 8 and text.isdigit():
+        return f"{text[:4]}-{text[4:6]}-{text[6:]}"
+    return pd.Timestamp(value).strftime("%Y-%m-%d")
+
+
+# ---------------------------------------------------------------------------
+# Source adapters → long (entity, period, field, value) frames
+# ---------------------------------------------------------------------------
+
+
+def _frame(records: Iterable[Tuple[str, str, str, Any]]) -> pd.DataFrame:
+    frame = pd.DataFrame(list(records), columns=LONG_COLUMNS)
+    frame["value"] = pd.to_numeric(frame["value"], errors="coerce")
+    return frame.dropna(subset=["value"])
+
+
+def sec_snapshot_frame(payload: Mapping[str, Any], entity: Optional[str] = None) -> pd.DataFrame:
+    """Long frame from a sec_edgar_raw.json payload (one row per snapshot fact)."""
+    entity = entity or payload.get("ticker") or DEFAULT_ENTITY
+    records = []
+    for snapshot in payload.values():
+        if not isinstance(snapshot, Mapping) or "data" not in snapshot or not snapshot.get("period_end"):
+            continue
+        period = iso_period(snapshot["period_end"])
+        for tag, fact in (snapshot.get("data") or {}).items():
+            if isinstance(fact, Mapping):
+                records.append((entity, period, tag, fact.get("value")))
+    return _frame(records)
+
+
+def fdic_quarters_frame(payload: Mapping[str, Any], entity: Optional[str] = None) -> pd.DataFrame:
+    """Long frame from an fdic_raw.json payload (every quarter, every field)."""
+    entity = entity or payload.get("ticker") or DEFAULT_ENTITY
+    records = []
+    for quarter in payload.get("quarters") or []:
+        period = quarter.get("period") or quarter.get("REPDTE")
+        if not period:
+            continue
+        for field, value in quarter.items():
+            if field not in FDIC_ID_FIELDS:
+                records.append((entity, iso_period(period), field, value))
+    return _frame(records)
+
+
+def _long(frame: Optional[pd.DataFrame]) -> pd.DataFrame:
+    if frame is None or frame.empty:
+        return pd.DataFrame(columns=LONG_COLUMNS)
+    if "period" not in frame.columns and "date" in frame.columns:
+        frame = frame.assign(period=pd.to_datetime(frame["date"]).dt.strftime("%Y-%m-%d"))
+    return frame[LONG_COLUMNS]
+
+
+def _pivot(long: pd.DataFrame, keys: Sequence[str]) -> pd.DataFrame:
+    subset = long[long["field"].isin(keys)]
+    if subset.empty:
+        index = pd.MultiIndex.from_arrays([[], []], names=KEY_COLUMNS)
+        return pd.DataFrame(np.nan, index=index, columns=list(keys), dtype=float)
+    wide = subset.pivot_table(index=KEY_COLUMNS, columns="field", values="value", aggfunc="last")
+    return wide.reindex(columns=list(keys)).astype(float)
+
+
+# ---------------------------------------------------------------------------
+# Merge
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class MergeResult:
+    """Merged values (one row per entity × period) plus the FDIC reconciliation."""
+
+    values: pd.DataFrame
+    reconciliation: pd.DataFrame
+    threshold_pct: float
+
+    @property
+    def conflicts(self) -> pd.DataFrame:
+        return self.reconciliation[~self.reconciliation["match"]]
+
+    def entities(self) -> List[str]:
+        return sorted(self.values.index.get_level_values("entity").unique())
+
+    def periods(self, entity: str) -> List[str]:
+        if entity not in self.entities():
+            return []
+        return list(self.values.loc[entity].index)
+
+    def row(self, entity: str, period: str) -> Dict[str, Optional[float]]:
+        """Converted values for one (entity, period); missing fields are None."""
+        if (entity, period) not in self.values.index:
+            return {column: None for column in self.values.columns}
+        series = self.values.loc[(entity, period)]
+        return {column: (None if pd.isna(value) else float(value)) for column, value in series.items()}
+
+    def comparisons(self, entity: str, period: str) -> Dict[str, Dict[str, Any]]:
+        rec = self.reconciliation
+        subset = rec[(rec["entity"] == entity) & (rec["period"] == period)]
+        return {
+            row.field: {"fdic_value": row.fdic_value, "diff_pct": row.diff_pct, "match": bool(row.match)}
+            for row in subset.itertuples(index=False)
+        }
+
+
+def merge(
+    sec: Optional[pd.DataFrame],
+    fdic: Optional[pd.DataFrame] = None,
+    *,
+    field_map: Sequence[FieldMapping] = FIELD_MAP,
+    derived: Sequence[DerivedField] = DERIVED_FIELDS,
+    threshold_pct: float = CONFLICT_THRESHOLD_PCT,
+) -> MergeResult:
+    """Join SEC and FDIC long frames on (entity, period) in one pass."""
+    raw = _pivot(_long(sec), [mapping.sec_key for mapping in field_map])
+    raw.columns = [mapping.name for mapping in field_map]
+    for spec in derived:
+        computed = spec.compute(raw)
+        raw[spec.name] = raw[spec.name].fillna(computed) if spec.fill and spec.name in raw else computed
+
+    conversions = {mapping.name: mapping.conversion for mapping in field_map}
+    conversions.update({spec.name: spec.conversion for spec in derived if spec.name not in conversions})
+    divisors = np.array([CONVERSIONS[conversions[column]][0] for column in raw.columns])
+    values = raw / divisors
+
+    compared = [mapping for mapping in field_map if mapping.fdic_key]
+    fdic_wide = _pivot(_long(fdic), [mapping.fdic_key for mapping in compared]) / FDIC_TO_MILLIONS
+    fdic_wide.columns = [mapping.name for mapping in compared]
+    names = np.array([mapping.name for mapping in compared], dtype=object)
+
+    sec_arr = values[list(names)].to_numpy(dtype=float)
+    fdic_arr = fdic_wide.reindex(values.index).to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        diff = np.where(sec_arr != 0, np.abs(sec_arr - fdic_arr) / np.abs(sec_arr) * 100.0, 0.0)
+    rows, cols = np.nonzero(~np.isnan(sec_arr) & ~np.isnan(fdic_arr))
+
+    reconciliation = pd.DataFrame(
+        {
+            "entity": values.index.get_level_values("entity")[rows],
+            "period": values.index.get_level_values("period")[rows],
+            "field": names[cols],
+            "xbrl_tag": [compared[col].xbrl_tag for col in cols],
+            "fdic_key": [compared[col].fdic_key for col in cols],
+            "sec_value": sec_arr[rows, cols],
+            "fdic_value": fdic_arr[rows, cols],
+            "diff_pct": diff[rows, cols],
+        }
+    )
+    reconciliation["match"] = reconciliation["diff_pct"] <= threshold_pct
+    return MergeResult(values=values, reconciliation=reconciliation, threshold_pct=threshold_pct)
+
+
+# ---------------------------------------------------------------------------
+# Report payloads
+# ---------------------------------------------------------------------------
+
+
+def conflict_records(result: MergeResult) -> List[Dict[str, Any]]:
+    return [
+        {
+            "entity": row.entity,
+            "period": row.period,
+            "field": row.xbrl_tag,
+            "fdic_field": row.fdic_key,
+            "sec_value": round(row.sec_value, 4),
+            "fdic_value": round(row.fdic_value, 4),
+            "diff_pct": round(row.diff_pct, 4),
+            "resolution": RESOLUTION,
+        }
+        for row in result.conflicts.itertuples(index=False)
+    ]
+
+
+def quality_summary(result: MergeResult) -> Dict[str, Dict[str, Any]]:
+    """Per-entity reconciliation counts for the consolidated DQ report."""
+    summary: Dict[str, Dict[str, Any]] = {}
+    rec = result.reconciliation
+    for entity in result.entities():
+        subset = rec[rec["entity"] == entity]
+        summary[entity] = {
+            "periods": result.periods(entity),
+            "fields_compared": int(len(subset)),
+            "conflicts": int((~subset["match"]).sum()),
+            "max_diff_pct": round(float(subset["diff_pct"].max()), 4) if len(subset) else None,
+        }
+    return summary
+
+
+def entity_payload(result: MergeResult, entity: str) -> Dict[str, Any]:
+    """Per-entity merged output: converted values by period plus reconciliation rows."""
+    periods: Dict[str, Dict[str, float]] = {}
+    for period in result.periods(entity):
+        periods[period] = {
+            field: round(value, CONVERSIONS[conversion_for(field)][1])
+            for field, value in result.row(entity, period).items()
+            if value is not None
+        }
+    rec = result.reconciliation
+    subset = rec[rec["entity"] == entity]
+    return {
+        "entity": entity,
+        "conflict_threshold_pct": result.threshold_pct,
+        "periods": periods,
+        "reconciliation": [
+            {
+                "period": row.period,
+                "field": row.field,
+                "sec_value": round(row.sec_value, 4),
+                "fdic_value": round(row.fdic_value, 4),
+                "diff_pct": round(row.diff_pct, 4),
+                "match": bool(row.match),
+            }
+            for row in subset.itertuples(index=False)
+        ],
+    }
@@ -1,10 +1,11 @@
 """Analyze Cathay Bank's historical net charge-off ratios using FDIC data.
 
 This module reads the FDIC quarterly net charge-off ratio series (field
-`NTLNLSCOQR`) stored in `evidence/raw/fdic_CATY_NTLNLSCOQR_timeseries.csv`
-and produces probability statistics for different horizons.  The output is a
-markdown file (`evidence/NCO_probability_summary.md`) that Claude can cite in
-the valuation work to justify scenario weights.
+`NTLNLSCOQR`) from the local time-series store (seeded from
+`evidence/raw/fdic_CATY_NTLNLSCOQR_timeseries.csv`) and produces probability
+statistics for different horizons.  The output is a markdown file
+(`evidence/NCO_probability_summary.md`) that Claude can cite in the valuation
+work to justify scenario weights.
 
 The logic is intentionally transparent:
 
@@ -12,9 +13,15 @@ The logic is intentionally transparent:
   through-cycle threshold (45.8 bps = 0.458%).
 * We look at multiple windows (full history, post-2000, post-GFC, post-2014,
   and trailing 8/16/32 quarters) to anchor judgment with data.
-* Rolling four-quarter averages provide an additional stress lens more aligned
-  with cycle assessments, recognizing that regulators focus on sustained loss
-  pressure rather than a single print.
+* Rolling four-, eight- and twelve-quarter averages provide an additional
+  stress lens more aligned with cycle assessments, recognizing that regulators
+  focus on sustained loss pressure rather than a single print.
+* Wilson score intervals take any confidence level; moving-block bootstrap
+  intervals respect the serial correlation of credit cycles.
+
+Every entity with an `NTLNLSCOQR` series in the store is loaded into one
+entity × quarter matrix, so window counts, rolling means and breach odds for
+CATY and its peers are computed together as array operations.
 
 Running this script regenerates the markdown summary and prints the key
 statistics to stdout for quick review.
@@ -22,143 +29,347 @@ statistics to stdout for quick review.
 
 from __future__ import annotations
 
+import argparse
 import csv
 import datetime as dt
+import sys
 from dataclasses import dataclass
 from pathlib import Path
-from math import sqrt
-from statistics import mean
-from typing import Iterable, List, Sequence, Tuple
+from statistics import NormalDist
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from analysis.data_io import load_json  # noqa: E402
+from analysis.timeseries_store import (  # noqa: E402
+    PEER_FDIC_NCO_PATH,
+    TimeSeriesStore,
+    fdic_timeseries_frame,
+    peer_fdic_nco_frame,
+)
 
 
 RAW_CSV = Path(__file__).resolve().parents[1] / "evidence" / "raw" / "fdic_CATY_NTLNLSCOQR_timeseries.csv"
 OUTPUT_MD = Path(__file__).resolve().parents[1] / "evidence" / "NCO_probability_summary.md"
 # Through-cycle net charge-off assumption expressed as a decimal (45.8 bps)
 THRESHOLD = 0.00458
+FIELD = "NTLNLSCOQR"
+TARGET_ENTITY = "CATY"
+
+WINDOWS: List[Tuple[str, Optional[dt.date]]] = [
+    ("Full history (since 1984)", None),
+    ("Post-2000", dt.date(2000, 1, 1)),
+    ("Post-GFC (>= 2008)", dt.date(2008, 1, 1)),
+    ("Post-2014", dt.date(2014, 1, 1)),
+    ("Post-2020", dt.date(2020, 1, 1)),
+]
+TRAILING_WINDOWS = [8, 16, 32]
+ROLLING_WINDOWS = [4, 8, 12]
+BOOTSTRAP_SAMPLES = 2000
+BLOCK_LENGTH = 4
 
 
-def wilson_interval(successes: int, total: int, confidence: float = 0.95) -> Tuple[float, float]:
-    """Return the Wilson score interval for a Bernoulli proportion."""
+@dataclass(frozen=True)
+class NCOPanel:
+    """Entity × quarter matrix of NCO ratios (decimal; NaN where unreported)."""
 
-    if total == 0:
-        return float("nan"), float("nan")
+    entities: List[str]
+    dates: np.ndarray  # datetime64[D], shape (quarters,)
+    ratios: np.ndarray  # shape (entities, quarters)
 
-    if confidence != 0.95:
-        raise ValueError("Currently only 95% confidence supported")
+    def row(self, entity: str) -> int:
+        return self.entities.index(entity)
 
-    z = 1.96
 
-    phat = successes / total
-    denom = 1 + z**2 / total
-    center = phat + z**2 / (2 * total)
-    sqrt_term = sqrt((phat * (1 - phat) + z**2 / (4 * total)) / total)
-    lower = (center - z * sqrt_term) / denom
-    upper = (center + z * sqrt_term) / denom
+@dataclass(frozen=True)
+class WindowStats:
+    labels: List[str]
+    masks: np.ndarray  # bool, shape (windows, quarters)
+    quarters: np.ndarray  # shape (entities, windows)
+    breaches: np.ndarray  # shape (entities, windows)
+    probability: np.ndarray
+    wilson_lower: np.ndarray
+    wilson_upper: np.ndarray
+
+
+def z_score(confidence: float) -> float:
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def wilson_interval(successes, total, confidence: float = 0.95):
+    """Return the Wilson score interval for a Bernoulli proportion.
+
+    Accepts scalars or arrays; empty samples yield NaN bounds.
+    """
+    z = z_score(confidence)
+    successes = np.asarray(successes, dtype=float)
+    total = np.asarray(total, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        phat = successes / total
+        denom = 1 + z**2 / total
+        center = phat + z**2 / (2 * total)
+        sqrt_term = np.sqrt((phat * (1 - phat) + z**2 / (4 * total)) / total)
+        lower = (center - z * sqrt_term) / denom
+        upper = (center + z * sqrt_term) / denom
+    if lower.ndim == 0:
+        return float(lower), float(upper)
     return lower, upper
 
 
-@dataclass(frozen=True)
-class Observation:
-    date: dt.date
-    ratio: float  # expressed as decimal (e.g., 0.002 = 20 bps)
-
-
-def load_series() -> List[Observation]:
-    rows: List[Observation] = []
-    with RAW_CSV.open(newline="") as fh:
-        reader = csv.DictReader(fh)
-        for record in reader:
-            date = dt.datetime.strptime(record["REPDTE"], "%Y%m%d").date()
-            ratio = float(record["NTLNLSCOQR"]) / 100.0  # convert percent to decimal
-            rows.append(Observation(date=date, ratio=ratio))
-    rows.sort(key=lambda obs: obs.date)
-    return rows
-
-
-def window_prob(observations: Sequence[Observation], start: dt.date | None) -> float:
-    window = [obs for obs in observations if start is None or obs.date >= start]
-    if not window:
-        return float("nan")
-    breaches = sum(obs.ratio >= THRESHOLD for obs in window)
-    return breaches / len(window)
-
-
-def trailing_prob(observations: Sequence[Observation], count: int) -> float:
-    if len(observations) < count:
-        return float("nan")
-    window = observations[-count:]
-    breaches = sum(obs.ratio >= THRESHOLD for obs in window)
-    return breaches / len(window)
-
-
-def rolling_average(observations: Sequence[Observation], window: int) -> List[Tuple[dt.date, float]]:
-    output: List[Tuple[dt.date, float]] = []
-    for idx in range(window - 1, len(observations)):
-        slice_ratios = [obs.ratio for obs in observations[idx - window + 1 : idx + 1]]
-        output.append((observations[idx].date, mean(slice_ratios)))
+def _panel_from_csv(path: Path = RAW_CSV, entity: str = TARGET_ENTITY) -> NCOPanel:
+    dates: List[str] = []
+    values: List[float] = []
+    with path.open(newline="") as fh:
+        for record in csv.DictReader(fh):
+            dates.append(dt.datetime.strptime(record["REPDTE"], "%Y%m%d").date().isoformat())
+            values.append(float(record[FIELD]) / 100.0)  # convert percent to decimal
+    order = np.argsort(np.array(dates, dtype="datetime64[D]"))
+    return NCOPanel(
+        entities=[entity],
+        dates=np.array(dates, dtype="datetime64[D]")[order],
+        ratios=np.array(values)[order][np.newaxis, :],
+    )
+
+
+def load_panel(entities: Optional[Sequence[str]] = None) -> NCOPanel:
+    """Load every requested entity's NCO series into one matrix in a single read.
+
+    Falls back to the raw CATY CSV when the time-series store is unavailable,
+    and seeds the store from that CSV on first use. Peer series come from
+    ``data/peer_fdic_nco.json`` (scripts/fetch_peer_fdic_nco.py); the append
+    is idempotent, so re-ingesting it on every run only writes new quarters.
+    """
+    try:
+        store = TimeSeriesStore()
+    except RuntimeError:
+        return _panel_from_csv()
+    if not store.query("fdic", entities=[TARGET_ENTITY], fields=[FIELD]).shape[0]:
+        store.append("fdic", fdic_timeseries_frame(RAW_CSV))
+    if PEER_FDIC_NCO_PATH.exists():
+        store.append("fdic", peer_fdic_nco_frame(load_json(PEER_FDIC_NCO_PATH)))
+    wide = store.pivot("fdic", FIELD, entities=entities)
+    if TARGET_ENTITY in wide.columns:
+        wide = wide[[TARGET_ENTITY] + [col for col in wide.columns if col != TARGET_ENTITY]]
+    return NCOPanel(
+        entities=list(wide.columns),
+        dates=wide.index.values.astype("datetime64[D]"),
+        ratios=wide.to_numpy(dtype=float).T / 100.0,  # convert percent to decimal
+    )
+
+
+def window_masks(
+    dates: np.ndarray,
+    starts: Sequence[Optional[dt.date]] = (),
+    trailing: Sequence[int] = (),
+) -> np.ndarray:
+    """Boolean (windows × quarters) matrix: calendar windows first, then trailing counts.
+
+    A trailing window longer than the series selects no quarters, so its
+    probability is NaN rather than the full-sample figure.
+    """
+    start_values = np.array(
+        [np.datetime64(start) if start else np.datetime64("NaT") for start in starts],
+        dtype="datetime64[D]",
+    )
+    calendar = np.isnat(start_values)[:, None] | (dates[None, :] >= start_values[:, None])
+    positions = np.arange(dates.size)
+    trailing_counts = np.asarray(trailing, dtype=int)
+    recent = positions[None, :] >= (dates.size - trailing_counts)[:, None]
+    recent &= (trailing_counts <= dates.size)[:, None]
+    return np.vstack([calendar.reshape(-1, dates.size), recent.reshape(-1, dates.size)])
+
+
+def window_stats(
+    panel: NCOPanel,
+    masks: np.ndarray,
+    labels: Sequence[str],
+    threshold: float = THRESHOLD,
+    confidence: float = 0.95,
+) -> WindowStats:
+    """Breach counts, frequencies and Wilson bounds for every entity × window at once."""
+    valid = ~np.isnan(panel.ratios)
+    breach = valid & (np.nan_to_num(panel.ratios, nan=-np.inf) >= threshold)
+    mask_matrix = masks.astype(float).T
+    quarters = valid.astype(float) @ mask_matrix
+    breaches = breach.astype(float) @ mask_matrix
+    with np.errstate(divide="ignore", invalid="ignore"):
+        probability = breaches / quarters
+    lower, upper = wilson_interval(breaches, quarters, confidence)
+    return WindowStats(
+        labels=list(labels),
+        masks=masks,
+        quarters=quarters.astype(int),
+        breaches=breaches.astype(int),
+        probability=probability,
+        wilson_lower=lower,
+        wilson_upper=upper,
+    )
+
+
+def rolling_means(ratios: np.ndarray, windows: Sequence[int] = ROLLING_WINDOWS) -> Dict[int, np.ndarray]:
+    """Trailing means along the quarter axis; NaN until a full window of reports exists."""
+    valid = ~np.isnan(ratios)
+    padded = np.zeros((ratios.shape[0], 1))
+    sums = np.hstack([padded, np.cumsum(np.nan_to_num(ratios), axis=1)])
+    counts = np.hstack([padded, np.cumsum(valid, axis=1)])
+    output: Dict[int, np.ndarray] = {}
+    for window in windows:
+        result = np.full(ratios.shape, np.nan)
+        if window <= ratios.shape[1]:
+            window_sum = sums[:, window:] - sums[:, :-window]
+            window_count = counts[:, window:] - counts[:, :-window]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                result[:, window - 1 :] = np.where(window_count == window, window_sum / window, np.nan)
+        output[window] = result
     return output
 
 
+def block_bootstrap_interval(
+    ratios: np.ndarray,
+    mask: np.ndarray,
+    threshold: float = THRESHOLD,
+    confidence: float = 0.95,
+    block_length: int = BLOCK_LENGTH,
+    samples: int = BOOTSTRAP_SAMPLES,
+    seed: int = 0,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Moving-block bootstrap interval of the breach frequency for each entity.
+
+    Quarters are resampled in contiguous blocks so clustered loss years (the
+    GFC) stay together; the same block draws are applied to every entity row.
+    """
+    window = ratios[:, mask]
+    n = window.shape[1]
+    if n == 0:
+        nan = np.full(ratios.shape[0], np.nan)
+        return nan, nan.copy()
+    block = max(1, min(block_length, n))
+    rng = np.random.default_rng(seed)
+    blocks = -(-n // block)
+    starts = rng.integers(0, n - block + 1, size=(samples, blocks))
+    indices = (starts[:, :, None] + np.arange(block)).reshape(samples, -1)[:, :n]
+    valid = ~np.isnan(window)
+    breach = (valid & (np.nan_to_num(window, nan=-np.inf) >= threshold)).astype(float)
+    drawn_breaches = breach[:, indices].sum(axis=2)
+    drawn_valid = valid[:, indices].sum(axis=2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        frequencies = drawn_breaches / drawn_valid
+    tail = (1 - confidence) / 2 * 100
+    lower, upper = np.nanpercentile(frequencies, [tail, 100 - tail], axis=1)
+    return lower, upper
+
+
 def format_percentage(value: float) -> str:
     return f"{value * 100:.1f}%"
 
 
-def generate_markdown(observations: Sequence[Observation]) -> str:
+def generate_markdown(
+    panel: NCOPanel,
+    threshold: float = THRESHOLD,
+    confidence: float = 0.95,
+    samples: int = BOOTSTRAP_SAMPLES,
+    block_length: int = BLOCK_LENGTH,
+) -> str:
+    target = panel.row(TARGET_ENTITY) if TARGET_ENTITY in panel.entities else 0
+    conf_label = f"{confidence * 100:g}%"
+    labels = [label for label, _ in WINDOWS] + [f"Last {count} quarters" for count in TRAILING_WINDOWS]
+    masks = window_masks(panel.dates, [start for _, start in WINDOWS], TRAILING_WINDOWS)
+    stats = window_stats(panel, masks, labels, threshold, confidence)
+    calendar = range(len(WINDOWS))
+    trailing = range(len(WINDOWS), len(labels))
+
     sections: List[str] = []
 
     sections.append("# Net Charge-Off Probability Summary\n")
     sections.append("Data source: FDIC Bank Financials API (field `NTLNLSCOQR`). Values represent annualised quarterly net charge-off ratios.")
     sections.append("")
 
-    windows = [
-        ("Full history (since 1984)", None),
-        ("Post-2000", dt.date(2000, 1, 1)),
-        ("Post-GFC (>= 2008)", dt.date(2008, 1, 1)),
-        ("Post-2014", dt.date(2014, 1, 1)),
-        ("Post-2020", dt.date(2020, 1, 1)),
-    ]
-
     sections.append("## Frequency of quarterly breaches\n")
-    sections.append("Threshold: 45.8 bps (0.458%) total loan & lease net charge-off ratio")
+    sections.append(f"Threshold: {threshold * 10_000:.1f} bps ({threshold * 100:.3f}%) total loan & lease net charge-off ratio")
     sections.append("")
-    sections.append("| Window | Quarters | Breach Probability | 95% Upper Bound |")
+    sections.append(f"| Window | Quarters | Breach Probability | {conf_label} Upper Bound |")
     sections.append("|--------|----------|--------------------|------------------|")
-    for label, start in windows:
-        window_obs = [obs for obs in observations if start is None or obs.date >= start]
-        probability = window_prob(observations, start)
-        breaches = sum(obs.ratio >= THRESHOLD for obs in window_obs)
-        upper = wilson_interval(breaches, len(window_obs))[1]
+    for idx in calendar:
         sections.append(
-            f"| {label} | {len(window_obs)} | {format_percentage(probability)} | {format_percentage(upper)} |"
+            f"| {labels[idx]} | {stats.quarters[target, idx]} | "
+            f"{format_percentage(stats.probability[target, idx])} | {format_percentage(stats.wilson_upper[target, idx])} |"
         )
 
-    trailing_windows = [8, 16, 32]
     sections.append("")
     sections.append("| Trailing sample | Breach Probability |")
     sections.append("|-----------------|--------------------|")
-    for count in trailing_windows:
-        prob = trailing_prob(observations, count)
-        sections.append(f"| Last {count} quarters | {format_percentage(prob)} |")
+    for idx in trailing:
+        sections.append(f"| {labels[idx]} | {format_percentage(stats.probability[target, idx])} |")
 
+    if samples > 0:
+        sections.append("")
+        sections.append(f"## Block-bootstrap intervals ({conf_label}, {block_length}-quarter blocks, {samples:,} draws)\n")
+        sections.append("Resamples contiguous blocks of quarters so clustered loss periods stay intact; complements the Wilson bound, which assumes independent quarters.")
+        sections.append("")
+        sections.append(f"| Window | Breach Probability | Wilson {conf_label} | Bootstrap {conf_label} |")
+        sections.append("|--------|--------------------|------------------|---------------------|")
+        for idx in calendar:
+            lower, upper = block_bootstrap_interval(
+                panel.ratios[target : target + 1], masks[idx], threshold, confidence, block_length, samples
+            )
+            sections.append(
+                f"| {labels[idx]} | {format_percentage(stats.probability[target, idx])} | "
+                f"{format_percentage(stats.wilson_lower[target, idx])} – {format_percentage(stats.wilson_upper[target, idx])} | "
+                f"{format_percentage(lower[0])} – {format_percentage(upper[0])} |"
+            )
+
+    rolling = rolling_means(panel.ratios, ROLLING_WINDOWS)
+    series_dates = panel.dates
     sections.append("")
-    sections.append("## Rolling four-quarter averages\n")
+    sections.append("## Rolling four-, eight- and twelve-quarter averages\n")
     sections.append("Evaluates sustained loss pressure – counts instances where the trailing 4-quarter average exceeds the through-cycle assumption.")
-    rolling = rolling_average(observations, window=4)
-    breaches = [(date, avg) for date, avg in rolling if avg >= THRESHOLD]
-    breach_pct = len(breaches) / len(rolling) if rolling else float("nan")
-    sections.append(f"- Rolling average breach probability: {format_percentage(breach_pct)} ({len(breaches)} of {len(rolling)} observations)")
-    if breaches:
-        sections.append("- Last breach: " + breaches[-1][0].isoformat())
-    else:
-        sections.append("- Last breach: Not observed post-1984")
-
-    recent = [obs for obs in observations if obs.date >= dt.date(2018, 1, 1)]
-    if recent:
-        average_recent = mean(obs.ratio for obs in recent)
+    for window in ROLLING_WINDOWS:
+        means = rolling[window][target]
+        observed = ~np.isnan(means)
+        breached = observed & (np.nan_to_num(means, nan=-np.inf) >= threshold)
+        count, total = int(breached.sum()), int(observed.sum())
+        breach_pct = count / total if total else float("nan")
+        if window == 4:
+            sections.append(f"- Rolling average breach probability: {format_percentage(breach_pct)} ({count} of {total} observations)")
+            if count:
+                sections.append("- Last breach: " + str(series_dates[breached][-1]))
+            else:
+                sections.append("- Last breach: Not observed post-1984")
+        else:
+            sections.append(f"- Rolling {window}-quarter average breach probability: {format_percentage(breach_pct)} ({count} of {total} observations)")
+
+    recent_mask = panel.dates >= np.datetime64("2018-01-01")
+    recent = panel.ratios[target, recent_mask]
+    recent = recent[~np.isnan(recent)]
+    if recent.size:
         sections.append("")
         sections.append("## Recent central tendency\n")
-        sections.append(f"- Mean net charge-off ratio since 2018: {average_recent * 100:.2f}%")
-        sections.append(f"- Standard deviation since 2018: { (sum((obs.ratio - average_recent) ** 2 for obs in recent) / len(recent)) ** 0.5 * 100:.2f}%")
+        sections.append(f"- Mean net charge-off ratio since 2018: {recent.mean() * 100:.2f}%")
+        sections.append(f"- Standard deviation since 2018: {recent.std() * 100:.2f}%")
+
+    if len(panel.entities) > 1:
+        post_gfc = 2  # index of the post-GFC window in WINDOWS
+        rolling_breach = rolling[4] >= threshold
+        sections.append("")
+        sections.append("## Peer benchmark (post-GFC)\n")
+        sections.append(f"| Bank | Quarters | Breach Probability | Wilson {conf_label} Upper | Rolling 4Q Breach |")
+        sections.append("|------|----------|--------------------|------------------|-------------------|")
+        order = np.argsort(-np.nan_to_num(stats.probability[:, post_gfc], nan=-1.0), kind="stable")
+        gfc_mask = masks[post_gfc]
+        for row in order:
+            rolling_valid = ~np.isnan(rolling[4][row]) & gfc_mask
+            rolling_pct = rolling_breach[row][rolling_valid].mean() if rolling_valid.any() else float("nan")
+            name = f"**{panel.entities[row]}**" if row == target else panel.entities[row]
+            sections.append(
+                f"| {name} | {stats.quarters[row, post_gfc]} | {format_percentage(stats.probability[row, post_gfc])} | "
+                f"{format_percentage(stats.wilson_upper[row, post_gfc])} | {format_percentage(rolling_pct)} |"
+            )
 
     sections.append("")
     sections.append("## Interpretation Guide\n")
@@ -171,8 +382,22 @@ def generate_markdown(observations: Sequence[Observation]) -> str:
 
 
 def main() -> None:
-    observations = load_series()
-    markdown = generate_markdown(observations)
+    parser = argparse.ArgumentParser(description="NCO breach probability analysis")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Interval confidence level (default: 0.95)")
+    parser.add_argument("--threshold-bps", type=float, default=THRESHOLD * 10_000, help="Breach threshold in bps (default: 45.8)")
+    parser.add_argument("--bootstrap", type=int, default=BOOTSTRAP_SAMPLES, help="Block-bootstrap draws; 0 disables")
+    parser.add_argument("--block-length", type=int, default=BLOCK_LENGTH, help="Bootstrap block length in quarters")
+    parser.add_argument("--entities", nargs="+", help="Restrict the panel to these entities (default: all in store)")
+    args = parser.parse_args()
+
+    panel = load_panel(args.entities)
+    markdown = generate_markdown(
+        panel,
+        threshold=args.threshold_bps / 10_000,
+        confidence=args.confidence,
+        samples=args.bootstrap,
+        block_length=args.block_length,
+    )
     OUTPUT_MD.write_text(markdown)
     print(markdown)
 
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Declarative stage DAG for the automation pipeline.
+
+A pipeline is a list of :class:`Stage` objects. Each stage names the files it
+reads and writes plus any explicit dependencies; a stage that reads a file
+another stage writes implicitly depends on that producer. The runner walks the
+graph in topological order, runs ``concurrent`` stages (network fetches) on a
+thread pool alongside each other, and serializes everything else so in-process
+script ``main()`` calls never overlap. Every stage's status and wall time is
+handed to a log callback so runs show up in ``logs/automation_run.log``.
+
+Stage callables return a :class:`StageResult` (or a plain message string for
+``ok``). Returning status ``cached`` records that the stage fell back to its
+previous outputs; raising marks it ``failed`` and skips everything downstream
+unless the stage sets ``allow_failure``.
+
+``cacheable`` stages are make-style: :class:`FingerprintStore` hashes their
+declared inputs and parameters, and when the fingerprint and the recorded
+output hashes still match the last successful run the stage is reported as
+``cached`` without being executed. JSON files are hashed after dropping
+write stamps (``fetch_timestamp``, ``report_generated`` ...) so a
+re-fetch that returns the same data, or build_site stamping
+market_data_current.json, does not invalidate everything downstream.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Collection, Dict, List, Mapping, Optional, Sequence, Union
+
+STATUSES = ("ok", "cached", "skipped", "failed")
+# JSON keys (at any depth) that only stamp when a file was written.
+VOLATILE_KEYS = ("fetch_timestamp", "generated_at", "report_generated", "report_metadata")
+
+
+@dataclass
+class StageResult:
+    status: str = "ok"
+    message: str = ""
+
+
+@dataclass
+class Stage:
+    name: str
+    run: Callable[[], Union[StageResult, str, None]]
+    inputs: Sequence[Path] = ()
+    outputs: Sequence[Path] = ()
+    deps: Sequence[str] = ()
+    concurrent: bool = False
+    allow_failure: bool = False
+    cacheable: bool = False
+    params: Mapping[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class StageOutcome:
+    name: str
+    status: str
+    seconds: float = 0.0
+    message: str = ""
+    error: Optional[BaseException] = field(default=None, repr=False)
+
+
+def resolve_dependencies(stages: Sequence[Stage]) -> Dict[str, List[str]]:
+    """Merge explicit deps with producer→consumer edges from declared files."""
+    names = [stage.name for stage in stages]
+    if len(set(names)) != len(names):
+        raise ValueError("Duplicate stage names in pipeline")
+    producers: Dict[Path, List[str]] = {}
+    for stage in stages:
+        for path in stage.outputs:
+            producers.setdefault(Path(path), []).append(stage.name)
+
+    graph: Dict[str, List[str]] = {}
+    for stage in stages:
+        deps = list(dict.fromkeys(stage.deps))
+        for path in stage.inputs:
+            for producer in producers.get(Path(path), []):
+                if producer != stage.name and producer not in deps:
+                    deps.append(producer)
+        unknown = [dep for dep in deps if dep not in names]
+        if unknown:
+            raise ValueError(f"Stage {stage.name} depends on unknown stage(s): {unknown}")
+        graph[stage.name] = deps
+    return graph
+
+
+def topological_order(stages: Sequence[Stage]) -> List[str]:
+    """Kahn ordering that keeps declaration order among ready stages."""
+    graph = resolve_dependencies(stages)
+    remaining = {name: set(deps) for name, deps in graph.items()}
+    order: List[str] = []
+    while remaining:
+        ready = [stage.name for stage in stages if stage.name in remaining and not remaining[stage.name]]
+        if not ready:
+            raise ValueError(f"Dependency cycle between stages: {sorted(remaining)}")
+        for name in ready:
+            order.append(name)
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return order
+
+
+def _strip_keys(payload: Any, keys: Collection[str]) -> Any:
+    if isinstance(payload, dict):
+        return {key: _strip_keys(value, keys) for key, value in payload.items() if key not in keys}
+    if isinstance(payload, list):
+        return [_strip_keys(item, keys) for item in payload]
+    return payload
+
+
+def content_hash(path: Path, volatile_keys: Collection[str] = VOLATILE_KEYS) -> Optional[str]:
+    """SHA256 of a file's content; ``None`` when missing. JSON drops volatile keys."""
+    try:
+        raw = Path(path).read_bytes()
+    except FileNotFoundError:
+        return None
+    if Path(path).suffix == ".json" and volatile_keys:
+        try:
+            payload = json.loads(raw)
+        except ValueError:
+            payload = None
+        if isinstance(payload, (dict, list)):
+            payload = _strip_keys(payload, set(volatile_keys))
+            raw = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+class FingerprintStore:
+    """Per-stage input fingerprints and output hashes from the last successful run."""
+
+    def __init__(self, path: Path, root: Optional[Path] = None) -> None:
+        self.path = Path(path)
+        self.root = Path(root) if root else None
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            try:
+                self._entries = json.loads(self.path.read_text(encoding="utf-8")).get("stages", {})
+            except (ValueError, AttributeError):
+                logging.warning("Ignoring unreadable fingerprint store %s", self.path)
+
+    def _key(self, path: Path) -> str:
+        path = Path(path)
+        if self.root:
+            try:
+                return str(path.resolve().relative_to(self.root.resolve()))
+            except ValueError:
+                pass
+        return str(path)
+
+    def fingerprint(self, stage: Stage) -> str:
+        digest = hashlib.sha256()
+        digest.update(json.dumps({"stage": stage.name, "params": stage.params}, sort_keys=True, default=str).encode("utf-8"))
+        for path in sorted(stage.inputs, key=self._key):
+            digest.update(f"\n{self._key(path)}={content_hash(path)}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _output_hashes(self, stage: Stage) -> Dict[str, Optional[str]]:
+        return {self._key(path): content_hash(path) for path in stage.outputs}
+
+    def is_fresh(self, stage: Stage) -> bool:
+        with self._lock:
+            entry = self._entries.get(stage.name)
+        if not entry or entry.get("fingerprint") != self.fingerprint(stage):
+            return False
+        outputs = self._output_hashes(stage)
+        return None not in outputs.values() and outputs == entry.get("outputs")
+
+    def record(self, stage: Stage) -> None:
+        # Fingerprint after the run so stages that rewrite their own inputs
+        # (e.g. market_data_current.json) are fresh on the next pass.
+        entry = {
+            "fingerprint": self.fingerprint(stage),
+            "outputs": self._output_hashes(stage),
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        }
+        with self._lock:
+            self._entries[stage.name] = entry
+
+    def forget(self, name: str) -> None:
+        with self._lock:
+            self._entries.pop(name, None)
+
+    def save(self) -> None:
+        with self._lock:
+            payload = {"stages": dict(sorted(self._entries.items()))}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+def _execute(
+    stage: Stage,
+    serial_lock: threading.Lock,
+    store: Optional[FingerprintStore] = None,
+    force: bool = False,
+) -> StageOutcome:
+    start = time.perf_counter()
+    use_cache = store is not None and stage.cacheable
+    if use_cache and not force and store.is_fresh(stage):
+        return StageOutcome(stage.name, "cached", time.perf_counter() - start, "inputs unchanged; reusing outputs")
+    try:
+        if stage.concurrent:
+            returned = stage.run()
+        else:
+            with serial_lock:
+                returned = stage.run()
+    except BaseException as exc:  # noqa: BLE001 - SystemExit from script mains counts as failure
+        if isinstance(exc, SystemExit) and not exc.code:
+            return StageOutcome(stage.name, "ok", time.perf_counter() - start)
+        if isinstance(exc, KeyboardInterrupt):
+            raise
+        logging.exception("Stage %s failed", stage.name)
+        if use_cache:
+            store.forget(stage.name)
+        return StageOutcome(stage.name, "failed", time.perf_counter() - start, f"{type(exc).__name__}: {exc}", exc)
+
+    if isinstance(returned, StageResult):
+        result = returned
+    else:
+        result = StageResult("ok", returned or "")
+    if result.status not in STATUSES:
+        raise ValueError(f"Stage {stage.name} returned unknown status {result.status!r}")
+    if use_cache and result.status == "ok":
+        store.record(stage)
+    return StageOutcome(stage.name, result.status, time.perf_counter() - start, result.message)
+
+
+def format_outcome(outcome: StageOutcome) -> str:
+    prefix = f"{outcome.message} " if outcome.message else ""
+    return f"{prefix}[stage={outcome.name} status={outcome.status} {outcome.seconds:.2f}s]"
+
+
+def run_pipeline(
+    stages: Sequence[Stage],
+    log: Optional[Callable[[str], None]] = None,
+    max_workers: int = 4,
+    store: Optional[FingerprintStore] = None,
+    force: Collection[str] = (),
+) -> Dict[str, StageOutcome]:
+    """Run stages respecting dependencies; returns outcomes keyed by stage name.
+
+    ``force`` names stages that must run even when their fingerprint is fresh
+    (``"all"`` forces every stage).
+    """
+    graph = resolve_dependencies(stages)
+    topological_order(stages)  # fail fast on cycles before anything runs
+    by_name = {stage.name: stage for stage in stages}
+    unknown = set(force) - set(by_name) - {"all"}
+    if unknown:
+        raise ValueError(f"Cannot force unknown stage(s): {sorted(unknown)}")
+    outcomes: Dict[str, StageOutcome] = {}
+    running: Dict[Future, str] = {}
+    serial_lock = threading.Lock()
+
+    def record(outcome: StageOutcome) -> None:
+        outcomes[outcome.name] = outcome
+        if log:
+            log(format_outcome(outcome))
+
+    def blocked(name: str) -> Optional[str]:
+        for dep in graph[name]:
+            dep_outcome = outcomes[dep]
+            if dep_outcome.status == "failed" and not by_name[dep].allow_failure:
+                return dep
+            if dep_outcome.status == "skipped" and dep_outcome.error is not None:
+                return dep
+        return None
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stage") as pool:
+        pending = [stage.name for stage in stages]
+        while pending or running:
+            progressed = False
+            for name in list(pending):
+                if not all(dep in outcomes for dep in graph[name]):
+                    continue
+                pending.remove(name)
+                progressed = True
+                failed_dep = blocked(name)
+                if failed_dep:
+                    record(
+                        StageOutcome(
+                            name,
+                            "skipped",
+                            message=f"upstream {failed_dep} failed",
+                            error=RuntimeError(f"upstream {failed_dep} failed"),
+                        )
+                    )
+                    continue
+                forced = name in force or "all" in force
+                running[pool.submit(_execute, by_name[name], serial_lock, store, forced)] = name
+            if running and not progressed:
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    running.pop(future)
+                    record(future.result())
+
+    if store is not None:
+        store.save()
+
+    return {name: outcomes[name] for name in topological_order(stages)}
+
+
+def failed_stages(stages: Sequence[Stage], outcomes: Dict[str, StageOutcome]) -> List[str]:
+    """Names of required stages that failed or were skipped because of a failure."""
+    by_name = {stage.name: stage for stage in stages}
+    return [
+        name
+        for name, outcome in outcomes.items()
+        if (outcome.status == "failed" and not by_name[name].allow_failure)
+        or (outcome.status == "skipped" and outcome.error is not None)
+    ]
+
+
+def summarize(outcomes: Dict[str, StageOutcome], wall_seconds: float) -> str:
+    counts = {status: 0 for status in STATUSES}
+    for outcome in outcomes.values():
+        counts[outcome.status] += 1
+    stage_seconds = sum(outcome.seconds for outcome in outcomes.values())
+    detail = ", ".join(f"{count} {status}" for status, count in counts.items() if count)
+    return (
+        f"{len(outcomes)} stages ({detail}); wall {wall_seconds:.2f}s vs {stage_seconds:.2f}s summed stage time"
+    )
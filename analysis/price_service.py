@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Shared price service over a local daily OHLC cache.
+
+Daily bars live in the time-series store (source ``daily_ohlc``, one partition
+per ticker, fields ``open``/``high``/``low``/``close``/``adj_close``/``volume``).
+``coverage.json`` next to the partitions records the date range already
+fetched for each ticker, so a request only downloads the gaps before and
+after it: a five-day peer close after a ten-year CAPM backfill costs one
+small tail download, and a same-day rerun costs nothing. Tickers sharing a
+gap go out as one batched ``yf.download`` call (yfinance fetches the symbols
+on parallel threads); distinct gaps are downloaded one after another because
+``yf.download`` keeps module-global state. When the network is unavailable
+every consumer is served from the cached bars. ``ensure`` holds a file lock
+on the cache for its whole read-download-write cycle, so concurrent stages
+(separate processes) top it up one after another instead of racing on the
+partitions and ``coverage.json``.
+
+Consumers:
+  - scripts/fetch_live_price.py, scripts/fetch_peer_prices.py (latest closes)
+  - analysis/beta_engine.py and the CAPM scripts (weekly closes from the
+    daily bars, labelled by week start like yfinance's ``1wk`` interval)
+
+Usage:
+  python3 analysis/price_service.py CATY EWBC --start 2020-01-01
+  python3 analysis/price_service.py --latest CATY EWBC
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from analysis.data_io import file_lock, load_json, write_json  # noqa: E402
+from analysis.http_cassette import install_from_env  # noqa: E402
+from analysis.timeseries_store import COLUMNS, TimeSeriesStore, records_to_frame  # noqa: E402
+
+SOURCE = "daily_ohlc"
+FIELDS = {
+    "Open": "open",
+    "High": "high",
+    "Low": "low",
+    "Close": "close",
+    "Adj Close": "adj_close",
+    "Volume": "volume",
+}
+MARKET_TZ = "America/New_York"
+# A bar for the current session may still be moving; re-fetch it once it is this old.
+INTRADAY_MAX_AGE = timedelta(minutes=15)
+
+Window = Tuple[pd.Timestamp, pd.Timestamp]
+Downloader = Callable[[Sequence[str], pd.Timestamp, pd.Timestamp], pd.DataFrame]
+
+
+def _day(value: Any) -> pd.Timestamp:
+    stamp = pd.Timestamp(value)
+    if stamp.tzinfo is not None:
+        stamp = stamp.tz_localize(None)
+    return stamp.normalize()
+
+
+def _market_today(now: datetime) -> pd.Timestamp:
+    return _day(pd.Timestamp(now).tz_convert(MARKET_TZ))
+
+
+def download_daily(tickers: Sequence[str], start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+    """Daily bars for ``tickers`` over ``[start, end]`` in one yfinance call.
+
+    Returns yfinance's (field × ticker) column layout.
+    """
+    import yfinance as yf  # type: ignore
+
+    data = yf.download(
+        list(tickers),
+        start=start.strftime("%Y-%m-%d"),
+        end=(end + timedelta(days=1)).strftime("%Y-%m-%d"),  # yfinance's end is exclusive
+        interval="1d",
+        auto_adjust=False,
+        group_by="column",
+        progress=False,
+        threads=True,
+    )
+    if data is None or data.empty:
+        return pd.DataFrame()
+    if not isinstance(data.columns, pd.MultiIndex):
+        data.columns = pd.MultiIndex.from_product([data.columns, [tickers[0]]])
+    return data
+
+
+def bars_to_frame(data: pd.DataFrame) -> pd.DataFrame:
+    """yfinance (field × ticker) bars → store-shaped long frame."""
+    if data.empty:
+        return records_to_frame([])
+    data = data.loc[:, data.columns.get_level_values(0).isin(list(FIELDS))].copy()
+    data.columns = data.columns.set_names(["field", "entity"])
+    data.index = pd.DatetimeIndex([_day(stamp) for stamp in data.index])
+    long = data.melt(ignore_index=False, value_name="value").rename_axis("date").reset_index()
+    long["field"] = long["field"].map(FIELDS)
+    return records_to_frame(long[COLUMNS].itertuples(index=False, name=None))
+
+
+class PriceService:
+    """Latest-close, daily and weekly price queries backed by the OHLC cache."""
+
+    def __init__(
+        self,
+        store: Optional[TimeSeriesStore] = None,
+        download: Optional[Downloader] = None,
+        offline: bool = False,
+        now: Optional[Callable[[], datetime]] = None,
+    ) -> None:
+        self.store = store or TimeSeriesStore()
+        self.download = download or download_daily
+        self.offline = offline
+        self.now = now or (lambda: datetime.now(timezone.utc))
+        self.coverage_path = self.store.root / SOURCE / "coverage.json"
+        self.lock_path = self.store.root / SOURCE / ".lock"
+
+    # -- cache maintenance --------------------------------------------------
+
+    def coverage(self) -> Dict[str, Dict[str, str]]:
+        return load_json(self.coverage_path, {})
+
+    def missing_windows(
+        self, tickers: Sequence[str], start: Any, end: Any = None
+    ) -> Dict[Window, List[str]]:
+        """Date windows still to download for ``[start, end]``, grouped by window.
+
+        Each window overlaps the cached range by one bar so the edge session
+        is refreshed and a non-empty response proves the fetch succeeded.
+        """
+        now = self.now()
+        today = _market_today(now)
+        start = _day(start)
+        end = today if end is None else min(_day(end), today)
+        coverage = self.coverage()
+        windows: Dict[Window, List[str]] = {}
+        for ticker in dict.fromkeys(tickers):
+            entry = coverage.get(ticker)
+            if entry is None:
+                windows.setdefault((start, end), []).append(ticker)
+                continue
+            first, last = _day(entry["start"]), _day(entry["end"])
+            if start < first:
+                windows.setdefault((start, min(first, end)), []).append(ticker)
+            fetched_at = datetime.fromisoformat(entry["fetched_at"])
+            if now - fetched_at < INTRADAY_MAX_AGE:
+                continue
+            behind = len(pd.bdate_range(last + timedelta(days=1), end)) > 0
+            live_session = end == today and last >= today
+            if behind or live_session:
+                windows.setdefault((min(last, end), end), []).append(ticker)
+        return windows
+
+    def ensure(self, tickers: Sequence[str], start: Any, end: Any = None) -> int:
+        """Download the uncached part of ``[start, end]``; returns new/changed rows.
+
+        Failed downloads are logged and the cached bars are served instead.
+        """
+        if self.offline:
+            return 0
+        # Coverage is re-read under the lock: another writer may have just
+        # fetched (part of) the window.
+        with file_lock(self.lock_path):
+            windows = self.missing_windows(tickers, start, end)
+            if not windows:
+                return 0
+
+            now = self.now()
+            coverage = self.coverage()
+            changed = 0
+            for (window_start, window_end), symbols in windows.items():
+                try:
+                    frame = bars_to_frame(self.download(symbols, window_start, window_end))
+                except Exception as exc:  # noqa: BLE001
+                    logging.warning("Price download failed for %s (%s); using cached bars", ",".join(symbols), exc)
+                    continue
+                if frame.empty:
+                    continue
+                changed += self.store.append(SOURCE, frame)
+                last_bars = frame.groupby("entity")["date"].max()
+                for ticker in symbols:
+                    if ticker not in last_bars.index:
+                        continue
+                    entry = coverage.get(ticker)
+                    if entry is None:
+                        first, last, fetched_at = window_start, last_bars[ticker], now.isoformat()
+                    else:
+                        first = min(window_start, _day(entry["start"]))
+                        last = max(last_bars[ticker], _day(entry["end"]))
+                        # A head backfill does not refresh the latest session.
+                        fetched_at = now.isoformat() if last_bars[ticker] >= _day(entry["end"]) else entry["fetched_at"]
+                    coverage[ticker] = {
+                        "start": first.strftime("%Y-%m-%d"),
+                        "end": last.strftime("%Y-%m-%d"),
+                        "fetched_at": fetched_at,
+                    }
+            if coverage != self.coverage():
+                write_json(self.coverage_path, coverage)
+            logging.info("Price cache: %s new/updated bars across %s download(s)", changed, len(windows))
+            return changed
+
+    # -- queries -------------------------------------------------------------
+
+    def daily(self, tickers: Sequence[str], start: Any = None, end: Any = None, field: str = "adj_close") -> pd.DataFrame:
+        """Cached daily ``field`` as a date × ticker frame (no download)."""
+        wide = self.store.pivot(SOURCE, field, entities=list(tickers), start=start, end=end)
+        return wide.reindex(columns=[ticker for ticker in tickers if ticker in wide.columns])
+
+    def series(self, tickers: Sequence[str], start: Any, end: Any = None, field: str = "adj_close") -> pd.DataFrame:
+        """Multi-year daily series, topping up the cache first."""
+        self.ensure(tickers, start, end)
+        return self.daily(tickers, start, end, field)
+
+    def weekly_closes(self, tickers: Sequence[str], start: Any, end: Any = None) -> pd.DataFrame:
+        """Last adjusted close of each week, labelled by the week's Monday."""
+        daily = self.series(tickers, start, end)
+        if daily.empty:
+            return daily
+        return daily.resample("W-MON", label="left", closed="left").last().dropna(how="all")
+
+    def weekly_returns(self, tickers: Sequence[str], start: Any, end: Any = None) -> pd.DataFrame:
+        return self.weekly_closes(tickers, start, end).pct_change(fill_method=None).iloc[1:]
+
+    def latest_closes(self, tickers: Sequence[str], days: int = 5) -> Dict[str, Tuple[float, str]]:
+        """``{ticker: (close, YYYY-MM-DD)}`` for the last bar within ``days`` sessions.
+
+        Tickers with no bar in the window are omitted.
+        """
+        if days < 1:
+            raise ValueError("days must be >= 1")
+        start = _market_today(self.now()) - pd.offsets.BDay(days)
+        self.ensure(tickers, start)
+        closes = self.daily(tickers, start=start, field="close")
+        latest: Dict[str, Tuple[float, str]] = {}
+        for ticker in closes.columns:
+            column = closes[ticker].dropna()
+            if not column.empty:
+                latest[ticker] = (float(column.iloc[-1]), column.index[-1].strftime("%Y-%m-%d"))
+        return latest
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Top up and query the local daily OHLC cache")
+    parser.add_argument("tickers", nargs="+")
+    parser.add_argument("--start", default=(datetime.now(timezone.utc) - timedelta(days=5 * 365)).strftime("%Y-%m-%d"))
+    parser.add_argument("--end")
+    parser.add_argument("--latest", action="store_true", help="Print the latest close per ticker")
+    parser.add_argument("--offline", action="store_true", help="Serve cached bars only")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    install_from_env()
+
+    try:
+        service = PriceService(offline=args.offline)
+    except RuntimeError as exc:
+        print(f"❌ {exc}")
+        return 1
+
+    if args.latest:
+        latest = service.latest_closes(args.tickers)
+        for ticker in args.tickers:
+            close, date = latest.get(ticker, (float("nan"), "n/a"))
+            print(f"{ticker:>6}  {close:10.2f}  {date}")
+        return 0 if len(latest) == len(args.tickers) else 1
+
+    service.ensure(args.tickers, args.start, args.end)
+    coverage = service.coverage()
+    for ticker in args.tickers:
+        entry = coverage.get(ticker)
+        span = f"{entry['start']} → {entry['end']}" if entry else "not cached"
+        print(f"{ticker:>6}  {span}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
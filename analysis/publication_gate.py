@@ -15,18 +15,20 @@ Prints a short summary for CI logs.
 """
 from __future__ import annotations
 
-import json
+import sys
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from analysis import data_io  # noqa: E402
 
 
 def load_json(path: Path) -> Dict[str, Any]:
-    if not path.exists():
-        return {}
-    with path.open("r", encoding="utf-8") as fh:
-        return json.load(fh)
+    # Read-only: the gate never mutates inputs, so share the memoized parse.
+    return data_io.load_json(path, {}, shared=True)
 
 
 def is_number(x: Any) -> bool:
@@ -37,8 +39,9 @@ def is_number(x: Any) -> bool:
         return False
 
 
-def main() -> int:
-    reasons: list[str] = []
+def gate_reasons() -> List[str]:
+    """Reasons the rating must stay NOT RATED (empty when every gate is clear)."""
+    reasons: List[str] = []
 
     market = load_json(ROOT / "data" / "market_data_current.json")
     metrics = market.get("calculated_metrics", {}) if isinstance(market, dict) else {}
@@ -69,7 +72,11 @@ def main() -> int:
     quarters = deposit_history.get("quarters") if isinstance(deposit_history, dict) else None
     if not quarters or len(quarters) < 3:
         reasons.append("Deposit beta product-level history < 3 quarters")
+    return reasons
 
+
+def main() -> int:
+    reasons = gate_reasons()
     if reasons:
         print("Publication Gate: NOT RATED")
         for r in reasons:
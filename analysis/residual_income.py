@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Residual-income (RIM) and dividend-discount (DDM) valuation kernel.
+
+Both models run off the same clean-surplus book value path:
+
+    BV_t = BV_(t-1) × (1 + ROTE_t × (1 - payout))
+    RI_t = (ROTE_t - COE) × BV_(t-1)
+    D_t  = payout × ROTE_t × BV_(t-1)
+
+with a Gordon terminal value on year T+1 (terminal ROTE, growth g). Every
+input broadcasts, so COE, growth and ROTE paths can be arrays: a full
+COE × growth × ROTE-shift cube (tens of thousands of valuations) is one call.
+The RIM target in calculate_valuation_metrics.py, the CATY_13 sensitivity
+tables and the Monte Carlo check below all go through ``rim_value``.
+
+Inputs come from ``data/caty13_residual_income.json`` (``inputs`` block).
+
+Usage:
+  python3 analysis/residual_income.py            # refresh CATY_13 tables + grid output
+  python3 analysis/residual_income.py --runs 50000 --seed 7
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from analysis.data_io import load_json, write_json, write_text  # noqa: E402
+
+RIM_DATA_PATH = ROOT / "data" / "caty13_residual_income.json"
+GRID_OUTPUT_PATH = ROOT / "analysis" / "rim_valuation_grid.json"
+
+# IRC blended target = 60% RIM + 10% DDM + 30% relative (regression). The
+# published DDM anchor predates the clean-surplus kernel and is kept until the
+# DDM payout assumptions are re-underwritten; ddm_target() is reported
+# alongside it for comparison.
+DDM_ANCHOR = 45.12
+IRC_WEIGHTS = {"rim": 0.60, "ddm": 0.10, "regression": 0.30}
+
+# Published grid: COE 8-12%, growth 1-4% and a ±300 bp ROTE-path shift, 25 bp steps.
+COE_GRID_PCT = (8.0, 12.0, 0.25)
+GROWTH_GRID_PCT = (1.0, 4.0, 0.25)
+ROTE_SHIFT_GRID_PCT = (-3.0, 3.0, 0.25)
+
+# Monte Carlo parameter distributions (mean, std, min, max), in percent, as in CATY_14.
+MC_DISTRIBUTIONS = {
+    "rote_shift_pct": (0.0, 2.2, -5.2, 6.3),
+    "coe_pct": (9.9, 0.8, 8.0, 12.0),
+    "terminal_growth_pct": (2.3, 0.4, 1.3, 3.5),
+}
+
+
+@dataclass(frozen=True)
+class RIMInputs:
+    book_value: float
+    coe: float
+    terminal_growth: float
+    rote_path: np.ndarray
+    terminal_rote: float
+    payout_ratio: float
+
+
+def load_inputs(path: Path = RIM_DATA_PATH) -> RIMInputs:
+    inputs = load_json(path, shared=True)["inputs"]
+    return RIMInputs(
+        book_value=float(inputs["gaap_tbvps"]),
+        coe=float(inputs["coe_pct"]) / 100.0,
+        terminal_growth=float(inputs["terminal_growth_pct"]) / 100.0,
+        rote_path=np.asarray(inputs["rote_path_pct"], dtype=float) / 100.0,
+        terminal_rote=float(inputs["terminal_rote_pct"]) / 100.0,
+        payout_ratio=float(inputs["payout_ratio"]),
+    )
+
+
+def clean_surplus_path(book_value, rote_path, payout_ratio) -> np.ndarray:
+    """Book value at the start of each year plus the final year-end value, shape (..., T+1)."""
+    rote_path = np.asarray(rote_path, dtype=float)
+    growth = 1.0 + rote_path * (1.0 - np.asarray(payout_ratio, dtype=float)[..., None])
+    ones = np.ones(growth.shape[:-1] + (1,))
+    factors = np.concatenate([ones, np.cumprod(growth, axis=-1)], axis=-1)
+    return np.asarray(book_value, dtype=float)[..., None] * factors
+
+
+def _discount_factors(coe: np.ndarray, years: int) -> np.ndarray:
+    return (1.0 + coe[..., None]) ** -np.arange(1, years + 1)
+
+
+def rim_value(
+    book_value,
+    coe,
+    terminal_growth,
+    rote_path,
+    terminal_rote=None,
+    payout_ratio=0.75,
+) -> Dict[str, np.ndarray]:
+    """Residual-income value per share for every broadcast combination of inputs.
+
+    ``rote_path`` carries the explicit forecast years on its last axis; the
+    other arguments broadcast against its leading axes. ``terminal_rote``
+    defaults to the final forecast year. Combinations with COE ≤ g are NaN.
+    """
+    rote_path = np.asarray(rote_path, dtype=float)
+    coe = np.asarray(coe, dtype=float)
+    growth = np.asarray(terminal_growth, dtype=float)
+    terminal_rote = rote_path[..., -1] if terminal_rote is None else np.asarray(terminal_rote, dtype=float)
+    payout = np.asarray(payout_ratio, dtype=float)
+    batch = np.broadcast_shapes(
+        np.shape(book_value), coe.shape, growth.shape, rote_path.shape[:-1], terminal_rote.shape, payout.shape
+    )
+    years = rote_path.shape[-1]
+    rote_path = np.broadcast_to(rote_path, batch + (years,))
+    coe = np.broadcast_to(coe, batch)
+
+    book = clean_surplus_path(np.broadcast_to(book_value, batch), rote_path, np.broadcast_to(payout, batch))
+    residual = (rote_path - coe[..., None]) * book[..., :-1]
+    discount = _discount_factors(coe, years)
+    pv_explicit = (residual * discount).sum(axis=-1)
+
+    terminal_ri = (terminal_rote - coe) * book[..., -1] * (1.0 + growth)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terminal_value = np.where(coe > growth, terminal_ri / (coe - growth), np.nan)
+    pv_terminal = terminal_value * discount[..., -1]
+    return {
+        "value": book[..., 0] + pv_explicit + pv_terminal,
+        "pv_explicit": pv_explicit,
+        "terminal_ri": terminal_ri,
+        "terminal_value": terminal_value,
+        "pv_terminal": pv_terminal,
+        "book_values": book,
+        "residual_income": residual,
+    }
+
+
+def ddm_value(
+    book_value,
+    coe,
+    terminal_growth,
+    rote_path,
+    terminal_rote=None,
+    payout_ratio=0.75,
+) -> Dict[str, np.ndarray]:
+    """Dividend-discount value on the same clean-surplus path as ``rim_value``."""
+    rote_path = np.asarray(rote_path, dtype=float)
+    coe = np.asarray(coe, dtype=float)
+    growth = np.asarray(terminal_growth, dtype=float)
+    terminal_rote = rote_path[..., -1] if terminal_rote is None else np.asarray(terminal_rote, dtype=float)
+    payout = np.asarray(payout_ratio, dtype=float)
+    batch = np.broadcast_shapes(
+        np.shape(book_value), coe.shape, growth.shape, rote_path.shape[:-1], terminal_rote.shape, payout.shape
+    )
+    years = rote_path.shape[-1]
+    rote_path = np.broadcast_to(rote_path, batch + (years,))
+    coe = np.broadcast_to(coe, batch)
+    payout = np.broadcast_to(payout, batch)
+
+    book = clean_surplus_path(np.broadcast_to(book_value, batch), rote_path, payout)
+    dividends = payout[..., None] * rote_path * book[..., :-1]
+    discount = _discount_factors(coe, years)
+    pv_explicit = (dividends * discount).sum(axis=-1)
+    terminal_dividend = payout * terminal_rote * book[..., -1] * (1.0 + growth)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terminal_value = np.where(coe > growth, terminal_dividend / (coe - growth), np.nan)
+    pv_terminal = terminal_value * discount[..., -1]
+    return {
+        "value": pv_explicit + pv_terminal,
+        "pv_explicit": pv_explicit,
+        "pv_terminal": pv_terminal,
+        "dividends": dividends,
+    }
+
+
+def rim_target(inputs: Optional[RIMInputs] = None) -> float:
+    """Base-case RIM value per share from CATY_13 inputs."""
+    inputs = inputs or load_inputs()
+    result = rim_value(
+        inputs.book_value,
+        inputs.coe,
+        inputs.terminal_growth,
+        inputs.rote_path,
+        inputs.terminal_rote,
+        inputs.payout_ratio,
+    )
+    return round(float(result["value"]), 2)
+
+
+def ddm_target(inputs: Optional[RIMInputs] = None) -> float:
+    inputs = inputs or load_inputs()
+    result = ddm_value(
+        inputs.book_value,
+        inputs.coe,
+        inputs.terminal_growth,
+        inputs.rote_path,
+        inputs.terminal_rote,
+        inputs.payout_ratio,
+    )
+    return round(float(result["value"]), 2)
+
+
+def axis(spec: Tuple[float, float, float]) -> np.ndarray:
+    start, stop, step = spec
+    count = int(round((stop - start) / step)) + 1
+    return np.round(start + step * np.arange(count), 6)
+
+
+def price_grid(
+    inputs: RIMInputs,
+    coe_pct: Sequence[float],
+    growth_pct: Sequence[float],
+    rote_shift_pct: Sequence[float],
+) -> np.ndarray:
+    """RIM value over a (COE × growth × ROTE-shift) cube.
+
+    The ROTE shift moves the explicit path and the terminal ROTE in parallel.
+    """
+    coe = np.asarray(coe_pct, dtype=float)[:, None, None] / 100.0
+    growth = np.asarray(growth_pct, dtype=float)[None, :, None] / 100.0
+    shift = np.asarray(rote_shift_pct, dtype=float)[None, None, :] / 100.0
+    result = rim_value(
+        inputs.book_value,
+        coe,
+        growth,
+        inputs.rote_path + shift[..., None],
+        inputs.terminal_rote + shift,
+        inputs.payout_ratio,
+    )
+    return result["value"]
+
+
+def _truncated_normal(rng: np.random.Generator, spec: Tuple[float, float, float, float], size: int) -> np.ndarray:
+    mean, std, low, high = spec
+    draws = rng.normal(mean, std, size)
+    # Resample out-of-bounds draws until every value sits inside the bounds.
+    bad = (draws < low) | (draws > high)
+    while bad.any():
+        draws[bad] = rng.normal(mean, std, int(bad.sum()))
+        bad = (draws < low) | (draws > high)
+    return draws
+
+
+def simulate(
+    inputs: RIMInputs,
+    runs: int = 10000,
+    seed: int = 0,
+    distributions: Dict[str, Tuple[float, float, float, float]] = MC_DISTRIBUTIONS,
+    spot_price: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Monte Carlo RIM values: all draws are priced in one kernel call."""
+    rng = np.random.default_rng(seed)
+    shift = _truncated_normal(rng, distributions["rote_shift_pct"], runs) / 100.0
+    coe = _truncated_normal(rng, distributions["coe_pct"], runs) / 100.0
+    growth = _truncated_normal(rng, distributions["terminal_growth_pct"], runs) / 100.0
+    values = rim_value(
+        inputs.book_value,
+        coe,
+        growth,
+        inputs.rote_path + shift[:, None],
+        inputs.terminal_rote + shift,
+        inputs.payout_ratio,
+    )["value"]
+    values = values[np.isfinite(values)]
+    percentiles = np.percentile(values, [5, 25, 50, 75, 95])
+    summary: Dict[str, Any] = {
+        "runs": int(values.size),
+        "seed": seed,
+        "mean": round(float(values.mean()), 2),
+        "std": round(float(values.std(ddof=1)), 2),
+        "percentiles": dict(zip(["p05", "p25", "p50", "p75", "p95"], np.round(percentiles, 2).tolist())),
+        "distributions": {name: list(spec) for name, spec in distributions.items()},
+    }
+    if spot_price:
+        summary["spot_price"] = spot_price
+        summary["prob_below_spot_pct"] = round(float((values < spot_price).mean() * 100), 1)
+    return summary
+
+
+def _money(value: float) -> str:
+    return f"${value:,.2f}" if value >= 0 else f"$-{abs(value):,.2f}"
+
+
+def _signed_money(value: float) -> str:
+    return f"{'+' if value >= 0 else '-'}${abs(value):.2f}"
+
+
+def _signed_bps(bps: float) -> str:
+    return f"{'+' if bps >= 0 else '-'} {abs(bps):.0f} bps"
+
+
+def _pct_change(value: float, base: float) -> str:
+    return f"{(value / base - 1) * 100:+.1f}%"
+
+
+def sensitivity_tables(inputs: RIMInputs) -> Dict[str, Any]:
+    """CATY_13 terminal-ROTE and COE sensitivity rows (plus their insight lines), priced in one call each."""
+    base = rim_value(inputs.book_value, inputs.coe, inputs.terminal_growth, inputs.rote_path, inputs.terminal_rote, inputs.payout_ratio)
+    base_value = float(base["value"])
+
+    rote_steps = np.array([-0.01, 0.0, 0.01])
+    terminal = rim_value(
+        inputs.book_value, inputs.coe, inputs.terminal_growth, inputs.rote_path, inputs.terminal_rote + rote_steps, inputs.payout_ratio
+    )
+    coe_steps = np.array([-0.005, 0.0, 0.005])
+    coe = rim_value(
+        inputs.book_value, inputs.coe + coe_steps, inputs.terminal_growth, inputs.rote_path, inputs.terminal_rote, inputs.payout_ratio
+    )
+
+    terminal_rows = []
+    for idx, step in enumerate(rote_steps):
+        rote_pct = (inputs.terminal_rote + step) * 100
+        spread_bps = (inputs.terminal_rote + step - inputs.coe) * 10000
+        value = float(terminal["value"][idx])
+        is_base = step == 0
+        row = {
+            "label": f"{rote_pct:.2f}% (Base)" if is_base else f"{rote_pct:.2f}% (COE {_signed_bps(spread_bps)})",
+            "terminal_ri": f"${float(terminal['terminal_ri'][idx]):.3f}",
+            "tv_pv": _money(float(terminal["pv_terminal"][idx])),
+            "total_rim": _money(value),
+            "vs_base": "Base" if is_base else _pct_change(value, base_value),
+        }
+        terminal_rows.append(_emphasize(row) if is_base else row)
+
+    coe_rows = []
+    for idx, step in enumerate(coe_steps):
+        coe_pct = (inputs.coe + step) * 100
+        value = float(coe["value"][idx])
+        is_base = step == 0
+        label = f"{coe_pct:.3f}% (Base)" if is_base else f"{coe_pct:.3f}% (Base {_signed_bps(step * 10000)})"
+        row = {
+            "label": label,
+            "pv_explicit": _money(float(coe["pv_explicit"][idx])),
+            "tv_pv": _money(float(coe["pv_terminal"][idx])),
+            "total_rim": _money(value),
+            "vs_base": "Base" if is_base else _pct_change(value, base_value),
+        }
+        coe_rows.append(_emphasize(row) if is_base else row)
+
+    rote_up = float(terminal["value"][2]) - base_value
+    coe_down = float(coe["value"][0]) - base_value
+    narratives = {
+        "terminal_rote_insight_html": (
+            "<p><strong>Key Insight:</strong> <strong>Terminal ROTE drives valuation</strong>. "
+            f"+100 bps terminal ROTE \u2192 {_signed_money(rote_up)}/share ({_pct_change(base_value + rote_up, base_value)}).</p>"
+        ),
+        "coe_insight_html": (
+            "<p><strong>Key Insight:</strong> <strong>COE sensitivity</strong>. "
+            f"-50 bps COE \u2192 {_signed_money(coe_down)}/share ({_pct_change(base_value + coe_down, base_value)}).</p>"
+        ),
+    }
+    return {"terminal_rote": terminal_rows, "coe_sensitivity": coe_rows, "narratives": narratives}
+
+
+def _emphasize(row: Dict[str, str]) -> Dict[str, str]:
+    emphasized = {key: f"<strong>{value}</strong>" for key, value in row.items()}
+    emphasized["row_class"] = "base-case"
+    return emphasized
+
+
+def build_grid_payload(inputs: RIMInputs, runs: int, seed: int, spot_price: Optional[float]) -> Dict[str, Any]:
+    coe_axis = axis(COE_GRID_PCT)
+    growth_axis = axis(GROWTH_GRID_PCT)
+    shift_axis = axis(ROTE_SHIFT_GRID_PCT)
+    cube = price_grid(inputs, coe_axis, growth_axis, shift_axis)
+    base_growth = int(np.argmin(np.abs(growth_axis - inputs.terminal_growth * 100)))
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "source": str(RIM_DATA_PATH.relative_to(ROOT)),
+        "base": {
+            "rim_value": rim_target(inputs),
+            "ddm_value": ddm_target(inputs),
+            "book_value": inputs.book_value,
+            "coe_pct": round(inputs.coe * 100, 3),
+            "terminal_growth_pct": round(inputs.terminal_growth * 100, 3),
+            "rote_path_pct": np.round(inputs.rote_path * 100, 3).tolist(),
+            "terminal_rote_pct": round(inputs.terminal_rote * 100, 3),
+            "payout_ratio": inputs.payout_ratio,
+        },
+        "axes": {
+            "coe_pct": coe_axis.tolist(),
+            "terminal_growth_pct": growth_axis.tolist(),
+            "rote_shift_pct": shift_axis.tolist(),
+        },
+        "shape": list(cube.shape),
+        "layout": "row-major flattening of [coe_pct][terminal_growth_pct][rote_shift_pct]; null where COE <= g",
+        "values": [None if np.isnan(v) else v for v in np.round(cube, 2).ravel().tolist()],
+        "heatmap": {
+            "rows": "coe_pct",
+            "columns": "rote_shift_pct",
+            "terminal_growth_pct": float(growth_axis[base_growth]),
+            "values": [[None if np.isnan(v) else v for v in row] for row in np.round(cube[:, base_growth, :], 2).tolist()],
+        },
+        "monte_carlo": simulate(inputs, runs=runs, seed=seed, spot_price=spot_price),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Residual-income valuation kernel")
+    parser.add_argument("--runs", type=int, default=10000, help="Monte Carlo draws")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    payload = load_json(RIM_DATA_PATH)
+    inputs = load_inputs()
+    spot = payload.get("valuation_summary", {}).get("spot_price")
+
+    sensitivity = sensitivity_tables(inputs)
+    payload.setdefault("narratives", {}).update(sensitivity.pop("narratives"))
+    payload.setdefault("tables", {}).update(sensitivity)
+    write_json(RIM_DATA_PATH, payload, sort_keys=False)
+
+    grid = build_grid_payload(inputs, args.runs, args.seed, spot)
+    write_text(GRID_OUTPUT_PATH, json.dumps(grid, separators=(",", ":")))
+
+    print(f"RIM value: ${grid['base']['rim_value']:.2f} | DDM value: ${grid['base']['ddm_value']:.2f}")
+    print(f"Grid: {'×'.join(map(str, grid['shape']))} valuations → {GRID_OUTPUT_PATH.relative_to(ROOT)}")
+    mc = grid["monte_carlo"]
+    print(f"Monte Carlo ({mc['runs']} runs): median ${mc['percentiles']['p50']:.2f}, mean ${mc['mean']:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
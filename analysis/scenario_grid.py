@@ -0,0 +1,418 @@
+"""
+Vectorized rate × credit × deposit-beta scenario engine.
+
+The deposit-rate bridge (Fed move → deposit cost → NIM → EPS/TBV) and the
+credit overlay (NCO → incremental provision → EPS/TBV) are written here as
+array functions, so a single call evaluates any number of scenarios. Inputs
+broadcast against each other: pass a 1-D Fed axis, a 1-D NCO axis and a 1-D
+beta-shock axis through ``mesh`` and every output is a (fed × nco × shock)
+cube.
+
+``build_grid`` evaluates dense grids for the sensitivity pages/heatmaps and
+integrates probability-weighted expectations and quantiles over the
+FedWatch rate distribution and the credit-mix distribution, evaluated
+exactly at each distribution's support points (no interpolation between
+grid nodes).
+
+The scenario scripts (build_deposit_rate_scenarios.py, build_credit_stress.py,
+build_probabilistic_scenarios.py) evaluate their published scenario lists with
+the same kernels.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from analysis.data_io import load_json
+
+ROOT = Path(__file__).resolve().parents[1]
+DEPOSIT_HISTORY_PATH = ROOT / "data" / "deposit_beta_history.json"
+DEPOSIT_REGRESSIONS_PATH = ROOT / "analysis" / "deposit_beta_regressions.json"
+SENSITIVITIES_PATH = ROOT / "analysis" / "sensitivities.json"
+NIM_META_PATH = ROOT / "data" / "caty05_calculated_tables.json"
+
+# Asset-yield pass-through assumption (delta asset yield / delta Fed funds).
+# Calibrated from 2023-2025 NIM disclosures where asset yields lagged Fed moves
+# by ~35% on average.
+ASSET_BETA = 0.35
+
+# Anchor to Q3 2025 interest-bearing deposit cost disclosed in the 8-K (3.28%).
+Q3_IB_COST_PCT = 3.28
+
+BASE_LOAN_BALANCE = 20.10e9  # Q3 2025 gross loans, USD
+BASE_PROVISION_M = 28.7  # Q3 provision, USD millions
+BASE_NCO_BPS = 18.1  # LTM NCO from 8-K
+
+# Dense grid defaults: every 5 bps of Fed change and NCO, ±20 pts of deposit beta
+# in 10-pt steps.
+FED_GRID_BPS = (-150.0, 100.0, 5.0)
+NCO_GRID_BPS = (0.0, 200.0, 5.0)
+BETA_SHOCK_GRID = (-0.20, 0.20, 0.10)
+QUANTILES = (0.05, 0.25, 0.50, 0.75, 0.95)
+# Quarterly EPS is annual / 4, so only these are stored per grid cell.
+GRID_METRICS = ("annual_eps", "tbvps", "implied_price_avg")
+
+
+@dataclass(frozen=True)
+class Fundamentals:
+    """Per-share bridge inputs from ``analysis/sensitivities.json``."""
+
+    avg_interest_earning_assets: float
+    shares_out: float
+    tax_rate: float
+    quarterly_eps: float
+    tbvps: float
+    payout_ratio: float
+    non_interest_items_eps: float
+
+
+@dataclass(frozen=True)
+class RateModel:
+    """Interest-bearing deposit book and NIM anchors for the rate bridge."""
+
+    codes: Tuple[str, ...]
+    balances: np.ndarray  # dollars, per product
+    base_rates_pct: np.ndarray
+    betas: np.ndarray
+    dda_balance: float
+    base_ib_cost_pct: float
+    base_nim_pct: float
+    base_asset_yield_pct: float
+    base_funding_cost_pct: float
+    base_fed_funds_pct: float
+    asset_beta: float
+    fundamentals: Fundamentals
+
+    @property
+    def total_ib_balance(self) -> float:
+        return float(self.balances.sum())
+
+
+@dataclass(frozen=True)
+class CreditModel:
+    """Loan book and provision anchors for the credit overlay."""
+
+    loan_balance: float
+    base_nco_bps: float
+    base_provision_m: float
+    fundamentals: Fundamentals
+
+
+def load_fundamentals(path: Path = SENSITIVITIES_PATH) -> Fundamentals:
+    base = load_json(path)["base"]
+    return Fundamentals(
+        avg_interest_earning_assets=float(base["avg_interest_earning_assets"]),
+        shares_out=float(base["shares_out"]),
+        tax_rate=float(base["tax_rate"]),
+        quarterly_eps=float(base["quarterly_eps"]),
+        tbvps=float(base["tbvps"]),
+        payout_ratio=float(base["payout_ratio"]),
+        non_interest_items_eps=float(base["non_interest_items_eps"]),
+    )
+
+
+def load_rate_model(asset_beta: float = ASSET_BETA) -> RateModel:
+    """Latest deposit mix, regression betas and NIM anchors as a ``RateModel``."""
+    history = load_json(DEPOSIT_HISTORY_PATH)
+    quarters: List[Dict] = history["quarters"]
+    if not quarters:
+        raise RuntimeError("Deposit history dataset is empty")
+    latest_metrics = quarters[-1]["metrics"]
+    regressions_payload = load_json(DEPOSIT_REGRESSIONS_PATH)
+    regressions = regressions_payload["regressions"]
+
+    base_ib_rate_pct = latest_metrics["total_interest_bearing"]["avg_rate_pct"]
+    dda_balance = latest_metrics.get("noninterest_demand", {}).get("avg_balance_thousands", 0.0) * 1000.0
+    shift = base_ib_rate_pct - Q3_IB_COST_PCT
+
+    key_map = {
+        "time_deposits": "time_deposits",
+        "money_market": "money_market",
+        "savings": "savings",
+        "interest_bearing_demand": "ib_demand",
+    }
+    codes, balances, rates, betas = [], [], [], []
+    for metrics_key, beta_key in key_map.items():
+        metrics = latest_metrics[metrics_key]
+        codes.append(beta_key)
+        balances.append(metrics["avg_balance_thousands"] * 1000.0)
+        rates.append(max(metrics["avg_rate_pct"] - shift, 0.0))
+        betas.append(regressions[beta_key]["beta"])
+
+    nim_meta = load_json(NIM_META_PATH).get("nim_recent", {})
+    return RateModel(
+        codes=tuple(codes),
+        balances=np.array(balances, dtype=float),
+        base_rates_pct=np.array(rates, dtype=float),
+        betas=np.array(betas, dtype=float),
+        dda_balance=float(dda_balance),
+        base_ib_cost_pct=Q3_IB_COST_PCT,
+        base_nim_pct=nim_meta.get("net_interest_margin_pct", 3.31),
+        base_asset_yield_pct=nim_meta.get("asset_yield_pct", 5.84),
+        base_funding_cost_pct=nim_meta.get("funding_cost_pct", 3.32),
+        base_fed_funds_pct=regressions_payload["fed_funds_avg"][-1],
+        asset_beta=asset_beta,
+        fundamentals=load_fundamentals(),
+    )
+
+
+def load_credit_model() -> CreditModel:
+    return CreditModel(
+        loan_balance=BASE_LOAN_BALANCE,
+        base_nco_bps=BASE_NCO_BPS,
+        base_provision_m=BASE_PROVISION_M,
+        fundamentals=load_fundamentals(),
+    )
+
+
+def eps_from_nim(fund: Fundamentals, nim_pct):
+    nii = fund.avg_interest_earning_assets * (np.asarray(nim_pct) / 100.0) / 4.0
+    return (nii * (1 - fund.tax_rate)) / fund.shares_out + fund.non_interest_items_eps
+
+
+def tbv_from_eps(fund: Fundamentals, eps):
+    """TBVPS after retaining ``eps`` instead of the baseline quarter's EPS."""
+    payout = fund.payout_ratio
+    return fund.tbvps + (np.asarray(eps) * (1 - payout) - fund.quarterly_eps * (1 - payout))
+
+
+def rate_leg(model: RateModel, fed_change_bps, beta_shock=0.0) -> Dict[str, np.ndarray]:
+    """Deposit cost, NIM, NII and EPS/TBV for each Fed move (and beta shock).
+
+    ``fed_change_bps`` and ``beta_shock`` broadcast against each other; the
+    shock is added to every product's deposit beta.
+    """
+    delta_pct = np.asarray(fed_change_bps, dtype=float) / 100.0
+    shock = np.asarray(beta_shock, dtype=float)
+    delta_pct, shock = np.broadcast_arrays(delta_pct, shock)
+    weights = model.balances / model.total_ib_balance
+
+    product_rates = np.maximum(
+        model.base_rates_pct + (model.betas + shock[..., None]) * delta_pct[..., None],
+        0.0,
+    )
+    deposit_cost_pct = product_rates @ weights
+    asset_yield_pct = model.base_asset_yield_pct + model.asset_beta * delta_pct
+    nim_pct = model.base_nim_pct + (asset_yield_pct - model.base_asset_yield_pct) - (
+        deposit_cost_pct - model.base_ib_cost_pct
+    )
+    fund = model.fundamentals
+    eps = eps_from_nim(fund, nim_pct)
+    nii_m = fund.avg_interest_earning_assets * (nim_pct / 100.0) / 4.0 / 1e6
+    base_nii_m = fund.avg_interest_earning_assets * (model.base_nim_pct / 100.0) / 4.0 / 1e6
+    return {
+        "fed_target_pct": model.base_fed_funds_pct + delta_pct,
+        "product_rates_pct": product_rates,
+        "deposit_cost_pct": deposit_cost_pct,
+        "all_in_deposit_cost_pct": deposit_cost_pct * model.total_ib_balance / (model.total_ib_balance + model.dda_balance),
+        "asset_yield_pct": asset_yield_pct,
+        "nim_pct": nim_pct,
+        "quarterly_eps": eps,
+        "tbvps": tbv_from_eps(fund, eps),
+        "net_interest_income_m": nii_m,
+        "nii_delta_m": nii_m - base_nii_m,
+        "interest_expense_delta_m": model.total_ib_balance * (deposit_cost_pct - model.base_ib_cost_pct) / 100.0 / 4.0 / 1e6,
+    }
+
+
+def credit_leg(model: CreditModel, nco_bps) -> Dict[str, np.ndarray]:
+    """Incremental provision and EPS/TBV hit for each NCO assumption."""
+    nco = np.asarray(nco_bps, dtype=float)
+    incremental_bps = np.maximum(nco - model.base_nco_bps, 0.0)
+    incremental_provision_m = (incremental_bps / 10000.0) * model.loan_balance / 4.0 / 1e6
+    fund = model.fundamentals
+    eps_hit = incremental_provision_m * 1e6 * (1 - fund.tax_rate) / fund.shares_out
+    eps = fund.quarterly_eps - eps_hit
+    return {
+        "incremental_bps": incremental_bps,
+        "incremental_provision_m": incremental_provision_m,
+        "provision_m": model.base_provision_m + incremental_provision_m,
+        "eps_hit": eps_hit,
+        "quarterly_eps": eps,
+        "tbvps": tbv_from_eps(fund, eps),
+    }
+
+
+def combine(
+    rate_eps,
+    rate_tbvps,
+    credit_eps,
+    credit_tbvps,
+    current_price: float,
+    base_quarterly_eps: float,
+    base_tbv: float,
+) -> Dict[str, np.ndarray]:
+    """Overlay credit deltas on rate outcomes and price them at current multiples."""
+    current_pe = current_price / (base_quarterly_eps * 4.0)
+    current_ptbv = current_price / base_tbv
+    quarterly_eps = np.asarray(rate_eps) + (np.asarray(credit_eps) - base_quarterly_eps)
+    tbvps = np.asarray(rate_tbvps) + (np.asarray(credit_tbvps) - base_tbv)
+    annual_eps = quarterly_eps * 4.0
+    price_pe = annual_eps * current_pe
+    price_ptbv = tbvps * current_ptbv
+    return {
+        "quarterly_eps": quarterly_eps,
+        "annual_eps": annual_eps,
+        "tbvps": tbvps,
+        "implied_price_pe": price_pe,
+        "implied_price_ptbv": price_ptbv,
+        "implied_price_avg": (price_pe + price_ptbv) / 2.0,
+    }
+
+
+def mesh(fed_change_bps, nco_bps, beta_shock) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Broadcastable (fed × nco × shock) views of three 1-D axes."""
+    fed = np.asarray(fed_change_bps, dtype=float)[:, None, None]
+    nco = np.asarray(nco_bps, dtype=float)[None, :, None]
+    shock = np.asarray(beta_shock, dtype=float)[None, None, :]
+    return fed, nco, shock
+
+
+def evaluate(
+    rate_model: RateModel,
+    credit_model: CreditModel,
+    fed_change_bps,
+    nco_bps,
+    beta_shock,
+    current_price: float,
+) -> Dict[str, np.ndarray]:
+    """EPS, TBVPS and implied prices on the (fed × nco × shock) cube."""
+    fed, nco, shock = mesh(fed_change_bps, nco_bps, beta_shock)
+    rate = rate_leg(rate_model, fed, shock)  # (F, 1, S)
+    credit = credit_leg(credit_model, nco)  # (1, N, 1)
+    fund = rate_model.fundamentals
+    return combine(
+        rate["quarterly_eps"],
+        rate["tbvps"],
+        credit["quarterly_eps"],
+        credit["tbvps"],
+        current_price,
+        fund.quarterly_eps,
+        fund.tbvps,
+    )
+
+
+def axis(spec: Tuple[float, float, float]) -> np.ndarray:
+    """Inclusive ``(start, stop, step)`` axis, rounded to kill float drift."""
+    start, stop, step = spec
+    count = int(round((stop - start) / step)) + 1
+    return np.round(start + step * np.arange(count), 6)
+
+
+def weighted_quantiles(values: np.ndarray, weights: np.ndarray, quantiles: Sequence[float]) -> np.ndarray:
+    """Inverse of the weighted empirical CDF (smallest value with CDF ≥ q)."""
+    flat_values = np.asarray(values, dtype=float).ravel()
+    flat_weights = np.broadcast_to(np.asarray(weights, dtype=float), np.shape(values)).ravel()
+    order = np.argsort(flat_values, kind="stable")
+    cdf = np.cumsum(flat_weights[order])
+    cdf /= cdf[-1]
+    idx = np.searchsorted(cdf, np.asarray(quantiles, dtype=float) - 1e-12, side="left")
+    return flat_values[order][np.minimum(idx, len(cdf) - 1)]
+
+
+def _distribution(probabilities: Mapping[float, float]) -> Tuple[np.ndarray, np.ndarray]:
+    points = np.array(sorted(probabilities), dtype=float)
+    weights = np.array([probabilities[key] for key in sorted(probabilities)], dtype=float)
+    total = weights.sum()
+    if total <= 0:
+        raise ValueError("Scenario probabilities must sum to a positive value")
+    return points, weights / total
+
+
+def _rounded(values: np.ndarray, digits: int) -> List:
+    return np.round(values, digits).tolist()
+
+
+def build_grid(
+    rate_model: RateModel,
+    credit_model: CreditModel,
+    current_price: float,
+    rate_probabilities: Mapping[float, float],
+    credit_probabilities: Mapping[float, float],
+    shock_probabilities: Optional[Mapping[float, float]] = None,
+    fed_axis: Optional[np.ndarray] = None,
+    nco_axis: Optional[np.ndarray] = None,
+    shock_axis: Optional[np.ndarray] = None,
+    quantiles: Sequence[float] = QUANTILES,
+) -> Dict:
+    """Dense scenario grid plus probability-weighted summaries.
+
+    ``rate_probabilities`` maps Fed change (bps) → probability (FedWatch),
+    ``credit_probabilities`` maps NCO (bps) → probability and
+    ``shock_probabilities`` maps deposit-beta shock → probability (defaults
+    to the regression betas, i.e. ``{0.0: 1.0}``). Distributions are treated
+    as independent.
+    """
+    fed_axis = axis(FED_GRID_BPS) if fed_axis is None else np.asarray(fed_axis, dtype=float)
+    nco_axis = axis(NCO_GRID_BPS) if nco_axis is None else np.asarray(nco_axis, dtype=float)
+    shock_axis = axis(BETA_SHOCK_GRID) if shock_axis is None else np.asarray(shock_axis, dtype=float)
+    shock_probabilities = shock_probabilities or {0.0: 1.0}
+
+    grid = evaluate(rate_model, credit_model, fed_axis, nco_axis, shock_axis, current_price)
+
+    fed_pts, fed_w = _distribution(rate_probabilities)
+    nco_pts, nco_w = _distribution(credit_probabilities)
+    shock_pts, shock_w = _distribution(shock_probabilities)
+    joint = fed_w[:, None, None] * nco_w[None, :, None] * shock_w[None, None, :]
+    support = evaluate(rate_model, credit_model, fed_pts, nco_pts, shock_pts, current_price)
+
+    # Conditional expectations along each grid axis, integrating the other two
+    # dimensions over their distributions.
+    by_fed = evaluate(rate_model, credit_model, fed_axis, nco_pts, shock_pts, current_price)
+    by_nco = evaluate(rate_model, credit_model, fed_pts, nco_axis, shock_pts, current_price)
+    by_shock = evaluate(rate_model, credit_model, fed_pts, nco_pts, shock_axis, current_price)
+
+    metrics = ("quarterly_eps", "annual_eps", "tbvps", "implied_price_avg")
+    digits = {"quarterly_eps": 4, "annual_eps": 3, "tbvps": 2, "implied_price_avg": 2}
+    expected = {name: round(float((support[name] * joint).sum()), digits[name]) for name in metrics}
+    quantile_table = {
+        name: dict(
+            zip(
+                [f"p{int(round(q * 100)):02d}" for q in quantiles],
+                _rounded(weighted_quantiles(support[name], joint, quantiles), digits[name]),
+            )
+        )
+        for name in metrics
+    }
+    conditional = {
+        "by_fed_change": {
+            name: _rounded(np.einsum("fns,n,s->f", by_fed[name], nco_w, shock_w), digits[name]) for name in metrics
+        },
+        "by_nco": {
+            name: _rounded(np.einsum("fns,f,s->n", by_nco[name], fed_w, shock_w), digits[name]) for name in metrics
+        },
+        "by_beta_shock": {
+            name: _rounded(np.einsum("fns,f,n->s", by_shock[name], fed_w, nco_w), digits[name]) for name in metrics
+        },
+    }
+
+    zero_shock = int(np.argmin(np.abs(shock_axis)))
+    return {
+        "axes": {
+            "fed_change_bps": fed_axis.tolist(),
+            "nco_bps": nco_axis.tolist(),
+            "beta_shock": shock_axis.tolist(),
+        },
+        "shape": [len(fed_axis), len(nco_axis), len(shock_axis)],
+        "layout": "row-major flattening of [fed_change_bps][nco_bps][beta_shock]",
+        "values": {name: _rounded(grid[name].ravel(), digits[name]) for name in GRID_METRICS},
+        "heatmap": {
+            "rows": "fed_change_bps",
+            "columns": "nco_bps",
+            "beta_shock": float(shock_axis[zero_shock]),
+            "implied_price_avg": _rounded(grid["implied_price_avg"][:, :, zero_shock], 2),
+            "annual_eps": _rounded(grid["annual_eps"][:, :, zero_shock], 3),
+        },
+        "distributions": {
+            "fed_change_bps": dict(zip(map(float, fed_pts), _rounded(fed_w, 4))),
+            "nco_bps": dict(zip(map(float, nco_pts), _rounded(nco_w, 4))),
+            "beta_shock": dict(zip(map(float, shock_pts), _rounded(shock_w, 4))),
+        },
+        "expected": expected,
+        "quantiles": quantile_table,
+        "conditional_expected": conditional,
+    }
@@ -0,0 +1,113 @@
+"""Tests for the rolling multi-benchmark CAPM beta engine."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from analysis import beta_engine  # noqa: E402
+from analysis.regression import rolling_ols  # noqa: E402
+
+
+def synthetic_returns(weeks=120, seed=3):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2022-01-03", periods=weeks, freq="W-MON")
+    market = rng.normal(0.002, 0.02, weeks)
+    sector = 0.8 * market + rng.normal(0, 0.01, weeks)
+    frame = pd.DataFrame(
+        {
+            "^GSPC": market,
+            "KRE": sector,
+            "CATY": 1.2 * market + rng.normal(0, 0.015, weeks),
+            "EWBC": 0.9 * sector + rng.normal(0, 0.015, weeks),
+        },
+        index=dates,
+    )
+    return frame
+
+
+def test_rolling_betas_match_rolling_ols():
+    returns = synthetic_returns()
+    assets, benchmarks = ["CATY", "EWBC"], ["^GSPC", "KRE"]
+    result = beta_engine.rolling_betas(returns, assets, benchmarks, windows=[52])[52]
+    assert result["beta"].shape == (len(returns), 2, 2)
+    assert np.isnan(result["beta"][:51]).all()
+    for a_idx, asset in enumerate(assets):
+        for b_idx, bench in enumerate(benchmarks):
+            fit = rolling_ols(returns[bench].to_numpy(), returns[asset].to_numpy(), 52)
+            assert np.allclose(result["beta"][51:, a_idx, b_idx], fit.slope)
+            assert np.allclose(result["r2"][51:, a_idx, b_idx], fit.r2)
+
+
+def test_rolling_betas_require_complete_windows():
+    returns = synthetic_returns(weeks=60)
+    returns.iloc[55, returns.columns.get_loc("CATY")] = np.nan
+    beta = beta_engine.rolling_betas(returns, ["CATY", "EWBC"], ["^GSPC"], windows=[52])[52]["beta"]
+    # Every CATY window containing the gap is withheld; EWBC is unaffected.
+    assert np.isnan(beta[55:, 0, 0]).all()
+    assert not np.isnan(beta[51:55, 0, 0]).any()
+    assert not np.isnan(beta[51:, 1, 0]).any()
+
+
+def test_payload_feeds_coe_from_latest_beta():
+    returns = synthetic_returns()
+    payload = beta_engine.build_payload(returns, ["CATY", "EWBC"], ["^GSPC"], windows=[52, 104], rf=0.04, erp=0.05)
+    latest = payload["latest"]["52w"]["^GSPC"]["CATY"]
+    assert latest["as_of"] == payload["dates"][-1]
+    feed = payload["coe_feed"]["by_window"]["52w"]["^GSPC"]
+    assert feed["capm_coe_pct"] == pytest.approx((0.04 + latest["beta"] * 0.05) * 100, abs=1e-3)
+    # 104 weeks fit inside 120 observations; 260 would not.
+    assert "104w" in payload["coe_feed"]["by_window"]
+    assert payload["series"]["52w"]["^GSPC"]["EWBC"]["beta"][0] is None
+
+
+def test_seed_and_incremental_refresh(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    from analysis.timeseries_store import TimeSeriesStore
+
+    seed = tmp_path / "returns.csv"
+    pd.DataFrame(
+        {
+            "Date": ["2025-09-22", "2025-09-29", "2025-10-06"],
+            "CATY": [0.01, -0.02, 0.03],
+            "SP500": [0.005, -0.01, 0.02],
+        }
+    ).to_csv(seed, index=False)
+    store = TimeSeriesStore(tmp_path / "store")
+    assert beta_engine.seed_from_csv(store, seed) == 6
+    assert beta_engine.seed_from_csv(store, seed) == 0
+
+    requested = {}
+
+    def fake_download(tickers, start):
+        requested["start"] = start
+        dates = pd.to_datetime(["2025-09-29", "2025-10-06", "2025-10-13"])
+        return pd.DataFrame({"CATY": [100.0, 103.0, 101.0], "^GSPC": [50.0, 51.0, 52.0]}, index=dates)
+
+    monkeypatch.setattr(beta_engine, "_download_weekly_closes", fake_download)
+    added = beta_engine.refresh(store, ["CATY", "^GSPC"])
+    assert requested["start"] == "2025-09-22"
+    assert added == 2  # only 2025-10-13 is new for each ticker
+    returns = beta_engine.load_returns(store, ["CATY", "^GSPC"])
+    assert returns.loc["2025-10-13", "CATY"] == pytest.approx(101.0 / 103.0 - 1)
+    assert returns.loc["2025-10-06", "CATY"] == pytest.approx(0.03)
+
+    def revised_download(tickers, start):
+        dates = pd.to_datetime(["2025-10-06", "2025-10-13"])
+        return pd.DataFrame({"CATY": [103.0, 99.0], "^GSPC": [51.0, 52.0]}, index=dates)
+
+    # 2025-10-13 was cached mid-week; the completed week overwrites it.
+    monkeypatch.setattr(beta_engine, "_download_weekly_closes", revised_download)
+    assert beta_engine.refresh(store, ["CATY", "^GSPC"]) == 1
+    returns = beta_engine.load_returns(store, ["CATY", "^GSPC"])
+    assert returns.loc["2025-10-13", "CATY"] == pytest.approx(99.0 / 103.0 - 1)
+
+    def failing_download(tickers, start):
+        raise OSError("offline")
+
+    monkeypatch.setattr(beta_engine, "_download_weekly_closes", failing_download)
+    assert beta_engine.refresh(store, ["CATY", "^GSPC"]) == 0
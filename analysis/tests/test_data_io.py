@@ -0,0 +1,95 @@
+"""Tests for the shared memoized JSON data-access layer."""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from analysis import data_io  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _clear_memo():
+    data_io.invalidate()
+    yield
+    data_io.invalidate()
+
+
+def test_load_is_memoized_until_the_file_changes(tmp_path):
+    path = tmp_path / "doc.json"
+    path.write_text('{"value": 1}', encoding="utf-8")
+
+    before = data_io.memo_stats()
+    assert data_io.load_json(path) == {"value": 1}
+    assert data_io.load_json(path) == {"value": 1}
+    after = data_io.memo_stats()
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
+
+    path.write_text('{"value": 22}', encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert data_io.load_json(path) == {"value": 22}
+
+
+def test_callers_get_fresh_copies_unless_shared(tmp_path, monkeypatch):
+    path = tmp_path / "doc.json"
+    path.write_text('{"items": [1, 2]}', encoding="utf-8")
+    parses = []
+    real_parse = data_io.parse
+    monkeypatch.setattr(data_io, "parse", lambda raw: parses.append(raw) or real_parse(raw))
+
+    first = data_io.load_json(path)
+    first["items"].append(3)
+    assert data_io.load_json(path) == {"items": [1, 2]}
+    assert data_io.load_json(path, shared=True) is data_io.load_json(path, shared=True)
+    assert len(parses) == 1
+
+
+def test_missing_files_raise_unless_defaulted(tmp_path):
+    missing = tmp_path / "absent.json"
+    assert data_io.load_json(missing, {}) == {}
+    with pytest.raises(FileNotFoundError, match="Required data file missing"):
+        data_io.load_json(missing)
+
+
+def test_non_finite_literals_fall_back_to_stdlib(tmp_path):
+    path = tmp_path / "doc.json"
+    path.write_text('{"beta": NaN}', encoding="utf-8")
+    value = data_io.load_json(path)["beta"]
+    assert value != value
+
+
+def test_write_json_is_atomic_and_refreshes_the_memo(tmp_path):
+    path = tmp_path / "nested" / "out.json"
+    data_io.write_json(path, {"b": 1, "a": "é"})
+    assert path.read_text(encoding="utf-8") == '{\n  "a": "\\u00e9",\n  "b": 1\n}\n'
+    assert data_io.load_json(path) == {"a": "é", "b": 1}
+
+    data_io.write_json(path, {"b": 2, "a": 1}, sort_keys=False)
+    assert list(data_io.load_json(path)) == ["b", "a"]
+    assert [p.name for p in path.parent.iterdir()] == ["out.json"]
+
+
+def test_file_lock_serializes_read_modify_write(tmp_path):
+    path = tmp_path / "counter.json"
+    data_io.write_json(path, {"count": 0})
+
+    def bump():
+        with data_io.file_lock(tmp_path / ".lock"):
+            count = data_io.load_json(path)["count"]
+            time.sleep(0.01)
+            data_io.write_json(path, {"count": count + 1})
+
+    workers = [threading.Thread(target=bump) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert data_io.load_json(path) == {"count": 4}
+    assert sorted(p.name for p in tmp_path.iterdir()) == [".lock", "counter.json"]
@@ -0,0 +1,54 @@
+"""Tests for the inotify / polling directory watchers."""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from analysis.file_watch import InotifyWatcher, PollingWatcher, open_watcher  # noqa: E402
+
+
+def _exercise(watcher, tmp_path):
+    data = tmp_path / "market.json"
+    assert watcher.wait(timeout=0.05) == set()
+
+    data.write_text('{"price": 47.13}')
+    (tmp_path / "notes.txt").write_text("ignored suffix")
+    assert watcher.wait(timeout=2) == {data}
+
+    # Atomic tmp-file + rename swaps surface as the final name only.
+    tmp_file = tmp_path / ".market.json.tmp"
+    tmp_file.write_text('{"price": 48.00}')
+    os.replace(tmp_file, data)
+    assert watcher.wait(timeout=2) == {data}
+
+    data.unlink()
+    assert watcher.wait(timeout=2) == {data}
+
+
+def test_polling_watcher_reports_json_changes(tmp_path):
+    watcher = PollingWatcher([tmp_path], poll_interval=0.01, settle=0.01)
+    try:
+        _exercise(watcher, tmp_path)
+    finally:
+        watcher.close()
+
+
+def test_inotify_watcher_reports_json_changes(tmp_path):
+    try:
+        watcher = InotifyWatcher([tmp_path], settle=0.01)
+    except OSError:
+        pytest.skip("inotify unavailable on this platform")
+    try:
+        _exercise(watcher, tmp_path)
+    finally:
+        watcher.close()
+
+
+def test_open_watcher_falls_back_to_polling(tmp_path):
+    assert open_watcher([tmp_path], backend="poll").backend == "poll"
+    with pytest.raises(ValueError):
+        open_watcher([tmp_path], backend="fsevents")
@@ -0,0 +1,201 @@
+"""Tests for the record/replay/stub HTTP transport."""
+
+import gzip
+import json
+import sys
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+import pandas as pd
+import pytest
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from analysis import http_cassette  # noqa: E402
+from analysis.http_cassette import (  # noqa: E402
+    CassetteStore,
+    frame_to_payload,
+    install,
+    install_from_env,
+    make_stub_server,
+    payload_to_frame,
+    request_key,
+    uninstall,
+)
+
+
+class _Origin(BaseHTTPRequestHandler):
+    hits = 0
+
+    def do_GET(self):  # noqa: N802
+        type(self).hits += 1
+        body = gzip.compress(json.dumps({"path": self.path, "hits": type(self).hits}).encode())
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+@pytest.fixture
+def origin():
+    _Origin.hits = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Origin)
+    yield _serve(server)
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def _reset_transport():
+    yield
+    uninstall()
+
+
+def test_request_key_normalizes_host_port_and_query_order():
+    assert request_key("get", "HTTPS://Data.SEC.gov:443/api?b=2&a=1#frag") == "GET https://data.sec.gov/api?a=1&b=2"
+    assert request_key("GET", "http://localhost:8080") == "GET http://localhost:8080/"
+    with_body = request_key("POST", "https://api.fdic.gov/x", b'{"cert": 18503}')
+    assert with_body.startswith("POST https://api.fdic.gov/x body=")
+    assert with_body != request_key("POST", "https://api.fdic.gov/x", b'{"cert": 1}')
+
+
+def test_requests_record_then_replay_offline(origin, tmp_path):
+    install("record", tmp_path)
+    recorded = requests.get(f"{origin}/submissions?b=2&a=1", timeout=5)
+    assert recorded.json() == {"path": "/submissions?b=2&a=1", "hits": 1}
+    assert "Content-Encoding" not in recorded.headers
+
+    entry = json.loads(next(tmp_path.glob("127.0.0.1_*/*.json")).read_text())
+    assert entry["key"].endswith("/submissions?a=1&b=2")
+    assert "Content-Encoding" not in entry["headers"]
+
+    transport = install("replay", tmp_path)
+    replayed = requests.get(f"{origin}/submissions?a=1&b=2", timeout=5)
+    assert replayed.json() == recorded.json()
+    assert _Origin.hits == 1
+    assert transport.replayed == 1
+
+    with pytest.raises(requests.ConnectionError, match="no cassette"):
+        requests.Session().get(f"{origin}/missing", timeout=5)
+
+
+def test_httpx_sync_and_async_record_replay(origin, tmp_path):
+    import asyncio
+
+    install("record", tmp_path)
+    with httpx.Client() as client:
+        assert client.get(f"{origin}/ir").json()["hits"] == 1
+
+    async def fetch():
+        async with httpx.AsyncClient() as client:
+            return (await client.get(f"{origin}/ir/async")).json()
+
+    assert asyncio.run(fetch())["hits"] == 2
+
+    install("replay", tmp_path)
+    with httpx.Client() as client:
+        assert client.get(f"{origin}/ir").json()["hits"] == 1
+    assert asyncio.run(fetch())["hits"] == 2
+    with pytest.raises(httpx.ConnectError):
+        httpx.get(f"{origin}/unrecorded")
+    assert _Origin.hits == 2
+
+
+def test_urllib_record_replay(origin, tmp_path):
+    install("record", tmp_path)
+    with urllib.request.urlopen(f"{origin}/filings", timeout=5) as resp:
+        assert json.loads(gzip.decompress(resp.read()))["hits"] == 1
+
+    install("replay", tmp_path)
+    with urllib.request.urlopen(f"{origin}/filings", timeout=5) as resp:
+        assert json.loads(gzip.decompress(resp.read()))["hits"] == 1
+    assert _Origin.hits == 1
+
+
+def test_stub_server_serves_recorded_cassettes(origin, tmp_path):
+    install("record", tmp_path)
+    expected = requests.get(f"{origin}/companyfacts", timeout=5).json()
+
+    stub = make_stub_server(CassetteStore(tmp_path), port=0)
+    stub_url = _serve(stub)
+    try:
+        install_from_env(
+            {
+                http_cassette.MODE_ENV_VAR: "stub",
+                http_cassette.CASSETTE_ENV_VAR: str(tmp_path),
+                http_cassette.STUB_ENV_VAR: stub_url,
+            }
+        )
+        response = requests.get(f"{origin}/companyfacts", timeout=5)
+        assert response.json() == expected
+        assert response.url == f"{origin}/companyfacts"
+        assert httpx.get(f"{origin}/companyfacts").json() == expected
+        assert requests.get(f"{origin}/other", timeout=5).status_code == 404
+    finally:
+        stub.shutdown()
+        stub.server_close()
+    assert _Origin.hits == 1
+
+
+def test_install_from_env_reuses_transport_and_live_is_noop(tmp_path):
+    assert install_from_env({}) is None
+    env = {http_cassette.MODE_ENV_VAR: "replay", http_cassette.CASSETTE_ENV_VAR: str(tmp_path)}
+    first = install_from_env(env)
+    assert first is not None and first.offline
+    assert install_from_env(env) is first
+
+    uninstall()
+    assert http_cassette.active() is None
+    assert requests.adapters.HTTPAdapter.send.__name__ == "send"
+    assert "send" in vars(requests.adapters.HTTPAdapter)
+
+
+def test_frame_payload_round_trip_keeps_multiindex_and_timezone():
+    index = pd.DatetimeIndex(["2025-10-14", "2025-10-15"], name="Date").tz_localize("America/New_York")
+    columns = pd.MultiIndex.from_tuples([("Close", "CATY"), ("Close", "^GSPC")], names=["Price", "Ticker"])
+    frame = pd.DataFrame([[47.13, 6644.31], [float("nan"), 6671.06]], index=index, columns=columns)
+
+    restored = payload_to_frame(json.loads(json.dumps(frame_to_payload(frame))))
+    pd.testing.assert_frame_equal(restored, frame, check_freq=False)
+
+
+def test_yfinance_history_and_download_replay_from_cassettes(tmp_path):
+    yf = pytest.importorskip("yfinance")
+    index = pd.DatetimeIndex(["2025-10-16", "2025-10-17"], name="Date").tz_localize("America/New_York")
+    history = pd.DataFrame({"Close": [46.88, 47.13], "Volume": [512000.0, 498000.0]}, index=index)
+    store = CassetteStore(tmp_path)
+    body = json.dumps(frame_to_payload(history)).encode()
+    store.put(http_cassette._yfinance_key("history", ["CATY"], {"period": "5d"}), 200, {}, body)
+    weekly = history[["Close"]].rename(columns={"Close": "CATY"})
+    store.put(
+        http_cassette._yfinance_key("download", ["CATY"], {"start": "2025-01-01", "interval": "1wk"}),
+        200,
+        {},
+        json.dumps(frame_to_payload(weekly)).encode(),
+    )
+
+    install("replay", tmp_path)
+    replayed = yf.Ticker("caty").history(period="5d")
+    pd.testing.assert_frame_equal(replayed, history, check_freq=False)
+    downloaded = yf.download("CATY", start="2025-01-01", interval="1wk", progress=False)
+    assert downloaded["CATY"].iloc[-1] == 47.13
+    with pytest.raises(http_cassette.CassetteMiss):
+        yf.Ticker("EWBC").history(period="5d")
+
+    uninstall()
+    assert "history" not in vars(yf.Ticker)
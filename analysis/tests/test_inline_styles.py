@@ -0,0 +1,71 @@
+"""Tests for the single-pass inline-style rewriter."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from analysis.inline_styles import StyleRewriter, StyleRule, normalize_style, rewrite_documents  # noqa: E402
+
+RULES = [
+    StyleRule("color: var(--success);", "numeric-success"),
+    StyleRule("margin-top: 20px;", "table-margin-top", tag="table"),
+    StyleRule("border-left-color: var(--danger);", "border-left-danger", requires_class="source-box"),
+    StyleRule("font-size: 1.3em; color: var(--cathay-red);", "", requires_class="callout-title"),
+    StyleRule("display: block; padding: 20px;", "module-card", tag="a", prefix=True, keep_attrs=("href",)),
+]
+
+
+def test_normalize_style_ignores_spacing_and_trailing_semicolon():
+    assert normalize_style("COLOR:var(--info) ;  background : rgba(1,2,3,0.5);") == (
+        "color: var(--info); background: rgba(1, 2, 3, 0.5)"
+    )
+
+
+def test_rewrite_merges_classes_and_respects_scope():
+    rewriter = StyleRewriter(RULES)
+    html = (
+        '<td class="numeric" style="color: var(--success);">1</td>\n'
+        '<span style="color:var(--success)">2</span>\n'
+        '<table style="margin-top: 20px;"><div style="margin-top: 20px;">\n'
+        '<div class="source-box" style="border-left-color: var(--danger);">\n'
+        '<div class="box" style="border-left-color: var(--danger);">\n'
+        '<div class="callout-title" style="font-size: 1.3em; color: var(--cathay-red);">\n'
+        '<a href="CATY_01.html" style="display: block; padding: 20px; border-radius: 8px;" onmouseover="x()">\n'
+        "<script>el.innerHTML = '<b style=\"color: var(--success);\">';</script>\n"
+    )
+    converted, count = rewriter.rewrite(html)
+    assert count == 6
+    assert converted == (
+        '<td class="numeric numeric-success">1</td>\n'
+        '<span class="numeric-success">2</span>\n'
+        '<table class="table-margin-top"><div style="margin-top: 20px;">\n'
+        '<div class="source-box border-left-danger">\n'
+        '<div class="box" style="border-left-color: var(--danger);">\n'
+        '<div class="callout-title">\n'
+        '<a href="CATY_01.html" class="module-card">\n'
+        "<script>el.innerHTML = '<b style=\"color: var(--success);\">';</script>\n"
+    )
+    assert rewriter.rewrite(converted) == (converted, 0)
+
+
+def test_conflicting_rules_are_rejected():
+    with pytest.raises(ValueError):
+        StyleRewriter([StyleRule("color: red;", "a"), StyleRule("color:red", "b")])
+
+
+def test_rewrite_documents_dry_run_leaves_pages_untouched(tmp_path):
+    page = tmp_path / "CATY_99.html"
+    page.write_text('<p style="color: var(--success);">ok</p>\n')
+    rewriter = StyleRewriter(RULES)
+
+    [(path, count, diff)] = rewrite_documents([page], rewriter.rewrite, dry_run=True, jobs=1)
+    assert (path, count) == (page, 1)
+    assert '-<p style="color: var(--success);">ok</p>' in diff
+    assert '+<p class="numeric-success">ok</p>' in diff
+    assert page.read_text() == '<p style="color: var(--success);">ok</p>\n'
+
+    rewrite_documents([page], rewriter.rewrite, jobs=1)
+    assert page.read_text() == '<p class="numeric-success">ok</p>\n'
@@ -0,0 +1,71 @@
+"""Tests for the cached internal link / anchor checker."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from analysis.internal_link_checker import LinkGraph, github_slug, parse_markdown  # noqa: E402
+
+
+def test_markdown_anchors_follow_github_slugs():
+    text = (
+        "# Post-Mortem Analysis: Why It Failed\n"
+        "## Notes\n"
+        "```\n# not a heading\n```\n"
+        "## Notes\n"
+        '<a id="legacy-anchor"></a>\n'
+        "See [the table](other.md#totals).\n"
+    )
+    links, ids = parse_markdown(text)
+    assert links == ["other.md#totals"]
+    assert set(ids) == {"post-mortem-analysis-why-it-failed", "notes", "notes-1", "legacy-anchor"}
+    assert github_slug("Step 2 — `load_json()` & [cache](x.md)") == "step-2--load_json--cache"
+
+
+def test_link_graph_checks_targets_and_fragments(tmp_path):
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "guide.md").write_text("# Guide\n## Fetch Data\n")
+    (tmp_path / "report.pdf").write_bytes(b"%PDF")
+    page = tmp_path / "index.html"
+    page.write_text(
+        '<h2 id="summary">S</h2>'
+        '<a href="#summary">ok</a><a href="#missing">bad</a><a href="#">top</a>'
+        '<a href="docs/guide.md#fetch-data">ok</a><a href="docs/guide.md#install">bad</a>'
+        '<a href="report.pdf#page=3">ok</a><a href="gone.html">bad</a>'
+        '<a href="https://example.com/#x">external</a>'
+    )
+    graph = LinkGraph(tmp_path, cache_path=None, jobs=1)
+    broken = {(href, problem) for _src, href, _tgt, problem in graph.check([page])}
+    assert broken == {
+        ("#missing", "missing anchor #missing"),
+        ("docs/guide.md#install", "missing anchor #install"),
+        ("gone.html", "missing"),
+    }
+
+
+def test_cached_run_reparses_only_changed_content(tmp_path):
+    cache = tmp_path / "logs" / "cache.json"
+    pages = []
+    for index in range(3):
+        page = tmp_path / f"page{index}.html"
+        page.write_text(f'<a id="a{index}" href="page0.html#a0">x</a>')
+        pages.append(page)
+
+    graph = LinkGraph(tmp_path, cache_path=cache, jobs=1)
+    assert graph.check(pages) == []
+    graph.save()
+    assert graph.parsed == 3
+
+    # Warm run: signatures match, nothing is read.
+    warm = LinkGraph(tmp_path, cache_path=cache, jobs=1)
+    assert warm.check(pages) == []
+    assert warm.parsed == 0
+
+    # Same bytes rewritten (new mtime) hash-match; a real edit re-parses one file.
+    pages[1].write_text(pages[1].read_text())
+    pages[2].write_text('<a href="page0.html#nope">x</a>')
+    edited = LinkGraph(tmp_path, cache_path=cache, jobs=1)
+    broken = edited.check(pages)
+    assert edited.parsed == 1
+    assert [(src.name, problem) for src, _href, _tgt, problem in broken] == [("page2.html", "missing anchor #nope")]
@@ -0,0 +1,132 @@
+"""Tests for the vectorized SEC × FDIC merge engine."""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from analysis import merge_engine  # noqa: E402
+
+
+def _sec(ticker, snapshots):
+    return {
+        "ticker": ticker,
+        **{
+            key: {"period_end": period, "accession": f"{ticker}-{key}", "data": {tag: {"value": v} for tag, v in facts.items()}}
+            for key, (period, facts) in snapshots.items()
+        },
+    }
+
+
+SEC_CATY = _sec(
+    "CATY",
+    {
+        "q2_2025": (
+            "2025-06-30",
+            {
+                "InterestAndDividendIncomeOperating": 322_918_000,
+                "InterestIncomeExpenseNet": 181_221_000,
+                "NetIncomeLoss": 77_450_000,
+                "IncomeTaxExpenseBenefit": 18_828_000,
+                "StockholdersEquity": 2_886_295_000,
+                "Goodwill": 375_696_000,
+                "IntangibleAssetsNetExcludingGoodwill": 2_888_000,
+                "CommonStockSharesOutstanding": 69_343_395,
+                "Assets": 23_723_847_000,
+            },
+        ),
+        "fy2024": ("2024-12-31", {"InterestExpense": 660_920_000, "StockholdersEquity": 2_845_704_000}),
+    },
+)
+SEC_EWBC = _sec("EWBC", {"q2_2025": ("2025-06-30", {"Assets": 76_000_000_000, "StockholdersEquity": 0})})
+FDIC_CATY = {
+    "quarters": [
+        {"period": "20250630", "ASSET": 23_709_143, "EQTOT": 2_969_033, "ROA": 1.34},
+        {"period": "20241231", "EQTOT": 2_898_510},
+        {"period": "20240930", "EQTOT": 2_850_000},
+    ]
+}
+FDIC_EWBC = {"ticker": "EWBC", "quarters": [{"period": "20250630", "ASSET": 75_000_000, "EQTOT": 9_000}]}
+
+
+@pytest.fixture
+def result():
+    sec = pd.concat([merge_engine.sec_snapshot_frame(SEC_CATY), merge_engine.sec_snapshot_frame(SEC_EWBC)])
+    fdic = pd.concat([merge_engine.fdic_quarters_frame(FDIC_CATY), merge_engine.fdic_quarters_frame(FDIC_EWBC)])
+    return merge_engine.merge(sec, fdic)
+
+
+def test_field_map_is_unique_and_derived_conversions_are_known():
+    names = [mapping.name for mapping in merge_engine.FIELD_MAP]
+    assert len(names) == len(set(names))
+    assert len({mapping.sec_key for mapping in merge_engine.FIELD_MAP}) == len(names)
+    for spec in merge_engine.DERIVED_FIELDS:
+        assert spec.conversion in merge_engine.CONVERSIONS
+        assert spec.fill == (spec.name in names)
+
+
+def test_values_are_converted_and_derived_per_row(result):
+    q2 = result.row("CATY", "2025-06-30")
+    assert q2["interest_expense"] == pytest.approx(141.697)  # filled from income − NII
+    assert q2["pretax_income"] == pytest.approx(96.278)
+    assert q2["effective_tax_rate_pct"] == pytest.approx(18.828 / 96.278 * 100)
+    assert q2["tce"] == pytest.approx(2507.711)
+    assert q2["shares_outstanding"] == pytest.approx(69.343395)
+    assert q2["tbvps"] == pytest.approx(2_507_711_000 / 69_343_395)
+    assert q2["loans_hfi"] is None
+
+    fy = result.row("CATY", "2024-12-31")
+    assert fy["interest_expense"] == pytest.approx(660.92)  # reported tag wins over the fill
+    assert result.row("CATY", "2019-12-31")["total_assets"] is None
+    assert result.entities() == ["CATY", "EWBC"]
+
+
+def test_reconciliation_joins_on_entity_and_period(result):
+    rec = result.reconciliation
+    # FDIC quarters without a SEC snapshot (2024-09-30) are not compared.
+    assert set(zip(rec["entity"], rec["period"])) == {
+        ("CATY", "2024-12-31"),
+        ("CATY", "2025-06-30"),
+        ("EWBC", "2025-06-30"),
+    }
+    caty_q2 = result.comparisons("CATY", "2025-06-30")
+    assert set(caty_q2) == {"total_assets", "total_equity"}
+    assert caty_q2["total_assets"]["diff_pct"] == pytest.approx(abs(23723.847 - 23709.143) / 23723.847 * 100)
+    assert caty_q2["total_assets"]["match"] and not caty_q2["total_equity"]["match"]
+
+    ewbc = result.comparisons("EWBC", "2025-06-30")
+    assert ewbc["total_equity"] == {"fdic_value": 9.0, "diff_pct": 0.0, "match": True}  # zero SEC base
+    assert ewbc["total_assets"]["diff_pct"] == pytest.approx(1 / 76 * 100)
+
+
+def test_reports_are_consolidated_across_entities(result):
+    conflicts = merge_engine.conflict_records(result)
+    assert [(c["entity"], c["period"], c["field"]) for c in conflicts] == [
+        ("CATY", "2024-12-31", "us-gaap:StockholdersEquity"),
+        ("CATY", "2025-06-30", "us-gaap:StockholdersEquity"),
+        ("EWBC", "2025-06-30", "us-gaap:Assets"),
+    ]
+    summary = merge_engine.quality_summary(result)
+    assert summary["EWBC"] == {"periods": ["2025-06-30"], "fields_compared": 2, "conflicts": 1, "max_diff_pct": 1.3158}
+
+    payload = merge_engine.entity_payload(result, "EWBC")
+    assert payload["periods"]["2025-06-30"] == {"total_assets": 76000.0, "total_equity": 0.0}
+    assert [row["field"] for row in payload["reconciliation"]] == ["total_assets", "total_equity"]
+
+
+def test_store_frames_with_dates_are_accepted():
+    sec = pd.DataFrame(
+        {
+            "entity": ["CATY"],
+            "field": ["Assets"],
+            "date": [pd.Timestamp("2025-06-30")],
+            "value": [23_723_847_000.0],
+        }
+    )
+    fdic = pd.DataFrame({"entity": ["CATY"], "field": ["ASSET"], "date": ["2025-06-30"], "value": [23_709_143.0]})
+    result = merge_engine.merge(sec, fdic)
+    assert result.comparisons("CATY", "2025-06-30")["total_assets"]["match"]
+    assert merge_engine.merge(None).reconciliation.empty
@@ -0,0 +1,79 @@
+"""Tests for the vectorized NCO breach probability engine."""
+
+import datetime as dt
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from analysis.nco_probability_analysis import (  # noqa: E402
+    NCOPanel,
+    block_bootstrap_interval,
+    generate_markdown,
+    rolling_means,
+    window_masks,
+    window_stats,
+    wilson_interval,
+)
+
+
+def make_panel() -> NCOPanel:
+    dates = np.array(
+        [f"{year}-{month:02d}-{day}" for year in range(2006, 2011) for month, day in ((3, 31), (6, 30), (9, 30), (12, 31))],
+        dtype="datetime64[D]",
+    )
+    caty = np.where(np.arange(dates.size) % 5 == 0, 0.01, 0.001)
+    peer = np.full(dates.size, 0.002)
+    peer[:3] = np.nan
+    return NCOPanel(entities=["CATY", "PEER"], dates=dates, ratios=np.vstack([caty, peer]))
+
+
+def test_wilson_interval_matches_published_post_gfc_bound():
+    lower, upper = wilson_interval(11, 70)
+    assert round(upper * 100, 1) == 26.0
+    assert lower < 11 / 70 < upper
+    _, wider = wilson_interval(11, 70, confidence=0.99)
+    assert wider > upper
+
+
+def test_window_stats_cover_every_entity_and_window():
+    panel = make_panel()
+    masks = window_masks(panel.dates, [None, dt.date(2008, 1, 1)], [8])
+    stats = window_stats(panel, masks, ["all", "post-2008", "last 8"])
+    assert stats.quarters.tolist() == [[20, 12, 8], [17, 12, 8]]
+    assert stats.breaches[0].tolist() == [4, 2, 1]
+    assert stats.breaches[1].tolist() == [0, 0, 0]
+
+
+def test_trailing_window_longer_than_series_is_nan():
+    panel = make_panel()
+    masks = window_masks(panel.dates, [], [panel.dates.size, panel.dates.size + 1])
+    stats = window_stats(panel, masks, ["all", "too long"])
+    assert stats.quarters[0].tolist() == [20, 0]
+    assert np.isnan(stats.probability[:, 1]).all()
+
+
+def test_rolling_means_match_naive_loop():
+    panel = make_panel()
+    means = rolling_means(panel.ratios, [4])[4]
+    caty = panel.ratios[0]
+    expected = [np.mean(caty[idx - 3 : idx + 1]) for idx in range(3, caty.size)]
+    assert np.allclose(means[0, 3:], expected)
+    assert np.isnan(means[1, :6]).all()
+
+
+def test_block_bootstrap_interval_brackets_point_estimate():
+    panel = make_panel()
+    mask = np.ones(panel.dates.size, dtype=bool)
+    lower, upper = block_bootstrap_interval(panel.ratios, mask, samples=500)
+    assert lower.shape == (2,)
+    assert lower[0] <= 0.2 <= upper[0]
+    assert upper[1] == 0.0
+
+
+def test_markdown_includes_peer_benchmark():
+    markdown = generate_markdown(make_panel(), samples=200)
+    assert "## Peer benchmark (post-GFC)" in markdown
+    assert "| **CATY** |" in markdown
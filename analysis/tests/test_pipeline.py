@@ -0,0 +1,104 @@
+"""Tests for the automation stage DAG runner."""
+
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from analysis.pipeline import (  # noqa: E402
+    FingerprintStore,
+    Stage,
+    StageResult,
+    content_hash,
+    failed_stages,
+    resolve_dependencies,
+    run_pipeline,
+    topological_order,
+)
+
+
+def test_file_edges_become_dependencies(tmp_path):
+    raw = tmp_path / "raw.json"
+    merged = tmp_path / "merged.json"
+    stages = [
+        Stage("report", lambda: None, inputs=[merged]),
+        Stage("merge", lambda: None, inputs=[raw], outputs=[merged]),
+        Stage("fetch", lambda: None, outputs=[raw]),
+    ]
+    assert resolve_dependencies(stages) == {"report": ["merge"], "merge": ["fetch"], "fetch": []}
+    assert topological_order(stages) == ["fetch", "merge", "report"]
+
+    with pytest.raises(ValueError):
+        topological_order([Stage("a", lambda: None, deps=["b"]), Stage("b", lambda: None, deps=["a"])])
+
+
+def test_concurrent_stages_overlap_and_downstream_waits():
+    barrier = threading.Barrier(3, timeout=5)
+    order = []
+
+    def fetch(name):
+        def run():
+            barrier.wait()  # deadlocks unless all three fetches run at once
+            order.append(name)
+            return StageResult("cached", f"{name} cached")
+
+        return run
+
+    stages = [Stage(name, fetch(name), concurrent=True) for name in ("sec", "fdic", "peers")]
+    stages.append(Stage("merge", lambda: order.append("merge") or "merged", deps=["sec", "fdic", "peers"]))
+    logged = []
+    outcomes = run_pipeline(stages, log=logged.append)
+
+    assert order[-1] == "merge"
+    assert [outcomes[name].status for name in ("sec", "fdic", "peers", "merge")] == ["cached"] * 3 + ["ok"]
+    assert any("stage=merge status=ok" in line for line in logged)
+
+
+def test_failure_skips_downstream_unless_allowed():
+    def boom():
+        raise RuntimeError("no payload")
+
+    stages = [
+        Stage("price", boom, concurrent=True, allow_failure=True),
+        Stage("fetch", boom, concurrent=True),
+        Stage("merge", lambda: "ok", deps=["fetch"]),
+        Stage("site", lambda: "ok", deps=["price"]),
+    ]
+    outcomes = run_pipeline(stages)
+    assert outcomes["merge"].status == "skipped"
+    assert outcomes["site"].status == "ok"
+    assert failed_stages(stages, outcomes) == ["fetch", "merge"]
+
+
+def test_fingerprint_skips_unchanged_inputs_and_honours_force(tmp_path):
+    raw = tmp_path / "raw.json"
+    out = tmp_path / "merged.json"
+    raw.write_text('{"fetch_timestamp": "t0", "value": 1}')
+    calls = []
+
+    def merge():
+        calls.append("merge")
+        out.write_text(str(json.loads(raw.read_text())["value"]))
+
+    stages = [Stage("merge", merge, inputs=[raw], outputs=[out], cacheable=True, params={"mode": "full"})]
+    store_path = tmp_path / "fingerprints.json"
+
+    def run(**kwargs):
+        return run_pipeline(stages, store=FingerprintStore(store_path, root=tmp_path), **kwargs)["merge"].status
+
+    assert run() == "ok"
+    # A re-fetch that only moves the fetch timestamp is still a cache hit.
+    raw.write_text('{"fetch_timestamp": "t1", "value": 1}')
+    assert run() == "cached"
+    assert run(force=["merge"]) == "ok"
+    raw.write_text('{"fetch_timestamp": "t2", "value": 2}')
+    assert run() == "ok"
+    # Outputs edited or deleted behind the runner's back invalidate the entry.
+    out.unlink()
+    assert run() == "ok"
+    assert calls == ["merge"] * 4
+    assert content_hash(tmp_path / "missing.json") is None
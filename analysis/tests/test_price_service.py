@@ -0,0 +1,124 @@
+"""Tests for the daily OHLC price cache."""
+
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+pytest.importorskip("pyarrow")
+
+from analysis import data_io  # noqa: E402
+from analysis.price_service import PriceService  # noqa: E402
+from analysis.timeseries_store import TimeSeriesStore  # noqa: E402
+
+
+def _bars(tickers, start, end):
+    """yfinance-shaped (field × ticker) daily bars; close = 100 + day of year."""
+    dates = pd.bdate_range(start, end)
+    columns = pd.MultiIndex.from_product(
+        [["Adj Close", "Close", "High", "Low", "Open", "Volume"], list(tickers)], names=["Price", "Ticker"]
+    )
+    frame = pd.DataFrame(index=dates, columns=columns, dtype=float)
+    for field in ["Adj Close", "Close", "High", "Low", "Open"]:
+        for ticker in tickers:
+            frame[(field, ticker)] = [100.0 + stamp.dayofyear for stamp in dates]
+    for ticker in tickers:
+        frame[("Volume", ticker)] = 1_000.0
+    return frame
+
+
+class FakeClock:
+    def __init__(self, value):
+        self.value = value
+
+    def __call__(self):
+        return self.value
+
+
+@pytest.fixture
+def service(tmp_path):
+    data_io.invalidate()
+    calls = []
+
+    def download(tickers, start, end):
+        calls.append((tuple(tickers), start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")))
+        return _bars(tickers, start, end)
+
+    # Friday 2025-10-24, 21:00 UTC (after the close in New York).
+    clock = FakeClock(datetime(2025, 10, 24, 21, 0, tzinfo=timezone.utc))
+    prices = PriceService(TimeSeriesStore(tmp_path), download=download, now=clock)
+    prices.calls = calls
+    prices.clock = clock
+    return prices
+
+
+def test_only_missing_ranges_are_downloaded(service):
+    service.ensure(["CATY", "EWBC"], "2025-10-01")
+    assert service.calls == [(("CATY", "EWBC"), "2025-10-01", "2025-10-24")]
+
+    # Same session, fresh cache: nothing to fetch.
+    assert service.ensure(["CATY", "EWBC"], "2025-10-01") == 0
+    assert len(service.calls) == 1
+
+    # Monday: one batched tail window; an earlier start adds a head window.
+    service.clock.value = datetime(2025, 10, 27, 21, 0, tzinfo=timezone.utc)
+    service.ensure(["CATY", "EWBC", "HAFC"], "2025-09-15")
+    assert service.calls[1:] == [
+        (("CATY", "EWBC"), "2025-09-15", "2025-10-01"),
+        (("CATY", "EWBC"), "2025-10-24", "2025-10-27"),
+        (("HAFC",), "2025-09-15", "2025-10-27"),
+    ]
+    assert service.coverage()["CATY"]["start"] == "2025-09-15"
+    assert service.coverage()["CATY"]["end"] == "2025-10-27"
+
+    daily = service.daily(["CATY", "HAFC"], start="2025-09-15")
+    assert list(daily.columns) == ["CATY", "HAFC"]
+    assert len(daily) == len(pd.bdate_range("2025-09-15", "2025-10-27"))
+
+
+def test_latest_closes_and_weekly_returns(service):
+    latest = service.latest_closes(["CATY", "EWBC"])
+    assert latest["CATY"] == (100.0 + 297, "2025-10-24")
+
+    weekly = service.weekly_closes(["CATY"], "2025-10-06", "2025-10-24")
+    assert [stamp.strftime("%Y-%m-%d") for stamp in weekly.index] == ["2025-10-06", "2025-10-13", "2025-10-20"]
+    assert weekly.loc["2025-10-13", "CATY"] == 100.0 + pd.Timestamp("2025-10-17").dayofyear
+
+    returns = service.weekly_returns(["CATY"], "2025-10-06", "2025-10-24")
+    assert returns.loc["2025-10-20", "CATY"] == pytest.approx((100 + 297) / (100 + 290) - 1)
+
+
+def test_failed_downloads_fall_back_to_cached_bars(service):
+    service.ensure(["CATY"], "2025-10-20")
+
+    def offline(tickers, start, end):
+        raise OSError("offline")
+
+    service.download = offline
+    service.clock.value += timedelta(days=3)
+    assert service.ensure(["CATY"], "2025-10-20") == 0
+    assert service.coverage()["CATY"]["end"] == "2025-10-24"
+    assert service.latest_closes(["CATY", "EWBC"]) == {"CATY": (100.0 + 297, "2025-10-24")}
+
+
+def test_concurrent_top_ups_download_once(service):
+    real_download = service.download
+
+    def slow_download(tickers, start, end):
+        time.sleep(0.05)
+        return real_download(tickers, start, end)
+
+    service.download = slow_download
+    workers = [threading.Thread(target=service.ensure, args=(["CATY"], "2025-10-01")) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert service.calls == [(("CATY",), "2025-10-01", "2025-10-24")]
+    assert not list(service.store.root.rglob("*.tmp"))
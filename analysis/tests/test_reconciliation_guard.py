@@ -0,0 +1,83 @@
+"""Tests for the manifest-driven reconciliation guard."""
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from analysis import reconciliation_guard as guard  # noqa: E402
+
+MARKET = {
+    "price": 46.94,
+    "calculated_metrics": {
+        "tbvps": 36.16,
+        "rote_ltm_pct": 10.6,
+        "normalized_rote_pct": 10.21,
+        "implied_coe_pct": 9.587,
+    },
+}
+
+
+def write_site(root: Path, wilson_display: str) -> dict:
+    calculated = guard.calculate_targets(MARKET)
+    market = json.loads(json.dumps(MARKET))
+    market["calculated_metrics"]["target_wilson_95"] = calculated["target_wilson_95"]
+    (root / "data").mkdir()
+    (root / "data" / "market_data_current.json").write_text(json.dumps(market))
+    html = (
+        "<!-- BEGIN AUTOGEN: price-target-grid -->\n"
+        f"<div class=\"metric-value\">{wilson_display}</div>\n"
+        "<!-- END AUTOGEN: price-target-grid -->\n"
+    )
+    (root / "index.html").write_text(html)
+    return {
+        "tolerance_dollars": 0.5,
+        "files": {"index.html": hashlib.sha256(html.encode()).hexdigest()},
+        "numbers": [
+            {
+                "id": "target_wilson_95",
+                "label": "Wilson 95% Target",
+                "value": calculated["target_wilson_95"],
+                "kind": "money",
+                "display": f"${calculated['target_wilson_95']:,.2f}",
+                "source": "data/market_data_current.json#calculated_metrics.target_wilson_95",
+                "published": True,
+                "locations": [{"file": "index.html", "marker": "price-target-grid"}],
+            }
+        ],
+    }
+
+
+def test_calculated_targets_follow_valuation_functions():
+    targets = guard.calculate_targets(MARKET)
+    regression = round((0.058 * 10.6 + 0.82) * 36.16, 2)
+    assert targets["target_regression"] == regression
+    assert targets["target_wilson_95"] == round(0.609 * regression + 0.391 * targets["target_normalized"], 2)
+    assert targets["return_regression_pct"] == round((regression - 46.94) / 46.94 * 100, 1)
+
+
+def test_manifest_passes_and_detects_mismatch(tmp_path):
+    manifest = write_site(tmp_path, "$0.00")
+    calculated = guard.calculate_targets(MARKET)
+    passed, _ = guard.check_manifest(manifest, calculated, root=tmp_path)
+    assert passed
+
+    drifted = dict(calculated, target_wilson_95=calculated["target_wilson_95"] + 1.0)
+    passed, lines = guard.check_manifest(manifest, drifted, root=tmp_path)
+    assert not passed
+    assert "≠" in lines[0]
+
+
+def test_deep_verify_reads_marker_sections(tmp_path):
+    calculated = guard.calculate_targets(MARKET)
+    manifest = write_site(tmp_path, f"${calculated['target_wilson_95']:,.2f}")
+    assert guard.stale_files(manifest, root=tmp_path) == []
+    assert guard.verify_manifest_locations(manifest, root=tmp_path)[0]
+
+    (tmp_path / "index.html").write_text(
+        "<!-- BEGIN AUTOGEN: price-target-grid -->$1.00<!-- END AUTOGEN: price-target-grid -->"
+    )
+    assert guard.stale_files(manifest, root=tmp_path) == ["index.html"]
+    assert not guard.verify_manifest_locations(manifest, root=tmp_path)[0]
@@ -0,0 +1,82 @@
+"""Tests for the shared batched OLS kernel."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from analysis.regression import batched_ols, rolling_ols, simple_ols  # noqa: E402
+
+
+def closed_form(x, y):
+    x_mean, y_mean = x.mean(), y.mean()
+    sxx = ((x - x_mean) ** 2).sum()
+    slope = ((x - x_mean) * (y - y_mean)).sum() / sxx
+    intercept = y_mean - slope * x_mean
+    resid = y - intercept - slope * x
+    std_err = np.sqrt((resid**2).sum() / (len(x) - 2) / sxx)
+    r2 = 1 - (resid**2).sum() / ((y - y_mean) ** 2).sum()
+    return slope, intercept, std_err, r2
+
+
+def test_batched_matches_closed_form_per_series():
+    rng = np.random.default_rng(7)
+    x = rng.normal(size=40)
+    y = np.outer([0.5, 1.0, 2.0], x) + rng.normal(scale=0.3, size=(3, 40))
+    fit = batched_ols(x, y)
+    for idx in range(3):
+        slope, intercept, std_err, r2 = closed_form(x, y[idx])
+        assert np.isclose(fit.slope[idx], slope)
+        assert np.isclose(fit.intercept[idx], intercept)
+        assert np.isclose(fit.slope_std_err[idx], std_err)
+        assert np.isclose(fit.r2[idx], r2)
+        assert np.isclose(fit.slope_t_stat[idx], slope / std_err)
+
+
+def test_missing_observations_are_dropped_per_series():
+    x = np.array([0.0, 1.0, 2.0, 3.0, 4.0])
+    y = np.array([[1.0, 3.0, 5.0, 7.0, 9.0], [np.nan, 2.0, 4.0, 6.0, 8.0]])
+    fit = batched_ols(x, y)
+    assert fit.nobs.tolist() == [5, 4]
+    assert np.allclose(fit.slope, [2.0, 2.0])
+    assert np.allclose(fit.intercept, [1.0, 0.0])
+
+
+def test_degenerate_regressor_returns_nan():
+    result = simple_ols([1.0, 1.0, 1.0], [1.0, 2.0, 3.0])
+    assert np.isnan(result["slope"])
+    assert np.isnan(result["std_err"])
+
+
+def test_rolling_windows_match_individual_fits():
+    rng = np.random.default_rng(3)
+    x = rng.normal(size=30)
+    y = 1.5 * x + rng.normal(scale=0.2, size=30)
+    rolled = rolling_ols(x, y, window=12)
+    assert rolled.slope.shape == (19,)
+    for start in (0, 9, 18):
+        slope, *_ = closed_form(x[start : start + 12], y[start : start + 12])
+        assert np.isclose(rolled.slope[start], slope)
+
+
+def test_newey_west_errors_match_explicit_sum():
+    rng = np.random.default_rng(11)
+    x = np.cumsum(rng.normal(size=60))
+    y = 0.8 * x + np.cumsum(rng.normal(scale=0.5, size=60))
+    lags = 3
+    fit = batched_ols(x, y, hac_lags=lags)
+
+    X = np.column_stack([np.ones_like(x), x])
+    beta = np.linalg.solve(X.T @ X, X.T @ y)
+    u = y - X @ beta
+    meat = sum(u[t] ** 2 * np.outer(X[t], X[t]) for t in range(60))
+    for lag in range(1, lags + 1):
+        weight = 1 - lag / (lags + 1)
+        for t in range(lag, 60):
+            term = u[t] * u[t - lag] * np.outer(X[t], X[t - lag])
+            meat = meat + weight * (term + term.T)
+    bread = np.linalg.inv(X.T @ X)
+    expected = np.sqrt(np.diag(bread @ meat @ bread))
+    assert np.allclose(fit.std_err, expected)
@@ -0,0 +1,70 @@
+"""Tests for the residual-income / DDM valuation kernel."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from analysis import residual_income as rim  # noqa: E402
+
+INPUTS = rim.RIMInputs(
+    book_value=45.05,
+    coe=0.09587,
+    terminal_growth=0.025,
+    rote_path=np.array([0.115, 0.11, 0.105, 0.103, 0.1021]),
+    terminal_rote=0.1021,
+    payout_ratio=0.75,
+)
+
+
+def scalar_rim(bv0, coe, g, rote, terminal, payout):
+    book = [bv0]
+    for r in rote:
+        book.append(book[-1] * (1 + r * (1 - payout)))
+    pv = sum((r - coe) * book[i] / (1 + coe) ** (i + 1) for i, r in enumerate(rote))
+    tv = (terminal - coe) * book[-1] * (1 + g) / (coe - g) / (1 + coe) ** len(rote)
+    return bv0 + pv + tv
+
+
+def test_base_case_reproduces_published_rim_target():
+    assert rim.rim_target(INPUTS) == 50.08
+    result = rim.rim_value(45.05, 0.09587, 0.025, INPUTS.rote_path, 0.1021, 0.75)
+    assert float(result["pv_terminal"]) == pytest.approx(2.93, abs=0.005)
+
+
+def test_grid_matches_scalar_valuations():
+    coe = [9.0, 9.587, 11.0]
+    growth = [2.0, 2.5]
+    shift = [-1.0, 0.0, 0.5]
+    cube = rim.price_grid(INPUTS, coe, growth, shift)
+    assert cube.shape == (3, 2, 3)
+    for i, c in enumerate(coe):
+        for j, g in enumerate(growth):
+            for k, s in enumerate(shift):
+                expected = scalar_rim(45.05, c / 100, g / 100, INPUTS.rote_path + s / 100, 0.1021 + s / 100, 0.75)
+                assert cube[i, j, k] == pytest.approx(expected)
+
+
+def test_growth_at_or_above_coe_is_undefined():
+    values = rim.rim_value(45.05, np.array([0.03, 0.025]), 0.025, INPUTS.rote_path)["value"]
+    assert np.isfinite(values[0])
+    assert np.isnan(values[1])
+
+
+def test_ddm_discounts_clean_surplus_dividends():
+    result = rim.ddm_value(45.05, 0.09587, 0.025, INPUTS.rote_path, 0.1021, 0.75)
+    book = rim.clean_surplus_path(45.05, INPUTS.rote_path, 0.75)
+    assert np.allclose(result["dividends"], 0.75 * INPUTS.rote_path * book[:-1])
+    assert np.allclose(np.diff(book), result["dividends"] / 0.75 * 0.25)
+
+
+def test_simulation_is_seeded_and_bounded():
+    first = rim.simulate(INPUTS, runs=2000, seed=3, spot_price=47.13)
+    second = rim.simulate(INPUTS, runs=2000, seed=3, spot_price=47.13)
+    assert first == second
+    assert first["runs"] == 2000
+    assert first["percentiles"]["p05"] < first["percentiles"]["p50"] < first["percentiles"]["p95"]
+    assert 0 <= first["prob_below_spot_pct"] <= 100
@@ -0,0 +1,108 @@
+"""Tests for the vectorized scenario grid engine."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from analysis import scenario_grid  # noqa: E402
+
+FUND = scenario_grid.Fundamentals(
+    avg_interest_earning_assets=22e9,
+    shares_out=68.7e6,
+    tax_rate=0.23,
+    quarterly_eps=1.13,
+    tbvps=41.0,
+    payout_ratio=0.32,
+    non_interest_items_eps=-0.91,
+)
+RATE = scenario_grid.RateModel(
+    codes=("time_deposits", "money_market"),
+    balances=np.array([8e9, 4e9]),
+    base_rates_pct=np.array([4.0, 2.5]),
+    betas=np.array([0.6, 0.4]),
+    dda_balance=3e9,
+    base_ib_cost_pct=3.5,
+    base_nim_pct=3.3,
+    base_asset_yield_pct=5.8,
+    base_funding_cost_pct=3.3,
+    base_fed_funds_pct=5.33,
+    asset_beta=0.35,
+    fundamentals=FUND,
+)
+CREDIT = scenario_grid.CreditModel(loan_balance=20e9, base_nco_bps=18.0, base_provision_m=28.7, fundamentals=FUND)
+
+
+def scalar_rate_eps(fed_bps, shock=0.0):
+    delta = fed_bps / 100.0
+    rates = [max(r + (b + shock) * delta, 0.0) for r, b in zip(RATE.base_rates_pct, RATE.betas)]
+    cost = sum(rate * bal for rate, bal in zip(rates, RATE.balances)) / RATE.balances.sum()
+    nim = RATE.base_nim_pct + RATE.asset_beta * delta - (cost - RATE.base_ib_cost_pct)
+    return 22e9 * nim / 100 / 4 * (1 - 0.23) / 68.7e6 - 0.91
+
+
+def test_rate_and_credit_legs_match_scalar_bridge():
+    fed = np.array([-100.0, 0.0, 50.0])
+    leg = scenario_grid.rate_leg(RATE, fed, beta_shock=0.1)
+    for idx, bps in enumerate(fed):
+        assert leg["quarterly_eps"][idx] == pytest.approx(scalar_rate_eps(bps, 0.1))
+
+    credit = scenario_grid.credit_leg(CREDIT, [10.0, 58.0])
+    assert credit["incremental_bps"].tolist() == [0.0, 40.0]
+    expected_hit = 40 / 10000 * 20e9 / 4 * (1 - 0.23) / 68.7e6
+    assert credit["eps_hit"][1] == pytest.approx(expected_hit)
+    assert credit["tbvps"][1] == pytest.approx(41.0 - expected_hit * (1 - 0.32))
+
+
+def test_evaluate_broadcasts_to_cube():
+    cube = scenario_grid.evaluate(RATE, CREDIT, [-50.0, 0.0], [18.0, 40.0, 80.0], [0.0, 0.1], current_price=40.0)
+    assert cube["implied_price_avg"].shape == (2, 3, 2)
+    pe = 40.0 / (1.13 * 4)
+    credit_hit = scenario_grid.credit_leg(CREDIT, 40.0)["eps_hit"]
+    annual = (scalar_rate_eps(-50.0, 0.1) - credit_hit) * 4
+    assert cube["annual_eps"][0, 1, 1] == pytest.approx(annual)
+    assert cube["implied_price_pe"][0, 1, 1] == pytest.approx(annual * pe)
+
+
+def test_weighted_quantiles():
+    values = np.array([3.0, 1.0, 2.0])
+    weights = np.array([0.2, 0.5, 0.3])
+    assert scenario_grid.weighted_quantiles(values, weights, [0.4, 0.5, 0.6, 0.95]).tolist() == [1.0, 1.0, 2.0, 3.0]
+
+
+def test_build_grid_expectation_matches_joint_sum():
+    rate_prob = {-25: 0.4, 0: 0.6}
+    credit_prob = {18.0: 0.7, 85.0: 0.3}
+    grid = scenario_grid.build_grid(
+        RATE,
+        CREDIT,
+        40.0,
+        rate_prob,
+        credit_prob,
+        fed_axis=np.arange(-50.0, 55.0, 5.0),
+        nco_axis=np.arange(0.0, 105.0, 5.0),
+        shock_axis=np.array([-0.1, 0.0, 0.1]),
+    )
+    assert grid["shape"] == [21, 21, 3]
+    assert len(grid["values"]["implied_price_avg"]) == 21 * 21 * 3
+    assert len(grid["heatmap"]["implied_price_avg"]) == 21
+
+    brute = 0.0
+    for fed, p_fed in rate_prob.items():
+        for nco, p_nco in credit_prob.items():
+            cell = scenario_grid.evaluate(RATE, CREDIT, [fed], [nco], [0.0], 40.0)
+            brute += p_fed * p_nco * float(cell["implied_price_avg"].squeeze())
+    assert grid["expected"]["implied_price_avg"] == pytest.approx(brute, abs=0.005)
+    # The zero-shock conditional expectation at the base Fed node equals the
+    # credit-weighted price at that node.
+    zero_fed = grid["axes"]["fed_change_bps"].index(0.0)
+    by_fed = grid["conditional_expected"]["by_fed_change"]["implied_price_avg"][zero_fed]
+    manual = sum(
+        p * float(scenario_grid.evaluate(RATE, CREDIT, [0.0], [nco], [0.0], 40.0)["implied_price_avg"].squeeze())
+        for nco, p in credit_prob.items()
+    )
+    assert by_fed == pytest.approx(manual, abs=0.005)
+    assert grid["quantiles"]["implied_price_avg"]["p05"] <= grid["quantiles"]["implied_price_avg"]["p95"]
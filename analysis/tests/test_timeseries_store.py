@@ -0,0 +1,89 @@
+"""Tests for the partitioned time-series store."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+pytest.importorskip("pyarrow")
+
+from analysis.timeseries_store import (  # noqa: E402
+    TimeSeriesStore,
+    peer_fdic_nco_frame,
+    records_to_frame,
+    sec_edgar_frame,
+)
+
+
+def test_append_is_incremental_and_idempotent(tmp_path):
+    store = TimeSeriesStore(tmp_path)
+    first = records_to_frame([
+        ("CATY", "NTLNLSCOQR", "20250331", 0.034),
+        ("CATY", "NTLNLSCOQR", "20250630", 0.217),
+    ])
+    assert store.append("fdic", first) == 2
+    assert store.append("fdic", first) == 0
+
+    extension = records_to_frame([
+        ("CATY", "NTLNLSCOQR", "20250630", 0.217),
+        ("CATY", "NTLNLSCOQR", "20250930", 0.150),
+    ])
+    assert store.append("fdic", extension) == 1
+
+    series = store.series("fdic", "CATY", "NTLNLSCOQR")
+    assert list(series.round(3)) == [0.034, 0.217, 0.150]
+
+
+def test_query_filters_entity_field_and_date_range(tmp_path):
+    store = TimeSeriesStore(tmp_path)
+    store.append(
+        "peers",
+        records_to_frame([
+            ("CATY", "rote_pct", "2025-03-31", 11.0),
+            ("CATY", "rote_pct", "2025-06-30", 12.0),
+            ("EWBC", "rote_pct", "2025-06-30", 16.0),
+            ("EWBC", "cre_pct", "2025-06-30", 37.6),
+        ]),
+    )
+    assert store.entities("peers") == ["CATY", "EWBC"]
+
+    rows = store.query("peers", fields=["rote_pct"], start="2025-04-01")
+    assert sorted(rows["entity"]) == ["CATY", "EWBC"]
+
+    wide = store.pivot("peers", "rote_pct")
+    assert list(wide.columns) == ["CATY", "EWBC"]
+    assert wide.loc["2025-06-30", "EWBC"] == 16.0
+
+
+def test_sec_facts_are_split_by_duration():
+    payload = {
+        "ticker": "CATY",
+        "fy2024": {"data": {"NetIncomeLoss": {"start": "2024-01-01", "end": "2024-12-31", "value": 286_000_000}}},
+        "q4_2024": {
+            "data": {
+                "NetIncomeLoss": {"start": "2024-10-01", "end": "2024-12-31", "value": 80_000_000},
+                "Assets": {"end": "2024-12-31", "value": 23_000_000_000},
+            }
+        },
+    }
+    frame = sec_edgar_frame(payload)
+    values = dict(zip(frame["field"], frame["value"]))
+    assert values == {"NetIncomeLoss.12M": 286_000_000, "NetIncomeLoss.3M": 80_000_000, "Assets": 23_000_000_000}
+
+
+def test_peer_nco_history_pivots_beside_caty(tmp_path):
+    store = TimeSeriesStore(tmp_path)
+    store.append("fdic", records_to_frame([("CATY", "NTLNLSCOQR", "20250630", 0.21)]))
+    payload = {
+        "field": "NTLNLSCOQR",
+        "banks": {
+            "EWBC": {"cert": 1, "quarters": [{"period": "20250630", "NTLNLSCOQR": 0.18}]},
+            "HAFC": {"cert": 2, "quarters": [{"period": "20250630", "NTLNLSCOQR": 0.33}]},
+        },
+    }
+    assert store.append("fdic", peer_fdic_nco_frame(payload)) == 2
+    wide = store.pivot("fdic", "NTLNLSCOQR")
+    assert list(wide.columns) == ["CATY", "EWBC", "HAFC"]
+    assert wide.loc["2025-06-30", "HAFC"] == 0.33
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Local columnar store for quarterly financial history.
+
+Every series lives in a long-format Parquet partition keyed by source and
+entity (``data/timeseries/<source>/<entity>.parquet``) with the columns
+``entity``, ``field``, ``date`` and ``value``. Fetchers append their latest
+snapshot after writing the raw JSON payload; appends merge on
+``(field, date)`` so re-fetching overlapping quarters updates values in place
+instead of requiring a full refresh. Analysis scripts query by entity, field
+and date range and only read the partitions they need.
+
+Usage:
+    python3 analysis/timeseries_store.py seed
+    python3 analysis/timeseries_store.py query --source fdic --entity CATY --field NTLNLSCOQR --start 2008-01-01
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:  # pragma: no cover - optional dependency guard
+    import pyarrow  # noqa: F401
+except ImportError:  # pragma: no cover
+    pyarrow = None  # type: ignore
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from analysis.data_io import load_json, temp_path  # noqa: E402
+
+DATA_DIR = ROOT / "data"
+STORE_ROOT = DATA_DIR / "timeseries"
+
+FDIC_NCO_CSV = ROOT / "evidence" / "raw" / "fdic_CATY_NTLNLSCOQR_timeseries.csv"
+FDIC_RAW_PATH = DATA_DIR / "fdic_raw.json"
+SEC_RAW_PATH = DATA_DIR / "sec_edgar_raw.json"
+PEER_RAW_PATH = DATA_DIR / "peer_data_raw.json"
+PEER_FDIC_NCO_PATH = DATA_DIR / "peer_fdic_nco.json"
+DEPOSIT_HISTORY_PATH = DATA_DIR / "deposit_beta_history.json"
+
+COLUMNS = ["entity", "field", "date", "value"]
+KEY_COLUMNS = ["field", "date"]
+
+Record = Tuple[str, str, Any, Any]  # (entity, field, date, value)
+
+
+def _empty_frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "entity": pd.Series(dtype="string"),
+            "field": pd.Series(dtype="string"),
+            "date": pd.Series(dtype="datetime64[ns]"),
+            "value": pd.Series(dtype="float64"),
+        }
+    )
+
+
+def records_to_frame(records: Iterable[Record]) -> pd.DataFrame:
+    """Build a store-shaped frame from ``(entity, field, date, value)`` tuples.
+
+    Non-numeric values are dropped; dates accept ``YYYYMMDD`` or ISO strings.
+    """
+    rows = list(records)
+    if not rows:
+        return _empty_frame()
+    frame = pd.DataFrame(rows, columns=COLUMNS)
+    frame["value"] = pd.to_numeric(frame["value"], errors="coerce")
+    frame["date"] = pd.to_datetime(frame["date"].astype(str), format="mixed", errors="coerce")
+    frame = frame.dropna(subset=["date", "value"])
+    frame["entity"] = frame["entity"].astype("string")
+    frame["field"] = frame["field"].astype("string")
+    frame["date"] = frame["date"].astype("datetime64[ns]")
+    return frame.reset_index(drop=True)
+
+
+class TimeSeriesStore:
+    """Partitioned Parquet store with incremental append and range queries."""
+
+    def __init__(self, root: Path = STORE_ROOT) -> None:
+        if pyarrow is None:
+            raise RuntimeError("pyarrow is required for the time-series store (pip install pyarrow)")
+        self.root = Path(root)
+
+    def partition_path(self, source: str, entity: str) -> Path:
+        return self.root / source / f"{entity}.parquet"
+
+    def sources(self) -> List[str]:
+        if not self.root.exists():
+            return []
+        return sorted(path.name for path in self.root.iterdir() if path.is_dir())
+
+    def entities(self, source: str) -> List[str]:
+        source_dir = self.root / source
+        if not source_dir.exists():
+            return []
+        return sorted(path.stem for path in source_dir.glob("*.parquet"))
+
+    def _read_partition(self, path: Path) -> pd.DataFrame:
+        if not path.exists():
+            return _empty_frame()
+        return pd.read_parquet(path)
+
+    def _write_partition(self, path: Path, frame: pd.DataFrame) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = temp_path(path)
+        frame.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    def append(self, source: str, frame: pd.DataFrame) -> int:
+        """Merge ``frame`` into the store and return the number of new or changed rows.
+
+        Rows are keyed by ``(field, date)`` within each entity partition; the
+        incoming value wins when a key already exists.
+        """
+        if frame.empty:
+            return 0
+        changed = 0
+        for entity, incoming in frame.groupby("entity", sort=False):
+            path = self.partition_path(source, str(entity))
+            existing = self._read_partition(path)
+            incoming = incoming[COLUMNS].drop_duplicates(subset=KEY_COLUMNS, keep="last")
+            if existing.empty:
+                merged = incoming
+                changed += len(incoming)
+            else:
+                joined = incoming.merge(
+                    existing[KEY_COLUMNS + ["value"]],
+                    on=KEY_COLUMNS,
+                    how="left",
+                    suffixes=("", "_existing"),
+                )
+                unchanged = np.isclose(joined["value"], joined["value_existing"], rtol=1e-9, atol=0.0)
+                delta = ~unchanged
+                changed += int(delta.sum())
+                if not delta.any():
+                    continue
+                merged = pd.concat([existing, incoming], ignore_index=True)
+                merged = merged.drop_duplicates(subset=KEY_COLUMNS, keep="last")
+            merged = merged.sort_values(KEY_COLUMNS).reset_index(drop=True)
+            self._write_partition(path, merged)
+        return changed
+
+    def query(
+        self,
+        source: str,
+        entities: Optional[Sequence[str]] = None,
+        fields: Optional[Sequence[str]] = None,
+        start: Any = None,
+        end: Any = None,
+    ) -> pd.DataFrame:
+        """Return long-format rows for the requested entities, fields and date range."""
+        if isinstance(entities, str):
+            entities = [entities]
+        if isinstance(fields, str):
+            fields = [fields]
+        targets = list(entities) if entities else self.entities(source)
+        frames = []
+        for entity in targets:
+            frame = self._read_partition(self.partition_path(source, entity))
+            if frame.empty:
+                continue
+            mask = pd.Series(True, index=frame.index)
+            if fields:
+                mask &= frame["field"].isin(list(fields))
+            if start is not None:
+                mask &= frame["date"] >= pd.Timestamp(start)
+            if end is not None:
+                mask &= frame["date"] <= pd.Timestamp(end)
+            frames.append(frame[mask])
+        if not frames:
+            return _empty_frame()
+        return pd.concat(frames, ignore_index=True)
+
+    def pivot(
+        self,
+        source: str,
+        field: str,
+        entities: Optional[Sequence[str]] = None,
+        start: Any = None,
+        end: Any = None,
+    ) -> pd.DataFrame:
+        """Return a date × entity frame for a single field."""
+        frame = self.query(source, entities=entities, fields=[field], start=start, end=end)
+        if frame.empty:
+            return pd.DataFrame()
+        wide = frame.pivot_table(index="date", columns="entity", values="value", aggfunc="last")
+        wide.columns = [str(col) for col in wide.columns]
+        return wide.sort_index()
+
+    def series(
+        self,
+        source: str,
+        entity: str,
+        field: str,
+        start: Any = None,
+        end: Any = None,
+    ) -> pd.Series:
+        """Return a date-indexed series for one entity and field."""
+        frame = self.query(source, entities=[entity], fields=[field], start=start, end=end)
+        return frame.set_index("date")["value"].sort_index().rename(field)
+
+    def latest_date(self, source: str, entity: str, field: Optional[str] = None) -> Optional[pd.Timestamp]:
+        frame = self.query(source, entities=[entity], fields=[field] if field else None)
+        if frame.empty:
+            return None
+        return frame["date"].max()
+
+
+# ---------------------------------------------------------------------------
+# Source adapters: raw payloads on disk → store-shaped frames
+# ---------------------------------------------------------------------------
+
+
+def fdic_timeseries_frame(path: Path = FDIC_NCO_CSV, entity: str = "CATY") -> pd.DataFrame:
+    """FDIC field export CSV (``ID, <FIELD>, REPDTE``) → frame."""
+    records: List[Record] = []
+    with path.open(newline="") as fh:
+        reader = csv.DictReader(fh)
+        fields = [name for name in (reader.fieldnames or []) if name not in {"ID", "REPDTE"}]
+        for row in reader:
+            for field in fields:
+                records.append((entity, field, row["REPDTE"], row[field]))
+    return records_to_frame(records)
+
+
+def fdic_raw_frame(payload: Dict[str, Any], entity: str = "CATY") -> pd.DataFrame:
+    """``data/fdic_raw.json`` quarters list → frame."""
+    records: List[Record] = []
+    for quarter in payload.get("quarters", []):
+        period = quarter.get("period")
+        for field, value in quarter.items():
+            if field != "period":
+                records.append((entity, field, period, value))
+    return records_to_frame(records)
+
+
+def peer_fdic_nco_frame(payload: Dict[str, Any]) -> pd.DataFrame:
+    """``data/peer_fdic_nco.json`` per-bank quarters → one ``fdic`` partition per ticker."""
+    field = payload.get("field", "NTLNLSCOQR")
+    records: List[Record] = []
+    for ticker, bank in payload.get("banks", {}).items():
+        for quarter in bank.get("quarters", []):
+            records.append((ticker, field, quarter.get("period"), quarter.get(field)))
+    return records_to_frame(records)
+
+
+def sec_fact_field(concept: str, fact: Dict[str, Any]) -> str:
+    """Store field for an XBRL fact: instants keep the concept name, durations
+    get a ``.<months>M`` suffix so quarterly, YTD and annual values ending on
+    the same date land in separate series (``NetIncomeLoss.3M`` vs ``.12M``)."""
+    start, end = fact.get("start"), fact.get("end")
+    if not start or not end:
+        return concept
+    days = (pd.Timestamp(end) - pd.Timestamp(start)).days + 1
+    return f"{concept}.{max(1, round(days / 30.44))}M"
+
+
+def sec_edgar_frame(payload: Dict[str, Any]) -> pd.DataFrame:
+    """``data/sec_edgar_raw.json`` filing snapshots → frame keyed by fact duration and end date."""
+    entity = payload.get("ticker", "CATY")
+    records: List[Record] = []
+    for snapshot in payload.values():
+        if not isinstance(snapshot, dict) or "data" not in snapshot:
+            continue
+        for concept, fact in snapshot["data"].items():
+            records.append((entity, sec_fact_field(concept, fact), fact.get("end"), fact.get("value")))
+            prior = fact.get("prior")
+            if isinstance(prior, dict):
+                records.append((entity, sec_fact_field(concept, prior), prior.get("end"), prior.get("value")))
+    return records_to_frame(records)
+
+
+def peer_snapshot_frame(payload: Dict[str, Any]) -> pd.DataFrame:
+    """``data/peer_data_raw.json`` bank metrics → one partition per ticker."""
+    records: List[Record] = []
+    for ticker, bank in payload.get("banks", {}).items():
+        period_end = bank.get("period_end")
+        for field, value in bank.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                records.append((ticker, field, period_end, value))
+    return records_to_frame(records)
+
+
+def deposit_history_frame(payload: Dict[str, Any], entity: str = "CATY") -> pd.DataFrame:
+    """``data/deposit_beta_history.json`` → ``<product>.<metric>`` fields."""
+    records: List[Record] = []
+    for quarter in payload.get("quarters", []):
+        report_date = quarter.get("report_date")
+        for product, metrics in quarter.get("metrics", {}).items():
+            for metric, value in metrics.items():
+                if not metric.startswith("prior_"):
+                    records.append((entity, f"{product}.{metric}", report_date, value))
+        for metric, value in quarter.get("derived", {}).items():
+            records.append((entity, f"derived.{metric}", report_date, value))
+    return records_to_frame(records)
+
+
+def record_snapshot(source: str, frame: pd.DataFrame, root: Path = STORE_ROOT) -> Optional[int]:
+    """Append a fetcher snapshot to the store.
+
+    Fetchers call this after writing their raw JSON so history accumulates
+    across runs. Returns ``None`` when the store is unavailable so a missing
+    optional dependency never fails a fetch.
+    """
+    try:
+        store = TimeSeriesStore(root)
+    except RuntimeError as exc:
+        logging.warning("Time-series store not updated: %s", exc)
+        return None
+    rows = store.append(source, frame)
+    logging.info("Time-series store: %s new/updated rows in %s", rows, source)
+    return rows
+
+
+def seed(store: TimeSeriesStore) -> Dict[str, int]:
+    """Ingest every on-disk history file; safe to re-run (appends are idempotent)."""
+    counts: Dict[str, int] = {}
+    if FDIC_NCO_CSV.exists():
+        counts["fdic_timeseries"] = store.append("fdic", fdic_timeseries_frame(FDIC_NCO_CSV))
+    if FDIC_RAW_PATH.exists():
+        counts["fdic_raw"] = store.append("fdic", fdic_raw_frame(load_json(FDIC_RAW_PATH)))
+    if PEER_FDIC_NCO_PATH.exists():
+        counts["peer_fdic_nco"] = store.append("fdic", peer_fdic_nco_frame(load_json(PEER_FDIC_NCO_PATH)))
+    if SEC_RAW_PATH.exists():
+        counts["sec"] = store.append("sec", sec_edgar_frame(load_json(SEC_RAW_PATH)))
+    if PEER_RAW_PATH.exists():
+        counts["peers"] = store.append("peers", peer_snapshot_frame(load_json(PEER_RAW_PATH)))
+    if DEPOSIT_HISTORY_PATH.exists():
+        counts["deposit_rates"] = store.append(
+            "deposit_rates", deposit_history_frame(load_json(DEPOSIT_HISTORY_PATH))
+        )
+    return counts
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Local columnar time-series store")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("seed", help="Ingest on-disk JSON/CSV history into the store")
+    query_parser = subparsers.add_parser("query", help="Print rows for an entity/field/date range")
+    query_parser.add_argument("--source", required=True)
+    query_parser.add_argument("--entity", action="append", dest="entities")
+    query_parser.add_argument("--field", action="append", dest="fields")
+    query_parser.add_argument("--start")
+    query_parser.add_argument("--end")
+    args = parser.parse_args()
+
+    try:
+        store = TimeSeriesStore()
+    except RuntimeError as exc:
+        print(f"❌ {exc}")
+        return 1
+
+    if args.command == "seed":
+        counts = seed(store)
+        for name, rows in counts.items():
+            print(f"✓ {name}: {rows} new/updated rows")
+        return 0
+
+    frame = store.query(args.source, entities=args.entities, fields=args.fields, start=args.start, end=args.end)
+    if frame.empty:
+        print("No rows matched.")
+        return 0
+    print(frame.to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
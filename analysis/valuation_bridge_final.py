@@ -5,13 +5,18 @@ Now exposes callable helpers so automation pipelines can depend on the logic.
 
 from __future__ import annotations
 
-import json
+import sys
 from pathlib import Path
 from typing import Any, Dict
 
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 
-DATA_PATH = Path(__file__).resolve().parents[1] / "data" / "market_data_current.json"
-PEER_PATH = Path(__file__).resolve().parents[1] / "data" / "caty11_peers_normalized.json"
+from analysis.data_io import load_json  # noqa: E402
+
+DATA_PATH = ROOT / "data" / "market_data_current.json"
+PEER_PATH = ROOT / "data" / "caty11_peers_normalized.json"
 
 
 def _to_decimal(value: float) -> float:
@@ -62,15 +67,11 @@ def calculate_normalized_target(
 
 
 def load_market_data(path: Path = DATA_PATH) -> Dict[str, Any]:
-    with path.open("r", encoding="utf-8") as fh:
-        return json.load(fh)
+    return load_json(path)
 
 
 def load_peer_context(path: Path = PEER_PATH) -> Dict[str, Any]:
-    if not path.exists():
-        return {}
-    with path.open("r", encoding="utf-8") as fh:
-        return json.load(fh)
+    return load_json(path, {})
 
 
 def main() -> int:
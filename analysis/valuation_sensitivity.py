@@ -3,11 +3,18 @@
 from __future__ import annotations
 
 import csv
+import sys
 from pathlib import Path
 from typing import Iterable, Tuple
 
 import numpy as np
 
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from analysis.regression import batched_ols  # noqa: E402
+
 
 PEER_CSV = Path(__file__).resolve().parents[1] / "evidence" / "peer_snapshot_2025Q2.csv"
 OUTPUT_MD = Path(__file__).resolve().parents[1] / "evidence" / "valuation_sensitivity_summary.md"
@@ -28,8 +35,8 @@ def load_peer_regression() -> Tuple[float, float]:
 
     rote = np.array([float(p["ROTE_Pct"]) for p in peers if float(p["ROTE_Pct"]) > 0])
     ptbv = np.array([float(p["P_TBV"]) for p in peers if float(p["ROTE_Pct"]) > 0])
-    slope, intercept = np.polyfit(rote, ptbv, deg=1)
-    return slope, intercept
+    fit = batched_ols(rote, ptbv)
+    return float(fit.slope), float(fit.intercept)
 
 
 def price_for_rote(rote: float, slope: float, intercept: float) -> float:
@@ -17,19 +17,22 @@ Usage:
 """
 
 import argparse
-import json
 import re
 import sys
 from datetime import datetime
 from pathlib import Path
 from typing import List
 
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from analysis.data_io import load_json  # noqa: E402
+
 
 def load_market_data(base_path: Path) -> dict:
     """Load market data JSON"""
-    data_path = base_path / 'data' / 'market_data_current.json'
-    with open(data_path, 'r') as f:
-        return json.load(f)
+    return load_json(base_path / 'data' / 'market_data_current.json')
 
 
 def surgical_replace(content: str, data: dict) -> str:
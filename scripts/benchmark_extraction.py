@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the DEF 14A and IR extraction pipelines.
+
+Runs each pipeline stage over the archived inputs already in the repo - SEC
+HTML filings under evidence/raw (DEF 14A artifacts under evidence/raw/def14a
+when archived, plus the 8-K filings) and the IR fixtures - and records per
+stage:
+
+- ``wall_ms``: median of ``--repeats`` timed runs (after one warm-up run);
+- ``rss_growth_mb``: peak RSS during the warm-up run above the RSS at stage
+  start (the peak is reset through /proc/self/clear_refs where available);
+- ``alloc_peak_kb``: peak Python allocations under tracemalloc.
+
+Results are compared with data/benchmarks/extraction_baseline.json; the run
+fails when a metric exceeds its baseline by more than ``--threshold`` percent
+and by more than a small absolute noise floor. The baseline records a
+fingerprint of each corpus, and stages whose corpus changed are reported but
+not compared. Refresh the baseline with ``--update-baseline`` on the machine
+that runs the check.
+
+Usage:
+    python scripts/benchmark_extraction.py
+    python scripts/benchmark_extraction.py --stage 'ir.*' --repeats 3
+    python scripts/benchmark_extraction.py --update-baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import fnmatch
+import gc
+import hashlib
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from tools.def14a_extract.api import SECTION_IDS  # noqa: E402
+from tools.def14a_extract.fact_extraction import build_fact_extractors  # noqa: E402
+from tools.def14a_extract.logging_utils import get_logger  # noqa: E402
+from tools.def14a_extract.models import FilingArtifact  # noqa: E402
+from tools.def14a_extract.normalizers.document_classifier import classify_artifact  # noqa: E402
+from tools.def14a_extract.registry import load_registry  # noqa: E402
+from tools.def14a_extract.section_locator import SectionLocator, clear_cache  # noqa: E402
+from tools.def14a_extract.table_extraction import TableExtractionOrchestrator  # noqa: E402
+from tools.ir_materials_extract.fact_extraction import (  # noqa: E402
+    GuidanceFactExtractor,
+    ResultsFactExtractor,
+    SegmentFactExtractor,
+)
+from tools.ir_materials_extract.normalizers import normalize_html, normalize_pdf  # noqa: E402
+from tools.ir_materials_extract.section_locators import locate_sections  # noqa: E402
+from tools.ir_materials_extract.table_extraction import extract_html_tables, extract_pdf_tables  # noqa: E402
+
+try:  # pragma: no cover - not available on Windows
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore
+
+BASELINE_PATH = ROOT / "data" / "benchmarks" / "extraction_baseline.json"
+RESULTS_PATH = ROOT / "logs" / "benchmark_extraction.json"
+DEFAULT_THRESHOLD_PCT = 25.0
+DEFAULT_REPEATS = 3
+
+# Regressions smaller than these are noise on any machine, whatever the percentage.
+NOISE_FLOORS = {"wall_ms": 5.0, "rss_growth_mb": 4.0, "alloc_peak_kb": 256.0}
+
+CORPORA: Dict[str, Sequence[str]] = {
+    "def14a": (
+        "evidence/raw/def14a/**/*.htm",
+        "evidence/raw/def14a/**/*.html",
+        "evidence/raw/*_8K/*.htm",
+    ),
+    "ir": (
+        "tools/ir_materials_extract/tests/fixtures/*.html",
+        "tools/ir_materials_extract/tests/fixtures/*.pdf",
+    ),
+}
+
+# Stage input/output state for one corpus: {"paths": [...], ...stage outputs}.
+State = Dict[str, Any]
+
+
+@dataclass(frozen=True)
+class BenchStage:
+    name: str
+    corpus: str
+    run: Callable[[State], None]
+
+
+# ---------------------------------------------------------------- DEF 14A
+
+
+def _def14a_classify(state: State) -> None:
+    documents = []
+    for path in state["paths"]:
+        payload = path.read_bytes()
+        artifact = FilingArtifact(
+            url=path.as_uri(),
+            path=path,
+            sha256=hashlib.sha256(payload).hexdigest(),
+            mime_type="text/html",
+            content_type="text/html",
+        )
+        documents.append(classify_artifact(artifact))
+    state["documents"] = documents
+
+
+def _def14a_locate(state: State) -> None:
+    # Measure cold locating, not the per-artifact-hash cache.
+    clear_cache()
+    state["spans"] = SectionLocator(SECTION_IDS).locate(state["documents"])
+
+
+def _def14a_tables(state: State) -> None:
+    orchestrator = TableExtractionOrchestrator()
+    tables = []
+    for span in state["spans"]:
+        tables.extend(orchestrator.extract(span, state["documents"]))
+    state["tables"] = tables
+
+
+def _def14a_facts(state: State) -> None:
+    registry = load_registry()
+    facts = {}
+    for extractor in build_fact_extractors():
+        facts.update(extractor.extract(state["spans"], state["tables"], state["documents"], registry))
+    state["facts"] = facts
+
+
+# ---------------------------------------------------------------- IR materials
+
+
+def _ir_normalize_html(state: State) -> None:
+    state["normalized"] = {
+        **state.get("normalized", {}),
+        **{path: normalize_html(path) for path in state["paths"] if path.suffix == ".html"},
+    }
+
+
+def _ir_normalize_pdf(state: State) -> None:
+    state["normalized"] = {
+        **state.get("normalized", {}),
+        **{path: normalize_pdf(path) for path in state["paths"] if path.suffix == ".pdf"},
+    }
+
+
+def _ir_tables(state: State) -> None:
+    state["tables"] = {
+        path: extract_pdf_tables(path) if path.suffix == ".pdf" else extract_html_tables(path)
+        for path in state["paths"]
+    }
+
+
+def _ir_text(state: State, path: Path) -> str:
+    return str(state["normalized"][path].get("text") or "")
+
+
+def _ir_locate(state: State) -> None:
+    state["sections"] = {path: locate_sections(_ir_text(state, path), str(path)) for path in state["paths"]}
+
+
+def _ir_facts(state: State) -> None:
+    extractors = (GuidanceFactExtractor(), ResultsFactExtractor(), SegmentFactExtractor())
+    facts = {}
+    for path in state["paths"]:
+        metadata = {"url": path.as_uri(), "sha256": "", "content_type": ""}
+        for extractor in extractors:
+            facts.update(
+                extractor.extract(state["sections"][path], state["tables"][path], _ir_text(state, path), metadata)
+            )
+    state["facts"] = facts
+
+
+STAGES: List[BenchStage] = [
+    BenchStage("def14a.classify", "def14a", _def14a_classify),
+    BenchStage("def14a.locate", "def14a", _def14a_locate),
+    BenchStage("def14a.tables", "def14a", _def14a_tables),
+    BenchStage("def14a.facts", "def14a", _def14a_facts),
+    BenchStage("ir.normalize_html", "ir", _ir_normalize_html),
+    BenchStage("ir.normalize_pdf", "ir", _ir_normalize_pdf),
+    BenchStage("ir.tables", "ir", _ir_tables),
+    BenchStage("ir.locate", "ir", _ir_locate),
+    BenchStage("ir.facts", "ir", _ir_facts),
+]
+
+
+# ---------------------------------------------------------------- measurement
+
+
+def corpus_paths(corpus: str, root: Path = ROOT) -> List[Path]:
+    paths = {path.resolve() for pattern in CORPORA[corpus] for path in root.glob(pattern) if path.is_file()}
+    return sorted(paths)
+
+
+def corpus_fingerprint(paths: Sequence[Path], root: Path = ROOT) -> str:
+    digest = hashlib.sha256()
+    for path in paths:
+        try:
+            name = path.relative_to(root).as_posix()
+        except ValueError:
+            name = path.name
+        digest.update(name.encode("utf-8"))
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()[:16]
+
+
+def _status_kb(field: str) -> Optional[int]:
+    try:
+        with open("/proc/self/status", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+def reset_peak_rss() -> bool:
+    """Reset the kernel's peak-RSS mark for this process (Linux only)."""
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as handle:
+            handle.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def current_rss_mb() -> float:
+    kb = _status_kb("VmRSS")
+    return kb / 1024 if kb is not None else peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    kb = _status_kb("VmHWM")
+    if kb is not None:
+        return kb / 1024
+    if resource is None:
+        return 0.0
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux.
+    return maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+
+
+def measure(run: Callable[[State], None], state: State, repeats: int) -> Dict[str, float]:
+    """Warm-up run (RSS), ``repeats`` timed runs, then one tracemalloc run."""
+    gc.collect()
+    reset_peak_rss()
+    rss_before = current_rss_mb()
+    run(state)
+    rss_growth = max(0.0, peak_rss_mb() - rss_before)
+
+    timings = []
+    for _ in range(max(1, repeats)):
+        started = time.perf_counter()
+        run(state)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    try:
+        run(state)
+        _current, alloc_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "wall_ms": round(statistics.median(timings), 3),
+        "wall_min_ms": round(min(timings), 3),
+        "rss_growth_mb": round(rss_growth, 3),
+        "alloc_peak_kb": round(alloc_peak / 1024, 1),
+    }
+
+
+@contextlib.contextmanager
+def _isolated_run():
+    """Run in a scratch cwd (stages write relative snapshot dirs) with logs and warnings muted."""
+    logger = get_logger()
+    level = logger.level
+    logger.setLevel(logging.WARNING)
+    try:
+        with tempfile.TemporaryDirectory(prefix="extraction-bench-") as scratch, contextlib.chdir(scratch), \
+                warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            yield
+    finally:
+        logger.setLevel(level)
+
+
+def run_benchmarks(
+    patterns: Sequence[str] = ("*",),
+    repeats: int = DEFAULT_REPEATS,
+    stages: Sequence[BenchStage] = STAGES,
+    root: Path = ROOT,
+) -> Dict[str, Any]:
+    """Measure every stage matching ``patterns``; returns the report dict."""
+    selected = [stage for stage in stages if any(fnmatch.fnmatch(stage.name, p) for p in patterns)]
+    corpora: Dict[str, Dict[str, Any]] = {}
+    results: Dict[str, Dict[str, float]] = {}
+    states: Dict[str, State] = {}
+    with _isolated_run():
+        for corpus in dict.fromkeys(stage.corpus for stage in selected):
+            paths = corpus_paths(corpus, root)
+            corpora[corpus] = {"files": len(paths), "fingerprint": corpus_fingerprint(paths, root)}
+            states[corpus] = {"paths": paths}
+        for stage in stages:
+            state = states.get(stage.corpus)
+            if state is None or not state["paths"]:
+                continue
+            if stage not in selected:
+                # Upstream of a selected stage: run once for its outputs only.
+                stage.run(state)
+                continue
+            results[stage.name] = measure(stage.run, state, repeats)
+    return {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+        "repeats": repeats,
+        "corpora": corpora,
+        "stages": results,
+    }
+
+
+def compare(
+    report: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold_pct: float = DEFAULT_THRESHOLD_PCT,
+) -> tuple[List[str], List[str]]:
+    """Return ``(regressions, skipped)`` messages for ``report`` against ``baseline``."""
+    regressions: List[str] = []
+    skipped: List[str] = []
+    base_corpora = baseline.get("corpora", {})
+    for name, metrics in report["stages"].items():
+        corpus = name.split(".", 1)[0]
+        base = baseline.get("stages", {}).get(name)
+        if base is None:
+            skipped.append(f"{name}: no baseline")
+            continue
+        if base_corpora.get(corpus, {}).get("fingerprint") != report["corpora"][corpus]["fingerprint"]:
+            skipped.append(f"{name}: corpus '{corpus}' changed since baseline")
+            continue
+        for metric, floor in NOISE_FLOORS.items():
+            old, new = base.get(metric), metrics.get(metric)
+            if old is None or new is None:
+                continue
+            if new - old > floor and new > old * (1 + threshold_pct / 100):
+                change = (new - old) / old * 100 if old else float("inf")
+                regressions.append(f"{name} {metric}: {old:g} -> {new:g} (+{change:.0f}%)")
+    return regressions, skipped
+
+
+def format_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> str:
+    base_stages = (baseline or {}).get("stages", {})
+    header = f"{'stage':<20} {'files':>5} {'wall ms':>10} {'base ms':>10} {'rss +MB':>8} {'alloc KB':>10}"
+    lines = [header, "-" * len(header)]
+    for name, metrics in report["stages"].items():
+        files = report["corpora"][name.split(".", 1)[0]]["files"]
+        base = base_stages.get(name, {}).get("wall_ms")
+        base_text = f"{base:>10.1f}" if base is not None else f"{'-':>10}"
+        lines.append(
+            f"{name:<20} {files:>5} {metrics['wall_ms']:>10.1f} {base_text} "
+            f"{metrics['rss_growth_mb']:>8.1f} {metrics['alloc_peak_kb']:>10.0f}"
+        )
+    return "\n".join(lines)
+
+
+def write_json(path: Path, payload: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark DEF 14A / IR extraction stages against a stored baseline")
+    parser.add_argument("--stage", action="append", default=None, help="Stage glob, e.g. 'ir.*' (repeatable; default: all)")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="Timed runs per stage (median reported)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD_PCT, help="Allowed regression in percent")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline JSON path")
+    parser.add_argument("--output", type=Path, default=RESULTS_PATH, help="Where to write this run's results")
+    parser.add_argument("--update-baseline", action="store_true", help="Write this run as the new baseline")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.stage or ["*"], repeats=args.repeats)
+    write_json(args.output, report)
+
+    baseline: Dict[str, Any] = {}
+    if args.baseline.is_file():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    print(format_report(report, baseline))
+    print()
+
+    if args.update_baseline:
+        merged = {**report, "stages": {**baseline.get("stages", {}), **report["stages"]}}
+        merged["corpora"] = {**baseline.get("corpora", {}), **report["corpora"]}
+        write_json(args.baseline, merged)
+        print(f"✓ Baseline updated: {args.baseline}")
+        return 0
+    if not baseline:
+        print(f"⚠️  No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+
+    regressions, skipped = compare(report, baseline, args.threshold)
+    for message in skipped:
+        print(f"⚠️  {message}")
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s) beyond {args.threshold:g}%:")
+        for message in regressions:
+            print(f"   - {message}")
+        return 1
+    print(f"✓ No stage regressed beyond {args.threshold:g}% of baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,13 +3,19 @@
 
 from __future__ import annotations
 
-import json
 import math
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Tuple
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from analysis.data_io import load_json, write_json  # noqa: E402
+from analysis.regression import simple_ols  # noqa: E402
+
 DEPOSIT_SCENARIOS_PATH = ROOT / "analysis" / "deposit_rate_scenarios.json"
 CREDIT_SCENARIOS_PATH = ROOT / "analysis" / "credit_stress_scenarios.json"
 DEPOSIT_BETA_PATH = ROOT / "analysis" / "deposit_beta_regressions.json"
@@ -29,13 +35,6 @@ BRIDGE_CASES = [
 ]
 
 
-def load_json(path: Path) -> Dict:
-    if not path.exists():
-        raise FileNotFoundError(path)
-    with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
-
-
 def load_base_snapshot() -> Dict:
     income_payload = load_json(INCOME_SNAPSHOT_PATH)["q3_2025_snapshot"]
     market_payload = load_json(MARKET_DATA_PATH)
@@ -88,30 +87,8 @@ def linear_regression(x: List[float], y: List[float]) -> Dict[str, float]:
     if n < 3:
         return {"slope": math.nan, "intercept": math.nan, "r2": math.nan, "std_err": math.nan, "t_stat": math.nan, "dof": n - 2}
 
-    x_mean = sum(x) / n
-    y_mean = sum(y) / n
-    sxx = sum((xi - x_mean) ** 2 for xi in x)
-    if sxx == 0:
-        return {"slope": math.nan, "intercept": math.nan, "r2": math.nan, "std_err": math.nan, "t_stat": math.nan, "dof": n - 2}
-
-    sxy = sum((xi - x_mean) * (yi - y_mean) for xi, yi in zip(x, y))
-    slope = sxy / sxx
-    intercept = y_mean - slope * x_mean
-
-    residuals = [yi - (intercept + slope * xi) for xi, yi in zip(x, y)]
-    ss_res = sum(res ** 2 for res in residuals)
-    ss_tot = sum((yi - y_mean) ** 2 for yi in y)
-    r2 = 1.0 - ss_res / ss_tot if ss_tot else math.nan
-
-    dof = n - 2
-    if dof <= 0:
-        return {"slope": slope, "intercept": intercept, "r2": r2, "std_err": math.nan, "t_stat": math.nan, "dof": dof}
-
-    variance = ss_res / dof
-    std_err = math.sqrt(variance / sxx) if sxx else math.nan
-    t_stat = slope / std_err if std_err and not math.isnan(std_err) else math.nan
-
-    return {"slope": slope, "intercept": intercept, "r2": r2, "std_err": std_err, "t_stat": t_stat, "dof": dof}
+    fit = simple_ols(x, y)
+    return {key: fit[key] for key in ("slope", "intercept", "r2", "std_err", "t_stat", "dof")}
 
 
 def format_regression(reg: Dict[str, float], base_value: float, unit_label: str, scale: float = 10.0) -> Dict:
@@ -274,7 +251,7 @@ def compute_bridge() -> Dict:
 
 def main() -> int:
     payload = compute_bridge()
-    OUTPUT_PATH.write_text(json.dumps(payload, indent=2))
+    write_json(OUTPUT_PATH, payload, sort_keys=False)
     print(f"Wrote {OUTPUT_PATH}")
     return 0
 
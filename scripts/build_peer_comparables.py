@@ -3,13 +3,18 @@
 
 from __future__ import annotations
 
-import json
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
 from statistics import median
 from typing import Any, Dict, List
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from analysis.data_io import load_json, write_json  # noqa: E402
+
 PEER_DATA_PATH = ROOT / "data" / "peer_data_raw.json"
 PEER_PRICE_PATH = ROOT / "data" / "peer_market_prices.json"
 OUTPUT_PATH = ROOT / "data" / "peer_comparables.json"
@@ -17,13 +22,6 @@ OUTPUT_PATH = ROOT / "data" / "peer_comparables.json"
 ASSUMED_COE = 0.10  # 10% hurdle for excess return comparison
 
 
-def load_json(path: Path) -> Dict[str, Any]:
-    if not path.exists():
-        raise FileNotFoundError(path)
-    with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
-
-
 def percentile_rank(population: List[float], value: float) -> float:
     if not population:
         return float("nan")
@@ -106,7 +104,7 @@ def build_metrics() -> Dict[str, Any]:
 
 def main() -> int:
     payload = build_metrics()
-    OUTPUT_PATH.write_text(json.dumps(payload, indent=2))
+    write_json(OUTPUT_PATH, payload, sort_keys=False)
     print(f"Wrote {OUTPUT_PATH}")
     return 0
 
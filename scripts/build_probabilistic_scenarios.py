@@ -1,18 +1,33 @@
 #!/usr/bin/env python3
-"""Combine rate-path and credit-loss scenarios into a probability-weighted outlook."""
+"""Combine rate-path and credit-loss scenarios into a probability-weighted outlook.
+
+Also writes ``analysis/scenario_grid.json``: EPS, TBVPS and implied price over
+dense Fed-change × NCO × deposit-beta-shock grids with FedWatch-weighted
+expectations and quantiles (see ``analysis/scenario_grid.py``).
+"""
 
 from __future__ import annotations
 
 import json
+import sys
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+import numpy as np
+
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from analysis import scenario_grid  # noqa: E402
+from analysis.data_io import load_json, write_json, write_text  # noqa: E402
+
 RATE_PATH = ROOT / "analysis" / "deposit_rate_scenarios.json"
 CREDIT_PATH = ROOT / "analysis" / "credit_stress_scenarios.json"
 OUTPUT_PATH = ROOT / "analysis" / "probabilistic_outlook.json"
+GRID_OUTPUT_PATH = ROOT / "analysis" / "scenario_grid.json"
 MARKET_DATA_PATH = ROOT / "data" / "market_data_current.json"
 FEDWATCH_PATH = ROOT / "analysis" / "fedwatch_snapshot.json"
 
@@ -20,9 +35,7 @@ BASE_QUARTERLY_EPS = 1.13  # Q3'25 diluted EPS per 8-K Exhibit 99.1
 BASE_TBV = 41.00  # Guardrail TBVPS per Module 18 sensitivity baseline
 
 def load_current_price() -> float:
-    if not MARKET_DATA_PATH.exists():
-        raise FileNotFoundError(f"Missing market data file: {MARKET_DATA_PATH}")
-    payload = json.loads(MARKET_DATA_PATH.read_text())
+    payload = load_json(MARKET_DATA_PATH, shared=True)
     price = payload.get("price")
     if price is None:
         raise ValueError("Market data payload missing 'price'")
@@ -50,7 +63,7 @@ class CreditScenario:
 
 
 def load_rate_probabilities() -> Tuple[Dict[int, float], Dict]:
-    payload = json.loads(FEDWATCH_PATH.read_text())
+    payload = load_json(FEDWATCH_PATH, shared=True)
     raw_probs = payload.get("probabilities", {})
     probabilities = {int(k): float(v) for k, v in raw_probs.items()}
     metadata = {
@@ -80,7 +93,7 @@ def load_credit_probabilities() -> Tuple[Dict[str, float], Dict[str, str]]:
 
 
 def load_rate_scenarios(rate_prob: Dict[int, float]) -> Dict[int, RateScenario]:
-    payload = json.loads(RATE_PATH.read_text())
+    payload = load_json(RATE_PATH, shared=True)
     mapping: Dict[int, RateScenario] = {}
     for item in payload["scenarios"]:
         delta = item["fed_change_bps"]
@@ -101,7 +114,7 @@ def load_rate_scenarios(rate_prob: Dict[int, float]) -> Dict[int, RateScenario]:
 
 
 def load_credit_scenarios(credit_prob: Dict[str, float]) -> Dict[str, CreditScenario]:
-    payload = json.loads(CREDIT_PATH.read_text())
+    payload = load_json(CREDIT_PATH, shared=True)
     mapping: Dict[str, CreditScenario] = {}
     for item in payload["scenarios"]:
         name = item["scenario"]
@@ -121,8 +134,9 @@ def load_credit_scenarios(credit_prob: Dict[str, float]) -> Dict[str, CreditScen
     return mapping
 
 
-def annualize_eps(quarterly_eps: float) -> float:
-    return quarterly_eps * 4.0
+def round_like_builtin(values: np.ndarray, digits: int) -> np.ndarray:
+    """Element-wise built-in ``round`` (matches the published JSON exactly)."""
+    return np.frompyfunc(round, 2, 1)(values, digits).astype(float)
 
 
 def combine_scenarios() -> Dict:
@@ -136,34 +150,52 @@ def combine_scenarios() -> Dict:
     rate_map = load_rate_scenarios(rate_prob)
     credit_map = load_credit_scenarios(credit_prob)
 
+    rates = list(rate_map.values())
+    credits = list(credit_map.values())
+    rate_probability = np.array([rate.probability for rate in rates])[:, None]
+    credit_probability = np.array([credit.probability for credit in credits])[None, :]
+    joint_prob = rate_probability * credit_probability
+
+    # Credit scenarios enter as deltas vs the base quarter, so pass the
+    # rebased EPS/TBV and let the kernel subtract the same base back out.
+    outcome = scenario_grid.combine(
+        np.array([rate.eps for rate in rates])[:, None],
+        np.array([rate.tbvps for rate in rates])[:, None],
+        np.array([BASE_QUARTERLY_EPS + credit.eps_delta for credit in credits])[None, :],
+        np.array([BASE_TBV + credit.tbv_delta for credit in credits])[None, :],
+        current_price,
+        BASE_QUARTERLY_EPS,
+        BASE_TBV,
+    )
+    annual_eps = outcome["annual_eps"]
+    adj_tbv = outcome["tbvps"]
+    pe_price = round_like_builtin(outcome["implied_price_pe"], 2)
+    ptbv_price = round_like_builtin(outcome["implied_price_ptbv"], 2)
+    implied_price = round_like_builtin((pe_price + ptbv_price) / 2.0, 2)
+    with np.errstate(divide="ignore"):
+        pe_at_price = np.where(annual_eps != 0, current_price / annual_eps, np.inf)
+        ptbv_at_price = np.where(adj_tbv != 0, current_price / adj_tbv, np.inf)
+
+    columns = {
+        "probability": round_like_builtin(joint_prob, 4),
+        "quarterly_eps": round_like_builtin(outcome["quarterly_eps"], 2),
+        "annual_eps": round_like_builtin(annual_eps, 2),
+        "tbvps": round_like_builtin(adj_tbv, 2),
+        "current_pe_at_price": round_like_builtin(pe_at_price, 2),
+        "current_ptbv_at_price": round_like_builtin(ptbv_at_price, 2),
+        "implied_price_pe": pe_price,
+        "implied_price_ptbv": ptbv_price,
+        "implied_price_avg": implied_price,
+    }
+    columns = {name: values.tolist() for name, values in columns.items()}
     combined: List[Dict] = []
-    expected_price = 0.0
-    expected_eps = 0.0
-    expected_tbv = 0.0
-    probability_sum = 0.0
-
-    for rate in rate_map.values():
-        for credit in credit_map.values():
-            joint_prob = rate.probability * credit.probability
-            adj_eps = rate.eps + credit.eps_delta
-            adj_tbv = rate.tbvps + credit.tbv_delta
-            annual_eps = annualize_eps(adj_eps)
-            pe_price = round(annual_eps * current_p_e, 2)
-            ptbv_price = round(adj_tbv * current_p_tbv, 2)
-            implied_price = round((pe_price + ptbv_price) / 2.0, 2)
+    for i, rate in enumerate(rates):
+        for j, credit in enumerate(credits):
             combined.append(
                 {
                     "rate_fed_change_bps": rate.fed_change_bps,
                     "credit_scenario": credit.name,
-                    "probability": round(joint_prob, 4),
-                    "quarterly_eps": round(adj_eps, 2),
-                    "annual_eps": round(annual_eps, 2),
-                    "tbvps": round(adj_tbv, 2),
-                    "current_pe_at_price": round(current_price / annual_eps if annual_eps else float("inf"), 2),
-                    "current_ptbv_at_price": round(current_price / adj_tbv if adj_tbv else float("inf"), 2),
-                    "implied_price_pe": pe_price,
-                    "implied_price_ptbv": ptbv_price,
-                    "implied_price_avg": implied_price,
+                    **{name: values[i][j] for name, values in columns.items()},
                     "rate_detail": rate.metadata,
                     "credit_detail": {
                         "nco_bps": credit.nco_bps,
@@ -172,15 +204,11 @@ def combine_scenarios() -> Dict:
                     },
                 }
             )
-            expected_price += implied_price * joint_prob
-            expected_eps += annual_eps * joint_prob
-            expected_tbv += adj_tbv * joint_prob
-            probability_sum += joint_prob
 
-    expected_price = round(expected_price, 2)
-    expected_eps = round(expected_eps, 2)
-    expected_tbv = round(expected_tbv, 2)
-    probability_sum = round(probability_sum, 4)
+    expected_price = round(float((implied_price * joint_prob).sum()), 2)
+    expected_eps = round(float((annual_eps * joint_prob).sum()), 2)
+    expected_tbv = round(float((adj_tbv * joint_prob).sum()), 2)
+    probability_sum = round(float(joint_prob.sum()), 4)
 
     return {
         "generated_at": datetime.now(timezone.utc).isoformat(),
@@ -205,10 +233,39 @@ def combine_scenarios() -> Dict:
     }
 
 
+def build_scenario_grid() -> Dict:
+    """Dense scenario grid integrated over the FedWatch and credit-mix distributions."""
+    current_price = load_current_price()
+    rate_prob, rate_meta = load_rate_probabilities()
+    credit_prob, _ = load_credit_probabilities()
+    credit_map = load_credit_scenarios(credit_prob)
+
+    payload = scenario_grid.build_grid(
+        scenario_grid.load_rate_model(),
+        scenario_grid.load_credit_model(),
+        current_price,
+        rate_probabilities=rate_prob,
+        credit_probabilities={credit.nco_bps: credit.probability for credit in credit_map.values()},
+    )
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "current_price": current_price,
+        **payload,
+        "metadata": {
+            "rate_path": rate_meta,
+            "credit_scenarios": {credit.name: credit.nco_bps for credit in credit_map.values()},
+            "credit_scenarios_source": str(CREDIT_PATH.relative_to(ROOT)),
+            "note": "Expectations and quantiles are evaluated at the distribution support points without intermediate rounding.",
+        },
+    }
+
+
 def main() -> int:
     payload = combine_scenarios()
-    OUTPUT_PATH.write_text(json.dumps(payload, indent=2))
+    write_json(OUTPUT_PATH, payload, sort_keys=False)
     print(f"Wrote {OUTPUT_PATH}")
+    write_text(GRID_OUTPUT_PATH, json.dumps(build_scenario_grid(), separators=(",", ":")))
+    print(f"Wrote {GRID_OUTPUT_PATH}")
     return 0
 
 
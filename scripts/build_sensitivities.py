@@ -12,12 +12,17 @@ Outputs:
 
 from __future__ import annotations
 
-import json
+import sys
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from analysis.data_io import write_json  # noqa: E402
+
 OUT_JSON = ROOT / "analysis" / "sensitivities.json"
 OUT_HTML = ROOT / "CATY_18_sensitivity_analysis.html"
 
@@ -118,7 +123,7 @@ def render_html(payload: Dict) -> str:
 def main() -> int:
     _ensure_dirs()
     payload = build_grid()
-    OUT_JSON.write_text(json.dumps(payload, indent=2))
+    write_json(OUT_JSON, payload, sort_keys=False)
     OUT_HTML.write_text(render_html(payload))
     print(f"Wrote {OUT_JSON} and {OUT_HTML}")
     return 0
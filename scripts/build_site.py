@@ -7,7 +7,17 @@ Responsibilities:
 - Render module navigation grid from data/module_metadata.json.
 - Render evidence provenance table from data/evidence_sources.json with live
   SHA256 hashes and timestamps.
+- Emit one content-hashed chart data bundle per charting page under
+  data/bundles/ and link it from the page's chart-data-bundle marker.
+- Emit data/published_numbers.json: every headline number as published, with
+  the AUTOGEN markers that display it and its source path, so the
+  reconciliation guard can check publications without scraping HTML.
 - Append execution log entries to logs/automation_run.log.
+
+``--watch`` keeps parsed data and the rendered pages in memory, subscribes to
+changes under data/ and analysis/ (inotify, polling fallback) and re-renders
+only the AUTOGEN sections whose input files or context keys changed. Pages are
+swapped in atomically so a browser refresh never sees a half-written file.
 """
 
 from __future__ import annotations
@@ -15,20 +25,79 @@ from __future__ import annotations
 import datetime as dt
 import hashlib
 import json
-import os
 import re
 import sys
+import time
+from contextlib import contextmanager
+from html.parser import HTMLParser
 from pathlib import Path
 import logging
-from typing import Any, Dict
-import subprocess
+from typing import Any, Callable, Dict, Iterable, Iterator
 
 ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from analysis import data_io  # noqa: E402
+from analysis.file_watch import file_signature, open_watcher  # noqa: E402
+from analysis.publication_gate import gate_reasons  # noqa: E402
+
 INDEX_PATH = ROOT / "index.html"
 LOG_PATH = ROOT / "logs" / "automation_run.log"
 EXEC_METRICS_PATH = ROOT / "data" / "executive_metrics.json"
 MODULE_SECTIONS_PATH = ROOT / "data" / "module_sections.json"
 VALUATION_OUTPUTS_PATH = ROOT / "data" / "valuation_outputs.json"
+PUBLISHED_NUMBERS_PATH = ROOT / "data" / "published_numbers.json"
+WATCH_DIRS = (ROOT / "data", ROOT / "analysis")
+FDIC_NCO_HISTORY_PATH = ROOT / "data" / "fdic_nco_history.json"
+PROBABILISTIC_OUTLOOK_PATH = ROOT / "analysis" / "probabilistic_outlook.json"
+
+# One minified, content-hashed JSON bundle per charting page holding only the
+# fields its scripts plot (see BUNDLE_BUILDERS); the page links it from the
+# chart-data-bundle AUTOGEN marker so the browser makes a single request.
+BUNDLE_DIR = ROOT / "data" / "bundles"
+BUNDLE_MARKER = "chart-data-bundle"
+CHART_BUNDLES = {
+    "CATY_07_loans_credit_quality.html": ("nco_time_series",),
+    "CATY_09_capital_liquidity.html": ("capital_stress",),
+    "CATY_12_valuation_model.html": ("nco_trend", "valuation_summary"),
+    "CATY_14_monte_carlo_valuation.html": ("monte_carlo",),
+}
+CHART_MAX_POINTS = 120
+NCO_QUARTERS_TO_PLOT = ("2024-Q3", "2024-Q4", "2025-Q1", "2025-Q2")
+# Files analysis/publication_gate.py reads; the gate result is memoized on them.
+GATE_INPUTS = (
+    ROOT / "data" / "market_data_current.json",
+    ROOT / "data" / "caty11_peers_normalized.json",
+    ROOT / "data" / "caty16_coe_triangulation.json",
+    ROOT / "data" / "deposit_beta_history.json",
+)
+
+# Headline numbers tracked in the published-numbers manifest:
+# (id, label, path inside data/market_data_current.json, display kind).
+HEADLINE_NUMBERS = [
+    ("price", "Current Price", "price", "money"),
+    ("target_wilson_95", "Wilson 95% Target", "calculated_metrics.target_wilson_95", "money"),
+    ("target_regression", "Regression Target", "calculated_metrics.target_regression", "money"),
+    ("target_normalized", "Normalized Target", "calculated_metrics.target_normalized", "money"),
+    ("target_irc_blended", "IRC Blended Target", "calculated_metrics.target_irc_blended", "money"),
+    ("return_wilson_95_pct", "Wilson 95% Return", "calculated_metrics.return_wilson_95_pct", "percent"),
+    ("return_regression_pct", "Regression Return", "calculated_metrics.return_regression_pct", "percent"),
+    ("return_normalized_pct", "Normalized Return", "calculated_metrics.return_normalized_pct", "percent"),
+    ("return_irc_blended_pct", "IRC Blended Return", "calculated_metrics.return_irc_blended_pct", "percent"),
+]
+
+# (marker, content) for every section replace_section() filled since the last
+# drain_rendered_sections() call.
+_RENDERED_SECTIONS: list[tuple[str, str]] = []
+
+# Watch-mode bookkeeping. While a section renders, _DEPENDENCY_TRACKER collects
+# the files it reads (Path) and the context keys it touches (str). JSON reads go
+# through analysis/data_io.py, which memoizes them by file signature. _OWN_WRITES
+# holds the signature of every file this module wrote so the watcher can ignore
+# the echo.
+_DEPENDENCY_TRACKER: set | None = None
+_OWN_WRITES: Dict[Path, Any] = {}
+_GATE_CACHE: Dict[tuple, bool] = {}
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -36,15 +105,53 @@ VALUATION_OUTPUTS_PATH = ROOT / "data" / "valuation_outputs.json"
 
 NARRATIVE_PLACEHOLDER_PATTERN = re.compile(r"\{\{([a-zA-Z0-9_]+)\}\}")
 
-def load_json(path: Path) -> Dict[str, Any]:
-    with path.open("r", encoding="utf-8") as fh:
-        return json.load(fh)
+def record_dependency(item: Path | str) -> None:
+    if _DEPENDENCY_TRACKER is not None:
+        _DEPENDENCY_TRACKER.add(item)
+
+
+@contextmanager
+def track_dependencies() -> Iterator[set]:
+    """Collect files and context keys read inside the block."""
+    global _DEPENDENCY_TRACKER
+    previous = _DEPENDENCY_TRACKER
+    deps: set = set()
+    _DEPENDENCY_TRACKER = deps
+    try:
+        yield deps
+    finally:
+        _DEPENDENCY_TRACKER = previous
+
+
+class TrackingContext(dict):
+    """Render context that reports which top-level keys a renderer reads."""
+
+    def __getitem__(self, key: str) -> Any:
+        record_dependency(key)
+        return super().__getitem__(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        record_dependency(key)
+        return super().get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        if isinstance(key, str):
+            record_dependency(key)
+        return super().__contains__(key)
+
+
+def load_json(path: Path, shared: bool = False) -> Dict[str, Any]:
+    record_dependency(path)
+    return data_io.load_json(path, shared=shared)
+
+
+def write_text_atomic(path: Path, text: str) -> None:
+    data_io.write_text(path, text)
+    _OWN_WRITES[path] = file_signature(path)
 
 
 def write_json(path: Path, payload: Dict[str, Any]) -> None:
-    with path.open("w", encoding="utf-8") as fh:
-        json.dump(payload, fh, indent=2)
-        fh.write("\n")
+    write_text_atomic(path, data_io.dumps(payload, sort_keys=False))
 
 
 def replace_placeholders(value: Any, replacements: Dict[str, str]) -> Any:
@@ -2642,8 +2749,8 @@ def render_module_section(section_cfg: Dict[str, Any], context: Dict[str, Any])
 
 
 def build_reconciliation_table() -> str:
-    market = load_json(ROOT / "data" / "market_data_current.json")
-    methods_cfg = load_json(ROOT / "data" / "valuation_methods.json")
+    market = load_json(ROOT / "data" / "market_data_current.json", shared=True)
+    methods_cfg = load_json(ROOT / "data" / "valuation_methods.json", shared=True)
     gate_active = publication_gate_active()
     price = float(market["price"]) if market.get("price") is not None else 0.0
     rows: list[str] = []
@@ -2767,14 +2874,20 @@ def build_reconciliation_table() -> str:
 
 def publication_gate_active() -> bool:
     """Return True if gate is active (i.e., not clear)."""
-    script = ROOT / "analysis" / "publication_gate.py"
-    if not script.exists():
-        return False
+    for path in GATE_INPUTS:
+        record_dependency(path)
+    # Evaluated in-process against the shared JSON memo, once per distinct set
+    # of gate inputs instead of once per caller.
+    key = tuple(file_signature(path) for path in GATE_INPUTS)
+    if key in _GATE_CACHE:
+        return _GATE_CACHE[key]
     try:
-        res = subprocess.run(["python3", str(script)], cwd=ROOT, capture_output=True, text=True)
-        return res.returncode != 0
+        active = bool(gate_reasons())
     except Exception:
-        return True
+        active = True
+    _GATE_CACHE.clear()
+    _GATE_CACHE[key] = active
+    return active
 
 
 def render_sensitivity_scaffold() -> str:
@@ -2876,6 +2989,7 @@ def render_module_grid() -> str:
 
 
 def compute_sha256(path: Path) -> str:
+    record_dependency(path)
     if not path.exists():
         return "MISSING"
     h = hashlib.sha256()
@@ -2907,6 +3021,7 @@ def render_evidence_table() -> str:
     for item in sources_cfg.get("sources", []):
         rel_path = Path(item["path"])
         abs_path = ROOT / rel_path
+        record_dependency(abs_path)
         if abs_path.exists():
             sha256 = compute_sha256(abs_path)
             mtime = dt.datetime.fromtimestamp(abs_path.stat().st_mtime, tz=dt.timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
@@ -2930,23 +3045,113 @@ def render_evidence_table() -> str:
 
 
 def replace_section(html: str, marker: str, content: str) -> str:
-    pattern = re.compile(
-        r"(?P<indent>[ \t]*)<!-- BEGIN AUTOGEN: " + re.escape(marker) + r" -->.*?<!-- END AUTOGEN: " + re.escape(marker) + r" -->",
-        re.DOTALL,
-    )
-
-    def repl(match: re.Match[str]) -> str:
-        indent = match.group("indent")
+    # Plain substring search: a regex with a leading ``[ \t]*`` retries at
+    # every offset and dominated build time on the large pages.
+    begin = f"<!-- BEGIN AUTOGEN: {marker} -->"
+    end = f"<!-- END AUTOGEN: {marker} -->"
+    pieces: list[str] = []
+    pos = 0
+    while True:
+        start = html.find(begin, pos)
+        if start < 0:
+            break
+        stop = html.find(end, start + len(begin))
+        if stop < 0:
+            break
+        indent_start = start
+        while indent_start > pos and html[indent_start - 1] in " \t":
+            indent_start -= 1
+        indent = html[indent_start:start]
         # Apply indentation to each line of generated content
         lines = [indent + line if line else "" for line in content.splitlines()]
         rendered = "\n".join(lines)
-        return f"{indent}<!-- BEGIN AUTOGEN: {marker} -->\n{rendered}\n{indent}<!-- END AUTOGEN: {marker} -->"
-
-    new_html, count = pattern.subn(repl, html)
-    if count == 0:
+        pieces.append(html[pos:indent_start])
+        pieces.append(f"{indent}{begin}\n{rendered}\n{indent}{end}")
+        pos = stop + len(end)
+    if not pieces:
         # Section marker missing—skip the substitution instead of aborting the build.
         return html
-    return new_html
+    pieces.append(html[pos:])
+    _RENDERED_SECTIONS.append((marker, content))
+    return "".join(pieces)
+
+
+def drain_rendered_sections() -> Dict[str, str]:
+    # A marker rendered twice ends up holding the later content.
+    sections = dict(_RENDERED_SECTIONS)
+    _RENDERED_SECTIONS.clear()
+    return sections
+
+
+def build_published_manifest(
+    market: Dict[str, Any],
+    methods_cfg: Dict[str, Any],
+    sections_by_file: Dict[str, Dict[str, str]],
+    file_hashes: Dict[str, str],
+) -> Dict[str, Any]:
+    """Record each headline number, where it was rendered and where it came from."""
+
+    def locate(display: str, markers: Any = None) -> list[Dict[str, str]]:
+        return [
+            {"file": file_name, "marker": marker}
+            for file_name, sections in sections_by_file.items()
+            for marker, content in sections.items()
+            if (markers is None or marker in markers) and display in content
+        ]
+
+    def entry(number_id: str, label: str, value: float, kind: str, source: str, markers: Any = None) -> Dict[str, Any]:
+        display = format_money(value) if kind == "money" else format_percent(value)
+        locations = locate(display, markers)
+        return {
+            "id": number_id,
+            "label": label,
+            "value": value,
+            "kind": kind,
+            "display": display,
+            "source": source,
+            "published": bool(locations),
+            "locations": locations,
+        }
+
+    numbers: list[Dict[str, Any]] = []
+    for number_id, label, path, kind in HEADLINE_NUMBERS:
+        try:
+            value = float(resolve_path(market, path))
+        except (KeyError, TypeError, ValueError):
+            continue
+        numbers.append(entry(number_id, label, value, kind, f"data/market_data_current.json#{path}"))
+
+    for index, method in enumerate(methods_cfg.get("methods", [])):
+        if method.get("id") == "spot":
+            continue
+        if "target_path" in method:
+            source = f"data/market_data_current.json#{method['target_path']}"
+            raw_value = resolve_path(market, method["target_path"])
+        else:
+            source = f"data/valuation_methods.json#methods.{index}.target_value"
+            raw_value = method.get("target_value")
+        try:
+            value = float(raw_value)
+        except (TypeError, ValueError):
+            continue
+        numbers.append(
+            entry(
+                f"reconciliation.{method.get('id')}",
+                f"{method.get('label', method.get('id'))} (reconciliation dashboard)",
+                value,
+                "money",
+                source,
+                markers={"reconciliation-dashboard"},
+            )
+        )
+
+    return {
+        "generated_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+        "generator": "scripts/build_site.py",
+        "tolerance_dollars": methods_cfg.get("tolerance_dollars", 0.50),
+        "files": file_hashes,
+        "numbers": numbers,
+    }
 
 
 def ensure_log_dir() -> None:
@@ -2962,187 +3167,431 @@ def append_log(entry: str, test_mode: bool = False) -> None:
         fh.write(f"[{timestamp}] {entry}\n")
 
 
-def main(test_mode: bool = False) -> int:
-    try:
-        html = INDEX_PATH.read_text(encoding="utf-8")
-        market = load_json(ROOT / "data" / "market_data_current.json")
-        methods_cfg = load_json(ROOT / "data" / "valuation_methods.json")
-        exec_cfg = load_json(EXEC_METRICS_PATH)
-        module_cfg = load_json(MODULE_SECTIONS_PATH) if MODULE_SECTIONS_PATH.exists() else {"modules": []}
-        module_metadata = load_json(ROOT / "data" / "module_metadata.json") if (ROOT / "data" / "module_metadata.json").exists() else {"modules": []}
-        for module in module_metadata.get("modules", []):
-            last_updated = module.get("last_updated")
-            if last_updated:
-                module["last_updated_formatted"] = format_date_value(last_updated, "long")
-        valuation_outputs = load_json(VALUATION_OUTPUTS_PATH) if VALUATION_OUTPUTS_PATH.exists() else {}
-
-        valuation_lookup = {"methods": {m["id"]: m for m in methods_cfg.get("methods", [])}, "config": methods_cfg}
-        caty01_path = ROOT / "data" / "caty01_company_profile.json"
-        caty01_tables = load_json(caty01_path) if caty01_path.exists() else {}
-        caty02_tables = load_json(ROOT / "data" / "caty02_income_statement.json") if (ROOT / "data" / "caty02_income_statement.json").exists() else {}
-        caty03_tables = load_json(ROOT / "data" / "caty03_balance_sheet.json") if (ROOT / "data" / "caty03_balance_sheet.json").exists() else {}
-        caty04_tables = load_json(ROOT / "data" / "caty04_cash_flow.json") if (ROOT / "data" / "caty04_cash_flow.json").exists() else {}
-        caty05_tables = load_json(ROOT / "data" / "caty05_calculated_tables.json") if (ROOT / "data" / "caty05_calculated_tables.json").exists() else {}
-        caty06_tables = load_json(ROOT / "data" / "caty06_deposits_funding.json") if (ROOT / "data" / "caty06_deposits_funding.json").exists() else {}
-        caty07_tables = load_json(ROOT / "data" / "caty07_credit_quality.json") if (ROOT / "data" / "caty07_credit_quality.json").exists() else {}
-        caty08_tables = load_json(ROOT / "data" / "caty08_cre_exposure.json") if (ROOT / "data" / "caty08_cre_exposure.json").exists() else {}
-        caty09_tables = load_json(ROOT / "data" / "caty09_capital_liquidity.json") if (ROOT / "data" / "caty09_capital_liquidity.json").exists() else {}
-        caty10_tables = load_json(ROOT / "data" / "caty10_capital_actions.json") if (ROOT / "data" / "caty10_capital_actions.json").exists() else {}
-        caty12_tables = load_json(ROOT / "data" / "caty12_calculated_tables.json") if (ROOT / "data" / "caty12_calculated_tables.json").exists() else {}
-        caty11_tables = load_json(ROOT / "data" / "caty11_peers_normalized.json") if (ROOT / "data" / "caty11_peers_normalized.json").exists() else {}
-        caty13_tables = load_json(ROOT / "data" / "caty13_residual_income.json") if (ROOT / "data" / "caty13_residual_income.json").exists() else {}
-        caty14_tables = load_json(ROOT / "data" / "caty14_monte_carlo.json") if (ROOT / "data" / "caty14_monte_carlo.json").exists() else {}
-        caty16_tables = load_json(ROOT / "data" / "caty16_coe_triangulation.json") if (ROOT / "data" / "caty16_coe_triangulation.json").exists() else {}
-        caty15_tables = load_json(ROOT / "data" / "caty15_esg_materiality.json") if (ROOT / "data" / "caty15_esg_materiality.json").exists() else {}
-        caty17_tables = load_json(ROOT / "data" / "caty17_esg_kpi.json") if (ROOT / "data" / "caty17_esg_kpi.json").exists() else {}
-        recent_developments = load_json(ROOT / "data" / "recent_developments.json") if (ROOT / "data" / "recent_developments.json").exists() else {}
-        catalysts_path = ROOT / "data" / "catalysts.json"
-        catalysts = load_json(catalysts_path) if catalysts_path.exists() else {}
-        peers_path = ROOT / "data" / "caty11_peers_normalized.json"
-        peers = load_json(peers_path) if peers_path.exists() else {}
-        history_path = ROOT / "data" / "historical_context.json"
-        historical_context = load_json(history_path) if history_path.exists() else {}
-        industry_path = ROOT / "data" / "industry_analysis.json"
-        industry_analysis = load_json(industry_path) if industry_path.exists() else {}
-        esg_path = ROOT / "data" / "esg_assessment.json"
-        esg_assessment = load_json(esg_path) if esg_path.exists() else {}
-
-        report_metadata = market.get("report_metadata") or {}
-        caty01_changed = False
-        prepared_on = report_metadata.get("report_date")
-        last_updated_ts = report_metadata.get("last_updated_utc") or market.get("report_generated")
-        if caty01_tables:
-            caty01_meta = caty01_tables.setdefault("metadata", {})
-            if prepared_on and caty01_meta.get("prepared_on") != prepared_on:
-                caty01_meta["prepared_on"] = prepared_on
-                caty01_changed = True
-            if last_updated_ts and caty01_tables.get("last_updated") != last_updated_ts:
-                caty01_tables["last_updated"] = last_updated_ts
-                caty01_changed = True
-        if caty01_changed and caty01_path.exists():
-            original_text = caty01_path.read_text(encoding="utf-8")
-            updated_text = original_text
-            if prepared_on:
-                updated_text = re.sub(
-                    r'("prepared_on":\s*")[^"]+(")',
-                    r'\g<1>' + prepared_on + r'\g<2>',
-                    updated_text,
-                    count=1,
-                )
-            if last_updated_ts:
-                updated_text = re.sub(
-                    r'("last_updated":\s*")[^"]+(")',
-                    r'\g<1>' + last_updated_ts + r'\g<2>',
-                    updated_text,
-                    count=1,
-                )
-            if updated_text != original_text:
-                caty01_path.write_text(updated_text, encoding="utf-8")
-
-        context = {
-            "market": market,
-            "valuation": valuation_lookup,
-            "executive": exec_cfg,
-            "valuation_outputs": valuation_outputs,
-            "module_metadata": module_metadata,
-            "calculated_metrics": market.get("calculated_metrics", {}),
-            "narrative_prose": market.get("narrative_prose", {}),
-            "recent_developments": recent_developments,
-            "catalysts": catalysts,
-            "peers": peers,
-            "historical_context": historical_context,
-            "industry_analysis": industry_analysis,
-            "esg_assessment": esg_assessment,
-            "caty01_tables": caty01_tables,
-            "caty02_tables": caty02_tables,
-            "caty03_tables": caty03_tables,
-            "caty04_tables": caty04_tables,
-            "caty05_tables": caty05_tables,
-            "caty06_tables": caty06_tables,
-            "caty07_tables": caty07_tables,
-            "caty08_tables": caty08_tables,
-            "caty09_tables": caty09_tables,
-            "caty10_tables": caty10_tables,
-            "caty12_tables": caty12_tables,
-            "caty11_tables": caty11_tables,
-            "caty13_tables": caty13_tables,
-            "caty14_tables": caty14_tables,
-            "caty16_tables": caty16_tables,
-            "caty15_tables": caty15_tables,
-            "caty17_tables": caty17_tables,
-        }
+# ---------------------------------------------------------------------------
+# Chart data bundles
+# ---------------------------------------------------------------------------
 
-        timestamps = render_timestamps()
-        context.update(timestamps)
-        narrative_placeholders = build_narrative_replacements(market, timestamps)
-        context["narrative_placeholders"] = narrative_placeholders
-
-        html = replace_section(html, "page-title", render_page_title(timestamps["report_date"]))
-        html = replace_section(html, "report-meta", render_report_meta(timestamps, market))
-        html = replace_section(html, "price-refresh-banner", render_price_refresh_banner(market))
-        html = replace_section(html, "footer-timestamp", render_footer_timestamp(timestamps))
-        html = replace_section(html, "company-overview", render_company_overview(context))
-        html = replace_section(html, "industry-analysis", render_industry_analysis(context))
-        html = replace_section(html, "esg-assessment", render_esg_assessment(context))
-        html = replace_section(html, "investment-thesis-summary", render_investment_thesis(context, narrative_placeholders))
-        html = replace_section(html, "key-findings-bullets", render_key_findings(narrative_placeholders))
-        html = replace_section(html, "valuation-framework-caption", render_price_target_caption(narrative_placeholders))
+class _TableRowParser(HTMLParser):
+    """Collect the text of every <td> per <tr> (nested markup flattened)."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.rows: list[list[str]] = []
+        self._row: list[str] | None = None
+        self._cell: list[str] | None = None
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        if tag == "tr":
+            self._row = []
+        elif tag == "td" and self._row is not None:
+            self._cell = []
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "td" and self._cell is not None and self._row is not None:
+            self._row.append("".join(self._cell).strip())
+            self._cell = None
+        elif tag == "tr" and self._row is not None:
+            self.rows.append(self._row)
+            self._row = None
+
+    def handle_data(self, data: str) -> None:
+        if self._cell is not None:
+            self._cell.append(data)
+
+
+def parse_annual_nco_rows(history_html: str | None) -> list[Dict[str, Any]]:
+    """Year rows (period, bps, context) from caty07 ``history_rows_html``."""
+    if not history_html:
+        return []
+    parser = _TableRowParser()
+    parser.feed(history_html)
+    parser.close()
+    rows: list[Dict[str, Any]] = []
+    for cells in parser.rows:
+        if len(cells) < 2 or not re.fullmatch(r"\d{4}", cells[0]):
+            continue
+        match = re.match(r"-?(?:\d+\.?\d*|\.\d+)", re.sub(r"[^0-9.\-]", "", cells[1]))
+        if not match:
+            continue
+        rows.append({"period": cells[0], "value": float(match.group(0)), "context": cells[2] if len(cells) > 2 else ""})
+    return rows
+
+
+def first_number(*values: Any) -> float | None:
+    for value in values:
+        number = safe_to_float(value)
+        if number is not None:
+            return number
+    return None
+
+
+def downsample_series(labels: list, values: list, max_points: int = CHART_MAX_POINTS) -> tuple[list, list]:
+    """Largest-triangle-three-buckets downsampling; keeps endpoints and peaks."""
+    count = len(values)
+    if count <= max_points or max_points < 3 or any(safe_to_float(value) is None for value in values):
+        return list(labels), list(values)
+    ys = [float(value) for value in values]
+    keep = [0]
+    bucket = (count - 2) / (max_points - 2)
+    anchor = 0
+    for index in range(max_points - 2):
+        start = int(index * bucket) + 1
+        end = int((index + 1) * bucket) + 1
+        next_end = min(int((index + 2) * bucket) + 1, count)
+        avg_x = (end + next_end - 1) / 2
+        avg_y = sum(ys[end:next_end]) / (next_end - end)
+        best, best_area = start, -1.0
+        for candidate in range(start, end):
+            area = abs((anchor - avg_x) * (ys[candidate] - ys[anchor]) - (anchor - candidate) * (avg_y - ys[anchor]))
+            if area > best_area:
+                best, best_area = candidate, area
+        keep.append(best)
+        anchor = best
+    keep.append(count - 1)
+    return [labels[i] for i in keep], [values[i] for i in keep]
+
+
+def bundle_nco_time_series(context: Dict[str, Any]) -> Dict[str, Any]:
+    """nco-time-series.js: annual history rows, plotted quarters and reference lines."""
+    credit = context.get("caty07_tables") or {}
+    through_cycle = credit.get("through_cycle_nco") or {}
+    snapshot = credit.get("snapshot_metrics") or {}
+    fdic = load_json(FDIC_NCO_HISTORY_PATH) if FDIC_NCO_HISTORY_PATH.exists() else {}
+    lookup = {row.get("date"): safe_to_float(row.get("nco_bps")) for row in fdic.get("raw_data") or []}
+    return {
+        "references": {
+            "through_cycle": first_number(through_cycle.get("guardrail_mean_bps"), snapshot.get("stress_guardrail_nco_bps"), 42.8),
+            "normalized": first_number(through_cycle.get("prob90_post2014_bps"), snapshot.get("through_cycle_nco_bps"), 30.0),
+            "current": first_number(snapshot.get("nco_rate_ltm_bps"), snapshot.get("nco_rate_qtd_bps"), 18.1),
+            "gfc_peak": first_number(through_cycle.get("gfc_peak_bps"), 234.4),
+        },
+        "annual": parse_annual_nco_rows(through_cycle.get("history_rows_html")),
+        "quarterly": [
+            {"period": period, "value": lookup[period]}
+            for period in NCO_QUARTERS_TO_PLOT
+            if lookup.get(period) is not None
+        ],
+    }
+
+
+def bundle_nco_trend(context: Dict[str, Any]) -> Dict[str, Any]:
+    """charts.js initNCOChart: FDIC quarterly NCO series."""
+    fdic = load_json(FDIC_NCO_HISTORY_PATH) if FDIC_NCO_HISTORY_PATH.exists() else {}
+    labels, values = downsample_series(fdic.get("labels") or [], fdic.get("values") or [])
+    return {"labels": labels, "values": values}
+
+
+def bundle_valuation_summary(context: Dict[str, Any]) -> Dict[str, Any]:
+    """charts.js initValuationChart: spot vs probability-weighted, Gordon and MC median."""
+    market = context.get("market") or {}
+    normalized = (market.get("calculated_metrics") or {}).get("target_normalized")
+    outlook = load_json(PROBABILISTIC_OUTLOOK_PATH) if PROBABILISTIC_OUTLOOK_PATH.exists() else {}
+    monte_carlo = (context.get("caty14_tables") or {}).get("simulation_summary") or {}
+    return {
+        "labels": ["Current Price", "Probability-weighted", "Normalized Gordon", "Monte Carlo Median"],
+        "values": [
+            market.get("price"),
+            (outlook.get("expected") or {}).get("price") or normalized,
+            normalized,
+            monte_carlo.get("target_median") or normalized,
+        ],
+    }
+
+
+def bundle_monte_carlo(context: Dict[str, Any]) -> Dict[str, Any]:
+    """monte-carlo-distribution.js: run summary, 95% interval and probability bands."""
+    caty14 = context.get("caty14_tables") or {}
+    summary = caty14.get("simulation_summary") or {}
+    interval = caty14.get("confidence_interval") or {}
+    return {
+        "simulation_summary": {
+            key: summary.get(key)
+            for key in ("num_runs", "target_median", "target_mean", "spot_price", "loss_probability_pct")
+        },
+        "confidence_interval": {key: interval.get(key) for key in ("lower_price", "upper_price")},
+        "probability_bands": [
+            {key: band.get(key) for key in ("band", "probability", "interpretation")}
+            for band in (caty14.get("tables") or {}).get("probability_bands") or []
+        ],
+    }
+
+
+def bundle_capital_stress(context: Dict[str, Any]) -> Dict[str, Any]:
+    """capital-stress.js: stress waterfall plus regulatory CET1 thresholds."""
+    caty09 = context.get("caty09_tables") or {}
+    stress = caty09.get("capital_stress_waterfall") or {}
+    regulatory = caty09.get("regulatory_capital_q3_2025") or {}
+    return {
+        "capital_stress_waterfall": {
+            "starting_cet1_pct": stress.get("starting_cet1_pct"),
+            "ending_cet1_pct": stress.get("ending_cet1_pct"),
+            "regulatory_minimum_cet1_pct": stress.get("regulatory_minimum_cet1_pct"),
+            "buffer_vs_regulatory_ppts": stress.get("buffer_vs_regulatory_ppts"),
+            "buffer_vs_well_capitalized_ppts": stress.get("buffer_vs_well_capitalized_ppts"),
+            "status": stress.get("status"),
+            "note": stress.get("note"),
+            "components": [
+                {key: component.get(key) for key in ("label", "impact_ppts", "assumptions", "category")}
+                for component in stress.get("components") or []
+            ],
+        },
+        "regulatory_capital_q3_2025": {
+            key: regulatory.get(key) for key in ("regulatory_minimum_cet1_pct", "well_capitalized_cet1_pct")
+        },
+    }
+
+
+BUNDLE_BUILDERS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "nco_time_series": bundle_nco_time_series,
+    "nco_trend": bundle_nco_trend,
+    "valuation_summary": bundle_valuation_summary,
+    "monte_carlo": bundle_monte_carlo,
+    "capital_stress": bundle_capital_stress,
+}
+
+
+def render_chart_bundle(page: Path, context: Dict[str, Any]) -> str:
+    """Write the page's content-hashed bundle and return the tag that preloads it."""
+    payload = {name: BUNDLE_BUILDERS[name](context) for name in CHART_BUNDLES[page.name]}
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    digest = hashlib.sha256(body.encode("utf-8")).hexdigest()[:12]
+    bundle_path = BUNDLE_DIR / f"{page.stem}.{digest}.json"
+    if not bundle_path.exists():
+        BUNDLE_DIR.mkdir(parents=True, exist_ok=True)
+        write_text_atomic(bundle_path, body)
+    for stale in BUNDLE_DIR.glob(f"{page.stem}.*.json"):
+        if stale != bundle_path:
+            stale.unlink()
+    href = bundle_path.relative_to(ROOT).as_posix()
+    return (
+        f'<link rel="preload" href="{href}" as="fetch" type="application/json" crossorigin data-chart-bundle>\n'
+        '<script src="scripts/chart-bundle.js"></script>'
+    )
+
+
+def load_site_context() -> tuple[TrackingContext, Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    """Load every data source the renderers use; returns (context, methods, exec, modules)."""
+    market = load_json(ROOT / "data" / "market_data_current.json")
+    methods_cfg = load_json(ROOT / "data" / "valuation_methods.json")
+    exec_cfg = load_json(EXEC_METRICS_PATH)
+    module_cfg = load_json(MODULE_SECTIONS_PATH) if MODULE_SECTIONS_PATH.exists() else {"modules": []}
+    module_metadata = load_json(ROOT / "data" / "module_metadata.json") if (ROOT / "data" / "module_metadata.json").exists() else {"modules": []}
+    for module in module_metadata.get("modules", []):
+        last_updated = module.get("last_updated")
+        if last_updated:
+            module["last_updated_formatted"] = format_date_value(last_updated, "long")
+    valuation_outputs = load_json(VALUATION_OUTPUTS_PATH) if VALUATION_OUTPUTS_PATH.exists() else {}
+
+    valuation_lookup = {"methods": {m["id"]: m for m in methods_cfg.get("methods", [])}, "config": methods_cfg}
+    caty01_path = ROOT / "data" / "caty01_company_profile.json"
+    caty01_tables = load_json(caty01_path) if caty01_path.exists() else {}
+    caty02_tables = load_json(ROOT / "data" / "caty02_income_statement.json") if (ROOT / "data" / "caty02_income_statement.json").exists() else {}
+    caty03_tables = load_json(ROOT / "data" / "caty03_balance_sheet.json") if (ROOT / "data" / "caty03_balance_sheet.json").exists() else {}
+    caty04_tables = load_json(ROOT / "data" / "caty04_cash_flow.json") if (ROOT / "data" / "caty04_cash_flow.json").exists() else {}
+    caty05_tables = load_json(ROOT / "data" / "caty05_calculated_tables.json") if (ROOT / "data" / "caty05_calculated_tables.json").exists() else {}
+    caty06_tables = load_json(ROOT / "data" / "caty06_deposits_funding.json") if (ROOT / "data" / "caty06_deposits_funding.json").exists() else {}
+    caty07_tables = load_json(ROOT / "data" / "caty07_credit_quality.json") if (ROOT / "data" / "caty07_credit_quality.json").exists() else {}
+    caty08_tables = load_json(ROOT / "data" / "caty08_cre_exposure.json") if (ROOT / "data" / "caty08_cre_exposure.json").exists() else {}
+    caty09_tables = load_json(ROOT / "data" / "caty09_capital_liquidity.json") if (ROOT / "data" / "caty09_capital_liquidity.json").exists() else {}
+    caty10_tables = load_json(ROOT / "data" / "caty10_capital_actions.json") if (ROOT / "data" / "caty10_capital_actions.json").exists() else {}
+    caty12_tables = load_json(ROOT / "data" / "caty12_calculated_tables.json") if (ROOT / "data" / "caty12_calculated_tables.json").exists() else {}
+    caty11_tables = load_json(ROOT / "data" / "caty11_peers_normalized.json") if (ROOT / "data" / "caty11_peers_normalized.json").exists() else {}
+    caty13_tables = load_json(ROOT / "data" / "caty13_residual_income.json") if (ROOT / "data" / "caty13_residual_income.json").exists() else {}
+    caty14_tables = load_json(ROOT / "data" / "caty14_monte_carlo.json") if (ROOT / "data" / "caty14_monte_carlo.json").exists() else {}
+    caty16_tables = load_json(ROOT / "data" / "caty16_coe_triangulation.json") if (ROOT / "data" / "caty16_coe_triangulation.json").exists() else {}
+    caty15_tables = load_json(ROOT / "data" / "caty15_esg_materiality.json") if (ROOT / "data" / "caty15_esg_materiality.json").exists() else {}
+    caty17_tables = load_json(ROOT / "data" / "caty17_esg_kpi.json") if (ROOT / "data" / "caty17_esg_kpi.json").exists() else {}
+    recent_developments = load_json(ROOT / "data" / "recent_developments.json") if (ROOT / "data" / "recent_developments.json").exists() else {}
+    catalysts_path = ROOT / "data" / "catalysts.json"
+    catalysts = load_json(catalysts_path) if catalysts_path.exists() else {}
+    peers_path = ROOT / "data" / "caty11_peers_normalized.json"
+    peers = load_json(peers_path) if peers_path.exists() else {}
+    history_path = ROOT / "data" / "historical_context.json"
+    historical_context = load_json(history_path) if history_path.exists() else {}
+    industry_path = ROOT / "data" / "industry_analysis.json"
+    industry_analysis = load_json(industry_path) if industry_path.exists() else {}
+    esg_path = ROOT / "data" / "esg_assessment.json"
+    esg_assessment = load_json(esg_path) if esg_path.exists() else {}
+
+    report_metadata = market.get("report_metadata") or {}
+    caty01_changed = False
+    prepared_on = report_metadata.get("report_date")
+    last_updated_ts = report_metadata.get("last_updated_utc") or market.get("report_generated")
+    if caty01_tables:
+        caty01_meta = caty01_tables.setdefault("metadata", {})
+        if prepared_on and caty01_meta.get("prepared_on") != prepared_on:
+            caty01_meta["prepared_on"] = prepared_on
+            caty01_changed = True
+        if last_updated_ts and caty01_tables.get("last_updated") != last_updated_ts:
+            caty01_tables["last_updated"] = last_updated_ts
+            caty01_changed = True
+    if caty01_changed and caty01_path.exists():
+        original_text = caty01_path.read_text(encoding="utf-8")
+        updated_text = original_text
+        if prepared_on:
+            updated_text = re.sub(
+                r'("prepared_on":\s*")[^"]+(")',
+                r'\g<1>' + prepared_on + r'\g<2>',
+                updated_text,
+                count=1,
+            )
+        if last_updated_ts:
+            updated_text = re.sub(
+                r'("last_updated":\s*")[^"]+(")',
+                r'\g<1>' + last_updated_ts + r'\g<2>',
+                updated_text,
+                count=1,
+            )
+        if updated_text != original_text:
+            write_text_atomic(caty01_path, updated_text)
+
+    context = TrackingContext({
+        "market": market,
+        "valuation": valuation_lookup,
+        "executive": exec_cfg,
+        "valuation_outputs": valuation_outputs,
+        "module_metadata": module_metadata,
+        "calculated_metrics": market.get("calculated_metrics", {}),
+        "narrative_prose": market.get("narrative_prose", {}),
+        "recent_developments": recent_developments,
+        "catalysts": catalysts,
+        "peers": peers,
+        "historical_context": historical_context,
+        "industry_analysis": industry_analysis,
+        "esg_assessment": esg_assessment,
+        "caty01_tables": caty01_tables,
+        "caty02_tables": caty02_tables,
+        "caty03_tables": caty03_tables,
+        "caty04_tables": caty04_tables,
+        "caty05_tables": caty05_tables,
+        "caty06_tables": caty06_tables,
+        "caty07_tables": caty07_tables,
+        "caty08_tables": caty08_tables,
+        "caty09_tables": caty09_tables,
+        "caty10_tables": caty10_tables,
+        "caty12_tables": caty12_tables,
+        "caty11_tables": caty11_tables,
+        "caty13_tables": caty13_tables,
+        "caty14_tables": caty14_tables,
+        "caty16_tables": caty16_tables,
+        "caty15_tables": caty15_tables,
+        "caty17_tables": caty17_tables,
+    })
+
+    timestamps = render_timestamps()
+    context.update(timestamps)
+    context["narrative_placeholders"] = build_narrative_replacements(market, timestamps)
+    return context, methods_cfg, exec_cfg, module_cfg
+
+
+SectionRenderer = tuple[str, Callable[[], str]]
+
+
+def index_section_renderers(context: Dict[str, Any], exec_cfg: Dict[str, Any]) -> list[SectionRenderer]:
+    """(marker, render) pairs for index.html in build order; later pairs win."""
+
+    def timestamps() -> Dict[str, str]:
+        return {key: context[key] for key in ("report_date", "report_date_iso", "last_updated_utc", "generated_at_utc")}
+
+    def placeholders() -> Dict[str, str]:
+        return context["narrative_placeholders"]
+
+    renderers: list[SectionRenderer] = [
+        ("page-title", lambda: render_page_title(context["report_date"])),
+        ("report-meta", lambda: render_report_meta(timestamps(), context["market"])),
+        ("price-refresh-banner", lambda: render_price_refresh_banner(context["market"])),
+        ("footer-timestamp", lambda: render_footer_timestamp(timestamps())),
+        ("company-overview", lambda: render_company_overview(context)),
+        ("industry-analysis", lambda: render_industry_analysis(context)),
+        ("esg-assessment", lambda: render_esg_assessment(context)),
+        ("investment-thesis-summary", lambda: render_investment_thesis(context, placeholders())),
+        ("key-findings-bullets", lambda: render_key_findings(placeholders())),
+        ("valuation-framework-caption", lambda: render_price_target_caption(placeholders())),
         # Populate both the above-the-fold price-target grid and the deeper valuation grid
-        html = replace_section(html, "price-target-grid", render_price_target_grid(narrative_placeholders))
-        html = replace_section(html, "valuation-framework-grid", render_price_target_grid(narrative_placeholders))
-        html = replace_section(html, "valuation-deep-dive", render_valuation_deep_dive(context))
-        html = replace_section(html, "scenario-analysis-table", render_scenario_analysis_table(context))
-        html = replace_section(html, "positive-catalysts", render_positive_catalysts(context))
-        html = replace_section(html, "peer-positioning", render_peer_positioning(context))
-        html = replace_section(html, "financial-analysis-summary", render_financial_analysis_summary(context))
-        html = replace_section(html, "liquidity-summary", render_liquidity_summary(context))
-        html = replace_section(html, "scenario-analysis-narrative", render_scenario_analysis_narrative(context))
-        html = replace_section(html, "monte-carlo-summary", render_monte_carlo_summary(context))
-        html = replace_section(html, "sensitivity-table", render_sensitivity_scaffold())
-        html = replace_section(html, "historical-context", render_historical_context(context))
-        html = replace_section(html, "recent-developments-section", render_recent_developments_section(recent_developments, narrative_placeholders))
-        html = replace_section(html, "investment-risks-bullets", render_investment_risks_section(context, narrative_placeholders))
-        html = replace_section(html, "investment-recommendation", render_investment_recommendation(context))
-
-        reconciliation_html = build_reconciliation_table()
-        html = replace_section(html, "reconciliation-dashboard", reconciliation_html)
-
-        module_grid_html = render_module_grid()
-        html = replace_section(html, "module-grid", module_grid_html)
-
-        evidence_html = render_evidence_table()
-        html = replace_section(html, "evidence-provenance", evidence_html)
-
-        for section in exec_cfg.get("sections", []):
-            marker = section["marker"]
-            section_html = render_cards(section, context)
-            html = replace_section(html, marker, section_html)
-
-        price_target_cfg = exec_cfg.get("price_target")
-        if price_target_cfg:
+        ("price-target-grid", lambda: render_price_target_grid(placeholders())),
+        ("valuation-framework-grid", lambda: render_price_target_grid(placeholders())),
+        ("valuation-deep-dive", lambda: render_valuation_deep_dive(context)),
+        ("scenario-analysis-table", lambda: render_scenario_analysis_table(context)),
+        ("positive-catalysts", lambda: render_positive_catalysts(context)),
+        ("peer-positioning", lambda: render_peer_positioning(context)),
+        ("financial-analysis-summary", lambda: render_financial_analysis_summary(context)),
+        ("liquidity-summary", lambda: render_liquidity_summary(context)),
+        ("scenario-analysis-narrative", lambda: render_scenario_analysis_narrative(context)),
+        ("monte-carlo-summary", lambda: render_monte_carlo_summary(context)),
+        ("sensitivity-table", render_sensitivity_scaffold),
+        ("historical-context", lambda: render_historical_context(context)),
+        ("recent-developments-section", lambda: render_recent_developments_section(context["recent_developments"], placeholders())),
+        ("investment-risks-bullets", lambda: render_investment_risks_section(context, placeholders())),
+        ("investment-recommendation", lambda: render_investment_recommendation(context)),
+        ("reconciliation-dashboard", build_reconciliation_table),
+        ("module-grid", render_module_grid),
+        ("evidence-provenance", render_evidence_table),
+    ]
+
+    for section in exec_cfg.get("sections", []):
+        renderers.append((section["marker"], lambda section=section: render_cards(section, context)))
+
+    price_target_cfg = exec_cfg.get("price_target")
+    if price_target_cfg:
+
+        def render_price_target() -> str:
             # Ensure gating-aware rendering for above-the-fold price target grid
             if publication_gate_active():
-                price_html = render_price_target_grid(narrative_placeholders)
-            else:
-                price_html = render_cards(price_target_cfg, context)
-            html = replace_section(html, price_target_cfg["marker"], price_html)
+                return render_price_target_grid(placeholders())
+            return render_cards(price_target_cfg, context)
+
+        renderers.append((price_target_cfg["marker"], render_price_target))
+    return renderers
+
+
+def module_section_renderers(module_entry: Dict[str, Any], context: Dict[str, Any]) -> list[SectionRenderer]:
+    module_context = TrackingContext(context)
+    module_context["module"] = module_entry.get("data", {})
+    return [
+        (section["marker"], lambda section=section: render_module_section(section, module_context))
+        for section in module_entry.get("sections", [])
+    ]
+
 
-        INDEX_PATH.write_text(html, encoding="utf-8")
+def site_pages(context: Dict[str, Any], exec_cfg: Dict[str, Any], module_cfg: Dict[str, Any]) -> Dict[Path, list[SectionRenderer]]:
+    pages = {INDEX_PATH: index_section_renderers(context, exec_cfg)}
+    for module_entry in module_cfg.get("modules", []):
+        module_path = ROOT / module_entry["file"]
+        if not module_path.exists():
+            raise FileNotFoundError(f"Module file '{module_entry['file']}' not found")
+        pages[module_path] = module_section_renderers(module_entry, context)
+    for page, renderers in pages.items():
+        if page.name in CHART_BUNDLES:
+            renderers.append((BUNDLE_MARKER, lambda page=page: render_chart_bundle(page, context)))
+    return pages
 
-        for module_entry in module_cfg.get("modules", []):
-            module_path = ROOT / module_entry["file"]
-            if not module_path.exists():
-                raise FileNotFoundError(f"Module file '{module_entry['file']}' not found")
 
-            module_html = module_path.read_text(encoding="utf-8")
-            module_context = dict(context)
-            module_context["module"] = module_entry.get("data", {})
+def render_sections(html: str, renderers: Iterable[SectionRenderer]) -> str:
+    for marker, render in renderers:
+        html = replace_section(html, marker, render())
+    return html
 
-            for module_section in module_entry.get("sections", []):
-                rendered_section = render_module_section(module_section, module_context)
-                module_html = replace_section(module_html, module_section["marker"], rendered_section)
 
-            module_path.write_text(module_html, encoding="utf-8")
+def page_key(path: Path) -> str:
+    return path.relative_to(ROOT).as_posix()
+
+
+def main(test_mode: bool = False) -> int:
+    _RENDERED_SECTIONS.clear()
+    try:
+        context, methods_cfg, exec_cfg, module_cfg = load_site_context()
+        sections_by_file: Dict[str, Dict[str, str]] = {}
+        file_hashes: Dict[str, str] = {}
+        for page, renderers in site_pages(context, exec_cfg, module_cfg).items():
+            html = render_sections(page.read_text(encoding="utf-8"), renderers)
+            write_text_atomic(page, html)
+            sections_by_file[page_key(page)] = drain_rendered_sections()
+            file_hashes[page_key(page)] = hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+        write_json(
+            PUBLISHED_NUMBERS_PATH,
+            build_published_manifest(context["market"], methods_cfg, sections_by_file, file_hashes),
+        )
 
         append_log(
             "build_site.py completed: reconciliation-dashboard, module-grid, evidence-provenance, executive-dashboard, price-target, module-pages updated",
@@ -3154,9 +3603,170 @@ def main(test_mode: bool = False) -> int:
         raise
 
 
+class SiteWatcher:
+    """Incremental rebuilds: re-render only sections whose recorded inputs changed.
+
+    Every section render is wrapped in :func:`track_dependencies`, so each
+    (page, marker) remembers the data files it read and the context keys it
+    touched. On a change batch the context is rebuilt from the JSON memo (only
+    modified files are re-parsed), keys whose values differ are diffed out, and
+    just the sections depending on a changed file or key are re-rendered.
+    Editing executive_metrics.json or module_sections.json changes the set of
+    sections itself and triggers a full in-memory rebuild.
+    """
+
+    STRUCTURE_FILES = (EXEC_METRICS_PATH, MODULE_SECTIONS_PATH)
+
+    def __init__(self, test_mode: bool = False) -> None:
+        self.test_mode = test_mode
+        self.context: Dict[str, Any] = {}
+        self.methods_cfg: Dict[str, Any] = {}
+        self.renderers: Dict[Path, list[SectionRenderer]] = {}
+        self.pages: Dict[Path, str] = {}
+        self.sections: Dict[Path, Dict[str, str]] = {}
+        self.dependencies: Dict[Path, Dict[str, set]] = {}
+        self.manifest: Dict[str, Any] | None = None
+        self.pending: set[Path] = set()
+        self.signatures: Dict[Path, Any] = {}
+        self.loaded: set = set()
+
+    def _load(self) -> None:
+        with track_dependencies() as loaded:
+            self.context, self.methods_cfg, exec_cfg, module_cfg = load_site_context()
+        self.loaded = {path for path in loaded if isinstance(path, Path)}
+        self.renderers = site_pages(self.context, exec_cfg, module_cfg)
+
+    def _render(self, page: Path, markers: set[str] | None = None) -> list[str]:
+        html = self.pages[page]
+        fresh: Dict[str, set] = {}
+        for marker, render in self.renderers[page]:
+            if markers is not None and marker not in markers:
+                continue
+            # A marker filled by several renderers depends on all of them.
+            with track_dependencies() as deps:
+                content = render()
+            fresh.setdefault(marker, set()).update(deps)
+            html = replace_section(html, marker, content)
+        self.pages[page] = html
+        self.dependencies[page].update(fresh)
+        self.sections[page].update(drain_rendered_sections())
+        return list(fresh)
+
+    def _publish(self) -> list[Path]:
+        written = []
+        for page, html in self.pages.items():
+            if page.read_text(encoding="utf-8") != html:
+                write_text_atomic(page, html)
+                written.append(page)
+        manifest = build_published_manifest(
+            self.context["market"],
+            self.methods_cfg,
+            {page_key(page): sections for page, sections in self.sections.items()},
+            {page_key(page): hashlib.sha256(html.encode("utf-8")).hexdigest() for page, html in self.pages.items()},
+        )
+        comparable = {key: value for key, value in manifest.items() if key != "generated_at"}
+        if comparable != self.manifest or not PUBLISHED_NUMBERS_PATH.exists():
+            write_json(PUBLISHED_NUMBERS_PATH, manifest)
+            self.manifest = comparable
+        # Signatures of every input as rendered; events that leave a file
+        # untouched (e.g. a touch-free rewrite) are dropped against these.
+        inputs = {dep for deps_by_marker in self.dependencies.values() for deps in deps_by_marker.values() for dep in deps if isinstance(dep, Path)}
+        self.signatures = {path: file_signature(path) for path in inputs | self.loaded}
+        return written
+
+    def build(self) -> Dict[str, list[str]]:
+        """Full render of every page; records each section's dependencies."""
+        _RENDERED_SECTIONS.clear()
+        self._load()
+        self.pages = {page: page.read_text(encoding="utf-8") for page in self.renderers}
+        self.sections = {page: {} for page in self.renderers}
+        self.dependencies = {page: {} for page in self.renderers}
+        rendered = {page_key(page): self._render(page) for page in self.renderers}
+        self._publish()
+        return rendered
+
+    def is_unchanged(self, path: Path) -> bool:
+        """True for our own writes echoing back and for paths no section reads."""
+        signature = file_signature(path)
+        if path in _OWN_WRITES and _OWN_WRITES[path] == signature:
+            return True
+        return path not in self.signatures or self.signatures[path] == signature
+
+    def refresh(self, changed: Iterable[Path]) -> Dict[str, list[str]]:
+        """Apply a batch of changed paths; returns re-rendered markers per page."""
+        self.pending.update(Path(path) for path in changed if not self.is_unchanged(Path(path)))
+        if not self.pending:
+            return {}
+        if self.pending & set(self.STRUCTURE_FILES):
+            rendered = self.build()
+            self.pending.clear()
+            return rendered
+
+        previous_context = dict(self.context)
+        writes_before = dict(_OWN_WRITES)
+        self._load()
+        # Stamps written while loading (market metadata, caty01) happened
+        # before any section renders, so they count as inputs of this batch.
+        stamped = {path for path, signature in _OWN_WRITES.items() if writes_before.get(path) != signature}
+        changed_keys = {
+            key
+            for key in previous_context.keys() | self.context.keys()
+            if previous_context.get(key) != dict.get(self.context, key)
+        }
+        triggers = self.pending | stamped | changed_keys
+
+        rendered: Dict[str, list[str]] = {}
+        for page, deps_by_marker in self.dependencies.items():
+            dirty = {marker for marker, deps in deps_by_marker.items() if deps & triggers}
+            if dirty:
+                rendered[page_key(page)] = self._render(page, dirty)
+        self._publish()
+        self.pending.clear()
+        return rendered
+
+    def run(self, poll_interval: float = 0.25, backend: str = "auto") -> int:
+        start = time.perf_counter()
+        rendered = self.build()
+        watcher = open_watcher(WATCH_DIRS, poll_interval=poll_interval, backend=backend)
+        section_count = sum(len(markers) for markers in rendered.values())
+        print(
+            f"✓ Built {len(rendered)} pages ({section_count} sections) in {time.perf_counter() - start:.2f}s; "
+            f"watching data/ and analysis/ via {watcher.backend} (Ctrl+C to stop)"
+        )
+        try:
+            while True:
+                changed = watcher.wait(timeout=None)
+                start = time.perf_counter()
+                try:
+                    rendered = self.refresh(changed)
+                except Exception as exc:  # noqa: BLE001 - keep watching after a bad edit
+                    print(f"❌ Rebuild failed: {exc}")
+                    append_log(f"build_site.py --watch rebuild FAILED: {exc}", test_mode=self.test_mode)
+                    continue
+                if not rendered:
+                    continue
+                summary = "; ".join(f"{page}: {', '.join(markers)}" for page, markers in rendered.items())
+                print(f"✓ Re-rendered in {time.perf_counter() - start:.2f}s — {summary}")
+                append_log(f"build_site.py --watch re-rendered {summary}", test_mode=self.test_mode)
+        except KeyboardInterrupt:
+            return 0
+        finally:
+            watcher.close()
+
+
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description="Build site sections from data sources")
     parser.add_argument("--test-mode", action="store_true", help="Run in test mode (skip logging)")
+    parser.add_argument("--watch", action="store_true", help="Stay running and re-render sections when data files change")
+    parser.add_argument("--poll-interval", type=float, default=0.25, help="Seconds between scans when polling (default: 0.25)")
+    parser.add_argument(
+        "--watch-backend",
+        choices=("auto", "inotify", "poll"),
+        default="auto",
+        help="File change backend for --watch (default: inotify, falling back to polling)",
+    )
     args = parser.parse_args()
+    if args.watch:
+        sys.exit(SiteWatcher(test_mode=args.test_mode).run(poll_interval=args.poll_interval, backend=args.watch_backend))
     sys.exit(main(test_mode=args.test_mode))
@@ -9,7 +9,6 @@ market_data_current.json.
 
 from __future__ import annotations
 
-import json
 from copy import deepcopy
 from datetime import datetime, timezone
 from pathlib import Path
@@ -21,7 +20,9 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+from analysis.data_io import load_json, write_json
 from analysis.probability_weighted_valuation import calculate_wilson_weighted
+from analysis.residual_income import DDM_ANCHOR, IRC_WEIGHTS, ddm_target, load_inputs as load_rim_inputs, rim_target
 from analysis.valuation_bridge_final import (
     calculate_normalized_target,
     calculate_regression_target,
@@ -35,21 +36,9 @@ MARKET_DATA_PATH = DATA_DIR / "market_data_current.json"
 VALUATION_OUTPUTS_PATH = DATA_DIR / "valuation_outputs.json"
 PEER_DATA_PATH = DATA_DIR / "caty11_peers_normalized.json"
 
-# IRC blended uses Residual Income (RIM) and Dividend Discount Model (DDM) anchors
-RIM_TARGET_PRICE = 50.08
-DDM_TARGET_PRICE = 45.12
-IRC_WEIGHTS = {"rim": 0.60, "ddm": 0.10, "regression": 0.30}
-
-
-def load_json(path: Path) -> Dict[str, Any]:
-    with path.open("r", encoding="utf-8") as fh:
-        return json.load(fh)
-
-
-def save_json(path: Path, payload: Dict[str, Any]) -> None:
-    with path.open("w", encoding="utf-8") as fh:
-        json.dump(payload, fh, indent=2)
-        fh.write("\n")
+# IRC blended uses Residual Income (RIM) and Dividend Discount Model (DDM) anchors;
+# RIM is priced by analysis/residual_income.py from the CATY_13 inputs, which
+# also owns the published DDM anchor and the blend weights.
 
 
 def compute_return(target_price: float, current_price: float) -> float:
@@ -75,14 +64,17 @@ def main() -> int:
     timestamp = timestamp_dt.isoformat()
     timestamp_display = timestamp_dt.strftime("%B %d, %Y %H:%M UTC")
 
+    rim_inputs = load_rim_inputs()
+    rim_target_price = rim_target(rim_inputs)
+
     regression = calculate_regression_target(roae, tbvps)
     normalized = calculate_normalized_target(normalized_rote, tbvps, coe=coe_decimal)
     wilson = calculate_wilson_weighted(regression["target_price"], normalized["target_price"])
 
     # IRC blended target uses the fresh regression output
     irc_target_price = round(
-        IRC_WEIGHTS["rim"] * RIM_TARGET_PRICE
-        + IRC_WEIGHTS["ddm"] * DDM_TARGET_PRICE
+        IRC_WEIGHTS["rim"] * rim_target_price
+        + IRC_WEIGHTS["ddm"] * DDM_ANCHOR
         + IRC_WEIGHTS["regression"] * regression["target_price"],
         2,
     )
@@ -126,8 +118,9 @@ def main() -> int:
         "method": "IRC Blended (60% RIM / 10% DDM / 30% Regression)",
         "weights": IRC_WEIGHTS,
         "inputs": {
-            "rim_target": RIM_TARGET_PRICE,
-            "ddm_target": DDM_TARGET_PRICE,
+            "rim_target": rim_target_price,
+            "ddm_target": DDM_ANCHOR,
+            "ddm_model_value": ddm_target(rim_inputs),
             "regression_target": regression_entry["target_price"],
         },
         "return_pct": compute_return(irc_target_price, current_price),
@@ -208,7 +201,7 @@ def main() -> int:
 
     valuation_outputs["last_updated"] = timestamp
 
-    save_json(VALUATION_OUTPUTS_PATH, valuation_outputs)
+    write_json(VALUATION_OUTPUTS_PATH, valuation_outputs, sort_keys=False)
 
     # Update market data calculated metrics
     metrics["target_regression"] = regression_entry["target_price"]
@@ -240,7 +233,7 @@ def main() -> int:
     report_metadata["report_date_iso"] = price_date_iso
     report_metadata["report_date"] = price_date_display
 
-    save_json(MARKET_DATA_PATH, market_data)
+    write_json(MARKET_DATA_PATH, market_data, sort_keys=False)
 
     print("Valuation metrics recalculated successfully.")
     return 0
@@ -2,7 +2,8 @@
 (function() {
     'use strict';
 
-    const DATA_URL = 'data/caty09_capital_liquidity.json';
+    // Precomputed by build_site.py and linked from the page head.
+    const BUNDLE_KEY = 'capital_stress';
 
     const SELECTORS = {
         canvas: 'capitalStressChart',
@@ -224,11 +225,11 @@
     }
 
     async function loadData() {
-        const response = await fetch(DATA_URL);
-        if (!response.ok) {
-            throw new Error(`Failed to load ${DATA_URL}: ${response.status}`);
+        const bundle = await window.loadChartBundle();
+        if (!bundle?.[BUNDLE_KEY]) {
+            throw new Error(`Chart data bundle has no ${BUNDLE_KEY} section`);
         }
-        return response.json();
+        return bundle[BUNDLE_KEY];
     }
 
     function prepareState(data) {
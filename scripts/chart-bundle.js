@@ -0,0 +1,29 @@
+/**
+ * Shared loader for the per-page chart data bundle written by build_site.py
+ * (data/bundles/<page>.<hash>.json, linked from the chart-data-bundle AUTOGEN
+ * marker). The bundle is fetched once per page and shared by every chart
+ * script on it.
+ *
+ * The returned promise rejects when the page links no bundle or the fetch
+ * fails; callers catch and render their own "data unavailable" state.
+ */
+(function () {
+    'use strict';
+
+    let bundlePromise = null;
+
+    window.loadChartBundle = function loadChartBundle() {
+        if (!bundlePromise) {
+            const link = document.querySelector('link[data-chart-bundle]');
+            bundlePromise = link
+                ? fetch(link.getAttribute('href')).then(response => {
+                    if (!response.ok) {
+                        throw new Error(`Failed to load ${link.getAttribute('href')}: ${response.status}`);
+                    }
+                    return response.json();
+                })
+                : Promise.reject(new Error('No chart data bundle linked from this page'));
+        }
+        return bundlePromise;
+    };
+})();
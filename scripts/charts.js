@@ -485,79 +485,56 @@ function updateChartsOnThemeChange(chartInstances) {
     });
 }
 
-// Fetch market data from JSON
-async function fetchMarketData() {
+async function fetchJsonResource(path) {
     try {
-        const response = await fetch('data/market_data_current.json');
+        const response = await fetch(path);
         if (!response.ok) {
             throw new Error(`HTTP error! status: ${response.status}`);
         }
         return await response.json();
     } catch (error) {
-        console.error('Error fetching market data:', error);
+        console.error(`Error fetching ${path}:`, error);
         return null;
     }
 }
 
-async function fetchJsonResource(path) {
+// Per-page chart data bundle (scripts/chart-bundle.js); null when the page has
+// none or it fails to load, so the initializers below fall back to their
+// "failed to load" path.
+async function loadPageBundle() {
+    if (typeof window.loadChartBundle !== 'function') {
+        return null;
+    }
     try {
-        const response = await fetch(path);
-        if (!response.ok) {
-            throw new Error(`HTTP error! status: ${response.status}`);
-        }
-        return await response.json();
+        return await window.loadChartBundle();
     } catch (error) {
-        console.error(`Error fetching ${path}:`, error);
+        console.error('Error loading chart data bundle:', error);
         return null;
     }
 }
 
-// Initialize valuation comparison chart from market data
+// Initialize valuation comparison chart from the page bundle
 async function initValuationChart(canvasId) {
-    const marketData = await fetchMarketData();
-    const probabilisticOutlook = await fetchJsonResource('analysis/probabilistic_outlook.json');
-    const monteCarlo = await fetchJsonResource('data/caty14_monte_carlo.json');
+    const bundle = await loadPageBundle();
+    const summary = bundle && bundle.valuation_summary;
 
-    if (!marketData || !probabilisticOutlook || !monteCarlo) {
+    if (!summary) {
         console.error('Failed to load valuation datasets');
         return null;
     }
 
     const chartData = {
-        labels: [
-            'Current Price',
-            'Probability-weighted',
-            'Normalized Gordon',
-            'Monte Carlo Median'
-        ],
-        values: [
-            marketData.price,
-            (probabilisticOutlook.expected && probabilisticOutlook.expected.price) ? probabilisticOutlook.expected.price : marketData.calculated_metrics.target_normalized,
-            marketData.calculated_metrics.target_normalized,
-            (monteCarlo.simulation_summary && monteCarlo.simulation_summary.target_median) ? monteCarlo.simulation_summary.target_median : marketData.calculated_metrics.target_normalized
-        ]
+        labels: summary.labels,
+        values: summary.values
     };
 
     return createValuationChart(canvasId, chartData);
 }
 
-// Fetch NCO history from JSON
-async function fetchNCOHistory() {
-    try {
-        const response = await fetch('data/fdic_nco_history.json');
-        if (!response.ok) {
-            throw new Error(`HTTP error! status: ${response.status}`);
-        }
-        return await response.json();
-    } catch (error) {
-        console.error('Error fetching NCO history:', error);
-        return null;
-    }
-}
-
 // Initialize NCO trend chart from FDIC history
 async function initNCOChart(canvasId) {
-    const ncoHistory = await fetchNCOHistory();
+    const bundle = await loadPageBundle();
+    const ncoHistory = bundle && bundle.nco_trend;
 
     if (!ncoHistory) {
         console.error('Failed to load NCO history');
@@ -3,12 +3,18 @@
 Compute CAPM beta and CAPM-implied COE using 2 years of weekly returns for
 CATY vs. KBW Regional Bank ETF (KBWR). Falls back to KRE if KBWR data absent.
 
+Weekly returns come from the cached return store (analysis/beta_engine.py);
+the cache is topped up with any missing weeks before the fit, built from the
+shared daily price cache (analysis/price_service.py), so repeated runs do not
+re-download the full history.
+
 Outputs:
   - analysis/capm_beta_results.json
   - analysis/capm_beta_results.md
 
 Dependencies:
-  - yfinance (pip install yfinance)
+  - pyarrow (return cache)
+  - yfinance (optional; incremental refresh only)
 
 Usage:
   python3 scripts/compute_capm_beta.py --start 2023-01-01 --rf 0.0423 --erp 0.0585
@@ -17,7 +23,7 @@ Usage:
 from __future__ import annotations
 
 import argparse
-import json
+import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict
@@ -25,6 +31,14 @@ from typing import Dict
 import pandas as pd
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from analysis import beta_engine  # noqa: E402
+from analysis.data_io import write_json  # noqa: E402
+from analysis.regression import simple_ols  # noqa: E402
+from analysis.timeseries_store import TimeSeriesStore  # noqa: E402
+
 OUT_JSON = ROOT / "analysis" / "capm_beta_results.json"
 OUT_MD = ROOT / "analysis" / "capm_beta_results.md"
 
@@ -33,47 +47,27 @@ def _ensure_dirs() -> None:
     (ROOT / "analysis").mkdir(parents=True, exist_ok=True)
 
 
-def fetch_prices(ticker: str, start: str, end: str) -> pd.Series:
-    import yfinance as yf  # type: ignore
-    data = yf.download(ticker, start=start, end=end, interval="1wk", progress=False, auto_adjust=False)
-    if data.empty:
-        return pd.Series(dtype=float)
-    cols = data.columns
-    series = None
-    if isinstance(cols, pd.MultiIndex):
-        if ("Adj Close", ticker) in cols:
-            series = data[("Adj Close", ticker)]
-        elif ("Close", ticker) in cols:
-            series = data[("Close", ticker)]
-    else:
-        if "Adj Close" in cols:
-            series = data["Adj Close"]
-        elif "Close" in cols:
-            series = data["Close"]
-    if series is None or series.empty:
-        return pd.Series(dtype=float)
-    return pd.Series(series).rename(ticker)
-
-
-def compute_weekly_returns(prices: pd.Series) -> pd.Series:
-    return prices.pct_change().dropna()
+def load_cached_returns(tickers, start: str, end: str, offline: bool = False) -> pd.DataFrame:
+    """Weekly returns for ``tickers`` from the cache, refreshing missing weeks first."""
+    store = TimeSeriesStore()
+    beta_engine.seed_from_csv(store)
+    if not offline:
+        beta_engine.refresh(store, tickers)
+    return beta_engine.load_returns(store, tickers, start=start, end=end)
 
 
 def run_capm(cat_returns: pd.Series, bench_returns: pd.Series) -> Dict:
     df = pd.concat([cat_returns, bench_returns], axis=1, join="inner").dropna()
     df.columns = ["caty", "bench"]
-    x = df["bench"]
-    y = df["caty"]
-    n = len(df)
-    x_mean = x.mean(); y_mean = y.mean()
-    cov = ((x - x_mean) * (y - y_mean)).sum()
-    var = ((x - x_mean) ** 2).sum()
-    beta = float('nan') if var == 0 else cov / var
-    alpha = y_mean - beta * x_mean if var != 0 else float('nan')
-    ss_tot = ((y - y_mean) ** 2).sum()
-    ss_res = ((y - (alpha + beta * x)) ** 2).sum() if var != 0 else float('nan')
-    r2 = 1 - ss_res / ss_tot if isinstance(ss_res, float) and ss_tot != 0 else float('nan')
-    return {"beta": float(beta), "alpha": float(alpha), "r2": float(r2), "observations": n}
+    fit = simple_ols(df["bench"].to_numpy(), df["caty"].to_numpy())
+    return {
+        "beta": fit["slope"],
+        "alpha": fit["intercept"],
+        "r2": fit["r2"],
+        "std_err": fit["std_err"],
+        "t_stat": fit["t_stat"],
+        "observations": fit["nobs"],
+    }
 
 
 def to_markdown(result: Dict, rf: float, erp: float, bench: str) -> str:
@@ -98,26 +92,23 @@ def main() -> int:
     parser.add_argument("--end", default=datetime.utcnow().strftime("%Y-%m-%d"))
     parser.add_argument("--rf", type=float, default=0.0423, help="Risk-free rate (annualized, decimal)")
     parser.add_argument("--erp", type=float, default=0.0585, help="Equity risk premium (annualized, decimal)")
+    parser.add_argument("--offline", action="store_true", help="Use cached returns without refreshing")
     args = parser.parse_args()
 
-    # Try KBWR, fallback to KRE
-    bench = "KBWR"
     try:
-        cat = fetch_prices("CATY", args.start, args.end)
-        idx = fetch_prices(bench, args.start, args.end)
-        if idx.empty:
-            bench = "KRE"
-            idx = fetch_prices(bench, args.start, args.end)
-    except Exception as e:
-        raise SystemExit(f"Error fetching prices: {e}")
-
-    if cat.empty or idx.empty:
-        raise SystemExit("Empty price series; check network or ticker availability.")
-
-    res = run_capm(compute_weekly_returns(cat), compute_weekly_returns(idx))
+        returns = load_cached_returns(["CATY", "KBWR", "KRE"], args.start, args.end, offline=args.offline)
+    except RuntimeError as e:
+        raise SystemExit(f"Error loading cached returns: {e}")
+
+    # Try KBWR, fallback to KRE
+    bench = "KBWR" if returns.get("KBWR", pd.Series(dtype=float)).notna().any() else "KRE"
+    if "CATY" not in returns.columns or bench not in returns.columns:
+        raise SystemExit("No cached returns for CATY/benchmark; check network or ticker availability.")
+
+    res = run_capm(returns["CATY"].dropna(), returns[bench].dropna())
     coe = args.rf + res["beta"] * args.erp if not pd.isna(res["beta"]) else float('nan')
     payload = {"benchmark": bench, "rf": args.rf, "erp": args.erp, "result": res, "coe": coe}
-    OUT_JSON.write_text(json.dumps(payload, indent=2))
+    write_json(OUT_JSON, payload, sort_keys=False)
     OUT_MD.write_text(to_markdown(res, args.rf, args.erp, bench))
     print(f"Wrote {OUT_JSON} and {OUT_MD}")
     return 0
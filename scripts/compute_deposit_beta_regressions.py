@@ -23,14 +23,20 @@ Notes:
 
 from __future__ import annotations
 
-import json
+import sys
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List
 
 import math
 import pandas as pd
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from analysis.data_io import load_json, write_json  # noqa: E402
+from analysis.regression import batched_ols  # noqa: E402
+
 DEPOSIT_JSON = ROOT / "data" / "deposit_beta_history.json"
 FED_FUNDS_CSV = ROOT / "data" / "fed_funds_quarterly.csv"
 OUT_JSON = ROOT / "analysis" / "deposit_beta_regressions.json"
@@ -42,7 +48,7 @@ def _ensure_dirs() -> None:
 
 
 def load_deposit_history() -> pd.DataFrame:
-    payload = json.loads(DEPOSIT_JSON.read_text())
+    payload = load_json(DEPOSIT_JSON, shared=True)
     rows: List[Dict] = []
     for q in payload.get("quarters", []):
         quarter = q["quarter"]
@@ -77,37 +83,12 @@ def delta(series: pd.Series) -> pd.Series:
     return series.diff()
 
 
-def run_ols(x: pd.Series, y: pd.Series) -> Tuple[float, float, float, float, float, int]:
-    """Return beta, intercept, r2, std_err, t_stat, n."""
-    df = pd.DataFrame({"x": x, "y": y}).dropna()
-    n = len(df)
-    if n < 2:
-        return (float("nan"),) * 5 + (n,)
-    x_mean = df["x"].mean()
-    y_mean = df["y"].mean()
-    cov = ((df["x"] - x_mean) * (df["y"] - y_mean)).sum()
-    var = ((df["x"] - x_mean) ** 2).sum()
-    if var == 0:
-        return (float("nan"),) * 5 + (n,)
-    beta = cov / var
-    alpha = y_mean - beta * x_mean
-    # r^2
-    ss_tot = ((df["y"] - y_mean) ** 2).sum()
-    ss_res = ((df["y"] - (alpha + beta * df["x"])) ** 2).sum()
-    r2 = 1 - ss_res / ss_tot if ss_tot != 0 else float("nan")
-    if n > 2:
-        sigma2 = ss_res / (n - 2) if (n - 2) > 0 else float("nan")
-        var_beta = sigma2 / var if var != 0 else float("nan")
-        std_err = math.sqrt(var_beta) if var_beta == var_beta else float("nan")
-        t_stat = beta / std_err if std_err and std_err != 0 else float("nan")
-    else:
-        std_err = float("nan")
-        t_stat = float("nan")
-    return float(beta), float(alpha), float(r2), float(std_err), float(t_stat), n
-
-
-def compute_regressions(merged: pd.DataFrame) -> Dict:
-    # Compute deltas
+def _rounded(value: float, digits: int):
+    return None if math.isnan(value) else round(float(value), digits)
+
+
+def compute_regressions(merged: pd.DataFrame, hac_lags=None) -> Dict:
+    """Regress every product's rate delta on the Fed Funds delta in one batched OLS call."""
     merged = merged.copy()
     merged["d_fed"] = delta(merged["fed_funds_avg"])  # in percentage points
 
@@ -120,16 +101,19 @@ def compute_regressions(merged: pd.DataFrame) -> Dict:
         "all_in_total": "all_in_rate",
     }
 
+    d_rates = merged[list(targets.values())].diff().to_numpy(dtype=float).T  # (products, quarters)
+    fit = batched_ols(merged["d_fed"].to_numpy(dtype=float), d_rates, hac_lags=hac_lags)
+
     results: Dict[str, Dict] = {}
-    for name, col in targets.items():
-        merged[f"d_{col}"] = delta(merged[col])
-        beta, alpha, r2, std_err, t_stat, n = run_ols(merged["d_fed"], merged[f"d_{col}"])
+    for idx, name in enumerate(targets):
+        beta, alpha, r2 = fit.slope[idx], fit.intercept[idx], fit.r2[idx]
+        std_err, t_stat, n = fit.slope_std_err[idx], fit.slope_t_stat[idx], int(fit.nobs[idx])
         results[name] = {
-            "beta": None if math.isnan(beta) else round(beta, 4),
-            "intercept": None if math.isnan(alpha) else round(alpha, 4),
-            "r2": None if math.isnan(r2) else round(r2, 4),
-            "std_err": None if math.isnan(std_err) else round(std_err, 4),
-            "t_stat": None if math.isnan(t_stat) else round(t_stat, 2),
+            "beta": _rounded(beta, 4),
+            "intercept": _rounded(alpha, 4),
+            "r2": _rounded(r2, 4),
+            "std_err": _rounded(std_err, 4),
+            "t_stat": _rounded(t_stat, 2),
             "observations": n,
             "provisional": n < 6,
         }
@@ -167,7 +151,7 @@ def main() -> int:
     if len(merged) < 6:
         print("WARNING: Fewer than 6 quarters of overlap; results will be provisional.")
     payload = compute_regressions(merged)
-    OUT_JSON.write_text(json.dumps(payload, indent=2))
+    write_json(OUT_JSON, payload, sort_keys=False)
     OUT_MD.write_text(to_markdown(payload))
     print(f"Wrote {OUT_JSON} and {OUT_MD}")
     return 0
@@ -2,15 +2,34 @@
 """
 Convert evidence markdown files into canonical HTML pages with site styling.
 
+Conversion is incremental: logs/evidence_html_manifest.json records, per
+document, the SHA-256 of the markdown source, the template version and the
+SHA-256 of the HTML written. A document is regenerated only when one of those
+no longer matches (or the output is missing). Stale documents are converted
+in a process pool. ``convert_evidence()`` is the in-process entry point used
+by update_all_data.py.
+
 Usage:
-    python3 scripts/convert_evidence_to_html.py
+    python3 scripts/convert_evidence_to_html.py [--force] [--jobs N]
 """
 from __future__ import annotations
 
+import argparse
+import hashlib
 import html
+import json
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+EVIDENCE_DIR = ROOT / "evidence"
+MANIFEST_PATH = ROOT / "logs" / "evidence_html_manifest.json"
+# Below this many stale documents a process pool costs more than it saves.
+PARALLEL_MIN_FILES = 8
 
 TEMPLATE = """<!DOCTYPE html>
 <html lang=\"en\">
@@ -57,6 +76,9 @@ TEMPLATE = """<!DOCTYPE html>
 </html>
 """
 
+# Any change to the page template or to this converter invalidates every output.
+TEMPLATE_VERSION = hashlib.sha256(TEMPLATE.encode("utf-8") + Path(__file__).read_bytes()).hexdigest()[:16]
+
 METADATA_PATTERN = re.compile(r"^\*\*(?P<key>[^:]+):\*\*\s*(?P<value>.+)$")
 TABLE_ROW_PATTERN = re.compile(r"^\s*\|.*\|\s*$")
 TABLE_DIVIDER_PATTERN = re.compile(
@@ -336,8 +358,8 @@ def build_meta(metadata: dict[str, str]) -> tuple[str, str, str, str]:
     return author, date, purpose, subtitle
 
 
-def convert_file(md_path: Path, output_path: Path) -> None:
-    """Convert a single markdown file to HTML."""
+def convert_file(md_path: Path, output_path: Path, evidence_dir: Path = EVIDENCE_DIR) -> str:
+    """Convert a single markdown file to HTML; returns the HTML written."""
     with md_path.open("r", encoding="utf-8") as handle:
         lines = handle.readlines()
 
@@ -354,7 +376,7 @@ def convert_file(md_path: Path, output_path: Path) -> None:
     meta_line = f"Author: {author} | Date: {date} | Purpose: {purpose}"
     short_title = subtitle[:80]
 
-    depth = len(output_path.relative_to("evidence").parts) - 1
+    depth = len(output_path.relative_to(evidence_dir).parts) - 1
     prefix = "../" * (depth + 1)
 
     footer_meta = f"Author: {author} | Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')} | Source: {md_path.name}"
@@ -372,40 +394,134 @@ def convert_file(md_path: Path, output_path: Path) -> None:
     )
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", encoding="utf-8") as handle:
-        handle.write(html_output)
-
-
-def main() -> None:
-    evidence_dir = Path("evidence")
+    tmp_path = output_path.with_name(f".{output_path.name}.tmp")
+    tmp_path.write_text(html_output, encoding="utf-8")
+    os.replace(tmp_path, output_path)
+    return html_output
+
+
+def sha256_file(path: Path) -> Optional[str]:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def load_manifest(manifest_path: Path) -> Dict[str, Dict[str, str]]:
+    try:
+        payload = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {}
+    return payload.get("documents", {}) if isinstance(payload, dict) else {}
+
+
+def save_manifest(manifest_path: Path, documents: Dict[str, Dict[str, str]]) -> None:
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"template_version": TEMPLATE_VERSION, "documents": dict(sorted(documents.items()))}
+    tmp_path = manifest_path.with_name(f".{manifest_path.name}.tmp")
+    tmp_path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp_path, manifest_path)
+
+
+def _convert_one(md_path: Path, html_path: Path, evidence_dir: Path) -> Tuple[Optional[str], Optional[str]]:
+    """Worker: returns ``(output_sha256, error)``."""
+    try:
+        html_output = convert_file(md_path, html_path, evidence_dir)
+    except Exception as exc:  # noqa: BLE001
+        return None, str(exc)
+    return hashlib.sha256(html_output.encode("utf-8")).hexdigest(), None
+
+
+def convert_evidence(
+    evidence_dir: Path = EVIDENCE_DIR,
+    manifest_path: Path = MANIFEST_PATH,
+    force: bool = False,
+    jobs: Optional[int] = None,
+    verbose: bool = True,
+) -> Dict[str, Any]:
+    """Regenerate stale evidence HTML; returns ``{"converted", "unchanged", "errors"}``.
+
+    ``converted``/``unchanged`` are lists of markdown paths relative to
+    ``evidence_dir``; ``errors`` maps relative paths to messages. Failed
+    documents are left out of the manifest so the next run retries them.
+    """
     md_files = sorted(evidence_dir.rglob("*.md"))
-    if not md_files:
-        print("No markdown files found in evidence/ directory.")
-        return
-
-    print(f"Found {len(md_files)} .md files in evidence/")
-
-    converted = 0
-    errors: list[tuple[Path, str]] = []
+    previous = {} if force else load_manifest(manifest_path)
+    documents: Dict[str, Dict[str, str]] = {}
+    stale: List[Tuple[str, Path, Path, str]] = []
+    unchanged: List[str] = []
 
     for md_path in md_files:
+        rel_path = md_path.relative_to(evidence_dir).as_posix()
         html_path = md_path.with_suffix(".html")
-        try:
-            convert_file(md_path, html_path)
-            converted += 1
-            rel_path = md_path.relative_to(evidence_dir)
+        source_sha = sha256_file(md_path)
+        entry = previous.get(rel_path)
+        if (
+            entry is not None
+            and entry.get("source_sha256") == source_sha
+            and entry.get("template_version") == TEMPLATE_VERSION
+            and entry.get("output_sha256") == sha256_file(html_path)
+        ):
+            documents[rel_path] = entry
+            unchanged.append(rel_path)
+        else:
+            stale.append((rel_path, md_path, html_path, source_sha))
+
+    workers = min(jobs or os.cpu_count() or 1, len(stale)) or 1
+    paths = ([md for _, md, _, _ in stale], [out for _, _, out, _ in stale], [evidence_dir] * len(stale))
+    if workers > 1 and len(stale) >= PARALLEL_MIN_FILES:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_convert_one, *paths))
+    else:
+        results = [_convert_one(*args) for args in zip(*paths)]
+
+    converted: List[str] = []
+    errors: Dict[str, str] = {}
+    for (rel_path, _md_path, html_path, source_sha), (output_sha, error) in zip(stale, results):
+        if error is not None:
+            errors[rel_path] = error
+            if verbose:
+                print(f"✗ {rel_path}: {error}")
+            continue
+        documents[rel_path] = {
+            "source_sha256": source_sha,
+            "template_version": TEMPLATE_VERSION,
+            "output_sha256": output_sha,
+        }
+        converted.append(rel_path)
+        if verbose:
             print(f"✓ {rel_path} → {html_path.name}")
-        except Exception as exc:  # noqa: BLE001
-            errors.append((md_path, str(exc)))
-            rel_path = md_path.relative_to(evidence_dir)
-            print(f"✗ {rel_path}: {exc}")
 
-    print(f"\nConversion complete: {converted}/{len(md_files)} files")
+    save_manifest(manifest_path, documents)
+    return {"converted": converted, "unchanged": unchanged, "errors": errors}
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Convert evidence/*.md into site-styled HTML (incremental)")
+    parser.add_argument("--force", action="store_true", help="Regenerate every document, ignoring the manifest")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    md_count = len(list(EVIDENCE_DIR.rglob("*.md")))
+    if not md_count:
+        print("No markdown files found in evidence/ directory.")
+        return 0
+
+    print(f"Found {md_count} .md files in evidence/")
+    report = convert_evidence(force=args.force, jobs=args.jobs)
+    errors = report["errors"]
+
+    print(
+        f"\nConversion complete: {len(report['converted'])} converted, "
+        f"{len(report['unchanged'])} up to date, {len(errors)} failed ({md_count} files)"
+    )
     if errors:
         print("Errors encountered:")
-        for path, message in errors:
+        for path, message in errors.items():
             print(f"  - {path}: {message}")
+        return 1
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
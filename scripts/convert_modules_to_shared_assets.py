@@ -4,19 +4,74 @@ Module Conversion Script - Extract CSS/JS to Shared Assets
 Converts CATY_*.html modules to use styles/caty-equity-research.css and scripts/theme-toggle.js
 """
 
+import argparse
 import re
+import sys
 from pathlib import Path
 
-def convert_module(html_path: Path) -> tuple[str, dict]:
-    """
-    Convert a module HTML file to use shared CSS/JS assets.
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 
-    Returns:
-        tuple: (converted_html, stats_dict)
-    """
-    with open(html_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+from analysis.inline_styles import StyleRewriter, StyleRule, rewrite_documents  # noqa: E402
+
+STYLE_BLOCK_RE = re.compile(r'    <style>.*?    </style>\n', re.DOTALL)
+THEME_SCRIPT_RE = re.compile(r'    <script>\n        function toggleTheme\(\).*?    </script>\n', re.DOTALL)
+
+# Common inline styles -> semantic classes (same patterns as used in index.html conversion)
+MODULE_STYLE_RULES = [
+    # Module cards: drop the inline hover handlers along with the style
+    StyleRule('display: block; background: var(--bg-tertiary); padding: 20px;', 'module-card',
+              tag='a', prefix=True, keep_attrs=('href',)),
+
+    # Grids
+    StyleRule('display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px;',
+              'grid-auto-fit-200', tag='div'),
+    StyleRule('display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 20px;',
+              'grid-auto-fit-250', tag='div'),
+    StyleRule('display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 15px;',
+              'module-grid', tag='div'),
+
+    # Dashboard grids
+    StyleRule('display: grid; grid-template-columns: repeat(4, 1fr); gap: 16px; margin: 24px 0;',
+              'dashboard-grid', tag='div'),
+
+    # Tables
+    StyleRule('overflow-x: auto; margin: 20px 0;', 'table-container', tag='div'),
+
+    # Sections
+    StyleRule('margin-bottom: 50px;', 'content-section', tag='section'),
+
+    # Cards with border-left
+    StyleRule('background: var(--bg-secondary); padding: 20px; border-radius: 8px; border-left: 4px solid var(--success);',
+              'metric-card metric-card-success', tag='div'),
+    StyleRule('background: var(--bg-secondary); padding: 20px; border-radius: 8px; border-left: 4px solid var(--danger);',
+              'metric-card metric-card-danger', tag='div'),
+    StyleRule('background: var(--bg-secondary); padding: 20px; border-radius: 8px; border-left: 4px solid var(--warning);',
+              'metric-card metric-card-warning', tag='div'),
+    StyleRule('background: var(--bg-secondary); padding: 20px; border-radius: 8px; border-left: 4px solid var(--cathay-gold);',
+              'metric-card metric-card-gold', tag='div'),
+
+    # Generic cards
+    StyleRule('background: var(--bg-secondary); padding: 20px; border-radius: 8px;', 'metric-card', tag='div'),
+
+    # Text alignment
+    StyleRule('text-align: center;', 'text-center', tag='div'),
+    StyleRule('text-align: center;', 'text-center', tag='p'),
+
+    # Dashboard cards
+    StyleRule('background: rgba(255,255,255,0.05); padding: 16px; border-radius: 8px;', 'dashboard-card', tag='div'),
+
+    # Price target grids
+    StyleRule('display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 12px; margin: 20px 0;',
+              'price-target-grid', tag='div'),
+]
 
+REWRITER = StyleRewriter(MODULE_STYLE_RULES)
+
+
+def convert_html(content: str) -> tuple[str, dict]:
+    """Convert module HTML to use shared CSS/JS assets; returns (converted_html, stats_dict)."""
     original_lines = content.count('\n')
     stats = {
         'original_lines': original_lines,
@@ -26,86 +81,22 @@ def convert_module(html_path: Path) -> tuple[str, dict]:
     }
 
     # STEP 1: Replace embedded <style> block with link to shared CSS
-    style_pattern = r'    <style>.*?    </style>\n'
-    style_match = re.search(style_pattern, content, re.DOTALL)
-
+    style_match = STYLE_BLOCK_RE.search(content)
     if style_match:
         stats['style_removed'] = style_match.group(0).count('\n')
         replacement = '    <link rel="stylesheet" href="styles/caty-equity-research.css">\n'
-        content = re.sub(style_pattern, replacement, content, count=1, flags=re.DOTALL)
+        content = content[:style_match.start()] + replacement + content[style_match.end():]
 
     # STEP 2: Replace embedded theme toggle <script> with link to shared JS
     # Find the script block that contains toggleTheme function
-    script_pattern = r'    <script>\n        function toggleTheme\(\).*?    </script>\n'
-    script_match = re.search(script_pattern, content, re.DOTALL)
-
+    script_match = THEME_SCRIPT_RE.search(content)
     if script_match:
         stats['script_removed'] = script_match.group(0).count('\n')
         replacement = '    <script src="scripts/theme-toggle.js"></script>\n'
-        content = re.sub(script_pattern, replacement, content, count=1, flags=re.DOTALL)
-
-    # STEP 3: Replace common inline styles with semantic classes
-    # (Same patterns as used in index.html conversion)
-
-    inline_replacements = [
-        # Module cards
-        (r'<a href="([^"]+)"[^>]*style="display: block; background: var\(--bg-tertiary\); padding: 20px;[^"]*"[^>]*>',
-         r'<a href="\1" class="module-card">'),
-
-        # Grids
-        (r'<div style="display: grid; grid-template-columns: repeat\(auto-fit, minmax\(200px, 1fr\)\); gap: 20px;">',
-         r'<div class="grid-auto-fit-200">'),
-        (r'<div style="display: grid; grid-template-columns: repeat\(auto-fit, minmax\(250px, 1fr\)\); gap: 20px;">',
-         r'<div class="grid-auto-fit-250">'),
-        (r'<div style="display: grid; grid-template-columns: repeat\(auto-fit, minmax\(300px, 1fr\)\); gap: 15px;">',
-         r'<div class="module-grid">'),
-
-        # Dashboard grids
-        (r'<div style="display: grid; grid-template-columns: repeat\(4, 1fr\); gap: 16px; margin: 24px 0;">',
-         r'<div class="dashboard-grid">'),
-
-        # Tables
-        (r'<div style="overflow-x: auto; margin: 20px 0;">',
-         r'<div class="table-container">'),
-
-        # Sections
-        (r'<section style="margin-bottom: 50px;">',
-         r'<section class="content-section">'),
-
-        # Cards with border-left
-        (r'<div style="background: var\(--bg-secondary\); padding: 20px; border-radius: 8px; border-left: 4px solid var\(--success\);">',
-         r'<div class="metric-card metric-card-success">'),
-        (r'<div style="background: var\(--bg-secondary\); padding: 20px; border-radius: 8px; border-left: 4px solid var\(--danger\);">',
-         r'<div class="metric-card metric-card-danger">'),
-        (r'<div style="background: var\(--bg-secondary\); padding: 20px; border-radius: 8px; border-left: 4px solid var\(--warning\);">',
-         r'<div class="metric-card metric-card-warning">'),
-        (r'<div style="background: var\(--bg-secondary\); padding: 20px; border-radius: 8px; border-left: 4px solid var\(--cathay-gold\);">',
-         r'<div class="metric-card metric-card-gold">'),
-
-        # Generic cards
-        (r'<div style="background: var\(--bg-secondary\); padding: 20px; border-radius: 8px;">',
-         r'<div class="metric-card">'),
-
-        # Text alignment
-        (r'<div style="text-align: center;">',
-         r'<div class="text-center">'),
-        (r'<p style="text-align: center;">',
-         r'<p class="text-center">'),
-
-        # Dashboard cards
-        (r'<div style="background: rgba\(255,255,255,0\.05\); padding: 16px; border-radius: 8px;">',
-         r'<div class="dashboard-card">'),
-
-        # Price target grids
-        (r'<div style="display: grid; grid-template-columns: repeat\(auto-fit, minmax\(200px, 1fr\)\); gap: 12px; margin: 20px 0;">',
-         r'<div class="price-target-grid">'),
-    ]
-
-    for pattern, replacement in inline_replacements:
-        matches = len(re.findall(pattern, content))
-        if matches > 0:
-            stats['inline_styles_replaced'] += matches
-            content = re.sub(pattern, replacement, content)
+        content = content[:script_match.start()] + replacement + content[script_match.end():]
+
+    # STEP 3: Replace common inline styles with semantic classes in one pass
+    content, stats['inline_styles_replaced'] = REWRITER.rewrite(content)
 
     # Count final lines
     stats['final_lines'] = content.count('\n')
@@ -114,14 +105,28 @@ def convert_module(html_path: Path) -> tuple[str, dict]:
     return content, stats
 
 
-def main():
+def convert_module(html_path: Path) -> tuple[str, dict]:
+    """
+    Convert a module HTML file to use shared CSS/JS assets.
+
+    Returns:
+        tuple: (converted_html, stats_dict)
+    """
+    return convert_html(html_path.read_text(encoding='utf-8'))
+
+
+def main(argv=None):
     """Convert all CATY_*.html modules to use shared CSS/JS."""
+    parser = argparse.ArgumentParser(description="Move module CSS/JS to shared assets and replace inline styles")
+    parser.add_argument('pages', nargs='*', type=Path, help="Pages to convert (default: CATY_*.html)")
+    parser.add_argument('--dry-run', action='store_true', help="Print a unified diff instead of writing pages")
+    parser.add_argument('--jobs', type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
 
-    base_dir = Path(__file__).parent.parent
-    modules = sorted(base_dir.glob('CATY_*.html'))
+    modules = args.pages or sorted(ROOT.glob('CATY_*.html'))
 
     print("=" * 70)
-    print("MODULE CONVERSION - Shared CSS/JS Migration")
+    print("MODULE CONVERSION - Shared CSS/JS Migration" + (" (dry run)" if args.dry_run else ""))
     print("=" * 70)
     print()
 
@@ -133,15 +138,11 @@ def main():
         'total_inline_replaced': 0
     }
 
-    for module_path in modules:
+    for module_path, stats, diff in rewrite_documents(modules, convert_html, args.dry_run, args.jobs):
+        if diff:
+            print(diff, end="")
         print(f"Converting {module_path.name}...", end=" ")
 
-        converted_html, stats = convert_module(module_path)
-
-        # Write converted file
-        with open(module_path, 'w', encoding='utf-8') as f:
-            f.write(converted_html)
-
         # Update totals
         total_stats['files_converted'] += 1
         total_stats['total_lines_removed'] += stats['lines_removed']
@@ -161,11 +162,13 @@ def main():
     print(f"  - JS removed:        {total_stats['total_script_lines']:,} lines")
     print(f"Inline styles fixed:   {total_stats['total_inline_replaced']}")
     print()
-    print("✅ All modules now use:")
-    print("   - styles/caty-equity-research.css (shared stylesheet)")
-    print("   - scripts/theme-toggle.js (shared JavaScript)")
-    print()
+    if not args.dry_run:
+        print("✅ All modules now use:")
+        print("   - styles/caty-equity-research.css (shared stylesheet)")
+        print("   - scripts/theme-toggle.js (shared JavaScript)")
+        print()
+    return 0
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
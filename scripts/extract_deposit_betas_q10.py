@@ -8,35 +8,60 @@ interest expense, and average rates for each deposit bucket. Results feed the
 NIM bridge and deposit beta workflow so the deck can flip within hours of the
 10-Q posting.
 
+Runs are incremental: quarters already in ``data/deposit_beta_history.json``
+under the same accession are kept as is, parsed filings are cached per
+accession in ``logs/deposit_q10_cache.json``, and only new filings are
+downloaded, concurrently through a shared limiter that keeps the process under
+SEC's 10 requests/second. Backfilling 40 quarters is therefore a one-time
+cost; later runs fetch only the latest 10-Q.
+
 Usage:
     python3 scripts/extract_deposit_betas_q10.py --quarters 2025Q2 2025Q1 2024Q3
+    python3 scripts/extract_deposit_betas_q10.py --count 40 --workers 4
 
-If --quarters is omitted the script defaults to the latest three 10-Q filings.
+If neither --quarters nor --count is given the script targets the latest
+three 10-Q filings and merges them into the existing history.
 """
 
 from __future__ import annotations
 
 import argparse
 import json
+import os
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from io import StringIO
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import pandas as pd
 import requests
-from io import BytesIO, StringIO
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from analysis.data_io import load_json, write_json  # noqa: E402
+from analysis.http_cassette import install_from_env, throttle  # noqa: E402
+from analysis.timeseries_store import deposit_history_frame, record_snapshot  # noqa: E402
+
 OUTPUT_PATH = ROOT / "data" / "deposit_beta_history.json"
+CACHE_PATH = ROOT / "logs" / "deposit_q10_cache.json"
+# Bump when the table parser changes so cached accessions are re-parsed.
+CACHE_VERSION = 1
 
 CIK_STR = "0000861842"
 SEC_SUBMISSIONS_URL = f"https://data.sec.gov/submissions/CIK{CIK_STR}.json"
 SEC_ARCHIVES_BASE = "https://www.sec.gov/Archives/edgar/data"
 USER_AGENT = "CATY Research Team (research@analysis.com)"
 REQUEST_TIMEOUT = 45
-SEC_RATE_LIMIT_SECONDS = 0.4  # < 10 requests per second as required
+SEC_RATE_LIMIT_SECONDS = 0.125  # 8 requests/second across all workers (< 10 required)
+DEFAULT_WORKERS = 4
+DEFAULT_QUARTER_COUNT = 3
 
 
 @dataclass
@@ -52,15 +77,50 @@ class DepositExtractionError(RuntimeError):
     """Domain-specific exception for extraction failures."""
 
 
-def load_sec_submissions() -> Dict[str, any]:
-    resp = requests.get(
-        SEC_SUBMISSIONS_URL,
-        headers={"User-Agent": USER_AGENT, "Accept": "application/json"},
+class RateLimiter:
+    """Spaces request starts ``interval`` seconds apart across threads."""
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            throttle(slot - now)
+
+
+_SEC_LIMITER = RateLimiter(SEC_RATE_LIMIT_SECONDS)
+
+
+def sec_get(url: str, accept: str, session: Optional[requests.Session] = None) -> requests.Response:
+    _SEC_LIMITER.wait()
+    resp = (session or requests).get(
+        url,
+        headers={"User-Agent": USER_AGENT, "Accept": accept},
         timeout=REQUEST_TIMEOUT,
     )
     resp.raise_for_status()
-    time.sleep(SEC_RATE_LIMIT_SECONDS)
-    return resp.json()
+    return resp
+
+
+def load_sec_submissions() -> Dict[str, any]:
+    return sec_get(SEC_SUBMISSIONS_URL, "application/json").json()
+
+
+def extend_with_older_filings(submissions: Dict[str, any]) -> Dict[str, any]:
+    """Append the paged ``filings.files`` history to ``recent`` (older 10-Qs)."""
+    filings = submissions.get("filings", {})
+    recent = {key: list(values) for key, values in filings.get("recent", {}).items()}
+    for page in filings.get("files", []):
+        older = sec_get(f"https://data.sec.gov/submissions/{page['name']}", "application/json").json()
+        for key, values in recent.items():
+            values.extend(older.get(key, []))
+    return {**submissions, "filings": {**filings, "recent": recent, "files": []}}
 
 
 def derive_quarter_label(report_date: str) -> str:
@@ -111,18 +171,11 @@ def default_quarters(filing_index: Dict[str, FilingRef], count: int = 3) -> List
     ]
 
 
-def download_filing(ref: FilingRef) -> str:
+def download_filing(ref: FilingRef, session: Optional[requests.Session] = None) -> str:
     cik_numeric = str(int(CIK_STR))  # drop leading zeros
     accession_slug = ref.accession.replace("-", "")
     url = f"{SEC_ARCHIVES_BASE}/{cik_numeric}/{accession_slug}/{ref.primary_doc}"
-    resp = requests.get(
-        url,
-        headers={"User-Agent": USER_AGENT, "Accept": "text/html"},
-        timeout=REQUEST_TIMEOUT,
-    )
-    resp.raise_for_status()
-    time.sleep(SEC_RATE_LIMIT_SECONDS)
-    return resp.text
+    return sec_get(url, "text/html", session).text
 
 
 TARGET_MATCH = "Interest-Earning Assets and Interest-Bearing Liabilities"
@@ -236,33 +289,82 @@ def compute_all_in_metrics(metrics: Dict[str, Dict[str, float]]) -> Dict[str, fl
     }
 
 
-def build_history(
-    quarters: List[str],
-    filing_index: Dict[str, FilingRef],
-) -> Dict[str, any]:
-    history: List[Dict[str, any]] = []
-    for quarter in quarters:
-        if quarter not in filing_index:
-            raise DepositExtractionError(f"No 10-Q filing located for {quarter}")
-        ref = filing_index[quarter]
-        html = download_filing(ref)
-        deposit_table = locate_deposit_table(html)
-        metrics = extract_deposit_metrics(deposit_table)
-        derived = compute_all_in_metrics(metrics)
-
-        history.append(
-            {
-                "quarter": ref.quarter,
-                "report_date": ref.report_date,
-                "filing_date": ref.filing_date,
-                "accession": ref.accession,
-                "primary_document": ref.primary_doc,
-                "metrics": metrics,
-                "derived": derived,
-            }
-        )
+def parse_filing(html: str) -> Tuple[Dict[str, Dict[str, float]], Dict[str, float]]:
+    metrics = extract_deposit_metrics(locate_deposit_table(html))
+    return metrics, compute_all_in_metrics(metrics)
 
-    history.sort(key=lambda entry: entry["report_date"])
+
+def extract_quarter(ref: FilingRef, session: Optional[requests.Session] = None) -> Dict[str, any]:
+    metrics, derived = parse_filing(download_filing(ref, session))
+    return {
+        "quarter": ref.quarter,
+        "report_date": ref.report_date,
+        "filing_date": ref.filing_date,
+        "accession": ref.accession,
+        "primary_document": ref.primary_doc,
+        "metrics": metrics,
+        "derived": derived,
+    }
+
+
+def load_parsed_cache(path: Optional[Path]) -> Dict[str, Dict[str, any]]:
+    """Parsed history entries keyed by accession; empty on version mismatch."""
+    if path is None or not path.is_file():
+        return {}
+    try:
+        cached = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if cached.get("version") != CACHE_VERSION or cached.get("cik") != CIK_STR:
+        return {}
+    return cached.get("accessions", {})
+
+
+def save_parsed_cache(path: Optional[Path], entries: Dict[str, Dict[str, any]]) -> None:
+    if path is None:
+        return
+    payload = {"version": CACHE_VERSION, "cik": CIK_STR, "accessions": dict(sorted(entries.items()))}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def load_history(path: Path) -> Dict[str, any]:
+    try:
+        return load_json(path, {})
+    except (OSError, ValueError):
+        return {}
+
+
+def extract_quarters(
+    refs: Sequence[FilingRef],
+    workers: int = DEFAULT_WORKERS,
+    verbose: bool = True,
+) -> Tuple[List[Dict[str, any]], Dict[str, str]]:
+    """Download and parse ``refs`` concurrently; failures are returned per quarter."""
+    entries: List[Dict[str, any]] = []
+    failures: Dict[str, str] = {}
+    if not refs:
+        return entries, failures
+    with requests.Session() as session, ThreadPoolExecutor(max_workers=max(1, min(workers, len(refs)))) as pool:
+        futures = {pool.submit(extract_quarter, ref, session): ref for ref in refs}
+        for future in as_completed(futures):
+            ref = futures[future]
+            try:
+                entries.append(future.result())
+            except (DepositExtractionError, requests.RequestException) as exc:
+                failures[ref.quarter] = str(exc)
+                if verbose:
+                    print(f"❌ {ref.quarter} ({ref.accession}): {exc}")
+                continue
+            if verbose:
+                print(f"✓ {ref.quarter} parsed ({ref.accession})")
+    return entries, failures
+
+
+def build_history(entries: Sequence[Dict[str, any]]) -> Dict[str, any]:
+    history = sorted(entries, key=lambda entry: entry["report_date"])
     return {
         "updated_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
         "source": "SEC inline XBRL 10-Q filings (auto-extracted)",
@@ -271,12 +373,69 @@ def build_history(
     }
 
 
+def update_history(
+    quarters: Sequence[str],
+    filing_index: Dict[str, FilingRef],
+    output: Path = OUTPUT_PATH,
+    cache_path: Optional[Path] = CACHE_PATH,
+    workers: int = DEFAULT_WORKERS,
+    rebuild: bool = False,
+    verbose: bool = True,
+) -> Dict[str, Any]:
+    """Merge ``quarters`` into the history at ``output``, fetching only new filings.
+
+    A quarter is *present* when the history already holds it under the same
+    accession, *cached* when the accession was parsed on an earlier run, and
+    fetched otherwise. ``rebuild`` ignores both. The history is rewritten only
+    when an entry was added or replaced.
+    """
+    missing = [q for q in quarters if q not in filing_index]
+    if missing:
+        raise DepositExtractionError(f"Missing accessions for: {', '.join(missing)}")
+
+    existing = {} if rebuild else {entry["quarter"]: entry for entry in load_history(output).get("quarters", [])}
+    parsed = {} if rebuild else load_parsed_cache(cache_path)
+    merged = dict(existing)
+    summary: Dict[str, Any] = {"present": [], "cached": [], "fetched": [], "failed": {}}
+
+    to_fetch: List[FilingRef] = []
+    for quarter in dict.fromkeys(quarters):
+        ref = filing_index[quarter]
+        if existing.get(quarter, {}).get("accession") == ref.accession:
+            summary["present"].append(quarter)
+        elif ref.accession in parsed:
+            merged[quarter] = parsed[ref.accession]
+            summary["cached"].append(quarter)
+        else:
+            to_fetch.append(ref)
+
+    entries, summary["failed"] = extract_quarters(to_fetch, workers, verbose)
+    for entry in entries:
+        merged[entry["quarter"]] = entry
+        parsed[entry["accession"]] = entry
+    summary["fetched"] = sorted(entry["quarter"] for entry in entries)
+    if entries:
+        save_parsed_cache(cache_path, parsed)
+
+    summary["payload"] = build_history(merged.values())
+    summary["changed"] = bool(entries or summary["cached"])
+    if summary["changed"]:
+        write_json(output, summary["payload"], sort_keys=False)
+    return summary
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Extract deposit metrics from CATY 10-Q filings")
     parser.add_argument(
         "--quarters",
         nargs="+",
-        help="Quarter labels (e.g., 2025Q2 2025Q1 2024Q3). Defaults to most recent three filings.",
+        help="Quarter labels (e.g., 2025Q2 2025Q1 2024Q3). Defaults to the most recent --count filings.",
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=DEFAULT_QUARTER_COUNT,
+        help=f"Most recent 10-Q filings to cover when --quarters is omitted (default: {DEFAULT_QUARTER_COUNT})",
     )
     parser.add_argument(
         "--output",
@@ -284,25 +443,41 @@ def main() -> int:
         default=OUTPUT_PATH,
         help="Destination JSON path (default: data/deposit_beta_history.json)",
     )
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent filing downloads")
+    parser.add_argument("--rebuild", action="store_true", help="Ignore the existing history and parsed cache")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the per-accession cache")
     args = parser.parse_args()
+    install_from_env()
 
     submissions = load_sec_submissions()
     filing_index = build_filing_index(submissions)
-
-    if args.quarters:
-        target_quarters = args.quarters
+    wanted = args.quarters or []
+    if any(q not in filing_index for q in wanted) or (not wanted and len(filing_index) < args.count):
+        filing_index = build_filing_index(extend_with_older_filings(submissions))
+
+    target_quarters = wanted or default_quarters(filing_index, count=args.count)
+    summary = update_history(
+        target_quarters,
+        filing_index,
+        output=args.output,
+        cache_path=None if args.no_cache else CACHE_PATH,
+        workers=args.workers,
+        rebuild=args.rebuild,
+    )
+    quarters = summary["payload"]["quarters"]
+    print(
+        f"{len(summary['fetched'])} fetched, {len(summary['cached'])} from cache, "
+        f"{len(summary['present'])} already present, {len(summary['failed'])} failed"
+    )
+    if summary["changed"]:
+        print(f"Wrote deposit beta history to {args.output} ({len(quarters)} quarters)")
+        try:
+            record_snapshot("deposit_rates", deposit_history_frame(summary["payload"]))
+        except Exception as exc:  # noqa: BLE001
+            print(f"⚠️  Time-series store not updated: {exc}")
     else:
-        target_quarters = default_quarters(filing_index, count=3)
-
-    missing = [q for q in target_quarters if q not in filing_index]
-    if missing:
-        raise DepositExtractionError(f"Missing accessions for: {', '.join(missing)}")
-
-    payload = build_history(target_quarters, filing_index)
-    args.output.parent.mkdir(parents=True, exist_ok=True)
-    args.output.write_text(json.dumps(payload, indent=2))
-    print(f"Wrote deposit beta history to {args.output} ({len(payload['quarters'])} quarters)")
-    return 0
+        print(f"✓ Deposit history up to date ({len(quarters)} quarters)")
+    return 1 if summary["failed"] else 0
 
 
 if __name__ == "__main__":
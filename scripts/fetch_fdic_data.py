@@ -9,16 +9,21 @@ quarter of financial metrics used by downstream templates.
 from __future__ import annotations
 
 import datetime as dt
-import json
 import logging
 import sys
-import time
 from pathlib import Path
 from typing import Any, Dict, List
 
 import requests
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from analysis.data_io import write_json  # noqa: E402
+from analysis.http_cassette import install_from_env, throttle  # noqa: E402
+from analysis.timeseries_store import fdic_raw_frame, record_snapshot  # noqa: E402
+
 OUTPUT_PATH = ROOT / "data" / "fdic_raw.json"
 FDIC_CERT = 23417
 BANK_NAME = "CATHAY BANK"
@@ -55,7 +60,7 @@ def _get(url: str, params: Dict[str, Any]) -> Dict[str, Any]:
         },
         timeout=REQUEST_TIMEOUT,
     )
-    time.sleep(RATE_LIMIT_SECONDS)
+    throttle(RATE_LIMIT_SECONDS)
     resp.raise_for_status()
     return resp.json()
 
@@ -137,18 +142,12 @@ def normalize_quarters(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return quarters
 
 
-def write_json(path: Path, payload: Dict[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as fh:
-        json.dump(payload, fh, indent=2, sort_keys=True)
-        fh.write("\n")
-
-
 def main() -> int:
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s %(levelname)s %(message)s",
     )
+    install_from_env()
     try:
         institution = fetch_institution()
         logging.info("FDIC CERT %s (%s)", institution["cert"], institution["name"])
@@ -168,11 +167,17 @@ def main() -> int:
         }
         write_json(OUTPUT_PATH, payload)
         logging.info("Wrote %s", OUTPUT_PATH.relative_to(ROOT))
-        return 0
     except Exception as exc:  # noqa: BLE001
         logging.error("Failed to fetch FDIC data: %s", exc, exc_info=True)
         return 1
 
+    # The store is a history cache: a store failure must not fail the fetch.
+    try:
+        record_snapshot("fdic", fdic_raw_frame(payload))
+    except Exception as exc:  # noqa: BLE001
+        logging.warning("Time-series store not updated: %s", exc)
+    return 0
+
 
 if __name__ == "__main__":
     sys.exit(main())
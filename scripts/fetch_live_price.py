@@ -1,34 +1,34 @@
 #!/usr/bin/env python3
-"""Fetch the latest CATY close price from Yahoo Finance and update market data."""
+"""Fetch the latest CATY close price from Yahoo Finance and update market data.
+
+The close is read through the shared daily price cache
+(analysis/price_service.py), which only downloads the sessions it is missing.
+"""
 
 from __future__ import annotations
 
-import json
 import sys
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
-import yfinance as yf
-
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from analysis.data_io import load_json, write_json  # noqa: E402
+from analysis.http_cassette import install_from_env  # noqa: E402
+from analysis.price_service import PriceService  # noqa: E402
+
 DATA_PATH = ROOT / "data" / "market_data_current.json"
 
 
 def fetch_latest_price(days: int = 5) -> tuple[float, str]:
     """Return the most recent close price within the trailing `days` window."""
-    if days < 1:
-        raise ValueError("days must be >= 1")
-
-    ticker = yf.Ticker("CATY")
-    history = ticker.history(period=f"{days}d")
-    history = history.dropna(subset=["Close"])
-    if history.empty:
+    latest = PriceService().latest_closes(["CATY"], days=days)
+    if "CATY" not in latest:
         raise RuntimeError("No price data returned from Yahoo Finance")
-
-    close_price = float(history["Close"].iloc[-1])
-    price_date = history.index[-1].strftime("%Y-%m-%d")
-    return close_price, price_date
+    return latest["CATY"]
 
 
 def update_market_data(price: float, price_date: str) -> dict[str, Any]:
@@ -36,8 +36,7 @@ def update_market_data(price: float, price_date: str) -> dict[str, Any]:
     if not DATA_PATH.exists():
         raise FileNotFoundError(f"Market data file missing: {DATA_PATH}")
 
-    with DATA_PATH.open("r", encoding="utf-8") as fh:
-        payload = json.load(fh)
+    payload = load_json(DATA_PATH)
 
     payload["price"] = round(price, 2)
     payload["price_date"] = price_date
@@ -80,14 +79,13 @@ def update_market_data(price: float, price_date: str) -> dict[str, Any]:
     report_meta["last_updated_utc"] = now_utc.isoformat().replace("+00:00", "Z")
     report_meta["generated_at_display"] = now_utc.strftime("%B %d, %Y %H:%M UTC")
 
-    with DATA_PATH.open("w", encoding="utf-8") as fh:
-        json.dump(payload, fh, indent=2)
-        fh.write("\n")
+    write_json(DATA_PATH, payload, sort_keys=False)
 
     return payload
 
 
 def main() -> int:
+    install_from_env()
     try:
         price, price_date = fetch_latest_price()
         payload = update_market_data(price, price_date)
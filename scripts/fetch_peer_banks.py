@@ -13,9 +13,8 @@ to historical CRE ratios when the XBRL payload does not disclose a granular brea
 from __future__ import annotations
 
 import datetime as dt
-import json
 import logging
-import time
+import sys
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Optional
@@ -23,6 +22,13 @@ from typing import Any, Dict, Optional
 import requests
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from analysis.data_io import write_json  # noqa: E402
+from analysis.http_cassette import install_from_env, throttle  # noqa: E402
+from analysis.timeseries_store import peer_snapshot_frame, record_snapshot  # noqa: E402
+
 OUTPUT_PATH = ROOT / "data" / "peer_data_raw.json"
 
 USER_AGENT = "Claude Peer Analytics peer-fetcher@example.com"
@@ -77,7 +83,7 @@ def _http_get_json(session: requests.Session, url: str) -> Dict[str, Any]:
         },
         timeout=REQUEST_TIMEOUT,
     )
-    time.sleep(RATE_LIMIT_SECONDS)
+    throttle(RATE_LIMIT_SECONDS)
     resp.raise_for_status()
     return resp.json()
 
@@ -399,18 +405,20 @@ def fetch_all_peers() -> Dict[str, Any]:
 
 def main() -> int:
     logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    install_from_env()
     try:
         payload = fetch_all_peers()
     except Exception as exc:
         logging.error("Peer fetch failed: %s", exc)
         return 1
 
-    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with OUTPUT_PATH.open("w", encoding="utf-8") as fh:
-        json.dump(payload, fh, indent=2, sort_keys=True)
-        fh.write("\n")
+    write_json(OUTPUT_PATH, payload)
 
     logging.info("Wrote peer dataset to %s (%s banks)", OUTPUT_PATH, len(payload["banks"]))
+    try:
+        record_snapshot("peers", peer_snapshot_frame(payload))
+    except Exception as exc:  # noqa: BLE001
+        logging.warning("Time-series store not updated: %s", exc)
     return 0
 
 
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Fetch quarterly net charge-off ratio history (FDIC field NTLNLSCOQR) for the
+CATY peer banks and record it in the time-series store.
+
+analysis/nco_probability_analysis.py pivots every entity's ``fdic``
+NTLNLSCOQR series into one panel; this fetcher supplies the peer rows that
+drive its "Peer benchmark" section. Bank CERTs are resolved once by name
+through the FDIC institutions API and reused from the previous payload on
+later runs.
+
+Output:
+  - data/peer_fdic_nco.json
+  - data/timeseries/fdic/<TICKER>.parquet (NTLNLSCOQR rows)
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import requests
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from analysis.data_io import load_json, write_json  # noqa: E402
+from analysis.http_cassette import install_from_env, throttle  # noqa: E402
+from analysis.timeseries_store import PEER_FDIC_NCO_PATH, peer_fdic_nco_frame, record_snapshot  # noqa: E402
+
+OUTPUT_PATH = PEER_FDIC_NCO_PATH
+USER_AGENT = "Claude Code Research caty-equity@example.com"
+RATE_LIMIT_SECONDS = 0.2
+REQUEST_TIMEOUT = 30
+
+INSTITUTIONS_URL = "https://banks.data.fdic.gov/api/institutions"
+FINANCIALS_URL = "https://banks.data.fdic.gov/api/financials"
+FIELD = "NTLNLSCOQR"
+HISTORY_LIMIT = 200  # quarters; covers the FDIC series back to the 1980s
+
+# Bank subsidiary names as registered with the FDIC (holding-company tickers).
+PEER_BANK_NAMES: Dict[str, str] = {
+    "EWBC": "East West Bank",
+    "CVBF": "Citizens Business Bank",
+    "HAFC": "Hanmi Bank",
+    "HOPE": "Bank of Hope",
+    "COLB": "Columbia Bank",
+    "WAFD": "WaFd Bank",
+    "PPBI": "Pacific Premier Bank",
+    "BANC": "Banc of California",
+    "OPBK": "Open Bank",
+}
+
+
+def _now_utc_iso() -> str:
+    return dt.datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+
+
+def _get(url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    logging.debug("GET %s params=%s", url, params)
+    resp = requests.get(
+        url,
+        params=params,
+        headers={
+            "User-Agent": USER_AGENT,
+            "Accept": "application/json",
+        },
+        timeout=REQUEST_TIMEOUT,
+    )
+    throttle(RATE_LIMIT_SECONDS)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _records(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [item.get("data", item) for item in payload.get("data", [])]
+
+
+def lookup_cert(name: str) -> Optional[int]:
+    params = {
+        "filters": f"NAME:\"{name}\" AND ACTIVE:1",
+        "fields": "CERT,NAME",
+        "limit": 1,
+        "format": "json",
+        "download": "false",
+        "filename": "data_file",
+    }
+    records = _records(_get(INSTITUTIONS_URL, params))
+    return int(records[0]["CERT"]) if records else None
+
+
+def fetch_nco_history(cert: int) -> List[Dict[str, Any]]:
+    params = {
+        "filters": f"CERT:{cert}",
+        "fields": f"CERT,REPDTE,{FIELD}",
+        "sort_by": "REPDTE",
+        "sort_order": "DESC",
+        "limit": HISTORY_LIMIT,
+        "offset": 0,
+        "format": "json",
+        "download": "false",
+        "filename": "data_file",
+    }
+    return [
+        {"period": record.get("REPDTE"), FIELD: record.get(FIELD)}
+        for record in _records(_get(FINANCIALS_URL, params))
+        if record.get(FIELD) is not None
+    ]
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    install_from_env()
+    previous = load_json(OUTPUT_PATH, {}).get("banks", {})
+    banks: Dict[str, Dict[str, Any]] = {}
+    for ticker, name in PEER_BANK_NAMES.items():
+        try:
+            cert = previous.get(ticker, {}).get("cert") or lookup_cert(name)
+            if cert is None:
+                logging.warning("No active FDIC institution named %r (%s)", name, ticker)
+                continue
+            banks[ticker] = {"cert": cert, "name": name, "quarters": fetch_nco_history(cert)}
+            logging.info("%s (CERT %s): %s quarters", ticker, cert, len(banks[ticker]["quarters"]))
+        except Exception as exc:  # noqa: BLE001
+            logging.warning("Failed to fetch NCO history for %s: %s", ticker, exc)
+            if ticker in previous:
+                banks[ticker] = previous[ticker]
+
+    if not banks:
+        logging.error("No peer NCO history fetched")
+        return 1
+
+    payload = {
+        "source": "FDIC Call Reports",
+        "fetch_timestamp": _now_utc_iso(),
+        "field": FIELD,
+        "banks": banks,
+    }
+    write_json(OUTPUT_PATH, payload)
+    logging.info("Wrote %s (%s banks)", OUTPUT_PATH.relative_to(ROOT), len(banks))
+
+    # The store is a history cache: a store failure must not fail the fetch.
+    try:
+        record_snapshot("fdic", peer_fdic_nco_frame(payload))
+    except Exception as exc:  # noqa: BLE001
+        logging.warning("Time-series store not updated: %s", exc)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,26 @@
 #!/usr/bin/env python3
-"""Fetch latest closing prices for the CATY peer set via yfinance."""
+"""Fetch latest closing prices for the CATY peer set via yfinance.
+
+All tickers are served from the shared daily price cache
+(analysis/price_service.py) in one batched download of the missing days.
+"""
 
 from __future__ import annotations
 
 import json
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Tuple
-
-import yfinance as yf
+from typing import Dict, List, Optional, Tuple
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from analysis.data_io import load_json, write_json  # noqa: E402
+from analysis.http_cassette import install_from_env  # noqa: E402
+from analysis.price_service import PriceService  # noqa: E402
+
 OUTPUT_PATH = ROOT / "data" / "peer_market_prices.json"
 
 PEER_TICKERS = [
@@ -28,36 +38,34 @@ PEER_TICKERS = [
 
 
 def load_existing_prices() -> Dict[str, any]:
-    if not OUTPUT_PATH.exists():
+    try:
+        return load_json(OUTPUT_PATH, {})
+    except json.JSONDecodeError:
         return {}
-    with OUTPUT_PATH.open("r", encoding="utf-8") as handle:
-        try:
-            return json.load(handle)
-        except json.JSONDecodeError:
-            return {}
 
 
-def fetch_close(ticker: str, fallback: Dict[str, any]) -> Tuple[float, str, bool]:
-    history = yf.Ticker(ticker).history(period="5d")
-    history = history.dropna(subset=["Close"])
-    if history.empty:
+def resolve_close(
+    ticker: str, latest: Optional[Tuple[float, str]], fallback: Dict[str, any]
+) -> Tuple[float, str, bool]:
+    if latest is None:
         fallback_prices = fallback.get("prices", {}) if fallback else {}
         if ticker in fallback_prices:
             return float(fallback_prices[ticker]), fallback.get("date", ""), True
         raise RuntimeError(f"No pricing data returned for {ticker}")
-    close_price = float(history["Close"].iloc[-1])
-    price_date = history.index[-1].strftime("%Y-%m-%d")
+    close_price, price_date = latest
     return close_price, price_date, False
 
 
 def main() -> int:
+    install_from_env()
     fallback_payload = load_existing_prices()
     closes: Dict[str, float] = {}
     price_dates: List[str] = []
     fallbacks_used: List[str] = []
 
+    latest = PriceService().latest_closes(PEER_TICKERS)
     for ticker in PEER_TICKERS:
-        price, date_str, used_fallback = fetch_close(ticker, fallback_payload)
+        price, date_str, used_fallback = resolve_close(ticker, latest.get(ticker), fallback_payload)
         closes[ticker] = round(price, 2)
         price_dates.append(date_str)
         if used_fallback:
@@ -78,9 +86,7 @@ def main() -> int:
             "previous_snapshot": fallback_payload.get("captured_at"),
         }
 
-    with OUTPUT_PATH.open("w", encoding="utf-8") as handle:
-        json.dump(payload, handle, indent=2)
-        handle.write("\n")
+    write_json(OUTPUT_PATH, payload, sort_keys=False)
 
     print(f"Wrote peer prices for {len(PEER_TICKERS)} tickers to {OUTPUT_PATH}")
     return 0
@@ -9,16 +9,21 @@ raw fact values, metadata, and provenance needed by downstream merge scripts.
 from __future__ import annotations
 
 import datetime as dt
-import json
 import logging
 import sys
-import time
 from pathlib import Path
 from typing import Any, Dict, Optional
 
 import requests
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from analysis.data_io import write_json  # noqa: E402
+from analysis.http_cassette import install_from_env, throttle  # noqa: E402
+from analysis.timeseries_store import record_snapshot, sec_edgar_frame  # noqa: E402
+
 OUTPUT_PATH = ROOT / "data" / "sec_edgar_raw.json"
 CIK = "0000861842"
 SUBMISSIONS_URL = f"https://data.sec.gov/submissions/CIK{CIK}.json"
@@ -71,7 +76,7 @@ def _http_get_json(url: str) -> Dict[str, Any]:
         },
         timeout=REQUEST_TIMEOUT,
     )
-    time.sleep(RATE_LIMIT_SECONDS)
+    throttle(RATE_LIMIT_SECONDS)
     resp.raise_for_status()
     return resp.json()
 
@@ -253,18 +258,12 @@ def build_payload(
     return payload
 
 
-def write_json(path: Path, payload: Dict[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as fh:
-        json.dump(payload, fh, indent=2, sort_keys=True)
-        fh.write("\n")
-
-
 def main() -> int:
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s %(levelname)s %(message)s",
     )
+    install_from_env()
     try:
         filings = find_recent_filings(limit=10)
         latest_10q = next((f for f in filings if f["form_type"] == "10-Q"), None)
@@ -300,11 +299,17 @@ def main() -> int:
 
         write_json(OUTPUT_PATH, payload)
         logging.info("Wrote %s", OUTPUT_PATH.relative_to(ROOT))
-        return 0
     except Exception as exc:  # noqa: BLE001
         logging.error("Failed to fetch SEC EDGAR data: %s", exc, exc_info=True)
         return 1
 
+    # The store is a history cache: a store failure must not fail the fetch.
+    try:
+        record_snapshot("sec", sec_edgar_frame(payload))
+    except Exception as exc:  # noqa: BLE001
+        logging.warning("Time-series store not updated: %s", exc)
+    return 0
+
 
 if __name__ == "__main__":
     sys.exit(main())
@@ -5,12 +5,17 @@ Filters FDIC NCO timeseries to post-2008 sample and formats for createNCOTrendCh
 """
 
 import csv
-import json
+import sys
 from datetime import datetime
 from pathlib import Path
 
 # Paths
 base_dir = Path(__file__).parent.parent
+if str(base_dir) not in sys.path:
+    sys.path.insert(0, str(base_dir))
+
+from analysis.data_io import write_json  # noqa: E402
+
 csv_path = base_dir / 'evidence' / 'raw' / 'fdic_CATY_NTLNLSCOQR_timeseries.csv'
 json_path = base_dir / 'data' / 'fdic_nco_history.json'
 
@@ -62,9 +67,7 @@ chart_data = {
 }
 
 # Write JSON
-json_path.parent.mkdir(exist_ok=True)
-with open(json_path, 'w') as f:
-    json.dump(chart_data, f, indent=2)
+write_json(json_path, chart_data, sort_keys=False)
 
 print(f"✓ Generated {json_path}")
 print(f"  Sample: {chart_data['metadata']['start_date']} to {chart_data['metadata']['end_date']}")
@@ -9,13 +9,18 @@ regression analysis, but is now generated entirely from API-derived metrics.
 from __future__ import annotations
 
 import csv
-import json
 import logging
 import shutil
+import sys
 from pathlib import Path
 from typing import Any, Dict, List
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from analysis.data_io import load_json  # noqa: E402
+
 PEER_DATA_PATH = ROOT / "data" / "peer_data_raw.json"
 PRICE_DATA_PATH = ROOT / "data" / "peer_market_prices.json"
 OUTPUT_PATH = ROOT / "evidence" / "peer_snapshot_2025Q2.csv"
@@ -52,11 +57,6 @@ CSV_FIELDS = [
 ]
 
 
-def _load_json(path: Path) -> Dict[str, Any]:
-    with path.open("r", encoding="utf-8") as fh:
-        return json.load(fh)
-
-
 def _fmt(value: Any, decimals: int) -> str:
     if value is None:
         return ""
@@ -70,8 +70,8 @@ def main() -> int:
         logging.error("Peer dataset missing: %s", PEER_DATA_PATH)
         return 1
 
-    peer_payload = _load_json(PEER_DATA_PATH)
-    price_payload = _load_json(PRICE_DATA_PATH) if PRICE_DATA_PATH.exists() else {"prices": {}}
+    peer_payload = load_json(PEER_DATA_PATH)
+    price_payload = load_json(PRICE_DATA_PATH, {"prices": {}})
 
     period = peer_payload.get("period", "Unknown Period")
     banks: Dict[str, Dict[str, Any]] = peer_payload.get("banks", {})
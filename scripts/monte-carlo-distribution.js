@@ -2,7 +2,8 @@
 (function() {
     'use strict';
 
-    const DATA_URL = 'data/caty14_monte_carlo.json';
+    // Precomputed by build_site.py and linked from the page head.
+    const BUNDLE_KEY = 'monte_carlo';
 
     const SELECTORS = {
         canvas: 'mcDistributionChart',
@@ -805,15 +806,15 @@
     }
 
     async function loadData() {
-        const response = await fetch(DATA_URL);
-        if (!response.ok) {
-            throw new Error(`Failed to load ${DATA_URL}: ${response.status}`);
+        const bundle = await window.loadChartBundle();
+        const json = bundle?.[BUNDLE_KEY];
+        if (!json) {
+            throw new Error(`Chart data bundle has no ${BUNDLE_KEY} section`);
         }
 
-        const json = await response.json();
-        const summary = json?.simulation_summary || {};
-        const confidence = json?.confidence_interval || {};
-        const probabilityBands = json?.tables?.probability_bands || [];
+        const summary = json.simulation_summary || {};
+        const confidence = json.confidence_interval || {};
+        const probabilityBands = json.probability_bands || [];
 
         state.summary = {
             numRuns: toNumber(summary.num_runs, 0),
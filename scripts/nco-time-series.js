@@ -2,9 +2,9 @@
 (function() {
     'use strict';
 
-    const CREDIT_DATA_URL = 'data/caty07_credit_quality.json';
-    const FDIC_HISTORY_URL = 'data/fdic_nco_history.json';
-    const QUARTERS_TO_PLOT = ['2024-Q3', '2024-Q4', '2025-Q1', '2025-Q2'];
+    // Precomputed by build_site.py: annual rows parsed from caty07, the plotted
+    // FDIC quarters and reference lines, linked from the page head.
+    const BUNDLE_KEY = 'nco_time_series';
 
     const DATASET_IDS = {
         annual: 'annual',
@@ -150,118 +150,66 @@
         return color || '#7A8893';
     }
 
-    function parseAnnualHistory(historyHtml) {
-        if (!historyHtml) {
-            return [];
-        }
-
-        const parser = new DOMParser();
-        const doc = parser.parseFromString(`<table>${historyHtml}</table>`, 'text/html');
-        const rows = Array.from(doc.querySelectorAll('tr'));
-        const data = [];
-
-        rows.forEach(row => {
-            const cells = row.querySelectorAll('td');
-            if (cells.length < 2) {
-                return;
-            }
-
-            const period = cells[0].textContent.trim();
-            if (!/^\d{4}$/.test(period)) {
-                return;
-            }
-
-            const valueText = cells[1].textContent.replace(/[^0-9.\-]/g, '');
-            const value = Number.parseFloat(valueText);
+    function buildAnnualSeries(rows) {
+        return (Array.isArray(rows) ? rows : []).reduce((data, row) => {
+            const value = toNumber(row.value);
             if (!Number.isFinite(value)) {
-                return;
+                return data;
             }
 
-            const context = cells[2] ? cells[2].textContent.trim() : '';
             const { category, label } = categorizeValue(value);
-
             data.push({
-                period,
+                period: row.period,
                 value,
-                context,
+                context: row.context || '',
                 category,
                 categoryLabel: label,
-                emphasize: ['2009', '2010', '2011', '2024'].includes(period),
-                isGfcPeak: period === '2009'
+                emphasize: ['2009', '2010', '2011', '2024'].includes(row.period),
+                isGfcPeak: row.period === '2009'
             });
-        });
-
-        return data;
+            return data;
+        }, []);
     }
 
-    function buildQuarterlySeries(fdicHistory) {
-        const rawSeries = Array.isArray(fdicHistory.raw_data) ? fdicHistory.raw_data : [];
-        const lookup = new Map(
-            rawSeries.map(item => [item.date, toNumber(item.nco_bps)])
-        );
-
-        const series = [];
-
-        QUARTERS_TO_PLOT.forEach(period => {
-            const value = lookup.get(period);
+    function buildQuarterlySeries(rows) {
+        return (Array.isArray(rows) ? rows : []).reduce((series, row) => {
+            const value = toNumber(row.value);
             if (!Number.isFinite(value)) {
-                console.warn(`NCO quarterly value missing for ${period}`);
-                return;
+                console.warn(`NCO quarterly value missing for ${row.period}`);
+                return series;
             }
 
             const { category, label } = categorizeValue(value);
             series.push({
-                period,
+                period: row.period,
                 value,
                 category,
                 categoryLabel: label,
                 context: 'Quarterly annualized net charge-off rate'
             });
-        });
-
-        return series;
+            return series;
+        }, []);
     }
 
     async function loadData() {
-        const [creditResponse, fdicResponse] = await Promise.all([
-            fetch(CREDIT_DATA_URL),
-            fetch(FDIC_HISTORY_URL)
-        ]);
-
-        if (!creditResponse.ok) {
-            throw new Error(`Failed to load ${CREDIT_DATA_URL} (${creditResponse.status})`);
+        const bundle = await window.loadChartBundle();
+        const data = bundle?.[BUNDLE_KEY];
+        if (!data) {
+            throw new Error(`Chart data bundle has no ${BUNDLE_KEY} section.`);
         }
 
-        if (!fdicResponse.ok) {
-            throw new Error(`Failed to load ${FDIC_HISTORY_URL} (${fdicResponse.status})`);
-        }
-
-        const creditData = await creditResponse.json();
-        const fdicHistory = await fdicResponse.json();
-
-        state.references.throughCycle = toNumber(
-            creditData?.through_cycle_nco?.guardrail_mean_bps,
-            toNumber(creditData?.snapshot_metrics?.stress_guardrail_nco_bps, 42.8)
-        );
-        state.references.normalized = toNumber(
-            creditData?.through_cycle_nco?.prob90_post2014_bps,
-            toNumber(creditData?.snapshot_metrics?.through_cycle_nco_bps, 30.0)
-        );
-        state.references.current = toNumber(
-            creditData?.snapshot_metrics?.nco_rate_ltm_bps,
-            toNumber(creditData?.snapshot_metrics?.nco_rate_qtd_bps, 18.1)
-        );
-        state.references.gfcPeak = toNumber(
-            creditData?.through_cycle_nco?.gfc_peak_bps,
-            234.4
-        );
+        const references = data.references || {};
+        state.references.throughCycle = toNumber(references.through_cycle);
+        state.references.normalized = toNumber(references.normalized);
+        state.references.current = toNumber(references.current);
+        state.references.gfcPeak = toNumber(references.gfc_peak);
 
-        state.annualData = parseAnnualHistory(creditData?.through_cycle_nco?.history_rows_html);
+        state.annualData = buildAnnualSeries(data.annual);
         if (!state.annualData.length) {
             throw new Error('Annual NCO history not available in credit quality dataset.');
         }
 
-        state.quarterlyData = buildQuarterlySeries(fdicHistory);
+        state.quarterlyData = buildQuarterlySeries(data.quarterly);
         state.gfcIndex = state.annualData.findIndex(item => item.isGfcPeak);
         state.recoveryIndices = state.annualData.reduce((accumulator, item, index) => {
             if (['2017', '2018', '2019'].includes(item.period)) {
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""Publish the static site into dist/: minified, fingerprinted, precompressed.
+
+Runs after build_site.py:
+- Pages (index.html and the module pages) are minified; inline <script> and
+  <style> blocks go through the JS/CSS minifiers, <pre>/<textarea> are kept.
+- Local stylesheets and scripts the pages link are minified and renamed to
+  ``<name>.<sha256[:10]>.<ext>``; every page reference is rewritten.
+- Other local files the pages link or the scripts fetch (data/*.json, evidence,
+  analysis exhibits) are copied unchanged.
+- Every text file gets .gz (level 9) and, when the ``brotli`` module is
+  installed, .br (quality 11) siblings.
+- dist/asset-manifest.json maps source paths to published names with sizes
+  and the Cache-Control each file should be served with.
+
+The JS minifier is deliberately conservative: it drops comments and
+indentation but keeps line breaks, so automatic semicolon insertion behaves
+exactly as in the source.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import re
+import shutil
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+try:  # pragma: no cover - optional dependency guard
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None  # type: ignore
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from analysis.data_io import write_json  # noqa: E402
+
+DIST_DIR = ROOT / "dist"
+MANIFEST_NAME = "asset-manifest.json"
+DASHBOARD_PAGE = "index.html"
+FINGERPRINT_SUFFIXES = (".css", ".js")
+COMPRESSIBLE_SUFFIXES = (".html", ".css", ".js", ".json", ".csv", ".svg", ".txt", ".md", ".xml")
+# build_site.py already content-hashes these.
+PREHASHED_DIRS = ("data/bundles/",)
+CACHE_IMMUTABLE = "public, max-age=31536000, immutable"
+CACHE_REVALIDATE = "no-cache"
+
+_REFERENCE_PATTERN = re.compile(r"""(?P<attr>\b(?:src|href))=(?P<quote>["'])(?P<url>[^"']+)(?P=quote)""")
+_SCRIPT_PATH_PATTERN = re.compile(r"""["'`]((?:[A-Za-z0-9_-]+/)+[A-Za-z0-9_.-]+\.[A-Za-z0-9]+)["'`]""")
+_RAW_BLOCK_PATTERN = re.compile(r"(<(script|style|pre|textarea)\b[^>]*>)(.*?)(</\2\s*>)", re.IGNORECASE | re.DOTALL)
+_HTML_COMMENT_PATTERN = re.compile(r"<!--(?!\[if).*?-->", re.DOTALL)
+_CSS_TOKEN_PATTERN = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|/\*.*?\*/""", re.DOTALL)
+_REGEX_PRECEDERS = set("(,=:[!&|?{};+-*%<>~^")
+_JS_RUN_PATTERN = re.compile(r"[A-Za-z0-9_$.\\]+|[^\sA-Za-z0-9_$.\\'\"`/{}]")
+# Punctuation that can never merge with a neighbouring token (no + - / . here).
+_TIGHT_PUNCTUATION = set("{}()[];,:=<>!&|?*")
+_REGEX_KEYWORDS = {
+    "return", "typeof", "case", "do", "else", "in", "of", "new", "delete", "void", "throw", "instanceof", "yield", "await",
+}
+
+
+# ---------------------------------------------------------------------------
+# Minifiers
+# ---------------------------------------------------------------------------
+
+def minify_css(css: str) -> str:
+    def drop_comments(match: re.Match[str]) -> str:
+        return match.group(1) or ""
+
+    parts = re.split(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')""", _CSS_TOKEN_PATTERN.sub(drop_comments, css))
+    for index in range(0, len(parts), 2):
+        code = re.sub(r"\s+", " ", parts[index])
+        code = re.sub(r"\s*([{};,>])\s*", r"\1", code)
+        code = re.sub(r":\s+", ":", code)
+        parts[index] = code.replace(";}", "}")
+    return "".join(parts).strip()
+
+
+def _last_significant(out: List[str]) -> str:
+    """Trailing identifier/keyword or punctuation character of the emitted code."""
+    for chunk in reversed(out):
+        stripped = chunk.rstrip()
+        if not stripped:
+            continue
+        word = re.search(r"[A-Za-z_$][\w$]*$", stripped)
+        return word.group(0) if word else stripped[-1]
+    return ""
+
+
+def _regex_allowed(out: List[str]) -> bool:
+    previous = _last_significant(out)
+    if not previous:
+        return True
+    if previous[-1].isalnum() or previous[-1] in "_$":
+        return previous in _REGEX_KEYWORDS
+    return previous in _REGEX_PRECEDERS or previous == "}"
+
+
+def minify_js(source: str) -> str:
+    """Strip comments, indentation and blank lines outside literals.
+
+    Line breaks between statements are kept as single newlines so automatic
+    semicolon insertion is unaffected; a space between two tokens is dropped
+    only when one side is unambiguous punctuation.
+    """
+    out: List[str] = []
+    templates: List[int] = []  # open-brace depth inside each ${ ... } expression
+    pending = ""  # whitespace seen since the last token: "", " " or "\n"
+    i, n = 0, len(source)
+
+    def emit(token: str) -> None:
+        nonlocal pending
+        if out and pending == "\n":
+            out.append("\n")
+        elif out and pending == " ":
+            if not (out[-1][-1] in _TIGHT_PUNCTUATION or token[0] in _TIGHT_PUNCTUATION):
+                out.append(" ")
+        pending = ""
+        out.append(token)
+
+    while i < n:
+        ch = source[i]
+        if ch in " \t\r\n":
+            if ch == "\n":
+                pending = "\n"
+            elif not pending:
+                pending = " "
+            i += 1
+            continue
+        if source.startswith("//", i):
+            end = source.find("\n", i)
+            i = n if end < 0 else end
+            continue
+        if source.startswith("/*", i):
+            end = source.find("*/", i + 2)
+            end = n if end < 0 else end + 2
+            if "\n" in source[i:end]:
+                pending = "\n"
+            elif not pending:
+                pending = " "
+            i = end
+            continue
+        if ch in "'\"":
+            j = i + 1
+            while j < n and source[j] != ch and source[j] != "\n":
+                j += 2 if source[j] == "\\" else 1
+            emit(source[i : j + 1])
+            i = j + 1
+            continue
+        if ch == "`" or (ch == "}" and templates and templates[-1] == 0):
+            if ch == "}":
+                templates.pop()
+            j = i + 1
+            while j < n:
+                if source[j] == "\\":
+                    j += 2
+                    continue
+                if source[j] == "`":
+                    j += 1
+                    break
+                if source.startswith("${", j):
+                    j += 2
+                    templates.append(0)
+                    break
+                j += 1
+            emit(source[i:j])
+            i = j
+            continue
+        if ch == "/" and _regex_allowed(out):
+            j, in_class = i + 1, False
+            while j < n and source[j] != "\n":
+                if source[j] == "\\":
+                    j += 2
+                    continue
+                if source[j] == "[":
+                    in_class = True
+                elif source[j] == "]":
+                    in_class = False
+                elif source[j] == "/" and not in_class:
+                    break
+                j += 1
+            if j < n and source[j] == "/":
+                j += 1
+                while j < n and (source[j].isalnum() or source[j] in "_$"):
+                    j += 1
+                emit(source[i:j])
+                i = j
+                continue
+        if ch in "{}":
+            if templates:
+                templates[-1] += 1 if ch == "{" else -1
+            emit(ch)
+            i += 1
+            continue
+        run = _JS_RUN_PATTERN.match(source, i)
+        token = run.group(0) if run else ch
+        emit(token)
+        i += len(token)
+    return "".join(out) + "\n"
+
+
+def minify_html(html: str) -> str:
+    def squeeze(text: str) -> str:
+        text = _HTML_COMMENT_PATTERN.sub("", text)
+        return "\n".join(line.strip() for line in text.splitlines() if line.strip())
+
+    pieces: List[str] = []
+    pos = 0
+    for match in _RAW_BLOCK_PATTERN.finditer(html):
+        pieces.append(squeeze(html[pos : match.start()]))
+        open_tag, tag, body, close_tag = match.group(1), match.group(2).lower(), match.group(3), match.group(4)
+        if tag == "script" and not re.search(r"\btype=[\"']?(?!text/javascript|module)[^\s>]", open_tag) and body.strip():
+            body = minify_js(body).strip("\n")
+        elif tag == "style":
+            body = minify_css(body)
+        pieces.append(f"{squeeze(open_tag)}{body}{close_tag}")
+        pos = match.end()
+    pieces.append(squeeze(html[pos:]))
+    return "\n".join(piece for piece in pieces if piece) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# Publishing
+# ---------------------------------------------------------------------------
+
+def local_reference(url: str) -> Optional[str]:
+    """Site-relative path for a local src/href, or None for external/anchors."""
+    if re.match(r"^[a-zA-Z][a-zA-Z0-9+.-]*:|^//|^#", url):
+        return None
+    path = re.split(r"[?#]", url, 1)[0]
+    if not path or path.startswith("/"):
+        path = path.lstrip("/")
+    return path or None
+
+
+def fingerprint_name(rel_path: str, payload: bytes) -> str:
+    digest = hashlib.sha256(payload).hexdigest()[:10]
+    stem, dot, suffix = rel_path.rpartition(".")
+    return f"{stem}.{digest}.{suffix}" if dot else f"{rel_path}.{digest}"
+
+
+def compress_siblings(path: Path, payload: bytes) -> Dict[str, int]:
+    sizes = {"bytes": len(payload)}
+    if path.suffix not in COMPRESSIBLE_SUFFIXES:
+        return sizes
+    gz = gzip.compress(payload, compresslevel=9, mtime=0)
+    if len(gz) < len(payload):
+        path.with_name(path.name + ".gz").write_bytes(gz)
+        sizes["gzip"] = len(gz)
+    if brotli is not None:
+        br = brotli.compress(payload, quality=11)
+        if len(br) < len(payload):
+            path.with_name(path.name + ".br").write_bytes(br)
+            sizes["br"] = len(br)
+    return sizes
+
+
+def site_pages(root: Path) -> List[Path]:
+    return sorted(root.glob("*.html"))
+
+
+def collect_references(html: str) -> List[str]:
+    return [ref for ref in (local_reference(m.group("url")) for m in _REFERENCE_PATTERN.finditer(html)) if ref]
+
+
+def script_references(source: str) -> Set[str]:
+    """Site-relative paths a script fetches at runtime (quoted ``dir/file.ext`` literals)."""
+    return {m.group(1) for m in _SCRIPT_PATH_PATTERN.finditer(source)}
+
+
+def published_sources(root: Path = ROOT, out_dir: Path = DIST_DIR) -> List[str]:
+    """Every source file ``publish`` reads: the pages, what they link and what their scripts fetch.
+
+    update_all_data.py fingerprints these as the publish_site stage inputs.
+    """
+    root, out_dir = root.resolve(), out_dir.resolve()
+    pages = {page.name: page.read_text(encoding="utf-8") for page in site_pages(root)}
+    referenced = {ref for html in pages.values() for ref in collect_references(html) if (root / ref).is_file()}
+    for ref in sorted(referenced):
+        if ref.endswith(".js") and ref not in pages:
+            referenced |= script_references((root / ref).read_text(encoding="utf-8"))
+    return sorted(
+        ref for ref in set(pages) | referenced
+        if (root / ref).is_file() and out_dir not in (root / ref).resolve().parents
+    )
+
+
+def publish(root: Path = ROOT, out_dir: Path = DIST_DIR) -> Dict[str, object]:
+    root, out_dir = root.resolve(), out_dir.resolve()
+    if out_dir == root or root.is_relative_to(out_dir):
+        raise ValueError(f"Refusing to publish into {out_dir}: it contains the source tree")
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    out_dir.mkdir(parents=True)
+
+    pages = {page.name: page.read_text(encoding="utf-8") for page in site_pages(root)}
+    referenced = sorted({ref for html in pages.values() for ref in collect_references(html) if (root / ref).is_file()})
+    fingerprint_sources = [ref for ref in referenced if ref.endswith(FINGERPRINT_SUFFIXES) and ref not in pages]
+
+    files: Dict[str, Dict[str, object]] = {}
+    assets: Dict[str, str] = {}
+
+    def write(rel_path: str, payload: bytes, source: str, cache: str) -> None:
+        target = out_dir / rel_path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(payload)
+        entry: Dict[str, object] = {"source": source, "source_bytes": (root / source).stat().st_size, "cache_control": cache}
+        entry.update(compress_siblings(target, payload))
+        files[rel_path] = entry
+
+    runtime_refs: set = set()
+    for rel_path in fingerprint_sources:
+        text = (root / rel_path).read_text(encoding="utf-8")
+        minified = minify_css(text) + "\n" if rel_path.endswith(".css") else minify_js(text)
+        payload = minified.encode("utf-8")
+        published = fingerprint_name(rel_path, payload)
+        assets[rel_path] = published
+        write(published, payload, rel_path, CACHE_IMMUTABLE)
+        if rel_path.endswith(".js"):
+            runtime_refs |= script_references(text)
+
+    copies = sorted(
+        ({ref for ref in referenced if ref not in assets and ref not in pages} | runtime_refs)
+        - set(assets)
+    )
+    for rel_path in copies:
+        source = root / rel_path
+        if not source.is_file() or out_dir in source.resolve().parents:
+            continue
+        cache = CACHE_IMMUTABLE if rel_path.startswith(PREHASHED_DIRS) else CACHE_REVALIDATE
+        write(rel_path, source.read_bytes(), rel_path, cache)
+
+    def rewrite(match: re.Match[str]) -> str:
+        ref = local_reference(match.group("url"))
+        if ref not in assets:
+            return match.group(0)
+        url = match.group("url")
+        return f"{match.group('attr')}={match.group('quote')}{url.replace(ref, assets[ref], 1)}{match.group('quote')}"
+
+    for name, html in pages.items():
+        write(name, minify_html(_REFERENCE_PATTERN.sub(rewrite, html)).encode("utf-8"), name, CACHE_REVALIDATE)
+
+    manifest = {
+        "assets": dict(sorted(assets.items())),
+        "files": dict(sorted(files.items())),
+        "dashboard_cold_load": cold_load(DASHBOARD_PAGE, pages.get(DASHBOARD_PAGE, ""), files, assets),
+    }
+    write_json(out_dir / MANIFEST_NAME, manifest, sort_keys=False)
+    return manifest
+
+
+def cold_load(page: str, html: str, files: Dict[str, Dict[str, object]], assets: Dict[str, str]) -> Dict[str, int]:
+    """Bytes a first visit to ``page`` downloads: the page plus linked CSS/JS."""
+    published = [page] + [assets[ref] for ref in dict.fromkeys(collect_references(html)) if ref in assets]
+    totals = {"source_bytes": 0, "minified_bytes": 0, "gzip_bytes": 0, "br_bytes": 0}
+    for rel_path in published:
+        entry = files.get(rel_path)
+        if not entry:
+            continue
+        totals["source_bytes"] += int(entry["source_bytes"])
+        totals["minified_bytes"] += int(entry["bytes"])
+        totals["gzip_bytes"] += int(entry.get("gzip", entry["bytes"]))
+        totals["br_bytes"] += int(entry.get("br", entry.get("gzip", entry["bytes"])))
+    return totals
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Minify, fingerprint and precompress the site into dist/")
+    parser.add_argument("--out", type=Path, default=DIST_DIR, help="Output directory (default: dist/)")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    manifest = publish(ROOT, args.out)
+    cold = manifest["dashboard_cold_load"]
+    best = "br" if brotli is not None else "gzip"
+    print(
+        f"✓ Published {len(manifest['files'])} files ({len(manifest['assets'])} fingerprinted assets) to {args.out}"
+    )
+    print(
+        f"✓ Dashboard cold load: {cold['source_bytes']:,} B source → {cold['minified_bytes']:,} B minified "
+        f"→ {cold[best + '_bytes']:,} B {best}"
+    )
+    if brotli is None:
+        print("⚠️  brotli not installed; wrote .gz siblings only (pip install brotli for .br)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,9 +13,13 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List
 
-from fetch_live_price import fetch_latest_price, update_market_data
-
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from analysis.data_io import load_json, write_json as _write_json  # noqa: E402
+from fetch_live_price import fetch_latest_price, update_market_data  # noqa: E402
+
 DATA_DIR = ROOT / "data"
 LOG_DIR = ROOT / "logs"
 MARKET_DATA_PATH = DATA_DIR / "market_data_current.json"
@@ -63,17 +67,9 @@ SCENARIO_TEMPLATE: List[Dict[str, Any]] = [
 ]
 
 
-def load_json(path: Path) -> Dict[str, Any]:
-    if not path.exists():
-        raise FileNotFoundError(path)
-    with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
-
-
 def write_json(path: Path, payload: Dict[str, Any]) -> None:
-    with path.open("w", encoding="utf-8") as handle:
-        json.dump(payload, handle, indent=2)
-        handle.write("\n")
+    # Every file refreshed here is a hand-ordered document updated in place.
+    _write_json(path, payload, sort_keys=False)
 
 
 def format_currency(value: float, decimals: int = 2) -> str:
@@ -0,0 +1,72 @@
+import importlib.util
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+BENCH_SCRIPT = ROOT / "scripts" / "benchmark_extraction.py"
+
+
+def load_benchmark():
+    spec = importlib.util.spec_from_file_location("_benchmark_extraction_under_test", BENCH_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class BenchmarkExtractionTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.bench = load_benchmark()
+
+    def _report(self, wall_ms: float, alloc_kb: float = 100.0, fingerprint: str = "abc") -> dict:
+        return {
+            "corpora": {"ir": {"files": 4, "fingerprint": fingerprint}},
+            "stages": {"ir.tables": {"wall_ms": wall_ms, "rss_growth_mb": 1.0, "alloc_peak_kb": alloc_kb}},
+        }
+
+    def test_compare_applies_threshold_and_noise_floor(self) -> None:
+        baseline = self._report(wall_ms=100.0)
+        self.assertEqual(self.bench.compare(self._report(wall_ms=120.0), baseline, 25.0), ([], []))
+        # +4 ms is +400% but under the 5 ms floor.
+        self.assertEqual(self.bench.compare(self._report(wall_ms=5.0), self._report(wall_ms=1.0), 25.0), ([], []))
+
+        regressions, skipped = self.bench.compare(self._report(wall_ms=140.0, alloc_kb=900.0), baseline, 25.0)
+        self.assertEqual(skipped, [])
+        self.assertEqual(
+            regressions,
+            ["ir.tables wall_ms: 100 -> 140 (+40%)", "ir.tables alloc_peak_kb: 100 -> 900 (+800%)"],
+        )
+
+        regressions, skipped = self.bench.compare(self._report(wall_ms=500.0, fingerprint="new"), baseline, 25.0)
+        self.assertEqual(regressions, [])
+        self.assertEqual(skipped, ["ir.tables: corpus 'ir' changed since baseline"])
+
+    def test_run_benchmarks_measures_selected_stages_on_fixtures(self) -> None:
+        report = self.bench.run_benchmarks(["ir.locate", "ir.facts"], repeats=1)
+        self.assertEqual(list(report["stages"]), ["ir.locate", "ir.facts"])
+        self.assertGreater(report["corpora"]["ir"]["files"], 0)
+        for metrics in report["stages"].values():
+            self.assertEqual(set(metrics), {"wall_ms", "wall_min_ms", "rss_growth_mb", "alloc_peak_kb"})
+            self.assertTrue(all(value >= 0 for value in metrics.values()))
+
+    def test_main_fails_on_regression_against_stored_baseline(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            baseline = Path(tmp) / "baseline.json"
+            output = Path(tmp) / "run.json"
+            args = ["--stage", "ir.normalize_pdf", "--repeats", "1", "--baseline", str(baseline), "--output", str(output)]
+            self.assertEqual(self.bench.main([*args, "--update-baseline"]), 0)
+            self.assertIn("ir.normalize_pdf", json.loads(baseline.read_text())["stages"])
+
+            stored = json.loads(baseline.read_text())
+            stored["stages"]["ir.normalize_pdf"].update(wall_ms=0.001, alloc_peak_kb=0.001)
+            baseline.write_text(json.dumps(stored))
+            self.assertEqual(self.bench.main(args), 1)
+            self.assertEqual(self.bench.main([*args, "--threshold", "1e9"]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
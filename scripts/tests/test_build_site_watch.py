@@ -0,0 +1,57 @@
+import importlib.util
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+BUILD_SCRIPT = ROOT / "scripts" / "build_site.py"
+
+
+def load_build_site():
+    spec = importlib.util.spec_from_file_location("_build_site_under_test", BUILD_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class BuildSiteWatchTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.build_site = load_build_site()
+
+    def test_replace_section_keeps_indent_and_replaces_every_occurrence(self) -> None:
+        html = (
+            "<main>\n"
+            "    <!-- BEGIN AUTOGEN: grid -->\n    old\n    <!-- END AUTOGEN: grid -->\n"
+            "\t<!-- BEGIN AUTOGEN: grid -->stale<!-- END AUTOGEN: grid -->\n"
+            "</main>\n"
+        )
+        result = self.build_site.replace_section(html, "grid", "<p>a</p>\n\n<p>b</p>")
+        self.assertEqual(
+            result,
+            "<main>\n"
+            "    <!-- BEGIN AUTOGEN: grid -->\n    <p>a</p>\n\n    <p>b</p>\n    <!-- END AUTOGEN: grid -->\n"
+            "\t<!-- BEGIN AUTOGEN: grid -->\n\t<p>a</p>\n\n\t<p>b</p>\n\t<!-- END AUTOGEN: grid -->\n"
+            "</main>\n",
+        )
+        self.assertEqual(self.build_site.replace_section(html, "missing", "x"), html)
+        self.build_site.drain_rendered_sections()
+
+    def test_section_dependencies_record_context_keys_and_files(self) -> None:
+        build_site = self.build_site
+        context = build_site.TrackingContext({"market": {"price": 47.13}, "peers": {}, "catalysts": {}})
+        methods_path = ROOT / "data" / "valuation_methods.json"
+        with build_site.track_dependencies() as deps:
+            price = context["market"]["price"]
+            context.get("catalysts")
+            build_site.load_json(methods_path)
+        self.assertEqual(price, 47.13)
+        self.assertEqual(deps, {"market", "catalysts", methods_path})
+        # Outside a tracked render nothing is recorded.
+        context["peers"]
+        self.assertNotIn("peers", deps)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import importlib.util
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+BUILD_SCRIPT = ROOT / "scripts" / "build_site.py"
+
+
+def load_build_site():
+    spec = importlib.util.spec_from_file_location("_build_site_bundles_under_test", BUILD_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class ChartBundleTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.build_site = load_build_site()
+
+    def test_downsample_keeps_endpoints_and_peaks(self) -> None:
+        labels = [f"q{i}" for i in range(400)]
+        values = [1.0] * 400
+        values[137] = 250.0
+        values[311] = -40.0
+        out_labels, out_values = self.build_site.downsample_series(labels, values, max_points=50)
+        self.assertEqual(len(out_values), 50)
+        self.assertEqual((out_labels[0], out_labels[-1]), ("q0", "q399"))
+        self.assertIn(250.0, out_values)
+        self.assertIn(-40.0, out_values)
+        # Short series pass through untouched.
+        self.assertEqual(self.build_site.downsample_series(labels[:5], values[:5]), (labels[:5], values[:5]))
+
+    def test_annual_rows_parse_nested_markup(self) -> None:
+        html = (
+            "<tr><td><strong>2009</strong></td><td class=\"numeric\">305.9 bps</td><td><strong>GFC</strong> peak</td></tr>"
+            "<tr><td>Mean</td><td>26.9</td></tr>"
+            "<tr><td>2017</td><td>(-5.7)</td></tr>"
+        )
+        self.assertEqual(
+            self.build_site.parse_annual_nco_rows(html),
+            [
+                {"period": "2009", "value": 305.9, "context": "GFC peak"},
+                {"period": "2017", "value": -5.7, "context": ""},
+            ],
+        )
+
+    def test_bundle_is_minified_content_hashed_and_pruned(self) -> None:
+        build_site = self.build_site
+        context = {
+            "caty09_tables": {
+                "capital_stress_waterfall": {"starting_cet1_pct": 13.15, "components": [{"label": "Credit", "impact_ppts": -3.2, "extra": 1}]},
+                "regulatory_capital_q3_2025": {"well_capitalized_cet1_pct": 6.5, "cet1_ratio_pct": 13.15},
+            }
+        }
+        page = ROOT / "CATY_09_capital_liquidity.html"
+        original = (build_site.ROOT, build_site.BUNDLE_DIR)
+        with tempfile.TemporaryDirectory() as tmp:
+            build_site.ROOT = Path(tmp)
+            build_site.BUNDLE_DIR = Path(tmp) / "data" / "bundles"
+            try:
+                stale = build_site.BUNDLE_DIR / "CATY_09_capital_liquidity.000000000000.json"
+                stale.parent.mkdir(parents=True)
+                stale.write_text("{}")
+                tag = build_site.render_chart_bundle(page, context)
+                bundles = list(build_site.BUNDLE_DIR.iterdir())
+                self.assertEqual(len(bundles), 1)
+                self.assertIn(f'href="data/bundles/{bundles[0].name}"', tag)
+                self.assertIn('<script src="scripts/chart-bundle.js"></script>', tag)
+                body = bundles[0].read_text()
+                self.assertNotIn(" ", body.replace("Credit", ""))
+                payload = json.loads(body)["capital_stress"]
+                self.assertEqual(payload["capital_stress_waterfall"]["components"][0], {"assumptions": None, "category": None, "impact_ppts": -3.2, "label": "Credit"})
+                self.assertEqual(payload["regulatory_capital_q3_2025"], {"regulatory_minimum_cet1_pct": None, "well_capitalized_cet1_pct": 6.5})
+                # Same content, same name: a rebuild leaves the cached file alone.
+                self.assertEqual(build_site.render_chart_bundle(page, context), tag)
+            finally:
+                build_site.ROOT, build_site.BUNDLE_DIR = original
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import importlib.util
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+CONVERT_SCRIPT = ROOT / "scripts" / "convert_evidence_to_html.py"
+
+
+def load_converter():
+    spec = importlib.util.spec_from_file_location("_convert_evidence_under_test", CONVERT_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class IncrementalEvidenceConversionTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.converter = load_converter()
+
+    def test_only_stale_documents_are_regenerated(self) -> None:
+        convert = self.converter.convert_evidence
+        with tempfile.TemporaryDirectory() as tmp:
+            evidence = Path(tmp) / "evidence"
+            (evidence / "nested").mkdir(parents=True)
+            (evidence / "A.md").write_text("# Alpha\n**Date:** Oct 2025\n---\nSee [B](nested/B.md).\n")
+            (evidence / "nested" / "B.md").write_text("# Beta\n| x | y |\n|---|---|\n| 1 | 2 |\n")
+            manifest = Path(tmp) / "manifest.json"
+
+            first = convert(evidence, manifest, jobs=1, verbose=False)
+            self.assertEqual(first["converted"], ["A.md", "nested/B.md"])
+            page = (evidence / "A.md").with_suffix(".html").read_text()
+            self.assertIn('<a href="nested/B.html">B</a>', page)
+            self.assertIn('href="../../styles/caty-equity-research.css"', (evidence / "nested" / "B.html").read_text())
+            entry = json.loads(manifest.read_text())["documents"]["A.md"]
+            self.assertEqual(entry["template_version"], self.converter.TEMPLATE_VERSION)
+
+            second = convert(evidence, manifest, jobs=1, verbose=False)
+            self.assertEqual((second["converted"], second["unchanged"]), ([], ["A.md", "nested/B.md"]))
+
+            # A source edit and a deleted output each make exactly that document stale.
+            (evidence / "A.md").write_text("# Alpha\nChanged.\n")
+            (evidence / "nested" / "B.html").unlink()
+            third = convert(evidence, manifest, jobs=1, verbose=False)
+            self.assertEqual(third["converted"], ["A.md", "nested/B.md"])
+            self.assertIn("<p>Changed.</p>", (evidence / "A.html").read_text())
+
+            # Entries for other template versions are regenerated.
+            payload = json.loads(manifest.read_text())
+            payload["documents"]["A.md"]["template_version"] = "old"
+            manifest.write_text(json.dumps(payload))
+            self.assertEqual(convert(evidence, manifest, jobs=1, verbose=False)["converted"], ["A.md"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import importlib.util
+import json
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+EXTRACT_SCRIPT = ROOT / "scripts" / "extract_deposit_betas_q10.py"
+
+
+def load_extractor():
+    spec = importlib.util.spec_from_file_location("_extract_deposit_betas_under_test", EXTRACT_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class IncrementalDepositHistoryTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.extractor = load_extractor()
+
+    def setUp(self) -> None:
+        self.downloads = []
+        self._lock = threading.Lock()
+        module = self.extractor
+        self._originals = (module.download_filing, module.parse_filing)
+
+        def fake_download(ref, session=None):
+            with self._lock:
+                self.downloads.append(ref.quarter)
+            if ref.quarter == "2023Q1":
+                raise module.DepositExtractionError("Deposit table not found in filing")
+            return ref.accession
+
+        def fake_parse(html):
+            rate = float(html[-2:])
+            return {"total_interest_bearing": {"avg_rate_pct": rate}}, {"interest_bearing_rate_pct": rate}
+
+        module.download_filing = fake_download
+        module.parse_filing = fake_parse
+
+    def tearDown(self) -> None:
+        self.extractor.download_filing, self.extractor.parse_filing = self._originals
+
+    def _index(self, accessions):
+        FilingRef = self.extractor.FilingRef
+        months = {"Q1": "03-31", "Q2": "06-30", "Q3": "09-30"}
+        return {
+            quarter: FilingRef(quarter, accession, f"{quarter[:4]}-{months[quarter[4:]]}", "", "caty.htm")
+            for quarter, accession in accessions.items()
+        }
+
+    def test_only_new_accessions_are_fetched(self) -> None:
+        update = self.extractor.update_history
+        with tempfile.TemporaryDirectory() as tmp:
+            output = Path(tmp) / "deposit_beta_history.json"
+            cache = Path(tmp) / "cache.json"
+            index = self._index({"2024Q2": "0001-24-000012", "2024Q3": "0001-24-000013"})
+
+            first = update(["2024Q3", "2024Q2"], index, output, cache, workers=2, verbose=False)
+            self.assertEqual(first["fetched"], ["2024Q2", "2024Q3"])
+            history = json.loads(output.read_text())["quarters"]
+            self.assertEqual([entry["quarter"] for entry in history], ["2024Q2", "2024Q3"])
+            self.assertEqual(history[1]["derived"]["interest_bearing_rate_pct"], 13.0)
+
+            # Re-running is free; a new filing is the only download.
+            index["2025Q1"] = self._index({"2025Q1": "0001-25-000021"})["2025Q1"]
+            self.downloads.clear()
+            second = update(["2025Q1", "2024Q3"], index, output, cache, verbose=False)
+            self.assertEqual(self.downloads, ["2025Q1"])
+            self.assertEqual(second["present"], ["2024Q3"])
+            quarters = [entry["quarter"] for entry in json.loads(output.read_text())["quarters"]]
+            self.assertEqual(quarters, ["2024Q2", "2024Q3", "2025Q1"])
+
+            unchanged = output.read_text()
+            third = update(["2025Q1"], index, output, cache, verbose=False)
+            self.assertFalse(third["changed"])
+            self.assertEqual(output.read_text(), unchanged)
+
+            # A rebuilt history is served from the per-accession cache.
+            output.unlink()
+            self.downloads.clear()
+            fourth = update(["2024Q2", "2024Q3", "2025Q1"], index, output, cache, verbose=False)
+            self.assertEqual((self.downloads, fourth["cached"]), ([], ["2024Q2", "2024Q3", "2025Q1"]))
+
+    def test_failed_quarters_are_reported_and_others_kept(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            output = Path(tmp) / "deposit_beta_history.json"
+            index = self._index({"2023Q1": "0001-23-000011", "2023Q2": "0001-23-000012"})
+            summary = self.extractor.update_history(["2023Q1", "2023Q2"], index, output, None, verbose=False)
+            self.assertEqual(list(summary["failed"]), ["2023Q1"])
+            self.assertEqual([entry["quarter"] for entry in summary["payload"]["quarters"]], ["2023Q2"])
+            with self.assertRaises(self.extractor.DepositExtractionError):
+                self.extractor.update_history(["2019Q4"], index, output, None, verbose=False)
+
+    def test_rate_limiter_spaces_requests_across_threads(self) -> None:
+        limiter = self.extractor.RateLimiter(0.02)
+        stamps = []
+        lock = threading.Lock()
+
+        def hit():
+            limiter.wait()
+            with lock:
+                stamps.append(self.extractor.time.monotonic())
+
+        threads = [threading.Thread(target=hit) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stamps.sort()
+        self.assertGreaterEqual(stamps[-1] - stamps[0], 0.07)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import gzip
+import importlib.util
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+PUBLISH_SCRIPT = ROOT / "scripts" / "publish_site.py"
+
+
+def load_publish_site():
+    spec = importlib.util.spec_from_file_location("_publish_site_under_test", PUBLISH_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class PublishSiteTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.publish_site = load_publish_site()
+
+    def test_minify_js_keeps_literals_and_line_breaks(self) -> None:
+        source = (
+            "// header comment\n"
+            "const url = 'data/a.json'; /* inline */ const re = /\\/\\*[^/]*\\//g;\n"
+            "\n"
+            "    const label = `total ${ items.map(x => `${x}  //` ).join(', ') }`;\n"
+            "let ratio = total / count / 2\n"
+            "return  -  -ratio\n"
+        )
+        self.assertEqual(
+            self.publish_site.minify_js(source),
+            "const url='data/a.json';const re=/\\/\\*[^/]*\\//g;\n"
+            "const label=`total ${items.map(x=>`${x}  //`).join(', ')}`;\n"
+            "let ratio=total / count / 2\n"
+            "return - -ratio\n",
+        )
+
+    def test_minify_css_and_html(self) -> None:
+        css = "/* theme */\n.card  >  p {\n  content: \"a  ;  b\";\n  margin: 0 ;\n}\n.nav :hover { x: 1 }"
+        self.assertEqual(self.publish_site.minify_css(css), '.card>p{content:"a  ;  b";margin:0}.nav :hover{x:1}')
+        html = (
+            "<html>\n  <!-- drop me -->\n  <body>\n"
+            "    <pre>\n  keep   this\n</pre>\n"
+            "    <script>\n      // note\n      const a = 1;\n    </script>\n"
+            "  </body>\n</html>\n"
+        )
+        self.assertEqual(
+            self.publish_site.minify_html(html),
+            "<html>\n<body>\n<pre>\n  keep   this\n</pre>\n<script>const a=1;</script>\n</body>\n</html>\n",
+        )
+
+    def test_publish_fingerprints_assets_and_rewrites_pages(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / "site"
+            (root / "styles").mkdir(parents=True)
+            (root / "scripts").mkdir()
+            (root / "data" / "bundles").mkdir(parents=True)
+            (root / "styles" / "site.css").write_text("body {\n  color: red;\n}\n" * 50)
+            (root / "scripts" / "app.js").write_text("fetch('data/market.json');\n" * 50)
+            (root / "data" / "market.json").write_text(json.dumps({"price": 47.13}))
+            (root / "data" / "bundles" / "index.abc123.json").write_text("{}")
+            (root / "index.html").write_text(
+                '<link rel="stylesheet" href="styles/site.css">\n'
+                '<link rel="preload" href="data/bundles/index.abc123.json" as="fetch">\n'
+                '<script src="scripts/app.js?v=2" defer></script>\n'
+                '<a href="https://example.com/">x</a>\n'
+            )
+            out = Path(tmp) / "dist"
+            manifest = self.publish_site.publish(root, out)
+
+            css_name = manifest["assets"]["styles/site.css"]
+            js_name = manifest["assets"]["scripts/app.js"]
+            self.assertRegex(css_name, r"^styles/site\.[0-9a-f]{10}\.css$")
+            page = (out / "index.html").read_text()
+            self.assertIn(f'href="{css_name}"', page)
+            self.assertIn(f'src="{js_name}?v=2"', page)
+            self.assertIn('href="https://example.com/"', page)
+            self.assertEqual(gzip.decompress((out / f"{js_name}.gz").read_bytes()), (out / js_name).read_bytes())
+            # Runtime fetches from scripts and pre-hashed bundles are copied as-is.
+            self.assertEqual(json.loads((out / "data" / "market.json").read_text()), {"price": 47.13})
+            files = manifest["files"]
+            self.assertEqual(files["data/bundles/index.abc123.json"]["cache_control"], self.publish_site.CACHE_IMMUTABLE)
+            self.assertEqual(files["index.html"]["cache_control"], self.publish_site.CACHE_REVALIDATE)
+            cold = manifest["dashboard_cold_load"]
+            self.assertLess(cold["gzip_bytes"], cold["minified_bytes"])
+            self.assertLess(cold["minified_bytes"], cold["source_bytes"])
+            self.assertEqual(json.loads((out / "asset-manifest.json").read_text()), manifest)
+            # The pipeline fingerprints exactly the files publish() read.
+            self.assertEqual(
+                self.publish_site.published_sources(root, out),
+                sorted({entry["source"] for entry in files.values()}),
+            )
+
+            with self.assertRaises(ValueError):
+                self.publish_site.publish(root, Path(tmp))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import importlib.util
+import os
+import sys
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+VALIDATE_SCRIPT = ROOT / "scripts" / "validate_print_pdf.py"
+
+# Speaks just enough of the DevTools pipe protocol (NUL-delimited JSON on fds 3/4).
+FAKE_BROWSER = textwrap.dedent(
+    """
+    import base64, json, os, sys
+    pdf = b"%PDF-1.4\\n1 0 obj << /Type /Pages /Kids [2 0 R 3 0 R 4 0 R] /Count 3 >> endobj\\n"
+    inp, out = os.fdopen(3, "rb", buffering=0), os.fdopen(4, "wb", buffering=0)
+    buf, sessions = b"", 0
+
+    def send(message):
+        out.write(json.dumps(message).encode() + b"\\0")
+
+    while True:
+        chunk = inp.read(65536)
+        if not chunk:
+            break
+        buf += chunk
+        *messages, buf = buf.split(b"\\0")
+        for raw in messages:
+            m = json.loads(raw)
+            sid = m.get("sessionId")
+            if m["method"] == "Target.attachToTarget":
+                sessions += 1
+                send({"id": m["id"], "result": {"sessionId": "s%d" % sessions}})
+            elif m["method"] == "Target.createTarget":
+                send({"id": m["id"], "result": {"targetId": "t"}})
+            elif m["method"] == "Page.navigate":
+                if m["params"]["url"].endswith("missing.html"):
+                    send({"id": m["id"], "sessionId": sid, "result": {"errorText": "net::ERR_FILE_NOT_FOUND"}})
+                    continue
+                send({"id": m["id"], "sessionId": sid, "result": {"frameId": "f"}})
+                send({"method": "Page.loadEventFired", "sessionId": sid, "params": {}})
+            elif m["method"] == "Page.printToPDF":
+                send({"id": m["id"], "sessionId": sid, "result": {"data": base64.b64encode(pdf).decode()}})
+            elif m["method"] == "Browser.close":
+                send({"id": m["id"], "result": {}})
+                sys.exit(0)
+            else:
+                send({"id": m["id"], "sessionId": sid, "result": {}})
+    """
+)
+
+
+def load_validator():
+    spec = importlib.util.spec_from_file_location("_validate_print_pdf_under_test", VALIDATE_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class PrintValidationTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.validator = load_validator()
+
+    def test_pdf_page_count_reads_page_tree(self) -> None:
+        count = self.validator.pdf_page_count
+        self.assertEqual(count(b"<< /Type /Pages /Count 12 /Kids [] >>\n<< /Count 3 /Type /Pages >>"), 12)
+        self.assertEqual(count(b"<< /Type /Page >> << /Type /Page /Parent 1 0 R >>"), 2)
+        self.assertIsNone(count(b"%PDF-1.4 empty"))
+
+    def test_fingerprint_tracks_linked_stylesheets(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "styles").mkdir()
+            css = root / "styles" / "site.css"
+            css.write_text("body { color: red; }")
+            page = root / "CATY_01.html"
+            page.write_text('<link rel="stylesheet" href="styles/site.css?v=1"><p>x</p>')
+            before = self.validator.page_fingerprint(page)
+            css.write_text("@media print { body { color: black; } }")
+            after = self.validator.page_fingerprint(page)
+            self.assertEqual(before["html_sha256"], after["html_sha256"])
+            self.assertNotEqual(before["css_sha256"], after["css_sha256"])
+
+    @unittest.skipUnless(os.name == "posix", "DevTools pipe transport is POSIX-only")
+    def test_pool_prints_pages_through_reused_tabs(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            browser = Path(tmp) / "chrome"
+            browser.write_text(f"#!{sys.executable}\n{FAKE_BROWSER}")
+            browser.chmod(0o755)
+            jobs = [(f"p{i}.html", Path(tmp) / f"p{i}.html") for i in range(5)]
+            jobs.append(("missing.html", Path(tmp) / "missing.html"))
+
+            results = self.validator.print_pages_devtools(str(browser), jobs, tabs=3)
+
+            self.assertEqual(set(results), {name for name, _ in jobs})
+            for name, _ in jobs[:-1]:
+                pdf, error = results[name]
+                self.assertEqual(error, "")
+                self.assertEqual(self.validator.pdf_page_count(pdf), 3)
+            self.assertIsNone(results["missing.html"][0])
+            self.assertIn("ERR_FILE_NOT_FOUND", results["missing.html"][1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,39 +2,92 @@
 """
 Master automation entrypoint for refreshing CATY data inputs.
 
-Pipeline:
-    1. Fetch SEC EDGAR XBRL data
-    2. Fetch FDIC Call Report data
+The pipeline is a declared stage DAG (see ``analysis/pipeline.py``):
+    1. Fetch live price, DEF 14A facts, SEC EDGAR XBRL, FDIC Call Report,
+       peer bank data and rolling betas (concurrently)
+    2. Rebuild the peer snapshot
     3. Merge sources into canonical JSON datasets
-    4. Update evidence metadata registry
-    5. Rebuild site artifacts
-    6. Run reconciliation guard validation
-    7. Append structured run logs
+    4. Recalculate valuation metrics
+    5. Update evidence metadata registry
+    6. Rebuild site artifacts
+    7. Run reconciliation guard validation
+
+Scripts run in this interpreter by calling their ``main()`` so pandas and
+friends are imported once. Per-stage status, timings and cached-payload
+fallbacks are appended to ``logs/automation_run.log``.
 """
 
 from __future__ import annotations
 
+import argparse
 import datetime as dt
+import importlib.util
 import os
 import json
 import logging
 import subprocess
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import Any, Dict, Optional
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from analysis import http_cassette  # noqa: E402
+from analysis.data_io import load_json, write_json  # noqa: E402
+from analysis.pipeline import (  # noqa: E402
+    FingerprintStore,
+    Stage,
+    StageResult,
+    failed_stages,
+    run_pipeline,
+    summarize,
+)
+
 DATA_DIR = ROOT / "data"
 LOG_PATH = ROOT / "logs" / "automation_run.log"
 
 SEC_RAW_PATH = DATA_DIR / "sec_edgar_raw.json"
 FDIC_RAW_PATH = DATA_DIR / "fdic_raw.json"
 PEER_RAW_PATH = DATA_DIR / "peer_data_raw.json"
+PEER_FDIC_NCO_PATH = DATA_DIR / "peer_fdic_nco.json"
 
 DQ_REPORT_PATH = DATA_DIR / "data_quality_report.json"
 PEER_SNAPSHOT_PATH = ROOT / "evidence" / "peer_snapshot_2025Q2.csv"
 EVIDENCE_PATH = DATA_DIR / "evidence_sources.json"
 DEF14A_OUTPUT_PATH = DATA_DIR / "def14a_facts_latest.json"
+MARKET_DATA_PATH = DATA_DIR / "market_data_current.json"
+PRICE_COVERAGE_PATH = DATA_DIR / "timeseries" / "daily_ohlc" / "coverage.json"
+VALUATION_OUTPUTS_PATH = DATA_DIR / "valuation_outputs.json"
+PEER_NORMALIZED_PATH = DATA_DIR / "caty11_peers_normalized.json"
+CATY02_PATH = DATA_DIR / "caty02_income_statement.json"
+CATY03_PATH = DATA_DIR / "caty03_balance_sheet.json"
+COE_TRIANGULATION_PATH = DATA_DIR / "caty16_coe_triangulation.json"
+BETA_OUTPUT_PATH = ROOT / "analysis" / "capm_beta_timeseries.json"
+INDEX_PATH = ROOT / "index.html"
+CATY01_PATH = DATA_DIR / "caty01_company_profile.json"
+PUBLISHED_NUMBERS_PATH = DATA_DIR / "published_numbers.json"
+MODULE_SECTIONS_PATH = DATA_DIR / "module_sections.json"
+PUBLISH_MANIFEST_PATH = ROOT / "dist" / "asset-manifest.json"
+PEER_PRICES_PATH = DATA_DIR / "peer_market_prices.json"
+RIM_INPUTS_PATH = DATA_DIR / "caty13_residual_income.json"
+DEPOSIT_HISTORY_PATH = DATA_DIR / "deposit_beta_history.json"
+NIM_META_PATH = DATA_DIR / "caty05_calculated_tables.json"
+DEPOSIT_SCENARIOS_PATH = ROOT / "analysis" / "deposit_rate_scenarios.json"
+CREDIT_SCENARIOS_PATH = ROOT / "analysis" / "credit_stress_scenarios.json"
+DEPOSIT_REGRESSIONS_PATH = ROOT / "analysis" / "deposit_beta_regressions.json"
+SENSITIVITIES_PATH = ROOT / "analysis" / "sensitivities.json"
+FEDWATCH_PATH = ROOT / "analysis" / "fedwatch_snapshot.json"
+PROBABILISTIC_OUTLOOK_PATH = ROOT / "analysis" / "probabilistic_outlook.json"
+SCENARIO_GRID_PATH = ROOT / "analysis" / "scenario_grid.json"
+DRIVER_ELASTICITIES_PATH = ROOT / "analysis" / "driver_elasticities.json"
+FINGERPRINT_PATH = ROOT / "logs" / "pipeline_fingerprints.json"
+BUNDLE_DIR = DATA_DIR / "bundles"
+MONTE_CARLO_IMAGE_PATH = ROOT / "assets" / "monte_carlo_pt_distribution.png"
 
 
 def validate_def14a_output(output_path: Path) -> bool:
@@ -44,8 +97,7 @@ def validate_def14a_output(output_path: Path) -> bool:
         return False
 
     try:
-        with output_path.open('r', encoding='utf-8') as handle:
-            facts = json.load(handle)
+        facts = load_json(output_path)
     except json.JSONDecodeError as exc:
         print(f'❌ DEF14A output is invalid JSON: {exc}')
         return False
@@ -90,14 +142,33 @@ def validate_def14a_output(output_path: Path) -> bool:
 
 SCRIPTS = ROOT / "scripts"
 
+_LOG_LOCK = threading.Lock()
+_SCRIPT_LOCK = threading.Lock()
+_SCRIPT_MODULES: Dict[Path, ModuleType] = {}
+
 
 def append_log(message: str) -> None:
     timestamp = dt.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
     line = f"[{timestamp}] {message}\n"
     LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with LOG_PATH.open("a", encoding="utf-8") as fh:
+    with _LOG_LOCK, LOG_PATH.open("a", encoding="utf-8") as fh:
         fh.write(line)
 
+
+def load_script(path: Path) -> ModuleType:
+    """Import a pipeline script by path once per run (scripts/ is not a package)."""
+    with _SCRIPT_LOCK:
+        module = _SCRIPT_MODULES.get(path)
+        if module is None:
+            spec = importlib.util.spec_from_file_location(f"_pipeline_{path.stem}", path)
+            if spec is None or spec.loader is None:
+                raise ImportError(f"Cannot load {path}")
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[spec.name] = module  # dataclasses resolve annotations via sys.modules
+            spec.loader.exec_module(module)
+            _SCRIPT_MODULES[path] = module
+        return module
+
 def run_step(cmd: list[str], step_name: str, allow_failure: bool = False) -> subprocess.CompletedProcess[str]:
     logging.info("Running %s: %s", step_name, " ".join(cmd))
     result = subprocess.run(
@@ -119,7 +190,7 @@ def run_step(cmd: list[str], step_name: str, allow_failure: bool = False) -> sub
     return result
 
 
-def run_def14a_refresh(year: Optional[int] = None) -> None:
+def run_def14a_refresh(year: Optional[int] = None) -> int:
     filing_year = year or dt.date.today().year
     DEF14A_OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
     cmd = [
@@ -138,17 +209,7 @@ def run_def14a_refresh(year: Optional[int] = None) -> None:
         str(DEF14A_OUTPUT_PATH),
     ]
     run_step(cmd, "def14a_facts")
-    append_log(
-        f"tools.def14a_extract.cli: Refreshed DEF 14A facts for {filing_year} "
-        f"to {DEF14A_OUTPUT_PATH.relative_to(ROOT)}"
-    )
-
-
-def load_json(path: Path) -> Dict[str, Any]:
-    with path.open("r", encoding="utf-8") as fh:
-        return json.load(fh)
-
-
+    return filing_year
 
 
 def update_evidence_sources(
@@ -241,9 +302,7 @@ def update_evidence_sources(
             },
         )
 
-    with EVIDENCE_PATH.open("w", encoding="utf-8") as fh:
-        json.dump(data, fh, indent=2, sort_keys=True)
-        fh.write("\n")
+    write_json(EVIDENCE_PATH, data)
     logging.info("Updated evidence sources for ids: %s", ", ".join(sorted(updated_ids)))
 
 def load_payload_safely(path: Path) -> Optional[Dict[str, Any]]:
@@ -256,118 +315,431 @@ def load_payload_safely(path: Path) -> Optional[Dict[str, Any]]:
         return None
 
 
-def main() -> int:
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s %(levelname)s %(message)s",
-    )
+def run_script_main(path: Path, *args: Any) -> int:
+    """Call a pipeline script's ``main()`` in this interpreter; exceptions count as exit 1."""
+    try:
+        code = load_script(path).main(*args)
+    except SystemExit as exc:
+        code = exc.code
+    except Exception as exc:  # noqa: BLE001
+        logging.error("%s raised %s: %s", path.name, type(exc).__name__, exc)
+        return 1
+    return int(code or 0)
 
-    append_log("update_all_data.py: START")
 
-    # Step 0: Fetch live market price (skip in test mode)
-    if not os.environ.get("CATY_TEST_MODE"):
-        print("Fetching live CATY price...")
-        fetch_live_result = run_step(
-            [sys.executable, str(SCRIPTS / "fetch_live_price.py")],
-            "fetch_live_price",
-            allow_failure=True,
-        )
-        if fetch_live_result.returncode == 0:
-            print("✅ Market data updated")
-            append_log("fetch_live_price.py: Updated market data with latest price")
-        else:
-            print("⚠️ Live price update failed - using cached value")
-            append_log("fetch_live_price.py: WARNING - live price fetch failed, using cached value")
-    else:
+def fetch_stage(
+    script: str,
+    raw_path: Path,
+    describe: Callable[[Dict[str, Any]], str],
+) -> Callable[[], StageResult]:
+    """Wrap a fetcher so a failed fetch falls back to its cached raw payload."""
+
+    def run() -> StageResult:
+        returncode = run_script_main(SCRIPTS / script)
+        payload = load_payload_safely(raw_path)
+        if payload is None:
+            raise RuntimeError(f"{script}: ERROR (no payload available)")
+        if returncode == 0:
+            return StageResult("ok", describe(payload))
+        return StageResult("cached", f"{script}: WARNING - fetch failed, using cached payload")
+
+    return run
+
+
+def live_price_stage() -> StageResult:
+    if os.environ.get("CATY_TEST_MODE"):
         print("⚠️ Test mode: Skipping live price fetch")
-        append_log("TEST MODE: Skipped live price fetch")
-
-    # Step 0b: DEF 14A fact refresh via CLI (skip in test mode)
-    if not os.environ.get("CATY_TEST_MODE"):
-        print("Refreshing DEF 14A facts via CLI...")
-        run_def14a_refresh()
-        if not validate_def14a_output(DEF14A_OUTPUT_PATH):
-            raise RuntimeError('DEF14A validation failed - aborting automation run')
-        print(f"✅ DEF 14A facts captured to {DEF14A_OUTPUT_PATH.relative_to(ROOT)}")
-    else:
+        return StageResult("skipped", "TEST MODE: Skipped live price fetch")
+    print("Fetching live CATY price...")
+    if run_script_main(SCRIPTS / "fetch_live_price.py") == 0:
+        print("✅ Market data updated")
+        return StageResult("ok", "fetch_live_price.py: Updated market data with latest price")
+    print("⚠️ Live price update failed - using cached value")
+    return StageResult("cached", "fetch_live_price.py: WARNING - live price fetch failed, using cached value")
+
+
+def def14a_stage() -> StageResult:
+    if os.environ.get("CATY_TEST_MODE"):
         print("⚠️ Test mode: Skipping DEF 14A CLI refresh")
-        append_log("TEST MODE: Skipped DEF 14A CLI refresh")
+        return StageResult("skipped", "TEST MODE: Skipped DEF 14A CLI refresh")
+    print("Refreshing DEF 14A facts via CLI...")
+    filing_year = run_def14a_refresh()
+    if not validate_def14a_output(DEF14A_OUTPUT_PATH):
+        raise RuntimeError("DEF14A validation failed - aborting automation run")
+    print(f"✅ DEF 14A facts captured to {DEF14A_OUTPUT_PATH.relative_to(ROOT)}")
+    return StageResult(
+        "ok",
+        f"tools.def14a_extract.cli: Refreshed DEF 14A facts for {filing_year} "
+        f"to {DEF14A_OUTPUT_PATH.relative_to(ROOT)}",
+    )
 
-    # Step 1: SEC EDGAR
-    sec_result = run_step([sys.executable, str(SCRIPTS / "fetch_sec_edgar.py")], "fetch_sec_edgar", allow_failure=True)
-    sec_payload = load_payload_safely(SEC_RAW_PATH)
-    if sec_payload is None:
-        append_log("fetch_sec_edgar.py: ERROR (no payload available)")
-        return 1
-    if sec_result.returncode == 0:
-        append_log(
-            f"fetch_sec_edgar.py: Fetched {sec_payload.get('form_type')} {sec_payload.get('accession')} "
-            f"(period {sec_payload.get('period_end')})"
-        )
-    else:
-        append_log("fetch_sec_edgar.py: WARNING - fetch failed, using cached payload")
-
-    # Step 2: FDIC
-    fdic_result = run_step([sys.executable, str(SCRIPTS / "fetch_fdic_data.py")], "fetch_fdic_data", allow_failure=True)
-    fdic_payload = load_payload_safely(FDIC_RAW_PATH)
-    if fdic_payload is None:
-        append_log("fetch_fdic_data.py: ERROR (no payload available)")
-        return 1
-    if fdic_result.returncode == 0:
-        latest_period = fdic_payload.get("quarters", [{}])[0].get("period")
-        append_log(
-            f"fetch_fdic_data.py: Fetched call report {latest_period or 'latest'} (CERT {fdic_payload.get('cert')})"
-        )
-    else:
-        append_log("fetch_fdic_data.py: WARNING - fetch failed, using cached payload")
-
-    # Step 3: Peer bank metrics
-    peer_result = run_step([sys.executable, str(SCRIPTS / "fetch_peer_banks.py")], "fetch_peer_banks", allow_failure=True)
-    peer_payload = load_payload_safely(PEER_RAW_PATH)
-    if peer_payload is None:
-        append_log("fetch_peer_banks.py: ERROR (no payload available)")
-        return 1
-    if peer_result.returncode == 0:
-        peer_count = len(peer_payload.get("banks", {}))
-        append_log(
-            f"fetch_peer_banks.py: Fetched {peer_count} peers for {peer_payload.get('period', 'unknown period')}"
-        )
-    else:
-        append_log("fetch_peer_banks.py: WARNING - fetch failed, using cached payload")
 
-    run_step([sys.executable, str(SCRIPTS / "generate_peer_snapshot.py")], "generate_peer_snapshot")
-    append_log("generate_peer_snapshot.py: Rebuilt evidence/peer_snapshot_2025Q2.csv")
+def peer_snapshot_stage() -> StageResult:
+    if run_script_main(SCRIPTS / "generate_peer_snapshot.py") != 0:
+        raise RuntimeError("generate_peer_snapshot.py failed")
+    return StageResult("ok", "generate_peer_snapshot.py: Rebuilt evidence/peer_snapshot_2025Q2.csv")
 
-    # Step 4: Merge
-    run_step([sys.executable, str(SCRIPTS / "merge_data_sources.py")], "merge_data_sources")
+
+def beta_engine_stage() -> StageResult:
+    # beta_engine parses its own argv, so it keeps running out of process.
+    result = run_step([sys.executable, str(ROOT / "analysis" / "beta_engine.py")], "beta_engine", allow_failure=True)
+    if result.returncode == 0:
+        return StageResult("ok", "beta_engine.py: Refreshed rolling CAPM betas (analysis/capm_beta_timeseries.json)")
+    return StageResult("cached", "beta_engine.py: WARNING - rolling beta refresh failed, keeping previous output")
+
+
+def merge_stage() -> StageResult:
+    if run_script_main(SCRIPTS / "merge_data_sources.py", []) != 0:
+        raise RuntimeError("merge_data_sources.py failed")
     dq_payload = load_payload_safely(DQ_REPORT_PATH) or {}
     conflict_count = len(dq_payload.get("conflicts", []))
-    append_log(f"merge_data_sources.py: {conflict_count} conflicts logged")
+    return StageResult("ok", f"merge_data_sources.py: {conflict_count} conflicts logged")
 
-    # Step 4.5: Calculate valuation metrics
+
+def valuation_stage() -> StageResult:
     print("Calculating valuation metrics...")
-    valuation_result = run_step(
-        [sys.executable, str(SCRIPTS / "calculate_valuation_metrics.py")],
-        "calculate_valuation_metrics",
-        allow_failure=True,
+    if run_script_main(SCRIPTS / "calculate_valuation_metrics.py") != 0:
+        raise RuntimeError("calculate_valuation_metrics.py: WARNING - calculation failed")
+    return StageResult("ok", "calculate_valuation_metrics.py: Recalculated all targets and returns")
+
+
+def probabilistic_stage() -> StageResult:
+    if run_script_main(SCRIPTS / "build_probabilistic_scenarios.py") != 0:
+        raise RuntimeError("build_probabilistic_scenarios.py failed")
+    return StageResult("ok", "build_probabilistic_scenarios.py: Rebuilt probabilistic outlook and scenario grid")
+
+
+def elasticities_stage() -> StageResult:
+    if run_script_main(SCRIPTS / "build_driver_elasticities.py") != 0:
+        raise RuntimeError("build_driver_elasticities.py failed")
+    return StageResult("ok", "build_driver_elasticities.py: Rebuilt driver elasticities")
+
+
+def evidence_stage() -> StageResult:
+    sec_payload = load_payload_safely(SEC_RAW_PATH) or {}
+    fdic_payload = load_payload_safely(FDIC_RAW_PATH) or {}
+    update_evidence_sources(sec_payload, fdic_payload, load_payload_safely(PEER_RAW_PATH))
+    return StageResult("ok", f"Updated evidence metadata ({EVIDENCE_PATH.relative_to(ROOT)})")
+
+
+def evidence_html_stage() -> StageResult:
+    if os.environ.get("CATY_TEST_MODE"):
+        print("⚠️ Test mode: Skipping evidence HTML conversion")
+        return StageResult("skipped", "TEST MODE: Skipped evidence HTML conversion")
+    # Serial on purpose: forking a process pool from the pipeline's threads is
+    # unsafe, and after an evidence edit only a few documents are stale.
+    report = load_script(SCRIPTS / "convert_evidence_to_html.py").convert_evidence(jobs=1, verbose=False)
+    if report["errors"]:
+        raise RuntimeError(f"convert_evidence_to_html.py failed for {', '.join(sorted(report['errors']))}")
+    return StageResult(
+        "ok",
+        f"convert_evidence_to_html.py: {len(report['converted'])} regenerated, {len(report['unchanged'])} up to date",
     )
-    if valuation_result.returncode == 0:
-        append_log("calculate_valuation_metrics.py: Recalculated all targets and returns")
-    else:
-        append_log("calculate_valuation_metrics.py: WARNING - calculation failed")
-        return 1
 
-    # Step 5: Evidence metadata
-    update_evidence_sources(sec_payload, fdic_payload, peer_payload)
 
-    # Step 6: Rebuild site
-    run_step([sys.executable, str(SCRIPTS / "build_site.py")], "build_site")
-    append_log("build_site.py: Rebuilt modules successfully")
+def build_site_stage() -> StageResult:
+    if run_script_main(SCRIPTS / "build_site.py") != 0:
+        raise RuntimeError("build_site.py failed")
+    return StageResult("ok", "build_site.py: Rebuilt modules successfully")
+
+
+def reconciliation_stage() -> StageResult:
+    if run_script_main(ROOT / "analysis" / "reconciliation_guard.py", []) != 0:
+        raise RuntimeError("reconciliation_guard.py: FAIL")
+    return StageResult("ok", "reconciliation_guard.py: PASS")
+
+
+def publish_stage() -> StageResult:
+    if run_script_main(SCRIPTS / "publish_site.py", []) != 0:
+        raise RuntimeError("publish_site.py failed")
+    return StageResult("ok", f"publish_site.py: Wrote {PUBLISH_MANIFEST_PATH.parent.relative_to(ROOT)}/")
+
+
+def published_sources() -> List[Path]:
+    return [ROOT / ref for ref in load_script(SCRIPTS / "publish_site.py").published_sources()]
+
+
+def site_module_paths() -> List[Path]:
+    config = load_payload_safely(MODULE_SECTIONS_PATH) or {}
+    return [ROOT / module["file"] for module in config.get("modules", []) if module.get("file")]
+
+
+def evidence_source_paths() -> List[Path]:
+    # build_site.py hashes every registered source into the evidence table.
+    config = load_payload_safely(EVIDENCE_PATH) or {}
+    return sorted({ROOT / source["path"] for source in config.get("sources", []) if source.get("path")})
+
+
+def build_stages() -> List[Stage]:
+    """Declare the automation DAG. File edges add dependencies automatically.
+
+    Cacheable stages list their script (and shared kernels) as inputs so a
+    code change invalidates the fingerprint just like a data change.
+    """
+    module_pages = site_module_paths()
+    evidence_markdown = sorted((ROOT / "evidence").rglob("*.md"))
+    # One page per markdown file, next to its source (convert_evidence_to_html.py).
+    evidence_pages = [path.with_suffix(".html") for path in evidence_markdown]
+    evidence_files = sorted({path for path in (ROOT / "evidence").rglob("*") if path.is_file()} | set(evidence_pages))
+    return [
+        Stage(
+            "fetch_live_price",
+            live_price_stage,
+            outputs=[MARKET_DATA_PATH, PRICE_COVERAGE_PATH],
+            concurrent=True,
+            allow_failure=True,
+        ),
+        Stage("def14a_facts", def14a_stage, outputs=[DEF14A_OUTPUT_PATH], concurrent=True),
+        Stage(
+            "fetch_sec_edgar",
+            fetch_stage(
+                "fetch_sec_edgar.py",
+                SEC_RAW_PATH,
+                lambda payload: (
+                    f"fetch_sec_edgar.py: Fetched {payload.get('form_type')} {payload.get('accession')} "
+                    f"(period {payload.get('period_end')})"
+                ),
+            ),
+            outputs=[SEC_RAW_PATH],
+            concurrent=True,
+        ),
+        Stage(
+            "fetch_fdic_data",
+            fetch_stage(
+                "fetch_fdic_data.py",
+                FDIC_RAW_PATH,
+                lambda payload: (
+                    f"fetch_fdic_data.py: Fetched call report "
+                    f"{payload.get('quarters', [{}])[0].get('period') or 'latest'} (CERT {payload.get('cert')})"
+                ),
+            ),
+            outputs=[FDIC_RAW_PATH],
+            concurrent=True,
+        ),
+        Stage(
+            "fetch_peer_banks",
+            fetch_stage(
+                "fetch_peer_banks.py",
+                PEER_RAW_PATH,
+                lambda payload: (
+                    f"fetch_peer_banks.py: Fetched {len(payload.get('banks', {}))} peers "
+                    f"for {payload.get('period', 'unknown period')}"
+                ),
+            ),
+            outputs=[PEER_RAW_PATH],
+            concurrent=True,
+        ),
+        Stage(
+            "fetch_peer_fdic_nco",
+            fetch_stage(
+                "fetch_peer_fdic_nco.py",
+                PEER_FDIC_NCO_PATH,
+                lambda payload: f"fetch_peer_fdic_nco.py: Fetched NCO history for {len(payload.get('banks', {}))} peers",
+            ),
+            outputs=[PEER_FDIC_NCO_PATH],
+            concurrent=True,
+            allow_failure=True,
+        ),
+        Stage(
+            "beta_engine",
+            beta_engine_stage,
+            # Both stages top up the shared daily OHLC cache; run them in turn.
+            inputs=[PRICE_COVERAGE_PATH],
+            outputs=[BETA_OUTPUT_PATH, COE_TRIANGULATION_PATH],
+            concurrent=True,
+            allow_failure=True,
+        ),
+        Stage(
+            "generate_peer_snapshot",
+            peer_snapshot_stage,
+            inputs=[PEER_RAW_PATH, PEER_PRICES_PATH, SCRIPTS / "generate_peer_snapshot.py"],
+            outputs=[PEER_SNAPSHOT_PATH],
+            cacheable=True,
+        ),
+        Stage(
+            "merge_data_sources",
+            merge_stage,
+            inputs=[SEC_RAW_PATH, FDIC_RAW_PATH, SCRIPTS / "merge_data_sources.py", ROOT / "analysis" / "merge_engine.py"],
+            outputs=[CATY02_PATH, CATY03_PATH, DQ_REPORT_PATH],
+            cacheable=True,
+        ),
+        Stage(
+            "calculate_valuation_metrics",
+            valuation_stage,
+            inputs=[
+                MARKET_DATA_PATH,
+                PEER_NORMALIZED_PATH,
+                CATY02_PATH,
+                CATY03_PATH,
+                RIM_INPUTS_PATH,
+                SCRIPTS / "calculate_valuation_metrics.py",
+                ROOT / "analysis" / "residual_income.py",
+                ROOT / "analysis" / "valuation_bridge_final.py",
+                ROOT / "analysis" / "probability_weighted_valuation.py",
+            ],
+            outputs=[MARKET_DATA_PATH, VALUATION_OUTPUTS_PATH],
+            cacheable=True,
+        ),
+        Stage(
+            "build_probabilistic_scenarios",
+            probabilistic_stage,
+            inputs=[
+                MARKET_DATA_PATH,
+                DEPOSIT_SCENARIOS_PATH,
+                CREDIT_SCENARIOS_PATH,
+                FEDWATCH_PATH,
+                DEPOSIT_HISTORY_PATH,
+                DEPOSIT_REGRESSIONS_PATH,
+                SENSITIVITIES_PATH,
+                NIM_META_PATH,
+                SCRIPTS / "build_probabilistic_scenarios.py",
+                ROOT / "analysis" / "scenario_grid.py",
+            ],
+            outputs=[PROBABILISTIC_OUTLOOK_PATH, SCENARIO_GRID_PATH],
+            cacheable=True,
+        ),
+        Stage(
+            "build_driver_elasticities",
+            elasticities_stage,
+            inputs=[
+                MARKET_DATA_PATH,
+                CATY02_PATH,
+                DEPOSIT_SCENARIOS_PATH,
+                CREDIT_SCENARIOS_PATH,
+                DEPOSIT_REGRESSIONS_PATH,
+                SCRIPTS / "build_driver_elasticities.py",
+                ROOT / "analysis" / "regression.py",
+            ],
+            outputs=[DRIVER_ELASTICITIES_PATH],
+            cacheable=True,
+        ),
+        Stage(
+            "update_evidence_sources",
+            evidence_stage,
+            inputs=[SEC_RAW_PATH, FDIC_RAW_PATH, PEER_RAW_PATH],
+            outputs=[EVIDENCE_PATH],
+            deps=["calculate_valuation_metrics"],
+        ),
+        Stage(
+            "convert_evidence_html",
+            evidence_html_stage,
+            inputs=[*evidence_markdown, SCRIPTS / "convert_evidence_to_html.py"],
+            # Declared so publish_site (which copies these pages) runs after the conversion.
+            outputs=evidence_pages,
+            concurrent=True,
+        ),
+        Stage(
+            "build_site",
+            build_site_stage,
+            inputs=[
+                *sorted(DATA_DIR.glob("*.json")),
+                PROBABILISTIC_OUTLOOK_PATH,
+                MONTE_CARLO_IMAGE_PATH,
+                *evidence_source_paths(),
+                INDEX_PATH,
+                *module_pages,
+                SCRIPTS / "build_site.py",
+                ROOT / "analysis" / "publication_gate.py",
+            ],
+            # Bundle names carry a content hash; a renamed bundle re-runs the stage once.
+            outputs=[INDEX_PATH, CATY01_PATH, PUBLISHED_NUMBERS_PATH, *module_pages, *sorted(BUNDLE_DIR.glob("*.json"))],
+            cacheable=True,
+        ),
+        Stage(
+            "reconciliation_guard",
+            reconciliation_stage,
+            inputs=[
+                PUBLISHED_NUMBERS_PATH,
+                MARKET_DATA_PATH,
+                RIM_INPUTS_PATH,
+                VALUATION_OUTPUTS_PATH,
+                PEER_SNAPSHOT_PATH,
+            ],
+        ),
+        Stage(
+            "publish_site",
+            publish_stage,
+            inputs=sorted(
+                {
+                    *DATA_DIR.glob("*.json"),
+                    INDEX_PATH,
+                    *module_pages,
+                    *(ROOT / "styles").glob("*.css"),
+                    *SCRIPTS.glob("*.js"),
+                    *evidence_files,
+                    *(ROOT / "analysis").glob("*.json"),
+                    # Everything else publish() copies: methodology notes, docs, logs, …
+                    *published_sources(),
+                    SCRIPTS / "publish_site.py",
+                }
+            ),
+            outputs=[PUBLISH_MANIFEST_PATH],
+            # Only pages that passed the reconciliation guard get published.
+            deps=["reconciliation_guard"],
+            cacheable=True,
+        ),
+    ]
+
 
-    # Step 7: Validation
-    run_step([sys.executable, str(ROOT / "analysis" / "reconciliation_guard.py")], "reconciliation_guard")
-    append_log("reconciliation_guard.py: PASS")
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Refresh CATY data inputs and rebuild the site")
+    parser.add_argument("--max-workers", type=int, default=4, help="Concurrent fetch stages")
+    parser.add_argument(
+        "--force",
+        action="append",
+        default=[],
+        metavar="STAGE",
+        help="Run STAGE even if its inputs are unchanged (repeatable; 'all' forces every stage)",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not update stage fingerprints")
+    parser.add_argument(
+        "--http-mode",
+        choices=http_cassette.MODES,
+        default=None,
+        help="Network transport for every fetcher: record cassettes, replay them offline, "
+        f"or use the local stub server (default: ${http_cassette.MODE_ENV_VAR} or live)",
+    )
+    parser.add_argument("--cassettes", type=Path, default=None, help="Cassette directory for record/replay/stub")
+    parser.add_argument("--stub-url", default=None, help="Stub server base URL for --http-mode stub")
+    args = parser.parse_args()
 
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(message)s",
+    )
+
+    # Environment variables carry the mode into out-of-process stages too.
+    for env_var, value in (
+        (http_cassette.MODE_ENV_VAR, args.http_mode),
+        (http_cassette.CASSETTE_ENV_VAR, args.cassettes and str(args.cassettes.resolve())),
+        (http_cassette.STUB_ENV_VAR, args.stub_url),
+    ):
+        if value:
+            os.environ[env_var] = value
+    transport = http_cassette.install_from_env()
+
+    append_log("update_all_data.py: START")
+    if transport is not None:
+        append_log(f"update_all_data.py: HTTP {transport.mode} mode using {transport.store.root}")
+    stages = build_stages()
+    known = {stage.name for stage in stages} | {"all"}
+    unknown = [name for name in args.force if name not in known]
+    if unknown:
+        parser.error(f"unknown stage(s) for --force: {', '.join(unknown)} (choose from {', '.join(sorted(known))})")
+    store = None if args.no_cache else FingerprintStore(FINGERPRINT_PATH, root=ROOT)
+    started = time.perf_counter()
+    outcomes = run_pipeline(stages, log=append_log, max_workers=args.max_workers, store=store, force=args.force)
+    append_log(f"update_all_data.py: {summarize(outcomes, time.perf_counter() - started)}")
+    if transport is not None:
+        append_log(
+            f"update_all_data.py: HTTP {transport.mode} - {transport.recorded} recorded, "
+            f"{transport.replayed} replayed in-process"
+        )
+
+    failed = failed_stages(stages, outcomes)
+    if failed:
+        append_log(f"update_all_data.py: FAILED ({', '.join(failed)})")
+        return 1
     append_log("update_all_data.py: SUCCESS")
     return 0
 
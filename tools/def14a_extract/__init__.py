@@ -1,10 +1,24 @@
-"""High-level entrypoints for DEF 14A extraction tool suite."""
+"""High-level entrypoints for DEF 14A extraction tool suite.
 
-from .api import get_def14a_facts  # noqa: F401
+``get_def14a_facts`` and ``cli_app`` are resolved on first access, so importing
+a submodule (the CLI, the registry, the artifact cache) does not load the
+parsing stack (pandas, lxml, httpx, rapidfuzz).
+"""
 
-try:  # pragma: no cover - CLI optional
-    from .cli import app as cli_app  # noqa: F401
-except RuntimeError:  # pragma: no cover - CLI optional
-    cli_app = None  # type: ignore
+from typing import Any
 
 __all__ = ["cli_app", "get_def14a_facts"]
+
+
+def __getattr__(name: str) -> Any:
+    if name == "get_def14a_facts":
+        from .api import get_def14a_facts
+
+        return get_def14a_facts
+    if name == "cli_app":
+        try:
+            from .cli import app as cli_app
+        except RuntimeError:  # pragma: no cover - CLI optional
+            cli_app = None  # type: ignore
+        return cli_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -23,6 +23,7 @@ from .provenance import ProvenanceAssembler
 from .registry import load_registry
 from .section_locator import SectionLocator
 from .table_extraction import TableExtractionOrchestrator
+from .tracing import get_tracer, span, tracing, tracing_from_env
 from .validators import ValidationSuite
 
 SECTION_IDS = [
@@ -38,6 +39,22 @@ def get_def14a_facts(request: FactRequest) -> FactCollection:
     if not request.ticker and not request.cik:
         raise ValueError("Ticker or CIK is required")
 
+    trace_path = tracing_from_env()
+    if trace_path is None or get_tracer() is not None:
+        return _run_pipeline(request)
+    with tracing(trace_path) as tracer:
+        facts = _run_pipeline(request)
+    log_event("Wrote DEF 14A trace", path=str(trace_path), spans=len(tracer.spans))
+    log_event("DEF 14A trace summary\n" + tracer.summary_table())
+    return facts
+
+
+def _run_pipeline(request: FactRequest) -> FactCollection:
+    with span("get_def14a_facts", ticker=request.ticker, cik=request.cik, year=request.year):
+        return _extract_facts(request)
+
+
+def _extract_facts(request: FactRequest) -> FactCollection:
     config = ToolConfig()
     ensure_cache_dirs(config)
     registry = load_registry()
@@ -49,42 +66,48 @@ def get_def14a_facts(request: FactRequest) -> FactCollection:
     )
 
     api_fetcher = EdgarApiFetcher(config)
-    metadata_list = api_fetcher.discover(identifier)
+    with span("discover"):
+        metadata_list = api_fetcher.discover(identifier)
 
-    if not metadata_list and identifier.cik:
-        html_fetcher = HtmlIndexFetcher(config)
-        metadata_list = html_fetcher.scrape(identifier)
+        if not metadata_list and identifier.cik:
+            html_fetcher = HtmlIndexFetcher(config)
+            metadata_list = html_fetcher.scrape(identifier)
 
     if not metadata_list:
         raise RuntimeError("No DEF 14A filings found for the supplied parameters")
 
     metadata = metadata_list[0]
-    artifacts = api_fetcher.fetch(metadata, refresh=request.refresh)
-    documents = [classify_artifact(artifact) for artifact in artifacts]
+    with span("fetch", accession=metadata.accession_number):
+        artifacts = api_fetcher.fetch(metadata, refresh=request.refresh)
+    with span("classify", artifacts=len(artifacts)):
+        documents = [classify_artifact(artifact) for artifact in artifacts]
 
     section_locator = SectionLocator(SECTION_IDS)
     section_spans = section_locator.locate(documents)
 
     table_extractor = TableExtractionOrchestrator()
     tables: List[TableExtractionResult] = []
-    for span in section_spans:
-        tables.extend(table_extractor.extract(span, documents))
+    for section_span in section_spans:
+        tables.extend(table_extractor.extract(section_span, documents))
 
     fact_extractors = build_fact_extractors()
     fact_candidates: Dict[str, FactCandidate] = {}
     requested = set(request.facts or registry.keys())
 
     for extractor in fact_extractors:
-        extracted = extractor.extract(section_spans, tables, documents, registry)
+        with span(f"extract.{type(extractor).__name__}") as extractor_span:
+            extracted = extractor.extract(section_spans, tables, documents, registry)
+            extractor_span.set(facts=len(extracted))
         for fact_id, candidate in extracted.items():
             if fact_id not in requested:
                 continue
             fact_candidates[fact_id] = candidate
 
-    validator = ValidationSuite()
-    validation_report = validator.validate(fact_candidates)
+    with span("validate", facts=len(fact_candidates)):
+        validator = ValidationSuite()
+        validation_report = validator.validate(fact_candidates)
 
-    assembler = ProvenanceAssembler()
-    fact_collection = assembler.attach(fact_candidates, validation_report, metadata)
+        assembler = ProvenanceAssembler()
+        fact_collection = assembler.attach(fact_candidates, validation_report, metadata)
     log_event("Produced DEF 14A facts", count=len(fact_collection))
     return fact_collection
@@ -6,8 +6,8 @@ import json
 from pathlib import Path
 from typing import List, Optional
 
-from .api import get_def14a_facts
 from .models import FactRequest
+from .tracing import tracing
 
 try:  # pragma: no cover - optional dependency handler
     import typer
@@ -15,6 +15,22 @@ except ImportError:  # pragma: no cover - optional dependency handler
     typer = None  # type: ignore
 
 
+def get_def14a_facts(request: FactRequest):
+    """Run the extraction pipeline; the parsing stack is imported on first call."""
+    from .api import get_def14a_facts as _get_def14a_facts
+
+    return _get_def14a_facts(request)
+
+
+def _install_http_transport() -> None:
+    """Honour ``CATY_HTTP_MODE`` record/replay when run from the CATY repo."""
+    try:
+        from analysis.http_cassette import install_from_env
+    except ImportError:  # pragma: no cover - toolkit used outside the repo
+        return
+    install_from_env()
+
+
 def _build_app() -> "typer.Typer | None":
     if not typer:
         return None
@@ -27,6 +43,7 @@ def _build_app() -> "typer.Typer | None":
     @app.callback(invoke_without_command=True)
     def main(ctx: "typer.Context") -> None:  # type: ignore[name-defined]
         """DEF 14A fact extraction tool suite."""
+        _install_http_transport()
         if ctx.invoked_subcommand is None:
             typer.echo(ctx.get_help())
             raise typer.Exit()
@@ -40,6 +57,9 @@ def _build_app() -> "typer.Typer | None":
         provenance: bool = typer.Option(False, "--provenance", help="Include provenance output"),
         output: Optional[Path] = typer.Option(None, "--output", help="Optional output path"),
         refresh: bool = typer.Option(False, "--refresh", help="Bypass cache"),
+        trace: Optional[Path] = typer.Option(
+            None, "--trace", help="Write tracing spans as JSONL and print a timing summary"
+        ),
     ) -> None:
         fact_list = facts or []
         expanded: List[str] = []
@@ -55,7 +75,13 @@ def _build_app() -> "typer.Typer | None":
             output_path=output,
             refresh=refresh,
         )
-        results = get_def14a_facts(request)
+        if trace:
+            with tracing(trace) as tracer:
+                results = get_def14a_facts(request)
+            typer.echo(tracer.summary_table(), err=True)
+            typer.echo(f"Wrote trace to {trace}", err=True)
+        else:
+            results = get_def14a_facts(request)
         serializable = {key: vars(value) for key, value in results.items()}
         payload = json.dumps(serializable, indent=2)
         if output:
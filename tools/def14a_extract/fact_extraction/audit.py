@@ -13,6 +13,7 @@ from ..models import (
     SectionSpan,
     TableExtractionResult,
 )
+from ..tracing import REGEXES_RUN, incr
 from .base import BaseFactExtractor
 from .helpers import build_table_result_from_frame, iter_document_tables
 
@@ -125,7 +126,9 @@ class AuditFactExtractor(BaseFactExtractor):
     def _is_audit_table(self, frame: pd.DataFrame) -> bool:
         if frame.empty:
             return False
-        contains_label = frame.applymap(
+        # DataFrame.applymap was renamed to DataFrame.map (pandas 2.1) and removed in 3.0.
+        elementwise = frame.map if hasattr(frame, "map") else frame.applymap
+        contains_label = elementwise(
             lambda value: isinstance(value, str) and "audit fees" in value.lower()
         ).any().any()
         if contains_label:
@@ -251,6 +254,7 @@ class AuditFactExtractor(BaseFactExtractor):
             r"services are provided by\s+([A-Z][A-Za-z&\.,\s]+?)(?:,|\.)",
         ]
         for pattern in patterns:
+            incr(REGEXES_RUN)
             match = re.search(pattern, text, re.IGNORECASE)
             if match:
                 candidate = self._clean_auditor_name(match.group(1))
@@ -7,6 +7,7 @@ from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
 from .base import BaseFactExtractor
 from ..models import DocumentProfile, FactCandidate, SectionSpan, TableExtractionResult
+from ..tracing import REGEXES_RUN, incr
 
 
 class GovernanceFactExtractor(BaseFactExtractor):
@@ -178,6 +179,7 @@ class GovernanceFactExtractor(BaseFactExtractor):
             for pattern in patterns:
                 if not pattern:
                     continue
+                incr(REGEXES_RUN)
                 match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
                 if not match:
                     continue
@@ -10,6 +10,7 @@ from typing import Iterator, Optional, Tuple
 import pandas as pd
 
 from ..models import DocumentProfile, TableExtractionResult
+from ..tracing import TABLES_PARSED, incr
 
 SNAPSHOT_DIR = Path('.cache/def14a_snapshots')
 
@@ -33,6 +34,7 @@ def iter_document_tables(
         tables = pd.read_html(**read_kwargs)
     except ValueError:
         return
+    incr(TABLES_PARSED, len(tables))
     for idx, frame in enumerate(tables):
         if idx >= max_tables:
             break
@@ -14,6 +14,7 @@ from ..models import (
     SectionSpan,
     TableExtractionResult,
 )
+from ..tracing import REGEXES_RUN, incr
 from .base import BaseFactExtractor
 
 
@@ -160,6 +161,7 @@ def _extract_text_with_meta(doc: DocumentProfile) -> tuple[str, Dict[str, object
 
 def _search_any(text: str, patterns: Sequence[str]) -> Optional[re.Match[str]]:
     for pattern in patterns:
+        incr(REGEXES_RUN)
         match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
         if match:
             return match
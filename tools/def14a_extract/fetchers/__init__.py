@@ -1,4 +1,24 @@
-"""Fetcher factory helpers."""
+"""Fetcher factory helpers.
 
-from .edgar_api import EdgarApiFetcher  # noqa: F401
-from .index_scraper import HtmlIndexFetcher  # noqa: F401
+Fetchers are imported on first access; httpx and BeautifulSoup are only
+loaded when a fetcher is actually needed.
+"""
+
+from importlib import import_module
+from typing import Any
+
+_LAZY_EXPORTS = {
+    "EdgarApiFetcher": ".edgar_api",
+    "HtmlIndexFetcher": ".index_scraper",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -12,6 +12,7 @@ from ..config import ToolConfig
 from ..logging_utils import log_event
 from ..models import FilingArtifact
 from ..throttling import RateLimiter, build_retry_decorator
+from ..tracing import BYTES_DOWNLOADED, CACHE_HITS, incr, span
 
 
 class ArtifactDownloader:
@@ -24,6 +25,7 @@ class ArtifactDownloader:
     def download(self, url: str, refresh: bool = False) -> FilingArtifact:
         cached = None if refresh else self._cache.get(url)
         if cached:
+            incr(CACHE_HITS)
             return cached
 
         @self._retry
@@ -34,11 +36,12 @@ class ArtifactDownloader:
                     "Accept": "*/*",
                 }
                 log_event("Fetching artifact", url=url)
-                with httpx.Client(
+                with span("fetch.artifact", url=url), httpx.Client(
                     timeout=self._config.timeout_seconds,
                 ) as client:
                     response = client.get(url, headers=headers)
                     response.raise_for_status()
+                    incr(BYTES_DOWNLOADED, len(response.content))
                     content_type = response.headers.get("Content-Type", "application/octet-stream")
                     main_type = content_type.split(";")[0].strip()
                     mime = main_type or mimetypes.guess_type(url)[0] or "application/octet-stream"
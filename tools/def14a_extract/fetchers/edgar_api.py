@@ -12,6 +12,7 @@ from ..config import ToolConfig
 from ..logging_utils import log_event
 from ..models import FilingArtifact, FilingIdentifier, FilingMetadata
 from ..throttling import RateLimiter, build_retry_decorator
+from ..tracing import BYTES_DOWNLOADED, incr, span
 from .artifact_downloader import ArtifactDownloader
 
 SEC_SUBMISSIONS_URL = "https://data.sec.gov/submissions/CIK{cik:0>10}.json"
@@ -36,9 +37,10 @@ class EdgarApiFetcher:
             return None
         url = f"https://www.sec.gov/files/company_tickers.json"
         headers = {"User-Agent": self._config.user_agent}
-        with httpx.Client(timeout=self._config.timeout_seconds) as client:
+        with span("fetch.company_tickers"), httpx.Client(timeout=self._config.timeout_seconds) as client:
             response = client.get(url, headers=headers)
             response.raise_for_status()
+            incr(BYTES_DOWNLOADED, len(response.content))
             data = response.json()
         for record in data.values():
             if record["ticker"].lower() == ticker.lower():
@@ -57,9 +59,12 @@ class EdgarApiFetcher:
             with self._limiter.limit():
                 headers = {"User-Agent": self._config.user_agent}
                 log_event("Fetching SEC submissions", cik=cik)
-                with httpx.Client(timeout=self._config.timeout_seconds) as client:
+                with span("fetch.submissions", cik=cik), httpx.Client(
+                    timeout=self._config.timeout_seconds
+                ) as client:
                     response = client.get(url, headers=headers)
                     response.raise_for_status()
+                    incr(BYTES_DOWNLOADED, len(response.content))
                     data = response.json()
             filings = data.get("filings", {}).get("recent", {})
             results: List[FilingMetadata] = []
@@ -5,12 +5,12 @@ from __future__ import annotations
 from typing import List
 
 import httpx
-from bs4 import BeautifulSoup
 
 from ..config import ToolConfig
 from ..logging_utils import log_event
 from ..models import FilingIdentifier, FilingMetadata
 from ..throttling import RateLimiter, build_retry_decorator
+from ..tracing import BYTES_DOWNLOADED, incr, span
 
 
 class HtmlIndexFetcher:
@@ -25,14 +25,20 @@ class HtmlIndexFetcher:
         year = identifier.year or ""
         url = f"https://www.sec.gov/cgi-bin/browse-edgar?action=getcompany&CIK={identifier.cik}&type=DEF%2014A&dateb={year}&owner=exclude&count=100"
 
+        # Only the HTML fallback needs a parser; keep it off the import path.
+        from bs4 import BeautifulSoup
+
         @self._retry
         def _scrape() -> List[FilingMetadata]:
             with self._limiter.limit():
                 headers = {"User-Agent": self._config.user_agent}
                 log_event("Scraping EDGAR HTML index", url=url)
-                with httpx.Client(timeout=self._config.timeout_seconds) as client:
+                with span("fetch.html_index", cik=identifier.cik), httpx.Client(
+                    timeout=self._config.timeout_seconds
+                ) as client:
                     response = client.get(url, headers=headers)
                     response.raise_for_status()
+                    incr(BYTES_DOWNLOADED, len(response.content))
                     soup = BeautifulSoup(response.text, "html.parser")
             table = soup.find("table", class_="tableFile2")
             if not table:
@@ -2,21 +2,39 @@
 
 from __future__ import annotations
 
-import re
+import functools
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional, Sequence
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 try:  # pragma: no cover - optional dependency guard
-    from rapidfuzz import fuzz
+    from rapidfuzz import fuzz, process
 except ImportError:  # pragma: no cover
     import difflib
 
     class _FallbackFuzz:
         @staticmethod
-        def partial_ratio(a: str, b: str) -> float:
-            return difflib.SequenceMatcher(None, a, b).ratio() * 100
+        def partial_ratio(a: str, b: str, score_cutoff: float = 0.0) -> float:
+            matcher = difflib.SequenceMatcher(None, a, b)
+            # The quick upper bounds skip the full match for hopeless pairs.
+            if matcher.real_quick_ratio() * 100 < score_cutoff or matcher.quick_ratio() * 100 < score_cutoff:
+                return 0.0
+            score = matcher.ratio() * 100
+            return score if score >= score_cutoff else 0.0
 
     fuzz = _FallbackFuzz()  # type: ignore
+    process = None  # type: ignore
+
+# Candidates need a score of at least this; fuzzy scores below it are dropped
+# by the matrix cutoff, which cannot change which headings qualify.
+MIN_CANDIDATE_SCORE = 0.5
+# Floor applied when the section id itself ("audit fees") appears in the heading.
+SECTION_NAME_SCORE = 0.6
+# Matrices at least this large are scored on all cores.
+PARALLEL_MIN_CELLS = 20_000
+
+Heading = Tuple[str, int, int, Optional[str]]
 
 SECTION_SYNONYMS: Dict[str, Sequence[str]] = {
     "meeting_overview": [
@@ -59,33 +77,97 @@ class HeadingCandidate:
 
 
 def score_heading(section_id: str, heading: str) -> float:
-    heading_lower = heading.lower()
-    best = 0.0
-    synonyms = SECTION_SYNONYMS.get(section_id, [])
-    for synonym in synonyms:
-        token_score = fuzz.partial_ratio(heading_lower, synonym)
-        best = max(best, token_score / 100.0)
-    if re.search(section_id.replace("_", " "), heading_lower):
-        best = max(best, 0.6)
-    return best
+    return float(score_headings([heading], [section_id], min_score=0.0)[0, 0])
 
 
-def find_heading_candidates(
-    section_id: str,
-    headings: Iterable[tuple[str, int, int, Optional[str]]],
-) -> List[HeadingCandidate]:
-    candidates: List[HeadingCandidate] = []
-    for heading_text, start, end, dom_path in headings:
-        score = score_heading(section_id, heading_text)
-        if score >= 0.5:
+def score_headings(
+    headings: Sequence[str],
+    section_ids: Sequence[str],
+    min_score: float = MIN_CANDIDATE_SCORE,
+) -> np.ndarray:
+    """Scores in [0, 1] as a ``(len(headings), len(section_ids))`` matrix.
+
+    Every heading is compared with every synonym of every section in one
+    ``rapidfuzz.process.cdist`` call; each section's column is the best of its
+    synonym columns, raised to ``SECTION_NAME_SCORE`` where the heading
+    contains the section name. Fuzzy scores under ``min_score`` are reported
+    as 0.
+    """
+    lowered = [heading.lower() for heading in headings]
+    synonyms, starts, has_synonyms = _synonym_layout(tuple(section_ids))
+    scores = np.zeros((len(lowered), len(section_ids)))
+    if lowered and synonyms:
+        matrix = _similarity_matrix(lowered, synonyms, min_score * 100) / 100.0
+        # Synonyms are laid out contiguously per section: reduce each run to its max.
+        scores[:, has_synonyms] = np.maximum.reduceat(matrix, starts, axis=1)
+    for column, section_id in enumerate(section_ids):
+        name = section_id.replace("_", " ")
+        for row, heading in enumerate(lowered):
+            if name in heading and scores[row, column] < SECTION_NAME_SCORE:
+                scores[row, column] = SECTION_NAME_SCORE
+    return scores
+
+
+@functools.lru_cache(maxsize=16)
+def _synonym_layout(section_ids: Tuple[str, ...]) -> Tuple[List[str], List[int], List[int]]:
+    """Flattened synonyms, the offset of each section's run, and the sections that have one."""
+    synonyms: List[str] = []
+    starts: List[int] = []
+    has_synonyms: List[int] = []
+    for column, section_id in enumerate(section_ids):
+        section_synonyms = SECTION_SYNONYMS.get(section_id, [])
+        if section_synonyms:
+            starts.append(len(synonyms))
+            has_synonyms.append(column)
+            synonyms.extend(section_synonyms)
+    return synonyms, starts, has_synonyms
+
+
+def _similarity_matrix(headings: Sequence[str], synonyms: Sequence[str], cutoff: float) -> np.ndarray:
+    if process is not None:
+        workers = -1 if len(headings) * len(synonyms) >= PARALLEL_MIN_CELLS else 1
+        return process.cdist(
+            headings,
+            synonyms,
+            scorer=fuzz.partial_ratio,
+            score_cutoff=cutoff,
+            dtype=np.float64,
+            workers=workers,
+        )
+    return np.array(
+        [[fuzz.partial_ratio(heading, synonym, score_cutoff=cutoff) for synonym in synonyms] for heading in headings],
+        dtype=np.float64,
+    )
+
+
+def find_candidates_by_section(
+    section_ids: Sequence[str],
+    headings: Sequence[Heading],
+) -> Dict[str, List[HeadingCandidate]]:
+    """Score ``headings`` once against all sections; best candidates first per section."""
+    headings = list(headings)
+    scores = score_headings([heading[0] for heading in headings], section_ids)
+    results: Dict[str, List[HeadingCandidate]] = {}
+    for column, section_id in enumerate(section_ids):
+        candidates = []
+        for row in np.flatnonzero(scores[:, column] >= MIN_CANDIDATE_SCORE):
+            heading_text, start, end, dom_path = headings[row]
             candidates.append(
                 HeadingCandidate(
                     section_id=section_id,
                     heading_text=heading_text,
-                    score=score,
+                    score=float(scores[row, column]),
                     start_offset=start,
                     end_offset=end,
                     dom_path=dom_path,
                 )
             )
-    return sorted(candidates, key=lambda c: c.score, reverse=True)
+        results[section_id] = sorted(candidates, key=lambda c: c.score, reverse=True)
+    return results
+
+
+def find_heading_candidates(
+    section_id: str,
+    headings: Iterable[Heading],
+) -> List[HeadingCandidate]:
+    return find_candidates_by_section([section_id], list(headings))[section_id]
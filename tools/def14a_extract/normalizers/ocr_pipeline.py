@@ -19,13 +19,14 @@ except ImportError:  # pragma: no cover - optional dependency guard
 
 from ..logging_utils import log_event
 from ..models import DocumentProfile
+from ..tracing import span
 
 
 def run_ocr(profile: DocumentProfile) -> Dict[str, object]:
     if not all([ocrmypdf, pytesseract, convert_from_path, Image]):
         raise RuntimeError("OCR dependencies not installed")
 
-    with tempfile.TemporaryDirectory() as tmpdir:
+    with span("ocr", url=profile.artifact.url), tempfile.TemporaryDirectory() as tmpdir:
         tmp_pdf = Path(tmpdir) / "ocr_input.pdf"
         tmp_pdf.write_bytes(profile.artifact.path.read_bytes())
         ocr_output = Path(tmpdir) / "ocr_output.pdf"
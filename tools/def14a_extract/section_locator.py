@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import re
-from typing import Iterable, List, Optional, Sequence, Tuple
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 from lxml import html as lxml_html
 
@@ -11,6 +12,7 @@ from .heading_rerankers import deterministic, llm_reranker
 from .logging_utils import log_event
 from .models import DocumentProfile, SectionSpan
 from .normalizers import pdf_text
+from .tracing import CACHE_HITS, incr, span
 
 # Capture visible headings plus bolded paragraph/div constructs that proxies often use.
 HEADING_XPATH = (
@@ -19,37 +21,83 @@ HEADING_XPATH = (
     "|//*[@role='heading']"
 )
 
+# Headings and scored candidates per artifact hash, so re-locating the same
+# filing (CLI reruns, update_all_data, benchmarks) skips parsing and scoring.
+CACHE_SIZE = 32
+_HEADING_CACHE: "OrderedDict[Tuple[str, str], List[deterministic.Heading]]" = OrderedDict()
+_CANDIDATE_CACHE: "OrderedDict[Tuple[str, str, Tuple[str, ...]], Dict[str, List[deterministic.HeadingCandidate]]]" = (
+    OrderedDict()
+)
+
 
 class SectionLocator:
     def __init__(self, section_ids: Sequence[str]) -> None:
-        self._section_ids = section_ids
+        self._section_ids = tuple(section_ids)
 
     def locate(self, documents: Sequence[DocumentProfile]) -> Sequence[SectionSpan]:
         spans: List[SectionSpan] = []
-        for doc in documents:
-            headings = list(_extract_headings(doc))
-            if not headings:
-                continue
-            for section_id in self._section_ids:
-                candidates = deterministic.find_heading_candidates(section_id, headings)
-                if not candidates:
-                    continue
-                ranked = llm_reranker.rerank_candidates(section_id, candidates)
-                best = ranked[0]
-                spans.append(
-                    SectionSpan(
-                        section_id=section_id,
-                        start_offset=best.start_offset,
-                        end_offset=best.end_offset,
-                        heading_text=best.heading_text,
-                        score=best.score,
-                        source="llm_rerank" if ranked != candidates else "deterministic",
-                        dom_path=best.dom_path,
+        with span("locate", documents=len(documents)) as locate_span:
+            for doc in documents:
+                with span("locate.headings", url=doc.artifact.url, doc_type=doc.doc_type):
+                    by_section = self._candidates(doc)
+                for section_id in self._section_ids:
+                    candidates = by_section.get(section_id)
+                    if not candidates:
+                        continue
+                    ranked = llm_reranker.rerank_candidates(section_id, candidates)
+                    best = ranked[0]
+                    spans.append(
+                        SectionSpan(
+                            section_id=section_id,
+                            start_offset=best.start_offset,
+                            end_offset=best.end_offset,
+                            heading_text=best.heading_text,
+                            score=best.score,
+                            source="llm_rerank" if ranked != candidates else "deterministic",
+                            dom_path=best.dom_path,
+                        )
                     )
-                )
+            locate_span.set(spans=len(spans))
         log_event("Section locator identified spans", count=len(spans))
         return spans
 
+    def _candidates(self, doc: DocumentProfile) -> Dict[str, List[deterministic.HeadingCandidate]]:
+        """Candidates for every section, scored in one batch and cached by artifact hash."""
+        sha256 = doc.artifact.sha256
+        key = (sha256, doc.doc_type, self._section_ids)
+        cached = _cache_get(_CANDIDATE_CACHE, key) if sha256 else None
+        if cached is not None:
+            return cached
+        headings = _cache_get(_HEADING_CACHE, key[:2]) if sha256 else None
+        if headings is None:
+            headings = list(_extract_headings(doc))
+            if sha256:
+                _cache_put(_HEADING_CACHE, key[:2], headings)
+        candidates = deterministic.find_candidates_by_section(self._section_ids, headings) if headings else {}
+        if sha256:
+            _cache_put(_CANDIDATE_CACHE, key, candidates)
+        return candidates
+
+
+def clear_cache() -> None:
+    _HEADING_CACHE.clear()
+    _CANDIDATE_CACHE.clear()
+
+
+def _cache_get(cache: OrderedDict, key: tuple):
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+        incr(CACHE_HITS)
+    return value
+
+
+def _cache_put(cache: OrderedDict, key: tuple, value) -> None:
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > CACHE_SIZE:
+        cache.popitem(last=False)
+
 
 def _extract_headings(doc: DocumentProfile) -> Iterable[Tuple[str, int, int, Optional[str]]]:
     if doc.doc_type == "html":
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import hashlib
 import uuid
+from io import StringIO
 from pathlib import Path
 from typing import List, Sequence
 
@@ -12,6 +13,7 @@ from lxml import html as lxml_html
 
 from .logging_utils import log_event
 from .models import DocumentProfile, SectionSpan, TableExtractionResult
+from .tracing import TABLES_PARSED, span
 
 
 class TableExtractionOrchestrator:
@@ -24,11 +26,13 @@ class TableExtractionOrchestrator:
         documents: Sequence[DocumentProfile],
     ) -> List[TableExtractionResult]:
         tables: List[TableExtractionResult] = []
-        for doc in documents:
-            if doc.doc_type == "html":
-                tables.extend(self._extract_html_tables(section, doc))
-            elif doc.doc_type.startswith("pdf"):
-                tables.extend(self._extract_pdf_tables(section, doc))
+        with span("tables", section=section.section_id) as table_span:
+            for doc in documents:
+                if doc.doc_type == "html":
+                    tables.extend(self._extract_html_tables(section, doc))
+                elif doc.doc_type.startswith("pdf"):
+                    tables.extend(self._extract_pdf_tables(section, doc))
+            table_span.incr(TABLES_PARSED, len(tables))
         log_event(
             "Extracted tables for section",
             section=section.section_id,
@@ -63,7 +67,7 @@ class TableExtractionOrchestrator:
         for idx, node in enumerate(table_nodes):
             try:
                 table_html = lxml_html.tostring(node, encoding="unicode")
-                frames = pd.read_html(table_html, flavor="lxml")
+                frames = pd.read_html(StringIO(table_html), flavor="lxml")
             except ValueError:
                 continue
             for frame_idx, frame in enumerate(frames):
@@ -57,3 +57,21 @@ def test_cli_facts_command_writes_output(monkeypatch, tmp_path):
     payload = output_path.read_text()
     assert '"meeting_date"' in payload
     assert '"2025-05-15"' in payload
+
+
+def test_cli_trace_option_writes_jsonl(monkeypatch, tmp_path):
+    from tools.def14a_extract.tracing import span
+
+    trace_path = tmp_path / "trace.jsonl"
+
+    def _fake_get_facts(request):  # type: ignore[unused-argument]
+        with span("get_def14a_facts"):
+            return {}
+
+    monkeypatch.setattr("tools.def14a_extract.cli.get_def14a_facts", _fake_get_facts)
+
+    runner = CliRunner()
+    result = runner.invoke(app, ["facts", "--ticker", "CATY", "--trace", str(trace_path)])
+
+    assert result.exit_code == 0
+    assert '"name": "get_def14a_facts"' in trace_path.read_text()
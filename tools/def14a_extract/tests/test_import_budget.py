@@ -0,0 +1,47 @@
+"""Startup guard: entry points must not import the parsing stack."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[3]
+
+HEAVY_MODULES = ("pandas", "numpy", "lxml", "bs4", "httpx", "rapidfuzz", "tenacity", "pdfplumber")
+# Cumulative import time allowed for an entry point, excluding interpreter startup.
+# Typer (and the rich console it pulls in) accounts for most of it.
+IMPORT_BUDGET_SECONDS = 0.5
+
+
+def _import_profile(module: str):
+    probe = f"import sys, {module}; print(','.join(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative_us = 0
+    for line in result.stderr.splitlines():
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            cumulative_us = int(fields[1])
+    loaded = [name for name in result.stdout.strip().split(",") if name]
+    return loaded, cumulative_us / 1e6
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "tools.def14a_extract",
+        "tools.def14a_extract.cli",
+        "tools.def14a_extract.registry",
+        "tools.def14a_extract.cache",
+    ],
+)
+def test_entry_points_import_lazily(module):
+    loaded, seconds = _import_profile(module)
+    assert loaded == []
+    assert seconds < IMPORT_BUDGET_SECONDS
@@ -57,3 +57,49 @@ def test_meeting_extractor_uses_normalized_html(tmp_path):
     assert facts["record_date"].value == "2025-03-25"
     assert facts["meeting_location_type"].value == "virtual-only"
     assert facts["meeting_access_url"].value.startswith("https://www.virtualshareholdermeeting.com")
+
+
+def test_batched_scoring_matches_per_section_scoring():
+    from tools.def14a_extract.heading_rerankers import deterministic
+
+    headings = [
+        ("NOTICE OF ANNUAL MEETING OF STOCKHOLDERS", 0, 0, "/html/body/h2[1]"),
+        ("Audit Fees and Services", 1, 1, None),
+        ("Security Ownership of Certain Beneficial Owners and Management", 2, 2, None),
+        ("Compensation Committee Report", 3, 3, None),
+        ("Other Matters", 4, 4, None),
+    ]
+    section_ids = list(deterministic.SECTION_SYNONYMS)
+    batched = deterministic.find_candidates_by_section(section_ids, headings)
+    for section_id in section_ids:
+        expected = []
+        for text, start, _end, _dom in headings:
+            score = max(
+                deterministic.fuzz.partial_ratio(text.lower(), synonym) / 100.0
+                for synonym in deterministic.SECTION_SYNONYMS[section_id]
+            )
+            if section_id.replace("_", " ") in text.lower():
+                score = max(score, 0.6)
+            if score >= 0.5:
+                expected.append((start, round(score, 9)))
+        got = [(c.start_offset, round(c.score, 9)) for c in batched[section_id]]
+        assert sorted(got) == sorted(expected)
+        assert [c.score for c in batched[section_id]] == sorted((c.score for c in batched[section_id]), reverse=True)
+    assert deterministic.score_heading("audit_fees", "Audit Fees and Services") == batched["audit_fees"][0].score
+
+
+def test_locator_caches_headings_by_artifact_hash(tmp_path):
+    from tools.def14a_extract import section_locator
+
+    section_locator.clear_cache()
+    profile = _build_html_proxy(tmp_path)
+    locator = SectionLocator(["meeting_overview", "executive_compensation"])
+    first = locator.locate([profile])
+
+    # Same hash: served from the cache without re-reading the artifact.
+    profile.artifact.path.unlink()
+    assert locator.locate([profile]) == first
+
+    # A different section set reuses the cached headings.
+    assert [span.section_id for span in SectionLocator(["meeting_overview"]).locate([profile])] == ["meeting_overview"]
+    section_locator.clear_cache()
@@ -0,0 +1,77 @@
+import json
+
+from tools.def14a_extract import tracing
+from tools.def14a_extract.fact_extraction.meeting import MeetingFactExtractor
+from tools.def14a_extract.section_locator import SectionLocator
+from tools.def14a_extract.tests.test_section_locator import _build_html_proxy
+
+
+def test_disabled_tracing_is_a_shared_noop():
+    assert tracing.get_tracer() is None
+    first = tracing.span("a", x=1)
+    assert first is tracing.span("b")
+    with first as opened:
+        opened.incr(tracing.CACHE_HITS)
+        opened.set(y=2)
+    tracing.incr(tracing.REGEXES_RUN)
+
+
+def test_spans_nest_and_export(tmp_path):
+    output = tmp_path / "trace" / "run.jsonl"
+    with tracing.tracing(output) as tracer:
+        with tracing.span("outer", ticker="CATY"):
+            tracing.incr(tracing.CACHE_HITS)
+            with tracing.span("inner") as inner:
+                inner.set(rows=3)
+                tracing.incr(tracing.BYTES_DOWNLOADED, 512)
+            with tracing.span("inner"):
+                tracing.incr(tracing.BYTES_DOWNLOADED, 256)
+    assert tracing.get_tracer() is None
+
+    records = tracer.records()
+    assert [r["name"] for r in records] == ["outer", "inner", "inner"]
+    outer = records[0]
+    assert all(r["parent_id"] == outer["span_id"] for r in records[1:])
+    assert outer["counters"] == {"cache_hits": 1}
+    assert records[1]["attrs"] == {"rows": 3}
+    assert outer["duration_ms"] >= records[1]["duration_ms"] + records[2]["duration_ms"]
+    assert tracer.counters == {"cache_hits": 1, "bytes_downloaded": 768}
+
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert len(lines) == 4
+    assert lines[-1] == {"totals": {"bytes_downloaded": 768, "cache_hits": 1}}
+
+    table = tracer.summary_table().splitlines()
+    assert table[0].split() == ["span", "calls", "total", "ms", "mean", "ms", "max", "ms", "bytes_downloaded", "cache_hits"]
+    inner_row = next(line for line in table if line.startswith("inner"))
+    assert inner_row.split()[1] == "2"
+    assert inner_row.split()[-2:] == ["768", "0"]
+    assert table[-1].split() == ["total", "768", "1"]
+
+
+def test_exceptions_are_recorded_on_the_span():
+    with tracing.tracing() as tracer:
+        try:
+            with tracing.span("boom"):
+                raise KeyError("x")
+        except KeyError:
+            pass
+    assert tracer.records()[0]["error"] == "KeyError"
+
+
+def test_locator_and_extractors_are_instrumented(tmp_path):
+    profile = _build_html_proxy(tmp_path)
+    with tracing.tracing() as tracer:
+        spans = SectionLocator(["meeting_overview"]).locate([profile])
+        MeetingFactExtractor().extract(spans, [], [profile], {})
+    records = {r["name"]: r for r in tracer.records()}
+    assert records["locate.headings"]["parent_id"] == records["locate"]["span_id"]
+    assert records["locate"]["attrs"]["spans"] == 1
+    assert tracer.counters[tracing.REGEXES_RUN] > 0
+
+
+def test_trace_path_comes_from_environment(monkeypatch, tmp_path):
+    monkeypatch.delenv(tracing.TRACE_ENV_VAR, raising=False)
+    assert tracing.tracing_from_env() is None
+    monkeypatch.setenv(tracing.TRACE_ENV_VAR, str(tmp_path / "t.jsonl"))
+    assert tracing.tracing_from_env() == tmp_path / "t.jsonl"
@@ -0,0 +1,215 @@
+"""Lightweight tracing spans and counters for the extraction pipeline.
+
+Spans are context managers timed with ``time.perf_counter`` and nested through
+a context variable, so a span opened inside another records it as its parent.
+Counters (``bytes_downloaded``, ``tables_parsed``, ``regexes_run``,
+``cache_hits``) are attributed to the innermost open span and totalled on the
+tracer.
+
+Tracing is off unless a :class:`Tracer` is active (``with tracing(...)`` or the
+``DEF14A_TRACE`` environment variable, see :func:`tracing_from_env`). While it
+is off, :func:`span` returns a shared no-op object and :func:`incr` returns
+immediately, so instrumented code pays one global lookup per call.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import itertools
+import json
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+TRACE_ENV_VAR = "DEF14A_TRACE"
+
+BYTES_DOWNLOADED = "bytes_downloaded"
+TABLES_PARSED = "tables_parsed"
+REGEXES_RUN = "regexes_run"
+CACHE_HITS = "cache_hits"
+
+
+@dataclass
+class SpanRecord:
+    span_id: int
+    parent_id: Optional[int]
+    name: str
+    start_ms: float
+    duration_ms: float = 0.0
+    attrs: Dict[str, Any] = field(default_factory=dict)
+    counters: Dict[str, int] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+class Span:
+    """An open span; use as a context manager."""
+
+    __slots__ = ("_tracer", "_record", "_started", "_token")
+
+    def __init__(self, tracer: "Tracer", record: SpanRecord) -> None:
+        self._tracer = tracer
+        self._record = record
+        self._started = 0.0
+        self._token: Optional[contextvars.Token] = None
+
+    def __enter__(self) -> "Span":
+        self._started = time.perf_counter()
+        self._record.start_ms = (self._started - self._tracer.origin) * 1000
+        self._token = _CURRENT_SPAN.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._record.duration_ms = (time.perf_counter() - self._started) * 1000
+        if exc_type is not None:
+            self._record.error = exc_type.__name__
+        if self._token is not None:
+            _CURRENT_SPAN.reset(self._token)
+        self._tracer.spans.append(self._record)
+
+    @property
+    def span_id(self) -> int:
+        return self._record.span_id
+
+    def set(self, **attrs: Any) -> None:
+        self._record.attrs.update(attrs)
+
+    def incr(self, counter: str, amount: int = 1) -> None:
+        counters = self._record.counters
+        counters[counter] = counters.get(counter, 0) + amount
+        self._tracer.counters[counter] = self._tracer.counters.get(counter, 0) + amount
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    span_id = None
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    def set(self, **attrs: Any) -> None:
+        return None
+
+    def incr(self, counter: str, amount: int = 1) -> None:
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+_CURRENT_SPAN: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "def14a_current_span", default=None
+)
+_ACTIVE_TRACER: Optional["Tracer"] = None
+
+
+class Tracer:
+    """Collects finished spans and counter totals for one run."""
+
+    def __init__(self) -> None:
+        self.origin = time.perf_counter()
+        self.spans: List[SpanRecord] = []
+        self.counters: Dict[str, int] = {}
+        self._ids = itertools.count(1)
+
+    def span(self, name: str, **attrs: Any) -> Span:
+        parent = _CURRENT_SPAN.get()
+        parent_id = parent.span_id if parent is not None and parent._tracer is self else None
+        record = SpanRecord(span_id=next(self._ids), parent_id=parent_id, name=name, start_ms=0.0, attrs=attrs)
+        return Span(self, record)
+
+    def incr(self, counter: str, amount: int = 1) -> None:
+        current = _CURRENT_SPAN.get()
+        if current is not None and current._tracer is self:
+            current.incr(counter, amount)
+        else:
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def records(self) -> List[Dict[str, Any]]:
+        """Finished spans as dicts, in start order."""
+        return [asdict(record) for record in sorted(self.spans, key=lambda r: (r.start_ms, r.span_id))]
+
+    def export_jsonl(self, path: Path) -> Path:
+        """Write one JSON object per span, then a ``totals`` line; atomic."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lines = [json.dumps(record, sort_keys=True, default=str) for record in self.records()]
+        lines.append(json.dumps({"totals": dict(sorted(self.counters.items()))}, sort_keys=True))
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.write_text("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+        return path
+
+    def summary_table(self) -> str:
+        """Per-span-name calls, wall time and counters as a fixed-width table."""
+        rows: Dict[str, Dict[str, Any]] = {}
+        for record in self.records():
+            row = rows.setdefault(record["name"], {"calls": 0, "total": 0.0, "max": 0.0, "counters": {}})
+            row["calls"] += 1
+            row["total"] += record["duration_ms"]
+            row["max"] = max(row["max"], record["duration_ms"])
+            for counter, amount in record["counters"].items():
+                row["counters"][counter] = row["counters"].get(counter, 0) + amount
+        counter_names = sorted(self.counters)
+        width = max([len("span"), *(len(name) for name in rows)])
+        header = f"{'span':<{width}}  {'calls':>5}  {'total ms':>10}  {'mean ms':>9}  {'max ms':>9}"
+        header += "".join(f"  {name:>{len(name)}}" for name in counter_names)
+        lines = [header, "-" * len(header)]
+        for name, row in rows.items():
+            line = (
+                f"{name:<{width}}  {row['calls']:>5}  {row['total']:>10.1f}  "
+                f"{row['total'] / row['calls']:>9.2f}  {row['max']:>9.1f}"
+            )
+            line += "".join(f"  {row['counters'].get(c, 0):>{len(c)}}" for c in counter_names)
+            lines.append(line)
+        if counter_names:
+            lines.append("-" * len(header))
+            totals = f"{'total':<{width}}  {'':>5}  {'':>10}  {'':>9}  {'':>9}"
+            totals += "".join(f"  {self.counters[c]:>{len(c)}}" for c in counter_names)
+            lines.append(totals)
+        return "\n".join(lines)
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _ACTIVE_TRACER
+
+
+def span(name: str, **attrs: Any) -> Any:
+    """Open a span under the active tracer; a shared no-op when tracing is off."""
+    tracer = _ACTIVE_TRACER
+    if tracer is None:
+        return _NOOP_SPAN
+    return tracer.span(name, **attrs)
+
+
+def incr(counter: str, amount: int = 1) -> None:
+    """Add to ``counter`` on the innermost open span; no-op when tracing is off."""
+    tracer = _ACTIVE_TRACER
+    if tracer is None:
+        return
+    tracer.incr(counter, amount)
+
+
+@contextmanager
+def tracing(output: Optional[Path] = None) -> Iterator[Tracer]:
+    """Activate a fresh tracer; export JSONL to ``output`` on exit if given."""
+    global _ACTIVE_TRACER
+    previous = _ACTIVE_TRACER
+    tracer = Tracer()
+    _ACTIVE_TRACER = tracer
+    try:
+        yield tracer
+    finally:
+        _ACTIVE_TRACER = previous
+        if output is not None:
+            tracer.export_jsonl(output)
+
+
+def tracing_from_env() -> Optional[Path]:
+    """JSONL path requested through ``DEF14A_TRACE``, or None."""
+    value = os.environ.get(TRACE_ENV_VAR, "").strip()
+    return Path(value) if value else None
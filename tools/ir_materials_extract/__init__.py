@@ -1,15 +1,28 @@
-"""Public exports for the IR materials extraction toolkit."""
+"""Public exports for the IR materials extraction toolkit.
+
+``extract_facts_from_url`` and ``cli_app`` are resolved on first access so
+that ``python -m tools.ir_materials_extract --help`` and cache lookups do not
+load the parsing stack.
+"""
 
 from __future__ import annotations
 
-from .config import ToolConfig
-from .pipeline import extract_facts_from_url
+from typing import Any
 
-try:  # pragma: no cover - optional CLI dependency guard
-    from .cli import app as cli_app
-except RuntimeError:  # pragma: no cover
-    cli_app = None  # type: ignore
-except ImportError:  # pragma: no cover
-    cli_app = None  # type: ignore
+from .config import ToolConfig
 
 __all__ = ["ToolConfig", "extract_facts_from_url", "cli_app"]
+
+
+def __getattr__(name: str) -> Any:
+    if name == "extract_facts_from_url":
+        from .pipeline import extract_facts_from_url
+
+        return extract_facts_from_url
+    if name == "cli_app":
+        try:
+            from .cli import app as cli_app
+        except (RuntimeError, ImportError):  # pragma: no cover - optional CLI dependency guard
+            cli_app = None  # type: ignore
+        return cli_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,9 +6,6 @@ import json
 from pathlib import Path
 from typing import List, Optional
 
-from .pipeline import extract_facts_from_url
-from .discovery import discover_ir_artifacts
-
 try:  # pragma: no cover - optional dependency guard
     import typer
 except ImportError:  # pragma: no cover
@@ -22,6 +19,29 @@ except ImportError:  # pragma: no cover
     RichTable = None  # type: ignore
 
 
+def extract_facts_from_url(url: str, **kwargs):
+    """Pipeline entry point, imported on first use to keep CLI startup fast."""
+    from .pipeline import extract_facts_from_url as _extract_facts_from_url
+
+    return _extract_facts_from_url(url, **kwargs)
+
+
+def discover_ir_artifacts(ticker: str, period: Optional[str] = None):
+    """Discovery entry point, imported on first use (httpx, BeautifulSoup)."""
+    from .discovery import discover_ir_artifacts as _discover_ir_artifacts
+
+    return _discover_ir_artifacts(ticker, period)
+
+
+def _install_http_transport() -> None:
+    """Honour ``CATY_HTTP_MODE`` record/replay when run from the CATY repo."""
+    try:
+        from analysis.http_cassette import install_from_env
+    except ImportError:  # pragma: no cover - toolkit used outside the repo
+        return
+    install_from_env()
+
+
 def _build_app() -> "typer.Typer | None":
     if not typer or not Console or not RichTable:
         return None
@@ -61,6 +81,7 @@ def _build_app() -> "typer.Typer | None":
     @app.callback(invoke_without_command=True)
     def main(ctx: "typer.Context") -> None:  # type: ignore[name-defined]
         """IR materials extraction toolkit."""
+        _install_http_transport()
         if ctx.invoked_subcommand is None:
             console.print(ctx.get_help())
             raise typer.Exit(0)
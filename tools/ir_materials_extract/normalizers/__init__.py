@@ -1,6 +1,20 @@
-"""Content normalizers for IR artifacts."""
+"""Content normalizers for IR artifacts (each loaded on first access)."""
 
-from .html_normalizer import normalize_html
-from .pdf_normalizer import normalize_pdf
+from importlib import import_module
+from typing import Any
+
+_LAZY_EXPORTS = {
+    "normalize_html": ".html_normalizer",
+    "normalize_pdf": ".pdf_normalizer",
+}
 
 __all__ = ["normalize_html", "normalize_pdf"]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -15,10 +15,7 @@ from .fact_extraction import (
     validate_all,
 )
 from .fact_extraction.models import FactCandidate
-from .fetchers import fetch_artifact_sync
-from .normalizers import normalize_html, normalize_pdf
 from .section_locators import locate_sections
-from .table_extraction import extract_html_tables, extract_pdf_tables
 
 
 def _content_type_from_suffix(path: Path, raw_content_type: str) -> str:
@@ -55,6 +52,8 @@ def extract_facts_from_url(
     if parsed.scheme == "file":
         artifact_path, content_type, sha256 = _resolve_local_artifact(url)
     else:
+        from .fetchers.http_fetcher import fetch_artifact_sync
+
         fetch_result = fetch_artifact_sync(url, config=active_config, force_refresh=force_refresh)
         if not fetch_result.success or not fetch_result.file_path:
             error = fetch_result.error or "unknown error"
@@ -67,10 +66,17 @@ def extract_facts_from_url(
         )
         sha256 = fetched_meta.sha256 if fetched_meta else ""
 
+    # Parsers load on first use: HTML runs never import pdfplumber and vice versa.
     if content_type.startswith("text/html"):
+        from .normalizers.html_normalizer import normalize_html
+        from .table_extraction.html_tables import extract_html_tables
+
         normalized = normalize_html(artifact_path)
         tables = extract_html_tables(artifact_path)
     elif content_type.startswith("application/pdf"):
+        from .normalizers.pdf_normalizer import normalize_pdf
+        from .table_extraction.pdf_tables import extract_pdf_tables
+
         normalized = normalize_pdf(artifact_path)
         tables = extract_pdf_tables(artifact_path)
     else:
@@ -1,9 +1,15 @@
-"""Convenience exports for table extraction helpers."""
+"""Convenience exports for table extraction helpers (each loaded on first access)."""
 
-from . import html_tables, pdf_tables
-from .html_tables import extract_html_tables
-from .models import TableExtractionResult
-from .pdf_tables import extract_pdf_tables
+from importlib import import_module
+from typing import Any
+
+_LAZY_EXPORTS = {
+    "extract_html_tables": ".html_tables",
+    "extract_pdf_tables": ".pdf_tables",
+    "TableExtractionResult": ".models",
+    "html_tables": ".html_tables",
+    "pdf_tables": ".pdf_tables",
+}
 
 __all__ = [
     "extract_pdf_tables",
@@ -12,3 +18,13 @@ __all__ = [
     "html_tables",
     "pdf_tables",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = import_module(module_name, __name__)
+    value = module if module_name == f".{name}" else getattr(module, name)
+    globals()[name] = value
+    return value